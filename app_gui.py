@@ -1,7 +1,22 @@
+import time
+
+# Instante en que empezó a cargarse el módulo (ver medir_inicio).
+INICIO = time.perf_counter()
+
+import functools
+import os
+import sys
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
 import db_manager
+from tabla_ui import TablaDatos, TablaVirtual
+from tareas_ui import EjecutorTareas
+
+# exportar e importar se cargan al usarse: no hacen falta para el login y
+# exportar arrastra xml.sax (y con él urllib y http.client).
+FIN_IMPORTS = time.perf_counter()
 
 # --- NUEVA PALETA DE COLORES "NEON GRID" ---
 APP_BG_COLOR = "#020617"
@@ -19,14 +34,39 @@ FONT_BOLD = ("Segoe UI", 12, "bold")
 FONT_TITLE = ("Segoe UI", 20, "bold")
 FONT_MENU_TITLE = ("Segoe UI", 16, "bold")
 
+# Filas por página en las tablas con paginación por clave.
+TAMANO_PAGINA = 100
+
+# Catálogos que se leen en segundo plano mientras se muestra el login, con
+# los mismos argumentos que usan las pantallas (así quedan en la caché de
+# get_catalogo).
+CATALOGOS_PRECARGA = (
+    ("Empresas", "ID_Empresa", "Nombre_Empresa"),
+    ("Areas_Conocimiento", "ID_Area_Conocimiento", "Nombre_Area"),
+    ("Profesiones", "ID_Profesion", "Nombre_Profesion"),
+    ("Universidades", "ID_Universidad", "Nombre_Universidad"),
+    ("Bancos", "ID_Banco", "Nombre_Banco"),
+)
+
+
+def precargar_catalogos():
+    for tabla, id_col, nombre_col in CATALOGOS_PRECARGA:
+        try:
+            db_manager.get_catalogo(tabla, id_col, nombre_col)
+        except Exception:
+            # Si falla, la pantalla que lo necesite lo volverá a pedir.
+            return
+
 
 # --- FUNCIÓN DE UTILIDAD (PARA EL TREEVIEW) ---
 def crear_tabla(parent, cols, widths={}):
-    tree = ttk.Treeview(parent, columns=cols, show="headings", style="Treeview")
-    for col in cols:
-        tree.heading(col, text=col)
-        tree.column(col, width=widths.get(col, 120), anchor="w")
-    return tree
+    """Tabla enlazada a datos (ver tabla_ui.TablaDatos)."""
+    return TablaDatos(parent, cols, widths=widths)
+
+
+def crear_tabla_virtual(parent, cols, widths={}, filas_visibles=15):
+    """Tabla para resultados grandes (ver tabla_ui.TablaVirtual)."""
+    return TablaVirtual(parent, cols, widths=widths, filas_visibles=filas_visibles)
 
 
 # --- CLASES DE FORMULARIO (BASE) ---
@@ -351,13 +391,10 @@ class GestionarExperienciaWindow(FormularioBase):
         self.populate_tree()
 
     def populate_tree(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for exp in db_manager.get_experiencias_db(self.id_postulante) or []:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
+        self.tree.actualizar(
+            (
+                exp["ID_Experiencia"],
+                (
                     exp["ID_Experiencia"],
                     exp["Empresa"],
                     exp["Cargo_Ocupado"],
@@ -365,6 +402,8 @@ class GestionarExperienciaWindow(FormularioBase):
                     exp["Fecha_Fin"] or "Actual",
                 ),
             )
+            for exp in db_manager.get_experiencias_db(self.id_postulante) or []
+        )
 
     def agregar(self):
         datos = {
@@ -480,12 +519,10 @@ class GestionCatalogoWindow(FormularioBase):
         self.populate_tree()
 
     def populate_tree(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for item in db_manager.get_catalogo(self.tabla, self.id_col, self.nombre_col):
-            self.tree.insert(
-                "", "end", values=(item[self.id_col], item[self.nombre_col])
-            )
+        self.tree.actualizar(
+            (item[self.id_col], (item[self.id_col], item[self.nombre_col]))
+            for item in db_manager.get_catalogo(self.tabla, self.id_col, self.nombre_col)
+        )
 
     def agregar(self):
         new_val = self.new_entry.get()
@@ -691,20 +728,73 @@ class ActualizarVacanteWindow(FormularioBase):
 
 
 class App(ctk.CTk):
-    def __init__(self, is_first_run=False):
+    # is_first_run=None: se averigua en segundo plano con la ventana ya visible.
+    def __init__(self, is_first_run=None):
         super().__init__(fg_color=APP_BG_COLOR)
         self.title("Sistema de Gestión Hiring Group")
         self.geometry("1100x700")
         self.minsize(800, 600)
-        self.is_first_run = is_first_run
+        self.is_first_run = bool(is_first_run)
         self.usuario_actual = None
+        self.frame_actual = None
         self.rol_actual = None
         self.setup_styles()
+        # Las llamadas a db_manager corren fuera del hilo de la interfaz.
+        self.tareas = EjecutorTareas(
+            self,
+            al_cambiar_ocupado=self.mostrar_ocupado,
+            al_fallar_por_defecto=self.mostrar_error_tarea,
+        )
+        self.protocol("WM_DELETE_WINDOW", self.cerrar)
         self.container = ctk.CTkFrame(self, fg_color="transparent")
         self.container.pack(side="top", fill="both", expand=True)
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
+        self.indicador_ocupado = ctk.CTkLabel(
+            self,
+            text="Cargando…",
+            font=FONT_BOLD,
+            fg_color=ACCENT_PURPLE,
+            text_color=TEXT_COLOR,
+            corner_radius=8,
+        )
         self.show_frame(LoginFrame)
+        if is_first_run is None:
+            self.tareas.ejecutar(
+                db_manager.hay_usuarios_registrados,
+                al_terminar=self.al_verificar_usuarios,
+                grupo="inicio",
+            )
+        self.tiempos_inicio = {"importar": (FIN_IMPORTS - INICIO) * 1000}
+        self.after_idle(self.al_primera_pintura)
+
+    def al_verificar_usuarios(self, hay_usuarios):
+        if not hay_usuarios:
+            self.is_first_run = True
+            if isinstance(self.frame_actual, LoginFrame):
+                self.frame_actual.mostrar_crear_primer_usuario()
+
+    def al_primera_pintura(self):
+        """
+        Registra cuánto tardó la ventana en mostrarse desde que empezó a
+        cargarse app_gui y precarga los catálogos mientras se ve el login.
+        Con HIRING_GROUP_MEDIR_INICIO definida imprime los tiempos (en ms)
+        por stderr; con el valor "salir" además cierra la aplicación.
+        """
+        self.update_idletasks()
+        self.tiempos_inicio["primera_pintura"] = (time.perf_counter() - INICIO) * 1000
+        threading.Thread(
+            target=precargar_catalogos, name="precarga_catalogos", daemon=True
+        ).start()
+        medir = os.environ.get("HIRING_GROUP_MEDIR_INICIO")
+        if medir:
+            print(
+                "Tiempos de inicio (ms): "
+                + " ".join(f"{k}={v:.1f}" for k, v in self.tiempos_inicio.items()),
+                file=sys.stderr,
+            )
+            if medir == "salir":
+                self.cerrar()
 
     def setup_styles(self):
         style = ttk.Style()
@@ -730,10 +820,28 @@ class App(ctk.CTk):
         style.map("Treeview.Heading", background=[("active", BUTTON_SECONDARY_HOVER)])
 
     def show_frame(self, FrameClass):
+        self.tareas.cancelar()
         for widget in self.container.winfo_children():
             widget.destroy()
         frame = FrameClass(parent=self.container, controller=self)
         frame.grid(row=0, column=0, sticky="nsew")
+        self.frame_actual = frame
+
+    def mostrar_ocupado(self, ocupado):
+        if ocupado:
+            self.indicador_ocupado.place(relx=1.0, rely=1.0, x=-20, y=-10, anchor="se")
+            self.indicador_ocupado.lift()
+            self.config(cursor="watch")
+        else:
+            self.indicador_ocupado.place_forget()
+            self.config(cursor="")
+
+    def mostrar_error_tarea(self, error):
+        messagebox.showerror("Error", f"No se pudo completar la operación: {error}")
+
+    def cerrar(self):
+        self.tareas.cerrar()
+        self.destroy()
 
 
 class LoginFrame(ctk.CTkFrame):
@@ -744,6 +852,7 @@ class LoginFrame(ctk.CTkFrame):
         self.grid_columnconfigure(0, weight=1)
         login_container = ctk.CTkFrame(self, fg_color="transparent")
         login_container.grid(row=0, column=0)
+        self.login_container = login_container
         ctk.CTkLabel(
             login_container,
             text="Login del Sistema",
@@ -779,7 +888,7 @@ class LoginFrame(ctk.CTkFrame):
         )
         self.pass_entry.pack()
         self.pass_entry.bind("<Return>", self.attempt_login)
-        ctk.CTkButton(
+        self.ingresar_btn = ctk.CTkButton(
             login_container,
             text="Ingresar",
             command=self.attempt_login,
@@ -788,18 +897,22 @@ class LoginFrame(ctk.CTkFrame):
             fg_color=ACCENT_PURPLE,
             hover_color=ACCENT_PINK,
             text_color=TEXT_COLOR,  # CORREGIDO
-        ).pack(pady=20, ipady=5)
+        )
+        self.ingresar_btn.pack(pady=20, ipady=5)
         if self.controller.is_first_run:
-            ctk.CTkButton(
-                login_container,
-                text="Crear Primer Usuario (Admin)",
-                command=self.crear_primer_usuario,
-                height=35,
-                corner_radius=10,
-                fg_color=BUTTON_SECONDARY_COLOR,
-                hover_color=BUTTON_SECONDARY_HOVER,
-                text_color=TEXT_COLOR,  # CORREGIDO
-            ).pack(pady=10)
+            self.mostrar_crear_primer_usuario()
+
+    def mostrar_crear_primer_usuario(self):
+        ctk.CTkButton(
+            self.login_container,
+            text="Crear Primer Usuario (Admin)",
+            command=self.crear_primer_usuario,
+            height=35,
+            corner_radius=10,
+            fg_color=BUTTON_SECONDARY_COLOR,
+            hover_color=BUTTON_SECONDARY_HOVER,
+            text_color=TEXT_COLOR,  # CORREGIDO
+        ).pack(pady=10)
 
     def crear_primer_usuario(self):
         CrearUsuarioWindow(
@@ -820,18 +933,62 @@ class LoginFrame(ctk.CTkFrame):
                 "Campos Vacíos", "Por favor, ingrese email y contraseña."
             )
             return
-        self.controller.config(cursor="watch")
-        self.controller.update_idletasks()
-        usuario, rol = db_manager.login_usuario(email, password)
-        self.controller.config(cursor="")
-        if usuario:
-            self.controller.usuario_actual, self.controller.rol_actual = usuario, rol
-            self.controller.show_frame(MainFrame)
-        else:
+        if str(self.ingresar_btn.cget("state")) == "disabled":
+            return
+        self.ingresar_btn.configure(state="disabled")
+
+        def resultado(respuesta):
+            usuario, rol = respuesta
+            if usuario:
+                self.controller.usuario_actual, self.controller.rol_actual = usuario, rol
+                self.controller.show_frame(MainFrame)
+                return
+            self.ingresar_btn.configure(state="normal")
             messagebox.showerror(
                 "Login Fallido", "Email, contraseña incorrectos o usuario inactivo."
             )
 
+        def fallo(error):
+            self.ingresar_btn.configure(state="normal")
+            self.controller.mostrar_error_tarea(error)
+
+        self.controller.tareas.ejecutar(
+            db_manager.login_usuario,
+            email,
+            password,
+            al_terminar=resultado,
+            al_fallar=fallo,
+            grupo="login",
+        )
+
+
+# --- CACHÉ DE PANTALLAS ---
+class Pantalla:
+    """Frame de una pantalla del menú y la versión de los datos con que se armó."""
+
+    def __init__(self, frame, version):
+        self.frame = frame
+        self.version = version
+
+
+def pantalla(guardar=True, tablas=None):
+    """
+    Decora un show_* de MainFrame: la pantalla se arma en su propio frame y
+    al volver a ella solo se vuelve a mostrar, salvo que hayan cambiado los
+    datos de 'tablas' (todas si es None) desde que se armó, aunque los haya
+    escrito otro proceso (db_manager.get_version_datos). Con guardar=False
+    se arma de nuevo cada vez.
+    """
+
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            self.mostrar_pantalla(metodo, args, kwargs, guardar, tablas)
+
+        return envoltura
+
+    return decorador
+
 
 class MainFrame(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -843,10 +1000,14 @@ class MainFrame(ctk.CTkFrame):
             self, width=220, corner_radius=0, fg_color=FRAME_BG_COLOR
         )
         menu_frame.grid(row=0, column=0, sticky="nsw")
-        self.content_frame = ctk.CTkScrollableFrame(
+        self.contenedor = ctk.CTkScrollableFrame(
             self, corner_radius=0, fg_color="transparent"
         )
-        self.content_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
+        self.contenedor.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
+        # content_frame es siempre el frame de la pantalla visible.
+        self.content_frame = None
+        self.pantallas = {}
+        self.pantalla_actual = None
         rol = self.controller.rol_actual
         ctk.CTkLabel(
             menu_frame,
@@ -860,8 +1021,11 @@ class MainFrame(ctk.CTkFrame):
                 ("Gestionar Empresas", self.show_gestionar_empresas),
                 ("Gestionar Catálogos", self.show_menu_catalogos),
                 ("Contratar Postulante", self.show_contratar_form),
+                ("Buscar Candidatos", self.show_buscar_candidatos),
                 ("Ejecutar Nómina", self.show_nomina_form),
                 ("Reportes de Nómina", self.show_reportes_nomina),
+                ("Importar Datos", self.show_importar),
+                ("Rendimiento", self.show_rendimiento),
             ],
             "Empresa": [
                 (
@@ -871,6 +1035,7 @@ class MainFrame(ctk.CTkFrame):
                     ),
                 ),
                 ("Ver Mis Vacantes", self.show_mis_vacantes),
+                ("Buscar Candidatos", self.show_buscar_candidatos),
                 (
                     "Editar Mi Perfil",
                     lambda: self.open_form_window(ActualizarUsuarioWindow),
@@ -924,8 +1089,11 @@ class MainFrame(ctk.CTkFrame):
     def open_form_window(self, WindowClass, *args, **kwargs):
         WindowClass(self.controller, self.controller, *args, **kwargs)
 
+    @pantalla(tablas=())
     def show_welcome_message(self):
-        self.clear_content_frame()
+        self.agregar_saludo()
+
+    def agregar_saludo(self):
         ctk.CTkLabel(
             self.content_frame,
             text=f"Bienvenido/a, {self.controller.usuario_actual['Email']}",
@@ -933,23 +1101,173 @@ class MainFrame(ctk.CTkFrame):
             text_color=TEXT_COLOR,
         ).pack(anchor="w", pady=(0, 10))
 
-    def clear_content_frame(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+    def mostrar_pantalla(self, metodo, args, kwargs, guardar, tablas=None):
+        """
+        Oculta la pantalla visible y muestra la de metodo(*args, **kwargs):
+        la guardada si sigue al día o una nueva armada por el método.
+        """
+        clave = (metodo.__name__, args, tuple(sorted(kwargs.items())))
+        self.ocultar_pantalla_actual()
+        version = db_manager.get_version_datos(tablas)
+        guardada = self.pantallas.pop(clave, None)
+        if guardada is not None and guardada.version != version:
+            guardada.frame.destroy()
+            guardada = None
+        nueva = guardada is None
+        if nueva:
+            guardada = Pantalla(
+                ctk.CTkFrame(self.contenedor, fg_color="transparent"), version
+            )
+        self.content_frame = guardada.frame
+        guardada.frame.pack(fill="both", expand=True)
+        if guardar:
+            self.pantallas[clave] = guardada
+        self.pantalla_actual = (clave, guardada)
+        if nueva:
+            metodo(self, *args, **kwargs)
+
+    def ocultar_pantalla_actual(self):
+        if self.pantalla_actual is None:
+            return
+        clave, actual = self.pantalla_actual
+        self.pantalla_actual = None
+        # Lo que se pidió para la pantalla anterior ya no debe dibujarse; si
+        # quedó a medio cargar tampoco se guarda.
+        if self.controller.tareas.cancelar("pantalla") or clave not in self.pantallas:
+            self.pantallas.pop(clave, None)
+            actual.frame.destroy()
+        else:
+            actual.frame.pack_forget()
+
+    def ejecutar(
+        self, funcion, *args, al_terminar=None, al_fallar=None, bloquear=(), **kwargs
+    ):
+        """
+        Corre funcion(*args, **kwargs) en segundo plano para la pantalla
+        visible y entrega el resultado a 'al_terminar' en el hilo de Tk (o la
+        excepción a 'al_fallar'; por defecto se muestra un mensaje de error).
+        Los widgets de 'bloquear' se deshabilitan mientras tanto. Si el
+        usuario cambia de pantalla antes de que termine, no se llama a nada.
+        """
+        for widget in bloquear:
+            widget.configure(state="disabled")
+
+        def reactivar():
+            for widget in bloquear:
+                widget.configure(state="normal")
+
+        def terminar(resultado):
+            reactivar()
+            if al_terminar:
+                al_terminar(resultado)
+
+        def fallar(error):
+            reactivar()
+            (al_fallar or self.controller.mostrar_error_tarea)(error)
+
+        return self.controller.tareas.ejecutar(
+            funcion,
+            *args,
+            al_terminar=terminar,
+            al_fallar=fallar,
+            grupo="pantalla",
+            **kwargs,
+        )
+
+    def cargar_empresas(self, combo, empresa_map, al_vacio=None):
+        """Llena en segundo plano un combo de empresas y su mapa nombre -> ID."""
+
+        def mostrar(empresas):
+            if not empresas and al_vacio:
+                al_vacio()
+            empresa_map.update(
+                {e["Nombre_Empresa"]: e["ID_Empresa"] for e in empresas or []}
+            )
+            combo.configure(values=list(empresa_map.keys()))
+
+        self.ejecutar(
+            db_manager.get_catalogo,
+            "Empresas",
+            "ID_Empresa",
+            "Nombre_Empresa",
+            al_terminar=mostrar,
+        )
+
+    def exportar(self, reporte, nombre_sugerido, boton, **filtros):
+        """Pide un archivo .xlsx o .csv y exporta el reporte en segundo plano."""
+        ruta = filedialog.asksaveasfilename(
+            parent=self,
+            title="Exportar reporte",
+            initialfile=nombre_sugerido,
+            defaultextension=".xlsx",
+            filetypes=[("Libro de Excel", "*.xlsx"), ("CSV", "*.csv")],
+        )
+        if not ruta:
+            return
+
+        import exportar
+
+        def resultado(respuesta):
+            success, msg = respuesta
+            if success:
+                messagebox.showinfo("Exportación", msg)
+            else:
+                messagebox.showerror("Error", msg)
+
+        self.ejecutar(
+            exportar.exportar_reporte,
+            reporte,
+            ruta,
+            al_terminar=resultado,
+            bloquear=(boton,),
+            **filtros,
+        )
 
     def logout(self):
         self.controller.usuario_actual, self.controller.rol_actual = None, None
         self.controller.show_frame(LoginFrame)
 
+    @pantalla(tablas=("empresas",))
     def show_gestionar_empresas(self):
-        self.show_welcome_message()
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
             text="Gestionar Empresas",
             font=FONT_TITLE,
             text_color=TEXT_COLOR,  # CORREGIDO
         ).pack(pady=10, anchor="w")
-        empresas = db_manager.get_catalogo(
+
+        def mostrar(empresas):
+            if not empresas:
+                ctk.CTkLabel(
+                    self.content_frame,
+                    text="No hay empresas registradas.",
+                    text_color=TEXT_COLOR,
+                ).pack()  # CORREGIDO
+                return
+            tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+            tree_frame.pack(fill="both", expand=True, pady=5)
+            tree = crear_tabla_virtual(
+                tree_frame,
+                ("ID", "Nombre", "RIF", "Sector", "Contacto", "Teléfono", "Email"),
+                widths={"ID": 40, "Nombre": 150, "RIF": 80},
+            )
+            tree.mostrar(
+                (
+                    e["ID_Empresa"],
+                    e["Nombre_Empresa"],
+                    e["RIF"],
+                    e["Sector_Industrial"],
+                    e["Persona_Contacto"],
+                    e["Telefono_Contacto"],
+                    e["Email_Contacto"],
+                )
+                for e in empresas
+            )
+            tree.pack(fill="both", expand=True)
+
+        self.ejecutar(
+            db_manager.get_catalogo,
             "Empresas",
             "ID_Empresa",
             [
@@ -960,39 +1278,12 @@ class MainFrame(ctk.CTkFrame):
                 "Telefono_Contacto",
                 "Email_Contacto",
             ],
+            al_terminar=mostrar,
         )
-        if not empresas:
-            ctk.CTkLabel(
-                self.content_frame,
-                text="No hay empresas registradas.",
-                text_color=TEXT_COLOR,
-            ).pack()  # CORREGIDO
-            return
-        tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        tree_frame.pack(fill="both", expand=True, pady=5)
-        tree = crear_tabla(
-            tree_frame,
-            ("ID", "Nombre", "RIF", "Sector", "Contacto", "Teléfono", "Email"),
-            widths={"ID": 40, "Nombre": 150, "RIF": 80},
-        )
-        for e in empresas:
-            tree.insert(
-                "",
-                "end",
-                values=(
-                    e["ID_Empresa"],
-                    e["Nombre_Empresa"],
-                    e["RIF"],
-                    e["Sector_Industrial"],
-                    e["Persona_Contacto"],
-                    e["Telefono_Contacto"],
-                    e["Email_Contacto"],
-                ),
-            )
-        tree.pack(fill="both", expand=True)
 
+    @pantalla(tablas=())
     def show_menu_catalogos(self):
-        self.show_welcome_message()
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
             text="Gestionar Catálogos",
@@ -1026,229 +1317,560 @@ class MainFrame(ctk.CTkFrame):
                 text_color=TEXT_COLOR,  # CORREGIDO
             ).pack(fill="x", padx=20, pady=5)
 
-    def show_contratar_form(self):
-        self.show_welcome_message()
+    @pantalla(tablas=())
+    def show_importar(self):
+        import importar
+
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
-            text="Contratar Postulante",
+            text="Importar Datos desde CSV",
             font=FONT_TITLE,
-            text_color=TEXT_COLOR,  # CORREGIDO
+            text_color=TEXT_COLOR,
         ).pack(pady=10, anchor="w")
-        postulaciones = db_manager.get_postulaciones_para_contratar()
-        bancos = db_manager.get_catalogo("Bancos", "ID_Banco", "Nombre_Banco")
-        if not postulaciones:
-            ctk.CTkLabel(
-                self.content_frame,
-                text="No hay postulaciones recibidas.",
-                text_color=TEXT_COLOR,  # CORREGIDO
-            ).pack()
-            return
+        controles = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        controles.pack(fill="x", pady=5)
+        ctk.CTkLabel(controles, text="Tipo:", text_color=TEXT_COLOR).pack(side=tk.LEFT)
+        tipo_combo = ctk.CTkComboBox(
+            controles,
+            values=list(importar.IMPORTADORES),
+            state="readonly",
+            width=180,
+            text_color=TEXT_COLOR,
+            fg_color=ENTRY_BG_COLOR,
+            border_color=BUTTON_SECONDARY_COLOR,
+            button_color=BUTTON_SECONDARY_COLOR,
+            button_hover_color=BUTTON_SECONDARY_HOVER,
+        )
+        tipo_combo.set("postulantes")
+        tipo_combo.pack(side=tk.LEFT, padx=5)
+        resumen_label = ctk.CTkLabel(
+            self.content_frame, text="", text_color=TEXT_COLOR, justify="left"
+        )
+        resumen_label.pack(anchor="w", pady=5)
         tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        tree_frame.pack(fill="x", expand=True, pady=5)
-        tree = crear_tabla(tree_frame, ("ID", "Nombre", "Cargo"))
-        for p in postulaciones:
-            tree.insert(
-                "",
-                "end",
-                values=(
-                    p["ID_Postulacion"],
-                    f"{p['Nombres']} {p['Apellidos']}",
-                    p["Cargo_Vacante"],
-                ),
-            )
-        tree.pack(fill="x")
-        form_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        form_frame.pack(anchor="w", fill="x", pady=(10, 0))
-        entries = {}
-        bancos_map = {b["Nombre_Banco"]: b["ID_Banco"] for b in bancos or []}
-        fields = [
-            ("Salario", "entry"),
-            ("Tipo Contrato", "combo_contrato"),
-            ("Tipo de Sangre", "entry"),
-            ("Nombre Contacto Emergencia", "entry"),
-            ("Teléfono Contacto Emergencia", "entry"),
-            ("Número de Cuenta", "entry"),
-            ("Banco", "combo_banco"),
-        ]
-        for i, (label_text, widget_type) in enumerate(fields):
-            label = ctk.CTkLabel(
-                form_frame,
-                text=f"{label_text}:",
-                font=FONT_NORMAL,
-                text_color=TEXT_COLOR,
-            )  # CORREGIDO
-            label.grid(row=i, column=0, padx=5, pady=8, sticky="w")
-            widget = None
-            if widget_type == "entry":
-                widget = ctk.CTkEntry(
-                    form_frame,
-                    width=250,
-                    text_color=TEXT_COLOR,
-                    fg_color=ENTRY_BG_COLOR,
-                    border_color=BUTTON_SECONDARY_COLOR,
-                )
-            elif (
-                widget_type == "combo_contrato" or widget_type == "combo_banco"
-            ):  # CORREGIDO (Agrupado)
-                widget = ctk.CTkComboBox(
-                    form_frame,
-                    width=250,
-                    values=(
-                        ["Un mes", "Seis meses", "Un año", "Indefinido"]
-                        if widget_type == "combo_contrato"
-                        else list(bancos_map.keys())
-                    ),
-                    state="readonly",
-                    text_color=TEXT_COLOR,
-                    fg_color=ENTRY_BG_COLOR,
-                    border_color=BUTTON_SECONDARY_COLOR,
-                    button_color=BUTTON_SECONDARY_COLOR,
-                    button_hover_color=BUTTON_SECONDARY_HOVER,
-                )
-            if widget:
-                widget.grid(row=i, column=1, padx=5, pady=8, sticky="ew")
-                entries[label_text] = widget
+        tree_frame.pack(fill="both", expand=True, pady=10)
+        tree = crear_tabla(tree_frame, ("Línea", "Error"), widths={"Línea": 80, "Error": 600})
+        tree.pack(fill="both", expand=True)
 
-        def contratar():
-            selected = tree.selection()
-            if not selected:
-                messagebox.showwarning(
-                    "Selección Requerida", "Por favor, selecciona una postulación."
-                )
+        def seleccionar_archivo():
+            tipo = tipo_combo.get()
+            ruta = filedialog.askopenfilename(
+                parent=self,
+                title=f"Importar {tipo}",
+                filetypes=[("CSV", "*.csv"), ("Todos los archivos", "*.*")],
+            )
+            if not ruta:
                 return
-            try:
-                salario_val = float(entries["Salario"].get())
-                if salario_val <= 0:
-                    raise ValueError
-            except (ValueError, TypeError):
-                messagebox.showerror(
-                    "Entrada no válida", "El salario debe ser un número positivo."
+            tree.limpiar()
+            resumen_label.configure(text="Importando…")
+
+            def mostrar(resultado):
+                resumen_label.configure(
+                    text=f"{resultado['Importadas']} de {resultado['Filas']} fila(s) importadas "
+                    f"en {resultado['Segundos']:.1f} s. "
+                    f"{len(resultado['Errores'])} fila(s) con errores."
                 )
-                return
-            id_postulacion = tree.item(selected[0])["values"][0]
-            datos_contrato = {
-                "Salario_Acordado": salario_val,
-                "Tipo_Contrato": entries["Tipo Contrato"].get(),
-                "Tipo_Sangre": entries["Tipo de Sangre"].get(),
-                "Contacto_Emergencia_Nombre": entries[
-                    "Nombre Contacto Emergencia"
-                ].get(),
-                "Contacto_Emergencia_Telefono": entries[
-                    "Teléfono Contacto Emergencia"
-                ].get(),
-                "Numero_Cuenta": entries["Número de Cuenta"].get(),
-                "ID_Banco": bancos_map.get(entries["Banco"].get()),
-            }
-            if not all(
-                v is not None if k == "ID_Banco" else v
-                for k, v in datos_contrato.items()
-            ):
-                messagebox.showerror("Error", "Todos los campos son obligatorios.")
-                return
-            success, msg = db_manager.contratar_postulante_db(
-                id_postulacion, datos_contrato
+                for linea, mensaje in resultado["Errores"]:
+                    tree.insert("", "end", values=(linea, mensaje))
+
+            def fallo(error):
+                resumen_label.configure(text="")
+                messagebox.showerror("Error", f"No se pudo importar el archivo: {error}")
+
+            self.ejecutar(
+                importar.importar_csv,
+                tipo,
+                ruta,
+                al_terminar=mostrar,
+                al_fallar=fallo,
+                bloquear=(importar_btn,),
             )
-            if success:
-                messagebox.showinfo("Resultado", msg)
-                self.show_contratar_form()
-            else:
-                messagebox.showerror("Error", msg)
 
-        ctk.CTkButton(
-            self.content_frame,
-            text="Contratar y Aceptar",
-            command=contratar,
-            height=40,
-            corner_radius=10,
+        importar_btn = ctk.CTkButton(
+            controles,
+            text="Seleccionar Archivo…",
+            command=seleccionar_archivo,
             fg_color=ACCENT_PURPLE,
             hover_color=ACCENT_PINK,
-            text_color=TEXT_COLOR,  # CORREGIDO
-        ).pack(pady=20, anchor="w")
-
-    def show_buscar_vacantes(self, read_only=False):
-        self.show_welcome_message()
-        title = "Vacantes Disponibles" if not read_only else "Visualizar Vacantes"
-        ctk.CTkLabel(
-            self.content_frame, text=title, font=FONT_TITLE, text_color=TEXT_COLOR
-        ).pack(  # CORREGIDO
-            pady=10, anchor="w"
-        )
-        filter_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        filter_frame.pack(fill="x", pady=5)
-        areas = db_manager.get_catalogo(
-            "Areas_Conocimiento", "ID_Area_Conocimiento", "Nombre_Area"
-        )
-        area_map = {"Todas": None}
-        area_map.update(
-            {a["Nombre_Area"]: a["ID_Area_Conocimiento"] for a in areas or []}
+            text_color=TEXT_COLOR,
         )
+        importar_btn.pack(side=tk.LEFT, padx=10)
+
+    # Muestra el estado de la instrumentación, no datos de la base.
+    @pantalla(guardar=False)
+    def show_rendimiento(self):
+        import instrumentacion
+
+        self.agregar_saludo()
         ctk.CTkLabel(
-            filter_frame, text="Área:", font=FONT_NORMAL, text_color=TEXT_COLOR
-        ).pack(  # CORREGIDO
-            side=tk.LEFT, padx=(0, 5)
-        )
-        area_combo = ctk.CTkComboBox(
-            filter_frame,
-            values=list(area_map.keys()),
-            state="readonly",
-            width=180,
-            text_color=TEXT_COLOR,  # CORREGIDO
-            fg_color=ENTRY_BG_COLOR,  # CORREGIDO
-            border_color=BUTTON_SECONDARY_COLOR,  # CORREGIDO
-            button_color=BUTTON_SECONDARY_COLOR,  # CORREGIDO
-            button_hover_color=BUTTON_SECONDARY_HOVER,  # CORREGIDO
-        )
-        area_combo.pack(side=tk.LEFT, padx=5)
-        area_combo.set("Todas")
+            self.content_frame,
+            text="Rendimiento de la Base de Datos",
+            font=FONT_TITLE,
+            text_color=TEXT_COLOR,
+        ).pack(pady=10, anchor="w")
+        if not instrumentacion.activa():
+            ctk.CTkLabel(
+                self.content_frame,
+                text="La instrumentación está desactivada. Al activarla se mide cada\n"
+                "consulta y se registran las que tardan más que el umbral.",
+                text_color=TEXT_COLOR,
+                justify="left",
+            ).pack(anchor="w", pady=5)
+
+            def activar():
+                instrumentacion.activar()
+                self.show_rendimiento()
+
+            ctk.CTkButton(
+                self.content_frame,
+                text="Activar Instrumentación",
+                command=activar,
+                fg_color=ACCENT_PURPLE,
+                hover_color=ACCENT_PINK,
+                text_color=TEXT_COLOR,
+            ).pack(anchor="w", pady=10)
+            return
+
         ctk.CTkLabel(
-            filter_frame, text="Salario:", font=FONT_NORMAL, text_color=TEXT_COLOR
-        ).pack(  # CORREGIDO
-            side=tk.LEFT, padx=(10, 5)
+            self.content_frame,
+            text=f"Consultas lentas: más de {instrumentacion.get_umbral_ms():g} ms.",
+            text_color=TEXT_COLOR,
+        ).pack(anchor="w")
+        instantanea_label = ctk.CTkLabel(self.content_frame, text="", text_color=TEXT_COLOR)
+        instantanea_label.pack(anchor="w")
+        funciones_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        funciones_frame.pack(fill="both", expand=True, pady=10)
+        columnas = ("Función", "Llamadas", "Errores", "Media ms", "p95 ms", "Máx ms", "Total ms")
+        funciones_tree = crear_tabla(
+            funciones_frame, columnas, widths={"Función": 260, "Llamadas": 80, "Errores": 70}
         )
-        salary_combo = ctk.CTkComboBox(
-            filter_frame,
-            values=["Sin Orden", "Mayor a Menor", "Menor a Mayor"],
-            state="readonly",
-            width=150,
-            text_color=TEXT_COLOR,  # CORREGIDO
-            fg_color=ENTRY_BG_COLOR,  # CORREGIDO
-            border_color=BUTTON_SECONDARY_COLOR,  # CORREGIDO
-            button_color=BUTTON_SECONDARY_COLOR,  # CORREGIDO
-            button_hover_color=BUTTON_SECONDARY_HOVER,  # CORREGIDO
+        funciones_tree.pack(fill="both", expand=True)
+        lentas_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        lentas_frame.pack(fill="both", expand=True, pady=10)
+        lentas_tree = crear_tabla(
+            lentas_frame, ("Hora", "Función", "ms"), widths={"Hora": 160, "Función": 260, "ms": 90}
         )
-        salary_combo.pack(side=tk.LEFT, padx=5)
-        salary_combo.set("Sin Orden")
-        tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        tree_frame.pack(fill="both", expand=True, pady=10)
-        tree = crear_tabla(
-            tree_frame,
-            ("ID", "Cargo", "Empresa", "Área", "Profesión", "Salario"),
-            widths={"ID": 40, "Salario": 80},
+        lentas_tree.pack(fill="both", expand=True)
+        detalle = ctk.CTkTextbox(
+            self.content_frame,
+            height=200,
+            font=("Consolas", 11),
+            fg_color=ENTRY_BG_COLOR,
+            border_color=BUTTON_SECONDARY_COLOR,
+            text_color=TEXT_COLOR,
         )
-        tree.pack(fill="both", expand=True)
+        detalle.pack(fill="x", pady=5)
+        lentas = []
 
-        def populate_tree():
-            for i in tree.get_children():
-                tree.delete(i)
-            filtro_area = area_map[area_combo.get()]
-            sort_map = {"Mayor a Menor": "DESC", "Menor a Mayor": "ASC"}
-            sort_salary = sort_map.get(salary_combo.get())
-            vacantes = db_manager.get_active_vacantes(
-                filtro_area=filtro_area, sort_salary=sort_salary
+        def actualizar():
+            instantanea = db_manager.get_estadisticas_instantanea()
+            if instantanea is None:
+                instantanea_label.configure(text="Reportes: leen la base de datos en vivo.")
+            else:
+                instantanea_label.configure(
+                    text=f"Reportes: instantánea de hace {instantanea['antiguedad_s']:.0f} s "
+                    f"(máximo {instantanea['antiguedad_maxima_s']:g} s), "
+                    f"{instantanea['copias']} copia(s), {instantanea['reinicios']} reinicio(s)."
+                )
+            funciones_tree.actualizar(
+                (
+                    f["Funcion"],
+                    (
+                        f["Funcion"],
+                        f["Llamadas"],
+                        f["Errores"],
+                        f"{f['Media_ms']:.2f}",
+                        f"{f['P95_ms']:.0f}",
+                        f"{f['Max_ms']:.2f}",
+                        f"{f['Total_ms']:.1f}",
+                    ),
+                )
+                for f in instrumentacion.resumen()
+            )
+            lentas[:] = instrumentacion.consultas_lentas()
+            lentas_tree.actualizar(
+                (i, (entrada["Hora"], entrada["Funcion"], f"{entrada['Milisegundos']:.1f}"))
+                for i, entrada in enumerate(lentas)
+            )
+
+        def mostrar_detalle(event):
+            seleccion = lentas_tree.selection()
+            if not seleccion:
+                return
+            detalle.delete("1.0", "end")
+            detalle.insert("1.0", instrumentacion.formatear_lenta(lentas[int(seleccion[0])]))
+
+        def reiniciar():
+            instrumentacion.reiniciar()
+            detalle.delete("1.0", "end")
+            actualizar()
+
+        def guardar():
+            ruta = filedialog.asksaveasfilename(
+                parent=self,
+                title="Guardar resumen",
+                initialfile="rendimiento.txt",
+                defaultextension=".txt",
+                filetypes=[("Texto", "*.txt")],
+            )
+            if not ruta:
+                return
+            try:
+                with open(ruta, "w", encoding="utf-8") as archivo:
+                    instrumentacion.volcar_resumen(archivo)
+                messagebox.showinfo("Rendimiento", "Resumen guardado.")
+            except OSError as e:
+                messagebox.showerror("Error", f"No se pudo guardar el resumen: {e}")
+
+        lentas_tree.bind("<<TreeviewSelect>>", mostrar_detalle)
+        botones = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        botones.pack(fill="x", pady=5)
+        for texto, comando in (
+            ("Actualizar", actualizar),
+            ("Reiniciar", reiniciar),
+            ("Guardar Resumen…", guardar),
+        ):
+            ctk.CTkButton(
+                botones,
+                text=texto,
+                command=comando,
+                fg_color=BUTTON_SECONDARY_COLOR,
+                hover_color=BUTTON_SECONDARY_HOVER,
+                text_color=TEXT_COLOR,
+            ).pack(side=tk.LEFT, padx=5)
+        actualizar()
+
+    @pantalla(tablas=("postulaciones", "postulantes", "vacantes", "bancos"))
+    def show_contratar_form(self):
+        self.agregar_saludo()
+        ctk.CTkLabel(
+            self.content_frame,
+            text="Contratar Postulante",
+            font=FONT_TITLE,
+            text_color=TEXT_COLOR,  # CORREGIDO
+        ).pack(pady=10, anchor="w")
+
+        def cargar():
+            return (
+                db_manager.get_postulaciones_para_contratar(),
+                db_manager.get_catalogo("Bancos", "ID_Banco", "Nombre_Banco"),
             )
-            for v in vacantes or []:
+
+        def mostrar(datos):
+            postulaciones, bancos = datos
+            if not postulaciones:
+                ctk.CTkLabel(
+                    self.content_frame,
+                    text="No hay postulaciones recibidas.",
+                    text_color=TEXT_COLOR,  # CORREGIDO
+                ).pack()
+                return
+            tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+            tree_frame.pack(fill="x", expand=True, pady=5)
+            tree = crear_tabla(tree_frame, ("ID", "Nombre", "Cargo"))
+            for p in postulaciones:
                 tree.insert(
                     "",
                     "end",
                     values=(
-                        v["ID_Vacante"],
-                        v["Cargo_Vacante"],
-                        v["Nombre_Empresa"],
-                        v["Nombre_Area"] or "No Asignada",
-                        v["Nombre_Profesion"],
-                        f"{float(v['Salario_Ofrecido']):.2f}",
+                        p["ID_Postulacion"],
+                        f"{p['Nombres']} {p['Apellidos']}",
+                        p["Cargo_Vacante"],
                     ),
                 )
+            tree.pack(fill="x")
+            form_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+            form_frame.pack(anchor="w", fill="x", pady=(10, 0))
+            entries = {}
+            bancos_map = {b["Nombre_Banco"]: b["ID_Banco"] for b in bancos or []}
+            fields = [
+                ("Salario", "entry"),
+                ("Tipo Contrato", "combo_contrato"),
+                ("Tipo de Sangre", "entry"),
+                ("Nombre Contacto Emergencia", "entry"),
+                ("Teléfono Contacto Emergencia", "entry"),
+                ("Número de Cuenta", "entry"),
+                ("Banco", "combo_banco"),
+            ]
+            for i, (label_text, widget_type) in enumerate(fields):
+                label = ctk.CTkLabel(
+                    form_frame,
+                    text=f"{label_text}:",
+                    font=FONT_NORMAL,
+                    text_color=TEXT_COLOR,
+                )  # CORREGIDO
+                label.grid(row=i, column=0, padx=5, pady=8, sticky="w")
+                widget = None
+                if widget_type == "entry":
+                    widget = ctk.CTkEntry(
+                        form_frame,
+                        width=250,
+                        text_color=TEXT_COLOR,
+                        fg_color=ENTRY_BG_COLOR,
+                        border_color=BUTTON_SECONDARY_COLOR,
+                    )
+                elif (
+                    widget_type == "combo_contrato" or widget_type == "combo_banco"
+                ):  # CORREGIDO (Agrupado)
+                    widget = ctk.CTkComboBox(
+                        form_frame,
+                        width=250,
+                        values=(
+                            ["Un mes", "Seis meses", "Un año", "Indefinido"]
+                            if widget_type == "combo_contrato"
+                            else list(bancos_map.keys())
+                        ),
+                        state="readonly",
+                        text_color=TEXT_COLOR,
+                        fg_color=ENTRY_BG_COLOR,
+                        border_color=BUTTON_SECONDARY_COLOR,
+                        button_color=BUTTON_SECONDARY_COLOR,
+                        button_hover_color=BUTTON_SECONDARY_HOVER,
+                    )
+                if widget:
+                    widget.grid(row=i, column=1, padx=5, pady=8, sticky="ew")
+                    entries[label_text] = widget
+
+            def contratar():
+                selected = tree.selection()
+                if not selected:
+                    messagebox.showwarning(
+                        "Selección Requerida", "Por favor, selecciona una postulación."
+                    )
+                    return
+                try:
+                    salario_val = float(entries["Salario"].get())
+                    if salario_val <= 0:
+                        raise ValueError
+                except (ValueError, TypeError):
+                    messagebox.showerror(
+                        "Entrada no válida", "El salario debe ser un número positivo."
+                    )
+                    return
+                id_postulacion = tree.item(selected[0])["values"][0]
+                datos_contrato = {
+                    "Salario_Acordado": salario_val,
+                    "Tipo_Contrato": entries["Tipo Contrato"].get(),
+                    "Tipo_Sangre": entries["Tipo de Sangre"].get(),
+                    "Contacto_Emergencia_Nombre": entries[
+                        "Nombre Contacto Emergencia"
+                    ].get(),
+                    "Contacto_Emergencia_Telefono": entries[
+                        "Teléfono Contacto Emergencia"
+                    ].get(),
+                    "Numero_Cuenta": entries["Número de Cuenta"].get(),
+                    "ID_Banco": bancos_map.get(entries["Banco"].get()),
+                }
+                if not all(
+                    v is not None if k == "ID_Banco" else v
+                    for k, v in datos_contrato.items()
+                ):
+                    messagebox.showerror("Error", "Todos los campos son obligatorios.")
+                    return
+
+                def resultado(respuesta):
+                    success, msg = respuesta
+                    if success:
+                        messagebox.showinfo("Resultado", msg)
+                        self.show_contratar_form()
+                    else:
+                        messagebox.showerror("Error", msg)
+
+                self.ejecutar(
+                    db_manager.contratar_postulante_db,
+                    id_postulacion,
+                    datos_contrato,
+                    al_terminar=resultado,
+                    bloquear=(contratar_btn,),
+                )
+
+            contratar_btn = ctk.CTkButton(
+                self.content_frame,
+                text="Contratar y Aceptar",
+                command=contratar,
+                height=40,
+                corner_radius=10,
+                fg_color=ACCENT_PURPLE,
+                hover_color=ACCENT_PINK,
+                text_color=TEXT_COLOR,  # CORREGIDO
+            )
+            contratar_btn.pack(pady=20, anchor="w")
+
+        self.ejecutar(cargar, al_terminar=mostrar)
+
+    @pantalla(tablas=("vacantes", "empresas", "areas_conocimiento", "profesiones"))
+    def show_buscar_vacantes(self, read_only=False):
+        self.agregar_saludo()
+        title = "Vacantes Disponibles" if not read_only else "Visualizar Vacantes"
+        ctk.CTkLabel(
+            self.content_frame, text=title, font=FONT_TITLE, text_color=TEXT_COLOR
+        ).pack(  # CORREGIDO
+            pady=10, anchor="w"
+        )
+        filter_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        filter_frame.pack(fill="x", pady=5)
+        area_map = {"Todas": None}
+        ctk.CTkLabel(
+            filter_frame, text="Área:", font=FONT_NORMAL, text_color=TEXT_COLOR
+        ).pack(  # CORREGIDO
+            side=tk.LEFT, padx=(0, 5)
+        )
+        area_combo = ctk.CTkComboBox(
+            filter_frame,
+            values=list(area_map.keys()),
+            state="readonly",
+            width=180,
+            text_color=TEXT_COLOR,  # CORREGIDO
+            fg_color=ENTRY_BG_COLOR,  # CORREGIDO
+            border_color=BUTTON_SECONDARY_COLOR,  # CORREGIDO
+            button_color=BUTTON_SECONDARY_COLOR,  # CORREGIDO
+            button_hover_color=BUTTON_SECONDARY_HOVER,  # CORREGIDO
+        )
+        area_combo.pack(side=tk.LEFT, padx=5)
+        area_combo.set("Todas")
+
+        def mostrar_areas(areas):
+            area_map.update(
+                {a["Nombre_Area"]: a["ID_Area_Conocimiento"] for a in areas or []}
+            )
+            area_combo.configure(values=list(area_map.keys()))
+
+        self.ejecutar(
+            db_manager.get_catalogo,
+            "Areas_Conocimiento",
+            "ID_Area_Conocimiento",
+            "Nombre_Area",
+            al_terminar=mostrar_areas,
+        )
+        ctk.CTkLabel(
+            filter_frame, text="Salario:", font=FONT_NORMAL, text_color=TEXT_COLOR
+        ).pack(  # CORREGIDO
+            side=tk.LEFT, padx=(10, 5)
+        )
+        salary_combo = ctk.CTkComboBox(
+            filter_frame,
+            values=["Sin Orden", "Mayor a Menor", "Menor a Mayor"],
+            state="readonly",
+            width=150,
+            text_color=TEXT_COLOR,  # CORREGIDO
+            fg_color=ENTRY_BG_COLOR,  # CORREGIDO
+            border_color=BUTTON_SECONDARY_COLOR,  # CORREGIDO
+            button_color=BUTTON_SECONDARY_COLOR,  # CORREGIDO
+            button_hover_color=BUTTON_SECONDARY_HOVER,  # CORREGIDO
+        )
+        salary_combo.pack(side=tk.LEFT, padx=5)
+        salary_combo.set("Sin Orden")
+        ctk.CTkLabel(
+            filter_frame, text="Buscar:", font=FONT_NORMAL, text_color=TEXT_COLOR
+        ).pack(side=tk.LEFT, padx=(10, 5))
+        busqueda_entry = ctk.CTkEntry(
+            filter_frame,
+            width=200,
+            placeholder_text="Cargo o descripción",
+            font=FONT_NORMAL,
+            fg_color=ENTRY_BG_COLOR,
+            border_color=BUTTON_SECONDARY_COLOR,
+            text_color=TEXT_COLOR,
+        )
+        busqueda_entry.pack(side=tk.LEFT, padx=5)
+        tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        tree_frame.pack(fill="both", expand=True, pady=10)
+        tree = crear_tabla(
+            tree_frame,
+            ("ID", "Cargo", "Empresa", "Área", "Profesión", "Salario"),
+            widths={"ID": 40, "Salario": 80},
+        )
+        tree.pack(fill="both", expand=True)
+
+        # Paginación por clave: se piden páginas a medida que el usuario llega
+        # al final de la tabla, así la primera carga no depende del total.
+        # 'consulta' identifica la búsqueda vigente: una página que llega
+        # después de cambiar los filtros se descarta.
+        paginacion = {"cursor": None, "filtros": None, "cargando": False, "consulta": 0}
+
+        def cargar_pagina():
+            if paginacion["filtros"] is None or paginacion["cargando"]:
+                return
+            paginacion["cargando"] = True
+            consulta = paginacion["consulta"]
+            primera = paginacion["cursor"] is None
+            filtro_area, sort_salary, texto = paginacion["filtros"]
+
+            def mostrar(resultado):
+                if consulta != paginacion["consulta"]:
+                    return
+                paginacion["cargando"] = False
+                vacantes, paginacion["cursor"] = resultado
+                filas = (
+                    (
+                        v["ID_Vacante"],
+                        (
+                            v["ID_Vacante"],
+                            v["Cargo_Vacante"],
+                            v["Nombre_Empresa"],
+                            v["Nombre_Area"] or "No Asignada",
+                            v["Nombre_Profesion"],
+                            f"{float(v['Salario_Ofrecido']):.2f}",
+                        ),
+                    )
+                    for v in vacantes
+                )
+                # La primera página reemplaza lo que mostraba la búsqueda anterior.
+                if primera:
+                    tree.actualizar(filas)
+                else:
+                    tree.agregar(filas)
+                if paginacion["cursor"] is None:
+                    paginacion["filtros"] = None
+                    cargar_mas_btn.configure(state="disabled")
+
+            def fallo(error):
+                if consulta == paginacion["consulta"]:
+                    paginacion["cargando"] = False
+                self.controller.mostrar_error_tarea(error)
+
+            self.ejecutar(
+                db_manager.get_active_vacantes_pagina,
+                filtro_area=filtro_area,
+                sort_salary=sort_salary,
+                tamano_pagina=TAMANO_PAGINA,
+                cursor=paginacion["cursor"],
+                texto=texto,
+                al_terminar=mostrar,
+                al_fallar=fallo,
+            )
+
+        def populate_tree():
+            sort_map = {"Mayor a Menor": "DESC", "Menor a Mayor": "ASC"}
+            paginacion["consulta"] += 1
+            paginacion["cargando"] = False
+            paginacion["cursor"] = None
+            paginacion["filtros"] = (
+                area_map[area_combo.get()],
+                sort_map.get(salary_combo.get()),
+                busqueda_entry.get().strip(),
+            )
+            cargar_mas_btn.configure(state="normal")
+            cargar_pagina()
+
+        def al_desplazar(primero, ultimo):
+            if float(ultimo) >= 0.98:
+                tree.after_idle(cargar_pagina)
+
+        tree.configure(yscrollcommand=al_desplazar)
+        busqueda_entry.bind("<Return>", lambda event: populate_tree())
+        cargar_mas_btn = ctk.CTkButton(
+            self.content_frame,
+            text="Cargar más",
+            command=cargar_pagina,
+            width=120,
+            corner_radius=8,
+            fg_color=BUTTON_SECONDARY_COLOR,
+            hover_color=BUTTON_SECONDARY_HOVER,
+            text_color=TEXT_COLOR,
+        )
+        cargar_mas_btn.pack(pady=(0, 5), anchor="e")
 
         ctk.CTkButton(
             filter_frame,
@@ -1273,6 +1895,112 @@ class MainFrame(ctk.CTkFrame):
             ).pack(pady=10, anchor="e")
         populate_tree()
 
+    @pantalla(tablas=("postulantes", "experiencias_laborales", "universidades"))
+    def show_buscar_candidatos(self):
+        self.agregar_saludo()
+        ctk.CTkLabel(
+            self.content_frame,
+            text="Buscar Candidatos",
+            font=FONT_TITLE,
+            text_color=TEXT_COLOR,
+        ).pack(pady=10, anchor="w")
+        filter_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        filter_frame.pack(fill="x", pady=5)
+        ctk.CTkLabel(
+            filter_frame, text="Buscar:", font=FONT_NORMAL, text_color=TEXT_COLOR
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        busqueda_entry = ctk.CTkEntry(
+            filter_frame,
+            width=320,
+            placeholder_text="Nombre, cédula, empresa, cargo o habilidad",
+            font=FONT_NORMAL,
+            fg_color=ENTRY_BG_COLOR,
+            border_color=BUTTON_SECONDARY_COLOR,
+            text_color=TEXT_COLOR,
+        )
+        busqueda_entry.pack(side=tk.LEFT, padx=5)
+        tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        tree_frame.pack(fill="both", expand=True, pady=10)
+        tree = crear_tabla_virtual(
+            tree_frame,
+            ("ID", "Nombres", "Apellidos", "Cédula", "Universidad", "Coincidencia"),
+            widths={"ID": 50, "Coincidencia": 360},
+        )
+        tree.pack(fill="both", expand=True)
+
+        def formatear(c):
+            return (
+                c["ID_Postulante"],
+                c["Nombres"],
+                c["Apellidos"],
+                c["Cedula_Identidad"] or "",
+                c["Nombre_Universidad"] or "",
+                c["Coincidencia"] or "",
+            )
+
+        def buscar():
+            texto = busqueda_entry.get().strip()
+            if not texto:
+                tree.mostrar(())
+                return
+
+            # La tabla pide las páginas siguientes a medida que se desplaza.
+            def cargar(cursor, al_recibir, al_fallar):
+                self.ejecutar(
+                    db_manager.buscar_postulantes_db,
+                    texto,
+                    tamano_pagina=TAMANO_PAGINA,
+                    cursor=cursor,
+                    al_terminar=al_recibir,
+                    al_fallar=al_fallar,
+                )
+
+            tree.paginar(cargar, formatear, al_fallar=self.controller.mostrar_error_tarea)
+
+        def ver_experiencia():
+            selected = tree.selection()
+            if not selected:
+                messagebox.showwarning(
+                    "Selección Requerida", "Selecciona un candidato."
+                )
+                return
+            id_postulante, nombres, apellidos = tree.item(selected[0])["values"][:3]
+
+            def mostrar(experiencias):
+                detalle = "\n".join(
+                    f"• {e['Cargo_Ocupado']} en {e['Empresa']} "
+                    f"({e['Fecha_Inicio']} - {e['Fecha_Fin'] or 'actual'})"
+                    for e in experiencias
+                )
+                messagebox.showinfo(
+                    f"{nombres} {apellidos}",
+                    detalle or "El candidato no tiene experiencia registrada.",
+                )
+
+            self.ejecutar(db_manager.get_experiencias_db, id_postulante, al_terminar=mostrar)
+
+        busqueda_entry.bind("<Return>", lambda event: buscar())
+        ctk.CTkButton(
+            filter_frame,
+            text="Buscar",
+            command=buscar,
+            width=80,
+            corner_radius=8,
+            fg_color=BUTTON_SECONDARY_COLOR,
+            hover_color=BUTTON_SECONDARY_HOVER,
+            text_color=TEXT_COLOR,
+        ).pack(side=tk.LEFT, padx=10)
+        buttons_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        buttons_frame.pack(fill="x", pady=5)
+        ctk.CTkButton(
+            buttons_frame,
+            text="Ver Experiencia",
+            command=ver_experiencia,
+            fg_color=ACCENT_PURPLE,
+            hover_color=ACCENT_PINK,
+            text_color=TEXT_COLOR,
+        ).pack(side="right")
+
     def aplicar(self, tree):
         selected = tree.selection()
         if not selected:
@@ -1281,13 +2009,24 @@ class MainFrame(ctk.CTkFrame):
             )
             return
         id_vacante = tree.item(selected[0])["values"][0]
-        success, msg = db_manager.aplicar_a_vacante_db(
-            self.controller.usuario_actual["ID_Usuario"], id_vacante
+        self.ejecutar(
+            db_manager.aplicar_a_vacante_db,
+            self.controller.usuario_actual["ID_Usuario"],
+            id_vacante,
+            al_terminar=lambda respuesta: messagebox.showinfo("Resultado", respuesta[1]),
         )
-        messagebox.showinfo("Resultado", msg)
 
+    @pantalla(
+        tablas=(
+            "recibos",
+            "nominas",
+            "contratos",
+            "postulaciones",
+            "archivos_nomina",
+        )
+    )
     def show_recibos_pago(self):
-        self.show_welcome_message()
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
             text="Mis Recibos de Pago",
@@ -1325,27 +2064,31 @@ class MainFrame(ctk.CTkFrame):
         )
         tree.pack(fill="both", expand=True)
 
-        def populate_recibos():
-            for i in tree.get_children():
-                tree.delete(i)
-            recibos = db_manager.get_recibos_por_contratado(
-                self.controller.usuario_actual["ID_Usuario"],
-                mes_entry.get() or None,
-                anio_entry.get() or None,
-            )
-            for r in recibos or []:
-                tree.insert(
-                    "",
-                    "end",
-                    values=(
+        def mostrar_recibos(recibos):
+            tree.actualizar(
+                (
+                    r["ID_Recibo"],
+                    (
                         f"{r['Mes']}/{r['Anio']}",
                         r["Fecha_Pago"],
                         f"{r['Salario_Base']:.2f}",
                         f"{r['Salario_Neto_Pagado']:.2f}",
                     ),
                 )
+                for r in recibos or []
+            )
 
-        ctk.CTkButton(
+        def populate_recibos():
+            self.ejecutar(
+                db_manager.get_recibos_por_contratado,
+                self.controller.usuario_actual["ID_Usuario"],
+                mes_entry.get() or None,
+                anio_entry.get() or None,
+                al_terminar=mostrar_recibos,
+                bloquear=(filtrar_btn,),
+            )
+
+        filtrar_btn = ctk.CTkButton(
             filter_frame,
             text="Filtrar",
             command=populate_recibos,
@@ -1354,110 +2097,135 @@ class MainFrame(ctk.CTkFrame):
             fg_color=BUTTON_SECONDARY_COLOR,
             hover_color=BUTTON_SECONDARY_HOVER,
             text_color=TEXT_COLOR,  # CORREGIDO
-        ).pack(side=tk.LEFT, padx=10)
+        )
+        filtrar_btn.pack(side=tk.LEFT, padx=10)
         populate_recibos()
 
+    @pantalla(tablas=("vacantes",))
     def show_mis_vacantes(self):
-        self.show_welcome_message()
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
             text="Mis Vacantes Publicadas",
             font=FONT_TITLE,
             text_color=TEXT_COLOR,  # CORREGIDO
         ).pack(pady=10, anchor="w")
-        vacantes = db_manager.get_vacantes_por_empresa(
-            self.controller.usuario_actual["ID_Usuario"]
-        )
-        if not vacantes:
-            ctk.CTkLabel(
-                self.content_frame,
-                text="No tienes vacantes publicadas.",
-                text_color=TEXT_COLOR,  # CORREGIDO
-            ).pack()
-            return
-        tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        tree_frame.pack(fill="both", expand=True, pady=10)
-        tree = crear_tabla(
-            tree_frame,
-            ("ID", "Cargo", "Salario", "Estatus"),
-            widths={"ID": 50, "Estatus": 80},
-        )
-        for v in vacantes:
-            salario = (
-                f"{float(v['Salario_Ofrecido']):.2f}"
-                if v["Salario_Ofrecido"]
-                else "N/A"
-            )
-            tree.insert(
-                "",
-                "end",
-                values=(v["ID_Vacante"], v["Cargo_Vacante"], salario, v["Estatus"]),
-            )
-        tree.pack(fill="both", expand=True)
-        buttons_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        buttons_frame.pack(fill="x", pady=5, anchor="e")
 
-        def editar_vacante():
-            selected = tree.selection()
-            if not selected:
-                messagebox.showwarning(
-                    "Selección Requerida",
-                    "Selecciona una vacante para editar.",
-                    parent=self.controller,
-                )
+        def mostrar(vacantes):
+            if not vacantes:
+                ctk.CTkLabel(
+                    self.content_frame,
+                    text="No tienes vacantes publicadas.",
+                    text_color=TEXT_COLOR,  # CORREGIDO
+                ).pack()
                 return
-            id_vacante = tree.item(selected[0])["values"][0]
-            datos_vacante = next(
-                (v for v in vacantes if v["ID_Vacante"] == id_vacante), None
+            tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+            tree_frame.pack(fill="both", expand=True, pady=10)
+            tree = crear_tabla(
+                tree_frame,
+                ("ID", "Cargo", "Salario", "Estatus"),
+                widths={"ID": 50, "Estatus": 80},
             )
-            if datos_vacante:
-                self.open_form_window(
-                    ActualizarVacanteWindow,
-                    datos_vacante=datos_vacante,
-                    on_success_callback=self.show_mis_vacantes,
+            for v in vacantes:
+                salario = (
+                    f"{float(v['Salario_Ofrecido']):.2f}"
+                    if v["Salario_Ofrecido"]
+                    else "N/A"
                 )
+                tree.insert(
+                    "",
+                    "end",
+                    values=(v["ID_Vacante"], v["Cargo_Vacante"], salario, v["Estatus"]),
+                )
+            tree.pack(fill="both", expand=True)
+            buttons_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+            buttons_frame.pack(fill="x", pady=5, anchor="e")
+
+            def editar_vacante():
+                selected = tree.selection()
+                if not selected:
+                    messagebox.showwarning(
+                        "Selección Requerida",
+                        "Selecciona una vacante para editar.",
+                        parent=self.controller,
+                    )
+                    return
+                id_vacante = tree.item(selected[0])["values"][0]
+                datos_vacante = next(
+                    (v for v in vacantes if v["ID_Vacante"] == id_vacante), None
+                )
+                if datos_vacante:
+                    self.open_form_window(
+                        ActualizarVacanteWindow,
+                        datos_vacante=datos_vacante,
+                        on_success_callback=self.show_mis_vacantes,
+                    )
 
-        def eliminar_vacante():
-            selected = tree.selection()
-            if not selected:
-                messagebox.showwarning(
-                    "Selección Requerida",
-                    "Selecciona una vacante para eliminar.",
+            def eliminar_vacante():
+                selected = tree.selection()
+                if not selected:
+                    messagebox.showwarning(
+                        "Selección Requerida",
+                        "Selecciona una vacante para eliminar.",
+                        parent=self.controller,
+                    )
+                    return
+                id_vacante, cargo = tree.item(selected[0])["values"][:2]
+                if messagebox.askyesno(
+                    "Confirmar Eliminación",
+                    f"¿Estás seguro de que quieres eliminar la vacante '{cargo}'?",
                     parent=self.controller,
-                )
-                return
-            id_vacante, cargo = tree.item(selected[0])["values"][:2]
-            if messagebox.askyesno(
-                "Confirmar Eliminación",
-                f"¿Estás seguro de que quieres eliminar la vacante '{cargo}'?",
-                parent=self.controller,
-            ):
-                success, msg = db_manager.eliminar_vacante_db(id_vacante)
-                if success:
-                    messagebox.showinfo("Resultado", msg, parent=self.controller)
-                    self.show_mis_vacantes()
-                else:
-                    messagebox.showerror("Error", msg, parent=self.controller)
+                ):
 
-        ctk.CTkButton(
-            buttons_frame,
-            text="Editar Vacante",
-            command=editar_vacante,
-            fg_color=BUTTON_SECONDARY_COLOR,
-            hover_color=BUTTON_SECONDARY_HOVER,
-            text_color=TEXT_COLOR,  # CORREGIDO
-        ).pack(side="right", padx=10)
-        ctk.CTkButton(
-            buttons_frame,
-            text="Eliminar Vacante",
-            command=eliminar_vacante,
-            fg_color=ACCENT_PINK,
-            hover_color=ACCENT_PURPLE,
-            text_color=TEXT_COLOR,  # CORREGIDO
-        ).pack(side="right")
 
+                    def resultado(respuesta):
+                        success, msg = respuesta
+                        if success:
+                            messagebox.showinfo("Resultado", msg, parent=self.controller)
+                            self.show_mis_vacantes()
+                        else:
+                            messagebox.showerror("Error", msg, parent=self.controller)
+
+                    self.ejecutar(
+                        db_manager.eliminar_vacante_db, id_vacante, al_terminar=resultado
+                    )
+
+            ctk.CTkButton(
+                buttons_frame,
+                text="Editar Vacante",
+                command=editar_vacante,
+                fg_color=BUTTON_SECONDARY_COLOR,
+                hover_color=BUTTON_SECONDARY_HOVER,
+                text_color=TEXT_COLOR,  # CORREGIDO
+            ).pack(side="right", padx=10)
+            ctk.CTkButton(
+                buttons_frame,
+                text="Eliminar Vacante",
+                command=eliminar_vacante,
+                fg_color=ACCENT_PINK,
+                hover_color=ACCENT_PURPLE,
+                text_color=TEXT_COLOR,  # CORREGIDO
+            ).pack(side="right")
+
+        self.ejecutar(
+            db_manager.get_vacantes_por_empresa,
+            self.controller.usuario_actual["ID_Usuario"],
+            al_terminar=mostrar,
+        )
+
+    @pantalla(
+        tablas=(
+            "nominas",
+            "recibos",
+            "empresas",
+            "contratos",
+            "postulaciones",
+            "postulantes",
+            "archivos_nomina",
+        )
+    )
     def show_reportes_nomina(self):
-        self.show_welcome_message()
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
             text="Reportes de Nómina",
@@ -1471,8 +2239,7 @@ class MainFrame(ctk.CTkFrame):
         ).pack(  # CORREGIDO
             pady=10
         )
-        empresas = db_manager.get_catalogo("Empresas", "ID_Empresa", "Nombre_Empresa")
-        empresa_map = {e["Nombre_Empresa"]: e["ID_Empresa"] for e in empresas or []}
+        empresa_map = {}
         filter_controls = ctk.CTkFrame(rep1_frame, fg_color="transparent")
         filter_controls.pack(fill="x", padx=10)
         ctk.CTkLabel(filter_controls, text="Empresa:", text_color=TEXT_COLOR).pack(
@@ -1490,6 +2257,7 @@ class MainFrame(ctk.CTkFrame):
             button_hover_color=BUTTON_SECONDARY_HOVER,  # CORREGIDO
         )
         empresa_combo.pack(side=tk.LEFT, padx=5)
+        self.cargar_empresas(empresa_combo, empresa_map)
         ctk.CTkLabel(filter_controls, text="Mes:", text_color=TEXT_COLOR).pack(
             side=tk.LEFT
         )  # CORREGIDO
@@ -1514,7 +2282,7 @@ class MainFrame(ctk.CTkFrame):
         anio_entry.pack(side=tk.LEFT, padx=5)
         tree1_frame = ctk.CTkFrame(rep1_frame, fg_color="transparent")
         tree1_frame.pack(fill="both", expand=True, pady=10, padx=10)
-        tree1 = crear_tabla(tree1_frame, ("Empleado", "Cédula", "Salario Base"))
+        tree1 = crear_tabla_virtual(tree1_frame, ("Empleado", "Cédula", "Salario Base"))
         tree1.pack(fill="both", expand=True)
 
         def buscar_nomina():
@@ -1530,27 +2298,60 @@ class MainFrame(ctk.CTkFrame):
             if not id_empresa:
                 messagebox.showerror("Error", "Debes seleccionar una empresa")
                 return
-            for i in tree1.get_children():
-                tree1.delete(i)
-            reporte = db_manager.get_nomina_reporte_db(id_empresa, mes, anio)
-            for row in reporte or []:
-                tree1.insert(
-                    "",
-                    "end",
-                    values=(
-                        row["Empleado"],
-                        row["Cedula_Identidad"],
-                        f"{row['Salario_Base']:.2f}",
-                    ),
+
+            def mostrar(reporte):
+                tree1.mostrar(
+                    (row["Empleado"], row["Cedula_Identidad"], f"{row['Salario_Base']:.2f}")
+                    for row in reporte or []
                 )
 
-        ctk.CTkButton(
+            self.ejecutar(
+                db_manager.get_nomina_reporte_db,
+                id_empresa,
+                mes,
+                anio,
+                al_terminar=mostrar,
+                bloquear=(buscar_btn,),
+            )
+
+        buscar_btn = ctk.CTkButton(
             filter_controls,
             text="Buscar",
             command=buscar_nomina,
             width=80,
             text_color=TEXT_COLOR,  # CORREGIDO
-        ).pack(side=tk.LEFT, padx=10)
+        )
+        buscar_btn.pack(side=tk.LEFT, padx=10)
+
+        def exportar_periodo():
+            # Sin empresa seleccionada se exporta el periodo de todas.
+            try:
+                mes, anio = int(mes_entry.get()), int(anio_entry.get())
+            except (ValueError, TypeError):
+                messagebox.showerror(
+                    "Entrada no válida",
+                    "Por favor, introduce un mes (1-12) y año válidos.",
+                )
+                return
+            self.exportar(
+                "recibos",
+                f"recibos_{anio}_{mes:02d}",
+                exportar_periodo_btn,
+                mes=mes,
+                anio=anio,
+                id_empresa=empresa_map.get(empresa_combo.get()),
+            )
+
+        exportar_periodo_btn = ctk.CTkButton(
+            filter_controls,
+            text="Exportar",
+            command=exportar_periodo,
+            width=80,
+            fg_color=BUTTON_SECONDARY_COLOR,
+            hover_color=BUTTON_SECONDARY_HOVER,
+            text_color=TEXT_COLOR,
+        )
+        exportar_periodo_btn.pack(side=tk.LEFT)
         rep2_frame = ctk.CTkFrame(self.content_frame, fg_color=FRAME_BG_COLOR)
         rep2_frame.pack(fill="both", pady=10, expand=True)
         ctk.CTkLabel(
@@ -1559,24 +2360,38 @@ class MainFrame(ctk.CTkFrame):
             font=FONT_BOLD,
             text_color=TEXT_COLOR,  # CORREGIDO
         ).pack(pady=10)
+        exportar_resumen_btn = ctk.CTkButton(
+            rep2_frame,
+            text="Exportar",
+            command=lambda: self.exportar(
+                "resumen", "resumen_nominas", exportar_resumen_btn
+            ),
+            width=80,
+            fg_color=BUTTON_SECONDARY_COLOR,
+            hover_color=BUTTON_SECONDARY_HOVER,
+            text_color=TEXT_COLOR,
+        )
+        exportar_resumen_btn.pack(anchor="e", padx=10)
         tree2_frame = ctk.CTkFrame(rep2_frame, fg_color="transparent")
         tree2_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        tree2 = crear_tabla(tree2_frame, ("Empresa", "Periodo", "Total Nómina"))
+        tree2 = crear_tabla_virtual(tree2_frame, ("Empresa", "Periodo", "Total Nómina"))
         tree2.pack(fill="both", expand=True)
-        reporte_total = db_manager.get_toda_nomina_reporte_db()
-        for row in reporte_total or []:
-            tree2.insert(
-                "",
-                "end",
-                values=(
+
+        def mostrar_total(reporte_total):
+            tree2.mostrar(
+                (
                     row["Nombre_Empresa"],
                     f"{row['Mes']}/{row['Anio']}",
                     f"{row['Total_Nomina']:.2f}",
-                ),
+                )
+                for row in reporte_total or []
             )
 
+        self.ejecutar(db_manager.get_toda_nomina_reporte_db, al_terminar=mostrar_total)
+
+    @pantalla(tablas=("empresas",))
     def show_nomina_form(self):
-        self.show_welcome_message()
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
             text="Ejecutar Nómina Mensual",
@@ -1585,21 +2400,13 @@ class MainFrame(ctk.CTkFrame):
         ).pack(pady=10, anchor="w")
         form_container = ctk.CTkFrame(self.content_frame, fg_color="transparent")
         form_container.pack(fill="x", pady=5, anchor="w")
-        empresas = db_manager.get_catalogo("Empresas", "ID_Empresa", "Nombre_Empresa")
-        if not empresas:
-            ctk.CTkLabel(
-                self.content_frame,
-                text="No hay empresas registradas.",
-                text_color=TEXT_COLOR,
-            ).pack()  # CORREGIDO
-            return
-        empresa_map = {e["Nombre_Empresa"]: e["ID_Empresa"] for e in empresas or []}
+        empresa_map = {}
         ctk.CTkLabel(form_container, text="Empresa:", text_color=TEXT_COLOR).pack(
             anchor="w"
         )  # CORREGIDO
         empresa_combo = ctk.CTkComboBox(
             form_container,
-            values=list(empresa_map.keys()),
+            values=[],
             state="readonly",
             width=300,
             text_color=TEXT_COLOR,  # CORREGIDO
@@ -1609,6 +2416,15 @@ class MainFrame(ctk.CTkFrame):
             button_hover_color=BUTTON_SECONDARY_HOVER,  # CORREGIDO
         )
         empresa_combo.pack(fill="x")
+        self.cargar_empresas(
+            empresa_combo,
+            empresa_map,
+            al_vacio=lambda: ctk.CTkLabel(
+                form_container,
+                text="No hay empresas registradas.",
+                text_color=TEXT_COLOR,
+            ).pack(anchor="w"),
+        )
         ctk.CTkLabel(form_container, text="Mes (1-12):", text_color=TEXT_COLOR).pack(
             anchor="w", pady=(10, 0)
         )  # CORREGIDO
@@ -1639,7 +2455,7 @@ class MainFrame(ctk.CTkFrame):
             font=FONT_BOLD,
             text_color=TEXT_COLOR,  # CORREGIDO
         ).pack(pady=10)
-        tree_resultado = crear_tabla(
+        tree_resultado = crear_tabla_virtual(
             resultado_frame,
             ("Empleado", "Cédula", "Salario Base", "Deducciones", "Salario Neto"),
             widths={
@@ -1652,48 +2468,152 @@ class MainFrame(ctk.CTkFrame):
         )
         tree_resultado.pack(fill="both", expand=True, padx=10, pady=10)
 
-        def generar():
-            for i in tree_resultado.get_children():
-                tree_resultado.delete(i)
-            nombre_empresa = empresa_combo.get()
+        lote_frame = ctk.CTkFrame(self.content_frame, fg_color=FRAME_BG_COLOR)
+        ctk.CTkLabel(
+            lote_frame,
+            text="Resultado por Empresa",
+            font=FONT_BOLD,
+            text_color=TEXT_COLOR,
+        ).pack(pady=10)
+        tree_lote = crear_tabla(
+            lote_frame,
+            ("Empresa", "Estado", "Recibos", "Detalle"),
+            widths={"Empresa": 200, "Estado": 90, "Recibos": 80, "Detalle": 380},
+        )
+        tree_lote.pack(fill="both", expand=True, padx=10, pady=10)
+
+        def leer_periodo():
             try:
                 mes, anio = int(mes_entry.get()), int(anio_entry.get())
             except (ValueError, TypeError):
                 messagebox.showerror(
                     "Entrada no válida", "Mes y año deben ser números."
                 )
-                return
+                return None
             if not (1 <= mes <= 12 and 2000 <= anio <= 2100):
                 messagebox.showerror(
                     "Entrada no válida",
                     "Por favor, introduce un mes (1-12) y año válidos.",
                 )
+                return None
+            return mes, anio
+
+        def generar():
+            tree_resultado.mostrar(())
+            nombre_empresa = empresa_combo.get()
+            periodo = leer_periodo()
+            if not periodo:
                 return
+            mes, anio = periodo
             if not nombre_empresa:
                 messagebox.showerror("Error", "Debes seleccionar una empresa")
                 return
             id_empresa = empresa_map.get(nombre_empresa)
-            success, msg, id_nomina = db_manager.ejecutar_nomina_db(
-                id_empresa, mes, anio
+
+            def generar_y_detallar():
+                success, msg, id_nomina = db_manager.ejecutar_nomina_db(
+                    id_empresa, mes, anio
+                )
+                detalles = []
+                if success and id_nomina:
+                    detalles = db_manager.get_nomina_generada_detalle_db(id_nomina)
+                return msg, detalles
+
+            def mostrar(resultado):
+                msg, detalles_nomina = resultado
+                messagebox.showinfo("Resultado", msg)
+                tree_resultado.mostrar(
+                    (
+                        detalle["Empleado"],
+                        detalle["Cedula_Identidad"],
+                        f"{detalle['Salario_Base']:.2f}",
+                        f"{detalle['Total_Deducciones']:.2f}",
+                        f"{detalle['Salario_Neto_Pagado']:.2f}",
+                    )
+                    for detalle in detalles_nomina or []
+                )
+
+            self.ejecutar(generar_y_detallar, al_terminar=mostrar, bloquear=botones)
+
+        def previsualizar():
+            periodo = leer_periodo()
+            if not periodo:
+                return
+            mes, anio = periodo
+            id_empresa = empresa_map.get(empresa_combo.get())
+            if not id_empresa:
+                messagebox.showerror("Error", "Debes seleccionar una empresa")
+                return
+            tree_resultado.mostrar(())
+
+            def mostrar(resultado):
+                success, msg, filas = resultado
+                if not success:
+                    messagebox.showinfo("Resultado", msg)
+                    return
+                tree_resultado.mostrar(
+                    (
+                        fila["Empleado"],
+                        fila["Cedula_Identidad"],
+                        f"{fila['Salario_Base']:.2f}",
+                        f"{fila['Monto_Deduccion_INCES'] + fila['Monto_Deduccion_IVSS']:.2f}",
+                        f"{fila['Salario_Neto_Pagado']:.2f}",
+                    )
+                    for fila in filas
+                )
+                messagebox.showinfo("Vista Previa", f"{msg} No se ha guardado nada.")
+
+            self.ejecutar(
+                db_manager.previsualizar_nomina_db,
+                mes,
+                anio,
+                id_empresa,
+                al_terminar=mostrar,
+                bloquear=botones,
             )
-            messagebox.showinfo("Resultado", msg)
-            if success and id_nomina:
-                detalles_nomina = db_manager.get_nomina_generada_detalle_db(id_nomina)
-                for detalle in detalles_nomina or []:
-                    tree_resultado.insert(
+
+        def generar_todas():
+            periodo = leer_periodo()
+            if not periodo:
+                return
+            mes, anio = periodo
+            if not messagebox.askyesno(
+                "Confirmar",
+                f"¿Generar la nómina de {mes}/{anio} para todas las empresas?",
+            ):
+                return
+            tree_lote.limpiar()
+
+            def mostrar(resultado):
+                resultados, segundos = resultado
+                for r in resultados:
+                    tree_lote.insert(
                         "",
                         "end",
-                        values=(
-                            detalle["Empleado"],
-                            detalle["Cedula_Identidad"],
-                            f"{detalle['Salario_Base']:.2f}",
-                            f"{detalle['Total_Deducciones']:.2f}",
-                            f"{detalle['Salario_Neto_Pagado']:.2f}",
-                        ),
+                        values=(r["Nombre_Empresa"], r["Estado"], r["Recibos"], r["Mensaje"]),
                     )
+                lote_frame.pack(fill="both", pady=(0, 20), expand=True)
+                generadas = sum(1 for r in resultados if r["Estado"] == "Generada")
+                omitidas = sum(1 for r in resultados if r["Estado"] == "Omitida")
+                errores = len(resultados) - generadas - omitidas
+                messagebox.showinfo(
+                    "Resultado",
+                    f"Nóminas generadas: {generadas}\nOmitidas: {omitidas}\n"
+                    f"Con error: {errores}\nTiempo total: {segundos:.2f} s",
+                )
 
-        ctk.CTkButton(
-            form_container,
+            self.ejecutar(
+                db_manager.ejecutar_nomina_lote_db,
+                mes,
+                anio,
+                al_terminar=mostrar,
+                bloquear=botones,
+            )
+
+        botones_frame = ctk.CTkFrame(form_container, fg_color="transparent")
+        botones_frame.pack(pady=20, anchor="w")
+        generar_btn = ctk.CTkButton(
+            botones_frame,
             text="Generar Nómina",
             command=generar,
             height=40,
@@ -1701,84 +2621,160 @@ class MainFrame(ctk.CTkFrame):
             fg_color=ACCENT_PURPLE,
             hover_color=ACCENT_PINK,
             text_color=TEXT_COLOR,  # CORREGIDO
-        ).pack(pady=20, anchor="w")
+        )
+        generar_btn.pack(side=tk.LEFT)
+        previsualizar_btn = ctk.CTkButton(
+            botones_frame,
+            text="Previsualizar",
+            command=previsualizar,
+            height=40,
+            corner_radius=10,
+            fg_color=BUTTON_SECONDARY_COLOR,
+            hover_color=BUTTON_SECONDARY_HOVER,
+            text_color=TEXT_COLOR,
+        )
+        previsualizar_btn.pack(side=tk.LEFT, padx=(10, 0))
+        generar_todas_btn = ctk.CTkButton(
+            botones_frame,
+            text="Generar para Todas las Empresas",
+            command=generar_todas,
+            height=40,
+            corner_radius=10,
+            fg_color=BUTTON_SECONDARY_COLOR,
+            hover_color=BUTTON_SECONDARY_HOVER,
+            text_color=TEXT_COLOR,
+        )
+        generar_todas_btn.pack(side=tk.LEFT, padx=10)
 
+        def exportar_periodo():
+            periodo = leer_periodo()
+            if not periodo:
+                return
+            mes, anio = periodo
+            self.exportar(
+                "recibos",
+                f"recibos_{anio}_{mes:02d}",
+                exportar_btn,
+                mes=mes,
+                anio=anio,
+                id_empresa=empresa_map.get(empresa_combo.get()),
+            )
+
+        exportar_btn = ctk.CTkButton(
+            botones_frame,
+            text="Exportar",
+            command=exportar_periodo,
+            height=40,
+            corner_radius=10,
+            fg_color=BUTTON_SECONDARY_COLOR,
+            hover_color=BUTTON_SECONDARY_HOVER,
+            text_color=TEXT_COLOR,
+        )
+        exportar_btn.pack(side=tk.LEFT)
+        # Mientras corre una nómina no se puede lanzar otra desde esta pantalla.
+        botones = (generar_btn, previsualizar_btn, generar_todas_btn)
+
+    @pantalla(tablas=("postulaciones", "vacantes", "empresas"))
     def show_mis_postulaciones(self):
-        self.show_welcome_message()
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
             text="Mis Postulaciones Realizadas",
             font=FONT_TITLE,
             text_color=TEXT_COLOR,  # CORREGIDO
         ).pack(pady=10, anchor="w")
-        postulaciones = db_manager.get_postulaciones_por_postulante(
-            self.controller.usuario_actual["ID_Usuario"]
-        )
-        if not postulaciones:
-            ctk.CTkLabel(
-                self.content_frame,
-                text="No has realizado ninguna postulación.",
-                text_color=TEXT_COLOR,  # CORREGIDO
-            ).pack()
-            return
-        tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        tree_frame.pack(fill="both", expand=True, pady=10)
-        tree = crear_tabla(
-            tree_frame, ("Cargo", "Empresa", "Salario", "Fecha", "Estatus")
-        )
-        for p in postulaciones:
-            salario = (
-                f"{float(p['Salario_Ofrecido']):.2f}"
-                if p["Salario_Ofrecido"]
-                else "N/A"
-            )
-            fecha = p["Fecha_Postulacion"] if p["Fecha_Postulacion"] else "N/A"
-            tree.insert(
-                "",
-                "end",
-                values=(
-                    p["Cargo_Vacante"],
-                    p["Nombre_Empresa"],
-                    salario,
-                    fecha,
-                    p["Estatus"],
-                ),
+
+        def mostrar(postulaciones):
+            if not postulaciones:
+                ctk.CTkLabel(
+                    self.content_frame,
+                    text="No has realizado ninguna postulación.",
+                    text_color=TEXT_COLOR,  # CORREGIDO
+                ).pack()
+                return
+            tree_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+            tree_frame.pack(fill="both", expand=True, pady=10)
+            tree = crear_tabla(
+                tree_frame, ("Cargo", "Empresa", "Salario", "Fecha", "Estatus")
             )
-        tree.pack(fill="both", expand=True)
+            for p in postulaciones:
+                salario = (
+                    f"{float(p['Salario_Ofrecido']):.2f}"
+                    if p["Salario_Ofrecido"]
+                    else "N/A"
+                )
+                fecha = p["Fecha_Postulacion"] if p["Fecha_Postulacion"] else "N/A"
+                tree.insert(
+                    "",
+                    "end",
+                    values=(
+                        p["Cargo_Vacante"],
+                        p["Nombre_Empresa"],
+                        salario,
+                        fecha,
+                        p["Estatus"],
+                    ),
+                )
+            tree.pack(fill="both", expand=True)
+
+        self.ejecutar(
+            db_manager.get_postulaciones_por_postulante,
+            self.controller.usuario_actual["ID_Usuario"],
+            al_terminar=mostrar,
+        )
 
+    @pantalla(
+        tablas=(
+            "contratos",
+            "postulaciones",
+            "postulantes",
+            "vacantes",
+            "empresas",
+        )
+    )
     def show_constancia(self):
-        self.show_welcome_message()
+        self.agregar_saludo()
         ctk.CTkLabel(
             self.content_frame,
             text="Constancia de Trabajo",
             font=FONT_TITLE,
             text_color=TEXT_COLOR,  # CORREGIDO
         ).pack(pady=10, anchor="w")
-        texto_constancia = db_manager.get_datos_constancia(
-            self.controller.usuario_actual["ID_Usuario"]
+
+        def mostrar(texto_constancia):
+            if texto_constancia:
+                textbox = ctk.CTkTextbox(
+                    self.content_frame,
+                    height=250,
+                    font=("Courier", 12),
+                    wrap="word",
+                    fg_color=ENTRY_BG_COLOR,
+                    border_color=BUTTON_SECONDARY_COLOR,
+                    text_color=TEXT_COLOR,
+                )
+                textbox.pack(pady=10, fill="x", expand=True)
+                textbox.insert(tk.END, texto_constancia)
+                textbox.configure(state="disabled")
+            else:
+                ctk.CTkLabel(
+                    self.content_frame,
+                    text="No se pudo generar la constancia. No se encontró un contrato activo.",
+                    text_color=TEXT_COLOR,  # CORREGIDO
+                ).pack()
+
+        self.ejecutar(
+            db_manager.get_datos_constancia,
+            self.controller.usuario_actual["ID_Usuario"],
+            al_terminar=mostrar,
         )
-        if texto_constancia:
-            textbox = ctk.CTkTextbox(
-                self.content_frame,
-                height=250,
-                font=("Courier", 12),
-                wrap="word",
-                fg_color=ENTRY_BG_COLOR,
-                border_color=BUTTON_SECONDARY_COLOR,
-                text_color=TEXT_COLOR,
-            )
-            textbox.pack(pady=10, fill="x", expand=True)
-            textbox.insert(tk.END, texto_constancia)
-            textbox.configure(state="disabled")
-        else:
-            ctk.CTkLabel(
-                self.content_frame,
-                text="No se pudo generar la constancia. No se encontró un contrato activo.",
-                text_color=TEXT_COLOR,  # CORREGIDO
-            ).pack()
 
 
 if __name__ == "__main__":
-    first_run = not db_manager.hay_usuarios_registrados()
-    app = App(is_first_run=first_run)
+    # instrumentacion se importa solo si se pide: no pesa en el arranque.
+    if os.environ.get("HIRING_GROUP_INSTRUMENTAR", "") not in ("", "0"):
+        import instrumentacion
+
+        instrumentacion.activar_desde_entorno()
+    # Si hay usuarios registrados se consulta con la ventana ya visible.
+    app = App()
     app.mainloop()
@@ -0,0 +1,404 @@
+"""
+Auditoría de índices: ejecuta cada función pública de db_manager sobre una
+base de datos (sintética por defecto), captura las sentencias SQL que emite
+con el trace callback de sqlite3 y revisa su EXPLAIN QUERY PLAN. Marca los
+recorridos completos de tablas (SCAN) y los ordenamientos en B-tree
+temporales (USE TEMP B-TREE).
+
+Uso: python auditoria_indices.py [--db ruta] [--escala N] [--estricto]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import types
+from contextlib import contextmanager
+from datetime import datetime
+
+import db_manager
+
+# Tablas de catálogo: pequeñas por naturaleza, un SCAN sobre ellas es aceptable.
+# archivos_nomina tiene una fila por año archivado.
+TABLAS_PEQUENAS = {
+    "archivos_nomina",
+    "areas_conocimiento",
+    "bancos",
+    "universidades",
+    "profesiones",
+    "tasas_nomina",
+}
+
+
+def primer_valor(conn, sql, params=(), defecto=-1):
+    fila = conn.execute(sql, params).fetchone()
+    return fila[0] if fila and fila[0] is not None else defecto
+
+
+def escenarios(conn):
+    """
+    Llamadas representativas de cada función pública de db_manager. Si la
+    base no tiene datos para algún caso se usan IDs inexistentes: el plan de
+    la consulta es el mismo.
+    """
+    empresa = primer_valor(
+        conn,
+        """SELECT v.ID_Empresa FROM Contratos c JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion
+           JOIN Vacantes v ON p.ID_Vacante = v.ID_Vacante WHERE c.Estatus = 'Activo' LIMIT 1""",
+    )
+    contratado = conn.execute(
+        """SELECT p.ID_Postulante, u.Email, u.Password FROM Contratos c
+           JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion
+           JOIN Usuarios u ON u.ID_Usuario = p.ID_Postulante WHERE c.Estatus = 'Activo' LIMIT 1"""
+    ).fetchone() or {"ID_Postulante": -1, "Email": "", "Password": ""}
+    nomina = conn.execute(
+        "SELECT ID_Nomina, ID_Empresa, Mes, Anio FROM Nominas WHERE ID_Empresa = ? LIMIT 1",
+        (empresa,),
+    ).fetchone() or {"ID_Nomina": -1, "ID_Empresa": empresa, "Mes": 1, "Anio": 2000}
+    postulacion = primer_valor(
+        conn, "SELECT ID_Postulacion FROM Postulaciones WHERE Estatus = 'Recibida' LIMIT 1"
+    )
+    vacante_libre = primer_valor(
+        conn,
+        """SELECT v.ID_Vacante FROM Vacantes v WHERE NOT EXISTS
+           (SELECT 1 FROM Postulaciones p WHERE p.ID_Vacante = v.ID_Vacante) LIMIT 1""",
+        defecto=primer_valor(conn, "SELECT MAX(ID_Vacante) FROM Vacantes"),
+    )
+    area = conn.execute("SELECT MIN(ID_Area_Conocimiento) FROM Areas_Conocimiento").fetchone()[0]
+    profesion = primer_valor(conn, "SELECT MIN(ID_Profesion) FROM Profesiones")
+    universidad = primer_valor(conn, "SELECT MIN(ID_Universidad) FROM Universidades")
+    id_postulante = contratado["ID_Postulante"]
+    datos_contrato = {
+        "Tipo_Contrato": "Indefinido",
+        "Salario_Acordado": 1000,
+        "Tipo_Sangre": "O+",
+        "Contacto_Emergencia_Nombre": "Auditoría",
+        "Contacto_Emergencia_Telefono": "0000",
+        "Numero_Cuenta": "0000",
+        "ID_Banco": 1,
+    }
+    datos_empresa = {
+        "Email": "auditoria.empresa@example.com",
+        "Contraseña": "auditoria",
+        "Nombre Empresa": "Auditoría",
+        "RIF": "J-00000000-0",
+        "Sector": "Auditoría",
+        "Persona de Contacto": "Auditoría",
+        "Teléfono de Contacto": "0000",
+        "Email de Contacto": "auditoria.empresa@example.com",
+    }
+    datos_postulante = {
+        "Email": "auditoria.postulante@example.com",
+        "Contraseña": "auditoria",
+        "Nombres": "Auditoría",
+        "Apellidos": "Auditoría",
+        "Cédula": "V-00000000",
+        "Teléfono": "0000",
+        "ID_Universidad": universidad,
+    }
+    datos_experiencia = {
+        "Empresa": "Auditoría",
+        "Cargo": "Auditor",
+        "Fecha Inicio (YYYY-MM-DD)": "2020-01-01",
+        "Descripción": "Auditoría",
+    }
+    return [
+        ("login_usuario", (contratado["Email"], contratado["Password"])),
+        ("hay_usuarios_registrados", ()),
+        ("get_catalogo", ("Bancos", "ID_Banco", "Nombre_Banco")),
+        (
+            "get_catalogo",
+            ("Empresas", "ID_Empresa", ["Nombre_Empresa", "RIF", "Sector_Industrial"]),
+        ),
+        ("get_active_vacantes", ()),
+        ("get_active_vacantes", (area, None, "DESC")),
+        ("get_active_vacantes_pagina", ()),
+        ("get_active_vacantes_pagina", (None, None, "DESC", 50, "1000.0:1")),
+        ("get_active_vacantes_pagina", (area, None, "ASC", 50, "1000.0:1")),
+        ("get_active_vacantes_pagina", (None, None, None, 50, None, "desarrollador")),
+        ("get_active_vacantes_pagina", (area, None, "DESC", 50, "1000.0:1", "ing")),
+        ("get_postulaciones_para_contratar", ()),
+        ("buscar_postulantes_db", ("python",)),
+        ("buscar_postulantes_db", ("analista", 50, "-1.0:1")),
+        ("get_vacantes_por_empresa", (empresa,)),
+        ("get_postulaciones_por_postulante", (id_postulante,)),
+        ("get_recibos_por_contratado", (id_postulante,)),
+        ("get_recibos_por_contratado", (id_postulante, nomina["Mes"], nomina["Anio"])),
+        ("get_datos_constancia", (id_postulante,)),
+        ("get_nomina_reporte_db", (empresa, nomina["Mes"], nomina["Anio"])),
+        ("get_toda_nomina_reporte_db", ()),
+        ("verificar_resumen_nominas_db", (False,)),
+        ("get_nomina_generada_detalle_db", (nomina["ID_Nomina"],)),
+        ("iterar_recibos_db", (nomina["Mes"], nomina["Anio"])),
+        ("iterar_recibos_db", (None, None, None, nomina["ID_Nomina"])),
+        ("get_experiencias_db", (id_postulante,)),
+        ("get_single_postulante", (id_postulante,)),
+        ("get_single_empresa", (empresa,)),
+        ("get_tasas_nomina_db", ()),
+        ("registrar_tasa_nomina_db", ("IVSS", 0.01, "2030-01-01")),
+        ("previsualizar_nomina_db", (12, 2030, empresa)),
+        ("ejecutar_nomina_db", (empresa, 12, 2030)),
+        ("ejecutar_nomina_lote_db", (11, 2030)),
+        ("aplicar_a_vacante_db", (id_postulante, vacante_libre)),
+        ("contratar_postulante_db", (postulacion, datos_contrato)),
+        (
+            "actualizar_vacante_db",
+            (vacante_libre, "Cargo", "Desc", 1000, "Activa"),
+        ),
+        ("eliminar_vacante_db", (vacante_libre,)),
+        ("crear_vacante_db", (empresa, "Cargo", "Desc", 1000, profesion)),
+        ("crear_experiencia_db", (id_postulante, datos_experiencia)),
+        ("eliminar_experiencia_db", (-1,)),
+        ("registrar_usuario_db", ("Empresa", datos_empresa)),
+        ("registrar_usuario_db", ("Postulante", datos_postulante)),
+        ("actualizar_usuario_db", (empresa, "Empresa", datos_empresa)),
+        ("actualizar_usuario_db", (id_postulante, "Postulante", datos_postulante)),
+        ("iterar_usuarios_db", ("Empresa",)),
+        ("iterar_usuarios_db", ("Postulante",)),
+        ("eliminar_usuario_db", (-1,)),
+        ("crear_item_catalogo", ("Bancos", "Nombre_Banco", "Banco de la Auditoría")),
+        ("actualizar_item_catalogo", ("Bancos", "ID_Banco", "Nombre_Banco", -1, "Sin banco")),
+        ("eliminar_item_catalogo", ("Bancos", "ID_Banco", -1)),
+        # Al final: mueve al archivo todas las nóminas salvo la más reciente.
+        ("archivar_nominas_db", (0, datetime(2100, 1, 1))),
+        ("get_archivos_nomina_db", ()),
+    ]
+
+
+def funciones_sin_escenario(llamadas):
+    """
+    Funciones que instrumentacion.py mide y que no tienen escenario: sus
+    sentencias quedarían fuera de la auditoría.
+    """
+    # Import diferido: instrumentacion importa este módulo.
+    import instrumentacion
+
+    cubiertas = {nombre for nombre, _ in llamadas}
+    return [nombre for nombre in instrumentacion.funciones_publicas() if nombre not in cubiertas]
+
+
+@contextmanager
+def capturar_sql(sentencias):
+    original = db_manager.get_db_connection
+
+    @contextmanager
+    def conexion_trazada():
+        with original() as conn:
+            conn.set_trace_callback(sentencias.append)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    db_manager.get_db_connection = conexion_trazada
+    try:
+        yield
+    finally:
+        db_manager.get_db_connection = original
+
+
+LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def normalizar(sql):
+    # El trace callback entrega el SQL con los parámetros ya sustituidos.
+    return " ".join(LITERALES.sub("?", sql).split())
+
+
+def es_auditable(sql):
+    inicio = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    return inicio in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+# Pasos del plan que se aceptan a conciencia, por función y prefijo del paso.
+# Los ordenamientos temporales listados ordenan pocas filas ya filtradas por
+# índice y no hay índice que pueda evitarlos.
+ACEPTADOS = {
+    # Casi todas las vacantes están activas: el recorrido completo es lo más barato.
+    "get_active_vacantes": ("SCAN ",),
+    # Sin orden por salario se recorre por ID_Vacante y el LIMIT corta el recorrido;
+    # con búsqueda de texto se ordenan por relevancia solo las coincidencias.
+    "get_active_vacantes_pagina": ("SCAN v", "USE TEMP B-TREE FOR ORDER BY"),
+    "buscar_postulantes_db": ("USE TEMP B-TREE FOR ORDER BY",),
+    # Recibos de un solo empleado, ordenados por columnas de Nominas.
+    "get_recibos_por_contratado": ("USE TEMP B-TREE FOR ORDER BY",),
+    # Orden por el nombre calculado del empleado.
+    "get_nomina_generada_detalle_db": ("USE TEMP B-TREE FOR ORDER BY",),
+    "previsualizar_nomina_db": ("USE TEMP B-TREE FOR RIGHT PART OF ORDER BY",),
+    # Tabla de pocas filas.
+    "get_tasas_nomina_db": ("USE TEMP B-TREE FOR ORDER BY",),
+    # Contratos activos de una sola empresa.
+    "ejecutar_nomina_db": ("USE TEMP B-TREE FOR ORDER BY",),
+    "ejecutar_nomina_lote_db": ("USE TEMP B-TREE FOR ORDER BY",),
+    # Reporte completo sobre resumen_nominas, que tiene una fila por nómina.
+    "get_toda_nomina_reporte_db": ("SCAN ", "USE TEMP B-TREE FOR "),
+    "verificar_resumen_nominas_db": ("SCAN ",),
+    # Exportación completa de empresas o postulantes, en orden de ID.
+    "iterar_usuarios_db": ("SCAN ",),
+    # Años a archivar: Nominas tiene una fila por nómina.
+    "archivar_nominas_db": ("SCAN nominas", "USE TEMP B-TREE FOR DISTINCT"),
+    # Recorre Nominas (una fila por nómina) en orden de ID para que los recibos
+    # salgan ya ordenados por el índice, sin ordenar el periodo completo.
+    "iterar_recibos_db": ("SCAN nom",),
+}
+
+
+def es_aceptado(nombre, detalle):
+    return any(detalle.startswith(prefijo) for prefijo in ACEPTADOS.get(nombre, ()))
+
+
+def hallazgos_plan(nombre, sql, plan, indices_parciales):
+    """
+    Devuelve los pasos del plan que merecen revisión: todo B-tree temporal y
+    todo SCAN sobre tablas grandes, salvo los aceptados, los que recorren un
+    índice parcial, los listados completos sin WHERE que recorren un índice en
+    orden y las consultas LIMIT 1.
+    """
+    sql = " ".join(sql.upper().split())
+    hallazgos = []
+    for detalle in plan:
+        if "USE TEMP B-TREE" in detalle:
+            if not es_aceptado(nombre, detalle):
+                hallazgos.append(detalle)
+            continue
+        if (
+            not detalle.startswith("SCAN ")
+            or detalle == "SCAN CONSTANT ROW"
+            or es_aceptado(nombre, detalle)
+        ):
+            continue
+        partes = detalle.split()
+        tabla = partes[1].lower().removeprefix("main.")
+        # Las tablas *_fts y sus tablas internas las gestiona FTS5.
+        if tabla in TABLAS_PEQUENAS or "_fts" in tabla or sql.endswith("LIMIT 1"):
+            continue
+        if "INDEX" in partes and partes[-1] in indices_parciales:
+            continue
+        if "INDEX" in partes and " WHERE " not in sql:
+            continue
+        hallazgos.append(detalle)
+    return hallazgos
+
+
+def plan_de(sql):
+    """
+    EXPLAIN QUERY PLAN de la sentencia en una conexión del pool. Las de
+    archivar_nominas_db usan la tabla temporal y el archivo adjunto de su
+    propia conexión: se recrean vacíos para poder explicarlas.
+    """
+    with db_manager.get_db_connection() as conn:
+        de_archivo = "temp.nominas_a_archivar" in sql or "archivo." in sql
+        if de_archivo:
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS nominas_a_archivar (ID_Nomina INTEGER PRIMARY KEY)"
+            )
+            conn.execute("ATTACH DATABASE ':memory:' AS archivo")
+            for sentencia in db_manager.SQL_ESQUEMA_ARCHIVO:
+                conn.execute(sentencia.format(esquema="archivo"))
+        try:
+            return [fila["detail"] for fila in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+        finally:
+            if de_archivo:
+                conn.execute("DETACH DATABASE archivo")
+                conn.execute("DROP TABLE temp.nominas_a_archivar")
+
+
+def auditar():
+    """
+    Ejecuta los escenarios sobre la base configurada en db_manager y devuelve
+    una lista de (funcion, sql, plan, hallazgos) por sentencia distinta
+    (sin contar los valores de los parámetros) y la lista de funciones
+    públicas sin escenario.
+    """
+    with db_manager.get_db_connection() as conn:
+        llamadas = escenarios(conn)
+        indices_parciales = {
+            fila["name"]
+            for fila in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '% WHERE %'"
+            )
+        }
+    resultados, vistas = [], set()
+    for nombre, args in llamadas:
+        sentencias = []
+        with capturar_sql(sentencias):
+            resultado = getattr(db_manager, nombre)(*args)
+            if isinstance(resultado, types.GeneratorType):
+                # Las funciones que generan filas solo consultan al recorrerlas.
+                for _ in resultado:
+                    pass
+        for sql in sentencias:
+            clave = (nombre, normalizar(sql))
+            if not es_auditable(sql) or clave in vistas:
+                continue
+            vistas.add(clave)
+            plan = plan_de(sql)
+            resultados.append(
+                (nombre, sql, plan, hallazgos_plan(nombre, sql, plan, indices_parciales))
+            )
+    return resultados, funciones_sin_escenario(llamadas)
+
+
+def imprimir_reporte(resultados, sin_escenario, detallado=False):
+    con_hallazgos = 0
+    for nombre, sql, plan, hallazgos in resultados:
+        if not hallazgos and not detallado:
+            continue
+        con_hallazgos += bool(hallazgos)
+        print(f"[{'REVISAR' if hallazgos else 'OK'}] {nombre}")
+        print("    " + " ".join(sql.split())[:300])
+        for detalle in plan:
+            marca = "  <--" if detalle in hallazgos else ""
+            print(f"        {detalle}{marca}")
+    print(
+        f"\n{len(resultados)} sentencias auditadas, {con_hallazgos} con recorridos "
+        "completos u ordenamientos temporales."
+    )
+    if sin_escenario:
+        print(f"Funciones públicas sin escenario: {', '.join(sin_escenario)}")
+    return con_hallazgos
+
+
+def main():
+    from datos_sinteticos import crear_base_sintetica, volumenes_por_escala
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", help="Base a auditar (se trabaja sobre una copia).")
+    parser.add_argument(
+        "--escala",
+        type=int,
+        default=20000,
+        help="Postulantes de la base sintética si no se indica --db.",
+    )
+    parser.add_argument("--todo", action="store_true", help="Mostrar también los planes sin hallazgos.")
+    parser.add_argument("--estricto", action="store_true", help="Salir con código 1 si hay hallazgos.")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    try:
+        ruta = os.path.join(directorio, "auditoria.db")
+        if args.db:
+            shutil.copyfile(args.db, ruta)
+        else:
+            crear_base_sintetica(
+                ruta,
+                meses_nomina=12,
+                **volumenes_por_escala(args.escala),
+            )
+        db_manager.configurar_base_datos(ruta)
+        with db_manager.get_db_connection() as conn:
+            conn.execute("ANALYZE")
+            conn.commit()
+        resultados, sin_escenario = auditar()
+        hallazgos = imprimir_reporte(resultados, sin_escenario, args.todo)
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    # Una función sin escenario siempre es un error: la auditoría estaría incompleta.
+    sys.exit(1 if sin_escenario or (args.estricto and hallazgos) else 0)
+
+
+if __name__ == "__main__":
+    main()
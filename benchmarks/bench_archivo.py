@@ -0,0 +1,212 @@
+"""
+Mide el efecto de archivar_nominas_db: sobre una base sintética con tres
+años de nóminas archiva los periodos anteriores al horizonte y compara,
+contra una copia sin archivar, el tamaño de la base (compactada con VACUUM)
+y la latencia de los reportes de nómina: el periodo más reciente (solo la
+base), un periodo archivado (adjunta un archivo) y el resumen de todas las
+nóminas (adjunta todos).
+
+Verifica que los reportes den lo mismo con y sin archivo, que no se pierda
+ni se duplique ningún recibo, que la base quede íntegra, que no se pueda
+volver a generar la nómina de un periodo archivado y que archivar otra vez
+no mueva nada. Termina con código 1 si algo falla.
+
+Uso: python -m benchmarks.bench_archivo [--postulantes 5000] [--meses 36]
+         [--horizonte 12] [--repeticiones 20]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import db_manager
+from datos_sinteticos import crear_base_sintetica, volumenes_por_escala
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def tamano_mb(ruta):
+    return os.path.getsize(ruta) / 1024 / 1024
+
+
+def datos_de(ruta):
+    """Periodos y un postulante con recibos, leídos antes de archivar."""
+    conn = sqlite3.connect(ruta)
+    try:
+        reciente = conn.execute(
+            "SELECT ID_Empresa, Mes, Anio FROM Nominas ORDER BY Anio DESC, Mes DESC LIMIT 1"
+        ).fetchone()
+        viejo = conn.execute(
+            "SELECT ID_Nomina, ID_Empresa, Mes, Anio FROM Nominas ORDER BY Anio, Mes LIMIT 1"
+        ).fetchone()
+        postulante = conn.execute(
+            """SELECT p.ID_Postulante FROM Recibos r JOIN Contratos c ON r.ID_Contrato = c.ID_Contrato
+               JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion LIMIT 1"""
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return reciente, viejo, postulante
+
+
+def consultas(reciente, viejo, postulante):
+    id_nomina, id_empresa, mes, anio = viejo
+    return (
+        ("periodo reciente", lambda: db_manager.get_nomina_reporte_db(*reciente)),
+        ("periodo archivado", lambda: db_manager.get_nomina_reporte_db(id_empresa, mes, anio)),
+        ("todas las nóminas", lambda: db_manager.get_toda_nomina_reporte_db()),
+        ("recibos de un año archivado", lambda: list(db_manager.iterar_recibos_db(anio=anio))),
+        ("recibos del postulante", lambda: db_manager.get_recibos_por_contratado(postulante)),
+        ("recibos del postulante (año)", lambda: db_manager.get_recibos_por_contratado(postulante, anio=anio)),
+        ("detalle de nómina archivada", lambda: db_manager.get_nomina_generada_detalle_db(id_nomina)),
+    )
+
+
+def compactar(ruta):
+    db_manager.configurar_base_datos(ruta)
+    with db_manager.get_db_connection() as conn:
+        conn.execute("VACUUM")
+    db_manager.cerrar_pool()
+
+
+def correr(ruta, lista, repeticiones):
+    db_manager.configurar_base_datos(ruta)
+    resultados = {nombre: [tuple(f) for f in consulta()] for nombre, consulta in lista}
+    tiempos = {nombre: medir(consulta, repeticiones) for nombre, consulta in lista}
+    return resultados, tiempos
+
+
+def contar(ruta):
+    """Nóminas y recibos en la base y en sus archivos."""
+    conn = sqlite3.connect(ruta)
+    try:
+        nominas, recibos = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM Nominas), (SELECT COUNT(*) FROM Recibos)"
+        ).fetchone()
+        ids = {fila[0] for fila in conn.execute("SELECT ID_Recibo FROM Recibos")}
+        archivos = []
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'archivos_nomina'").fetchone():
+            archivos = [fila[0] for fila in conn.execute("SELECT Archivo FROM archivos_nomina")]
+    finally:
+        conn.close()
+    duplicados = 0
+    for archivo in archivos:
+        conn = sqlite3.connect(os.path.join(os.path.dirname(ruta), archivo))
+        try:
+            nominas += conn.execute("SELECT COUNT(*) FROM nominas").fetchone()[0]
+            archivados = {fila[0] for fila in conn.execute("SELECT ID_Recibo FROM recibos")}
+        finally:
+            conn.close()
+        duplicados += len(ids & archivados)
+        recibos += len(archivados)
+        ids |= archivados
+    return nominas, recibos, duplicados
+
+
+def verificar(ruta, base, viejo, resultados_base, resultados_archivo):
+    correcto = True
+
+    def comprobar(condicion, descripcion):
+        nonlocal correcto
+        print(f"  {'ok   ' if condicion else 'FALLÓ'} {descripcion}")
+        correcto = correcto and condicion
+
+    print("\nVerificación:")
+    for nombre, filas in resultados_base.items():
+        comprobar(filas == resultados_archivo[nombre] and filas, f"{nombre}: mismo resultado ({len(filas)} filas)")
+    nominas, recibos, duplicados = contar(ruta)
+    nominas_base, recibos_base, _ = contar(base)
+    comprobar(
+        (nominas, recibos, duplicados) == (nominas_base, recibos_base, 0),
+        f"no se pierden ni duplican nóminas ni recibos ({nominas} nóminas, {recibos} recibos)",
+    )
+
+    db_manager.configurar_base_datos(ruta)
+    with db_manager.get_db_connection() as conn:
+        integridad = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        foraneas = conn.execute("PRAGMA foreign_key_check").fetchall()
+    comprobar(integridad == "ok" and not foraneas, "la base queda íntegra y sin claves foráneas rotas")
+    comprobar(not db_manager.verificar_resumen_nominas_db(False), "resumen_nominas coincide con los recibos")
+    _, id_empresa, mes, anio = viejo
+    exito, mensaje, _ = db_manager.ejecutar_nomina_db(id_empresa, mes, anio)
+    comprobar(not exito, f"no se regenera un periodo archivado ({mensaje})")
+    resultados = db_manager.ejecutar_nomina_lote_db(mes, anio)[0]
+    comprobar(
+        all(r["Estado"] == "Omitida" for r in resultados),
+        "la nómina por lote omite las empresas con el periodo archivado",
+    )
+    exito, mensaje, filas = db_manager.archivar_nominas_db(0, hoy=datetime(anio, mes, 1))
+    comprobar(exito and not filas, f"archivar otra vez no mueve nada ({mensaje})")
+    db_manager.cerrar_pool()
+    return correcto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postulantes", type=int, default=5000)
+    parser.add_argument("--meses", type=int, default=36, help="Meses de nómina desde enero de 2024.")
+    parser.add_argument("--horizonte", type=int, default=12, help="Meses que quedan en la base.")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix="bench_archivo_")
+    try:
+        base = os.path.join(directorio, "base.db")
+        crear_base_sintetica(base, meses_nomina=args.meses, **volumenes_por_escala(args.postulantes))
+        ruta = os.path.join(directorio, "archivada.db")
+        shutil.copyfile(base, ruta)
+        reciente, viejo, postulante = datos_de(base)
+        # El mes siguiente al último generado, como si se corriera al cerrar el periodo.
+        hoy = datetime(2024 + args.meses // 12, args.meses % 12 + 1, 1)
+
+        db_manager.configurar_base_datos(ruta)
+        inicio = time.perf_counter()
+        exito, mensaje, filas = db_manager.archivar_nominas_db(args.horizonte, hoy=hoy)
+        segundos = time.perf_counter() - inicio
+        db_manager.cerrar_pool()
+        print(f"archivar_nominas_db({args.horizonte}): {mensaje} ({segundos:.2f} s)")
+        if not exito:
+            print("Verificación: FALLÓ")
+            sys.exit(1)
+        for ruta_db in (base, ruta):
+            compactar(ruta_db)
+
+        lista = consultas(reciente, viejo, postulante)
+        resultados_base, tiempos_base = correr(base, lista, args.repeticiones)
+        resultados_archivo, tiempos_archivo = correr(ruta, lista, args.repeticiones)
+        db_manager.cerrar_pool()
+
+        print(f"\n{'Archivo':<32}{'Nóminas':>9}{'Recibos':>9}{'MB':>8}")
+        print(f"{'base sin archivar':<32}{'':>9}{'':>9}{tamano_mb(base):>8.1f}")
+        print(f"{'base archivada':<32}{'':>9}{'':>9}{tamano_mb(ruta):>8.1f}")
+        for fila in filas:
+            print(
+                f"{fila['Archivo']:<32}{fila['Nominas']:>9}{fila['Recibos']:>9}"
+                f"{tamano_mb(os.path.join(directorio, fila['Archivo'])):>8.1f}"
+            )
+        print(f"\n{'Consulta (mediana)':<32}{'Sin archivo (ms)':>18}{'Con archivo (ms)':>18}")
+        for nombre, _ in lista:
+            print(f"{nombre:<32}{tiempos_base[nombre]:>18.2f}{tiempos_archivo[nombre]:>18.2f}")
+
+        correcto = bool(filas) and verificar(ruta, base, viejo, resultados_base, resultados_archivo)
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Lanza cientos de corrutinas concurrentes que mezclan lecturas (login,
+vacantes paginadas, búsqueda de candidatos) y escrituras (postulaciones,
+experiencias y nóminas) sobre una base sintética y compara dos formas de
+atenderlas desde asyncio: llamar a db_manager con asyncio.to_thread y
+usar db_async. Cuenta los errores "database is locked" de cada una y
+verifica que con db_async no haya ninguno, que toda escritura informada
+como exitosa esté en la base de datos y que las lecturas devuelvan lo
+mismo que db_manager; termina con código 1 si algo falla.
+
+Uso: python -m benchmarks.bench_async [--corrutinas 500] [--wal]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import db_async
+import db_manager
+from datos_sinteticos import crear_base_sintetica
+
+PERIODO = (12, 2030)
+
+
+def es_bloqueo(resultado):
+    mensaje = str(resultado[1]) if isinstance(resultado, tuple) else str(resultado)
+    return "locked" in mensaje or "busy" in mensaje
+
+
+def preparar_trabajo(corrutinas):
+    with db_manager.get_db_connection() as conn:
+        postulantes = [
+            fila[0]
+            for fila in conn.execute(
+                "SELECT ID_Postulante FROM Postulantes ORDER BY ID_Postulante LIMIT ?",
+                (corrutinas,),
+            )
+        ]
+        vacantes = [
+            fila[0]
+            for fila in conn.execute(
+                """SELECT ID_Vacante FROM Vacantes WHERE Estatus = 'Activa'
+                   ORDER BY ID_Vacante DESC LIMIT 50"""
+            )
+        ]
+        empresas = [
+            fila[0] for fila in conn.execute("SELECT ID_Empresa FROM Empresas")
+        ]
+    return postulantes, vacantes, empresas
+
+
+async def cliente(api, i, postulantes, vacantes, empresas):
+    # Una sesión típica: entrar, mirar vacantes, postularse y dejar experiencia.
+    id_postulante = postulantes[i % len(postulantes)]
+    resultados = []
+    await api.login_usuario(f"postulante{id_postulante}@correo.com", "clave")
+    await api.get_active_vacantes_pagina(tamano_pagina=20, texto="analista")
+    await api.buscar_postulantes_db("python", 20)
+    resultados.append(
+        ("postulacion", await api.aplicar_a_vacante_db(id_postulante, vacantes[i % len(vacantes)]))
+    )
+    datos = {
+        "Empresa": f"Empresa concurrente {i}",
+        "Cargo": "Analista",
+        "Fecha Inicio (YYYY-MM-DD)": "2020-01-01",
+        "Descripción": "carga concurrente",
+    }
+    resultados.append(("experiencia", await api.crear_experiencia_db(id_postulante, datos)))
+    if i < len(empresas):
+        resultados.append(("nomina", await api.ejecutar_nomina_db(empresas[i], *PERIODO)))
+    return resultados
+
+
+class ApiHilos:
+    """db_manager llamado directamente desde asyncio.to_thread."""
+
+    def __getattr__(self, nombre):
+        funcion = getattr(db_manager, nombre)
+
+        async def envoltura(*args, **kwargs):
+            return await asyncio.to_thread(funcion, *args, **kwargs)
+
+        return envoltura
+
+
+async def correr(api, corrutinas, trabajo):
+    tareas = [cliente(api, i, *trabajo) for i in range(corrutinas)]
+    inicio = time.perf_counter()
+    sesiones = await asyncio.gather(*tareas, return_exceptions=True)
+    segundos = time.perf_counter() - inicio
+    escrituras = []
+    for sesion in sesiones:
+        if isinstance(sesion, Exception):
+            escrituras.append(("excepcion", (False, str(sesion))))
+        else:
+            escrituras.extend(sesion)
+    return escrituras, segundos
+
+
+def resumir(nombre, escrituras, segundos, corrutinas):
+    exitos = sum(1 for _, r in escrituras if r[0])
+    bloqueos = sum(1 for _, r in escrituras if es_bloqueo(r))
+    print(
+        f"{nombre:<22}{segundos:>8.2f}{corrutinas / segundos:>12.0f}"
+        f"{exitos:>9}{bloqueos:>10}"
+    )
+    return exitos, bloqueos
+
+
+def contar_escrituras(inicial):
+    with db_manager.get_db_connection() as conn:
+        actual = {
+            "postulacion": conn.execute("SELECT COUNT(*) FROM Postulaciones").fetchone()[0],
+            "experiencia": conn.execute(
+                "SELECT COUNT(*) FROM Experiencias_Laborales"
+            ).fetchone()[0],
+            "nomina": conn.execute(
+                "SELECT COUNT(*) FROM Nominas WHERE Mes = ? AND Anio = ?", PERIODO
+            ).fetchone()[0],
+        }
+    return {k: actual[k] - inicial.get(k, 0) for k in actual}
+
+
+async def lecturas_iguales():
+    # Las corrutinas deben devolver exactamente lo mismo que las funciones originales.
+    llamadas = [
+        ("get_active_vacantes_pagina", (), {"tamano_pagina": 30, "texto": "analista"}),
+        ("buscar_postulantes_db", ("python", 30), {}),
+        ("get_toda_nomina_reporte_db", (), {}),
+        ("get_catalogo", ("Bancos", "ID_Banco", "Nombre_Banco"), {}),
+    ]
+    for nombre, args, kwargs in llamadas:
+        esperado = getattr(db_manager, nombre)(*args, **kwargs)
+        obtenido = await getattr(db_async, nombre)(*args, **kwargs)
+        if repr(normalizar(esperado)) != repr(normalizar(obtenido)):
+            print(f"Diferencia en {nombre}")
+            return False
+    return True
+
+
+def normalizar(valor):
+    if isinstance(valor, (list, tuple)):
+        return [normalizar(v) for v in valor]
+    if hasattr(valor, "keys"):
+        return {k: valor[k] for k in valor.keys()}
+    return valor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corrutinas", type=int, default=500)
+    parser.add_argument("--postulantes", type=int, default=20000)
+    parser.add_argument("--lectores", type=int, default=4)
+    # Espera máxima por un bloqueo, la misma para las dos formas.
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--wal", action="store_true", help="Pasa la copia de db_async a modo WAL.")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    correcto = True
+    try:
+        base = os.path.join(directorio, "base.db")
+        crear_base_sintetica(
+            base,
+            empresas=max(5, args.postulantes // 1000),
+            postulantes=args.postulantes,
+            vacantes=max(10, args.postulantes // 20),
+            postulaciones=args.postulantes,
+            contratos=args.postulantes // 10,
+            meses_nomina=1,
+        )
+        print(
+            f"{'Modo':<22}{'Seg.':>8}{'Sesiones/s':>12}{'Éxitos':>9}{'Bloqueos':>10}"
+        )
+
+        # Cada modo trabaja sobre su propia copia de la misma base.
+        for nombre, usar_async in (("asyncio.to_thread", False), ("db_async", True)):
+            ruta = os.path.join(directorio, f"{'async' if usar_async else 'hilos'}.db")
+            shutil.copyfile(base, ruta)
+            db_manager.configurar_base_datos(
+                ruta, max_conexiones=32, timeout=args.timeout
+            )
+            trabajo = preparar_trabajo(args.corrutinas)
+            inicial = contar_escrituras({})
+            if usar_async:
+                db_async.configurar(lectores=args.lectores, timeout=args.timeout, wal=args.wal)
+                api = db_async
+            else:
+                api = ApiHilos()
+            escrituras, segundos = asyncio.run(correr(api, args.corrutinas, trabajo))
+            exitos, bloqueos = resumir(nombre, escrituras, segundos, args.corrutinas)
+            if not usar_async:
+                continue
+
+            guardadas = contar_escrituras(inicial)
+            informadas = {}
+            for tipo, resultado in escrituras:
+                informadas[tipo] = informadas.get(tipo, 0) + (1 if resultado[0] else 0)
+            if bloqueos:
+                print("db_async devolvió errores de bloqueo.")
+                correcto = False
+            for tipo, cantidad in guardadas.items():
+                if informadas.get(tipo, 0) != cantidad:
+                    print(
+                        f"{tipo}: {informadas.get(tipo, 0)} exitosas informadas, "
+                        f"{cantidad} guardadas."
+                    )
+                    correcto = False
+            if not asyncio.run(lecturas_iguales()):
+                correcto = False
+            db_async.cerrar_sincrono()
+    finally:
+        db_async.cerrar_sincrono()
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Mide la búsqueda de candidatos por texto completo (postulantes_fts) sobre una
+base sintética grande: tiempo de construcción del índice en la migración,
+latencia de la primera página y de la décima frente a una búsqueda con
+LIKE, y costo de los triggers al agregar experiencias. Verifica además
+que recorrer todas las páginas devuelva los mismos candidatos que una sola
+consulta sin paginar; termina con código 1 si difieren.
+
+Uso: python -m benchmarks.bench_busqueda_postulantes [--postulantes 500000]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import db_manager
+from datos_sinteticos import crear_base_sintetica
+
+BUSQUEDAS = ("python", "garcía", "analista contab", "compañía 12")
+
+
+def buscar_con_like(texto):
+    # Alternativa sin índice de texto: recorre postulantes y experiencias.
+    patron = f"%{texto}%"
+    with db_manager.get_db_connection() as conn:
+        return conn.execute(
+            """SELECT DISTINCT p.ID_Postulante FROM Postulantes p
+               LEFT JOIN Experiencias_Laborales e ON e.ID_Postulante = p.ID_Postulante
+               WHERE p.Nombres LIKE ? OR p.Apellidos LIKE ? OR p.Cedula_Identidad LIKE ?
+                  OR e.Empresa LIKE ? OR e.Cargo_Ocupado LIKE ? OR e.Descripcion LIKE ?
+               LIMIT 50""",
+            (patron,) * 6,
+        ).fetchall()
+
+
+def mediana_ms(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def cursor_de_pagina(texto, numero):
+    # Cursor con el que se pide la página 'numero' (None para la primera).
+    cursor = None
+    for _ in range(numero - 1):
+        _, siguiente = db_manager.buscar_postulantes_db(texto, 50, cursor)
+        if siguiente is None:
+            break
+        cursor = siguiente
+    return cursor
+
+
+def todas_las_paginas(texto):
+    ids, cursor = [], None
+    while True:
+        filas, cursor = db_manager.buscar_postulantes_db(texto, 1000, cursor)
+        ids.extend(fila["ID_Postulante"] for fila in filas)
+        if cursor is None:
+            return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postulantes", type=int, default=500000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    diferencias = False
+    try:
+        ruta = os.path.join(directorio, "busqueda.db")
+        crear_base_sintetica(
+            ruta,
+            empresas=max(5, args.postulantes // 1000),
+            postulantes=args.postulantes,
+            vacantes=max(10, args.postulantes // 25),
+            postulaciones=args.postulantes,
+            contratos=args.postulantes // 25,
+            meses_nomina=0,
+        )
+        # La primera conexión del pool aplica las migraciones y llena el índice.
+        db_manager.configurar_base_datos(ruta)
+        inicio = time.perf_counter()
+        with db_manager.get_db_connection() as conn:
+            indexados = conn.execute("SELECT COUNT(*) FROM postulantes_fts").fetchone()[0]
+        print(
+            f"Índice construido: {indexados} candidatos en "
+            f"{time.perf_counter() - inicio:.1f} s\n"
+        )
+
+        print(
+            f"{'Búsqueda':<18}{'Resultados':>11}{'LIKE (ms)':>11}"
+            f"{'FTS pág. 1':>12}{'FTS pág. 10':>13}  Paginación"
+        )
+        with db_manager.get_db_connection() as conn:
+            cedula = conn.execute(
+                "SELECT Cedula_Identidad FROM Postulantes ORDER BY ID_Postulante DESC LIMIT 1"
+            ).fetchone()[0]
+        for texto in (*BUSQUEDAS, cedula):
+            ids = todas_las_paginas(texto)
+            completa, _ = db_manager.buscar_postulantes_db(texto, len(ids) + 1)
+            iguales = ids == [fila["ID_Postulante"] for fila in completa]
+            diferencias = diferencias or not iguales
+            like = mediana_ms(lambda: buscar_con_like(texto), max(1, args.repeticiones // 10))
+            cursor = cursor_de_pagina(texto, 10)
+            primera = mediana_ms(
+                lambda: db_manager.buscar_postulantes_db(texto, 50), args.repeticiones
+            )
+            decima = mediana_ms(
+                lambda: db_manager.buscar_postulantes_db(texto, 50, cursor), args.repeticiones
+            )
+            print(
+                f"{texto:<18}{len(ids):>11}{like:>11.1f}{primera:>12.1f}{decima:>13.1f}"
+                f"  {'consistente' if iguales else 'DIFERENTE'}"
+            )
+
+        with db_manager.get_db_connection() as conn:
+            ids_postulantes = [
+                fila[0]
+                for fila in conn.execute("SELECT ID_Postulante FROM Postulantes LIMIT 1000")
+            ]
+        datos = {
+            "Empresa": "Compañía de prueba",
+            "Cargo": "Analista",
+            "Fecha Inicio (YYYY-MM-DD)": "2020-01-01",
+            "Descripción": "python",
+        }
+        inicio = time.perf_counter()
+        for id_postulante in ids_postulantes:
+            db_manager.crear_experiencia_db(id_postulante, datos)
+        por_insercion = (time.perf_counter() - inicio) / len(ids_postulantes) * 1e6
+        print(f"\nAgregar experiencia (con actualización del índice): {por_insercion:.0f} µs")
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    sys.exit(1 if diferencias else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Mide el motor de cálculo de nómina (calculo_nomina.calcular_recibos) contra
+el cálculo contrato por contrato del bucle original, a 10k, 100k y 1M
+contratos, y verifica que ambos den los mismos valores.
+
+Uso: python -m benchmarks.bench_calculo_nomina [--tamanos 10000 100000 1000000]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import calculo_nomina
+
+TASAS = {
+    "INCES": calculo_nomina.Tasa("INCES", 0.005, None),
+    "IVSS": calculo_nomina.Tasa("IVSS", 0.01, None),
+    "Comision_Hiring_Group": calculo_nomina.Tasa("Comision_Hiring_Group", 0.02, None),
+}
+
+
+def calcular_por_contrato(ids, salarios):
+    filas = []
+    for id_contrato, salario in zip(ids, salarios):
+        ded_inces, ded_ivss, comision = (
+            float(salario) * 0.005,
+            float(salario) * 0.01,
+            float(salario) * 0.02,
+        )
+        neto = float(salario) - ded_inces - ded_ivss
+        filas.append((id_contrato, salario, ded_inces, ded_ivss, comision, neto))
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    correcto = True
+    print(f"{'Contratos':>10}{'Por contrato (ms)':>19}{'Por columnas (ms)':>19}{'Mejora':>9}  Resultado")
+    for total in args.tamanos:
+        ids = list(range(1, total + 1))
+        salarios = [round(rng.uniform(300, 5000), 2) for _ in ids]
+
+        inicio = time.perf_counter()
+        esperado = calcular_por_contrato(ids, salarios)
+        por_contrato = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        columnas = calculo_nomina.calcular_recibos(salarios, TASAS)
+        por_columnas = time.perf_counter() - inicio
+
+        iguales = calculo_nomina.filas_recibos(ids, columnas) == esperado
+        correcto = correcto and iguales
+        print(
+            f"{total:>10}{por_contrato * 1000:>19.1f}{por_columnas * 1000:>19.1f}"
+            f"{por_contrato / por_columnas:>8.1f}x  {'idénticos' if iguales else 'DIFERENTES'}"
+        )
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
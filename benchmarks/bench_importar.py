@@ -0,0 +1,173 @@
+"""
+Mide la importación masiva (importar.py) de empresas, postulantes,
+experiencias y vacantes desde CSV generados con errores intercalados, y la
+compara con registrar un subconjunto de postulantes uno por uno con
+registrar_usuario_db. Verifica que se informen exactamente las líneas con
+errores y que la base quede con las filas válidas; termina con código 1 si
+no coincide.
+
+Uso: python -m benchmarks.bench_importar [--postulantes 50000]
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import db_manager
+import importar
+from datos_sinteticos import aplicar_esquema
+
+CADA_ERROR = 97  # Una fila de cada tantas viene con un error.
+
+
+def escribir(ruta, encabezados, filas, delimitador=","):
+    with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+        escritor = csv.writer(archivo, delimiter=delimitador)
+        escritor.writerow(encabezados)
+        escritor.writerows(filas)
+
+
+def generar_csvs(directorio, empresas, postulantes):
+    """Escribe los cuatro CSV y devuelve {tipo: (ruta, lineas_con_error)}."""
+    archivos = {}
+
+    filas, malas = [], set()
+    for i in range(empresas):
+        email = f"empresa{i}@import.com"
+        rif = f"J-{i:08d}"
+        if i % CADA_ERROR == 5:
+            email = "sin-arroba"
+            malas.add(i + 2)
+        elif i % CADA_ERROR == 7 and i > 7:
+            rif = f"J-{i - 1:08d}"  # RIF repetido en el archivo
+            malas.add(i + 2)
+        filas.append((email, "clave", f"Empresa Importada {i}", rif, "Servicios", "", "", ""))
+    archivos["empresas"] = (os.path.join(directorio, "empresas.csv"), malas)
+    escribir(archivos["empresas"][0], importar.ImportadorEmpresas.columnas, filas)
+
+    filas, malas = [], set()
+    for i in range(postulantes):
+        fecha = f"19{80 + i % 20}-0{1 + i % 9}-1{i % 9}"
+        universidad = ""
+        if i % CADA_ERROR == 3:
+            fecha = "31/12/1990"
+            malas.add(i + 2)
+        elif i % CADA_ERROR == 11:
+            universidad = "Universidad Inexistente"
+            malas.add(i + 2)
+        filas.append(
+            (
+                f"postulante{i}@import.com", "clave", "Ana María", f"Pérez {i}",
+                f"V-{i:09d}", fecha, "Caracas", "0414-0000000", universidad,
+            )
+        )
+    archivos["postulantes"] = (os.path.join(directorio, "postulantes.csv"), malas)
+    # Como los guarda Excel en español: separados por punto y coma.
+    escribir(archivos["postulantes"][0], importar.ImportadorPostulantes.columnas, filas, ";")
+
+    filas, malas = [], set()
+    for i in range(postulantes):
+        email = f"postulante{i}@import.com"
+        if (i % CADA_ERROR) in (3, 11):
+            malas.add(i + 2)  # El postulante no se importó.
+        elif i % CADA_ERROR == 13:
+            email = "nadie@import.com"
+            malas.add(i + 2)
+        filas.append((email, "Compañía Anterior", "Analista", "2015-01-01", "2018-06-30", "python sql"))
+    archivos["experiencias"] = (os.path.join(directorio, "experiencias.csv"), malas)
+    escribir(archivos["experiencias"][0], importar.ImportadorExperiencias.columnas, filas)
+
+    filas, malas = [], set()
+    for i in range(empresas * 10):
+        id_empresa = i % empresas
+        email = f"empresa{id_empresa}@import.com"
+        salario = f"{1000 + i % 500},50"
+        if id_empresa % CADA_ERROR in (5, 7) and (id_empresa % CADA_ERROR != 7 or id_empresa > 7):
+            malas.add(i + 2)  # La empresa no se importó.
+        elif i % CADA_ERROR == 17:
+            salario = "mil"
+            malas.add(i + 2)
+        elif i % CADA_ERROR == 41:
+            salario = "1.500"  # Punto de miles o decimal: ambiguo.
+            malas.add(i + 2)
+        filas.append((email, "Desarrollador", "Perfil importado", salario, "", "Activa"))
+    archivos["vacantes"] = (os.path.join(directorio, "vacantes.csv"), malas)
+    escribir(archivos["vacantes"][0], importar.ImportadorVacantes.columnas, filas)
+    return archivos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postulantes", type=int, default=50000)
+    parser.add_argument("--empresas", type=int, default=2000)
+    parser.add_argument("--uno-por-uno", type=int, default=2000)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    correcto = True
+    try:
+        ruta = os.path.join(directorio, "importar.db")
+        conn = db_manager.sqlite3.connect(ruta)
+        aplicar_esquema(conn)
+        conn.close()
+        db_manager.configurar_base_datos(ruta)
+        archivos = generar_csvs(directorio, args.empresas, args.postulantes)
+
+        print(f"{'Tipo':<14}{'Filas':>8}{'Importadas':>12}{'Errores':>9}{'Filas/s':>10}")
+        for tipo in ("empresas", "postulantes", "experiencias", "vacantes"):
+            ruta_csv, malas = archivos[tipo]
+            resultado = importar.importar_csv(tipo, ruta_csv)
+            print(
+                f"{tipo:<14}{resultado['Filas']:>8}{resultado['Importadas']:>12}"
+                f"{len(resultado['Errores']):>9}"
+                f"{resultado['Filas'] / resultado['Segundos']:>10.0f}"
+            )
+            informadas = {linea for linea, _ in resultado["Errores"]}
+            if informadas != malas:
+                print(f"  Líneas con error esperadas y obtenidas difieren en {len(informadas ^ malas)}.")
+                correcto = False
+            if resultado["Importadas"] != resultado["Filas"] - len(malas):
+                correcto = False
+
+        with db_manager.get_db_connection() as conn:
+            conteos = {
+                tabla: conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+                for tabla in ("Empresas", "Postulantes", "Experiencias_Laborales", "Vacantes")
+            }
+            indexados = conn.execute("SELECT COUNT(*) FROM postulantes_fts").fetchone()[0]
+        esperados = {
+            "Empresas": args.empresas - len(archivos["empresas"][1]),
+            "Postulantes": args.postulantes - len(archivos["postulantes"][1]),
+            "Experiencias_Laborales": args.postulantes - len(archivos["experiencias"][1]),
+            "Vacantes": args.empresas * 10 - len(archivos["vacantes"][1]),
+        }
+        if conteos != esperados or indexados != conteos["Postulantes"]:
+            print(f"Filas en la base: {conteos}, esperadas: {esperados}")
+            correcto = False
+
+        # Lo que costaba antes: un registrar_usuario_db (una transacción) por persona.
+        inicio = time.perf_counter()
+        for i in range(args.uno_por_uno):
+            db_manager.registrar_usuario_db(
+                "Postulante",
+                {
+                    "Email": f"manual{i}@import.com", "Contraseña": "clave",
+                    "Nombres": "Ana", "Apellidos": f"Manual {i}", "Cédula": f"M-{i}",
+                    "Teléfono": "", "ID_Universidad": None,
+                },
+            )
+        por_segundo = args.uno_por_uno / (time.perf_counter() - inicio)
+        print(f"\nregistrar_usuario_db uno por uno: {por_segundo:.0f} filas/s")
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
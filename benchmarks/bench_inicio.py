@@ -0,0 +1,151 @@
+"""
+Mide el arranque de la aplicación en procesos nuevos y lo compara con un
+presupuesto: cuánto tardan en importarse los módulos que necesita el login
+y, con pantalla, cuánto tarda app_gui.py en mostrar la ventana (lo informa
+la propia aplicación con HIRING_GROUP_MEDIR_INICIO=salir). Verifica además
+que los módulos que se cargan recién al usarse (exportar, importar,
+instrumentacion y lo que arrastran) no se importen al arrancar. Termina
+con código 1 si algo se pasa del presupuesto o se importa antes de tiempo.
+
+Sin pantalla o sin customtkinter solo mide los módulos que no dependen de
+customtkinter.
+
+Uso: python -m benchmarks.bench_inicio [--repeticiones 7]
+         [--presupuesto-importar-ms 80] [--presupuesto-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import tkinter as tk
+
+from datos_sinteticos import crear_base_sintetica
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Lo que app_gui importa al cargarse, salvo customtkinter.
+MODULOS_LOGIN = ("tkinter", "db_manager", "tabla_ui", "tareas_ui")
+# Lo que no debe estar cargado hasta que el usuario lo necesite.
+DIFERIDOS = (
+    "exportar",
+    "importar",
+    "instrumentacion",
+    "auditoria_indices",
+    "datos_sinteticos",
+    "xml.sax.saxutils",
+    "urllib.request",
+    "inspect",
+)
+
+MEDIR_IMPORTS = """
+import json, sys, time
+inicio = time.perf_counter()
+for modulo in {modulos!r}:
+    __import__(modulo)
+print(json.dumps({{
+    "ms": (time.perf_counter() - inicio) * 1000,
+    "cargados": [m for m in {diferidos!r} if m in sys.modules],
+}}))
+"""
+
+
+def en_proceso_nuevo(codigo, entorno=None):
+    resultado = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        env=entorno,
+        check=True,
+    )
+    return json.loads(resultado.stdout)
+
+
+def medir_imports(modulos, repeticiones):
+    codigo = MEDIR_IMPORTS.format(modulos=modulos, diferidos=DIFERIDOS)
+    medidas = [en_proceso_nuevo(codigo) for _ in range(repeticiones)]
+    return statistics.median(m["ms"] for m in medidas), medidas[0]["cargados"]
+
+
+def medir_ventana(ruta_db, repeticiones):
+    entorno = dict(os.environ, HIRING_GROUP_DB=ruta_db, HIRING_GROUP_MEDIR_INICIO="salir")
+    tiempos = []
+    for _ in range(repeticiones):
+        resultado = subprocess.run(
+            [sys.executable, "app_gui.py"],
+            cwd=RAIZ,
+            capture_output=True,
+            text=True,
+            env=entorno,
+            timeout=60,
+        )
+        encontrado = re.search(r"primera_pintura=([\d.]+)", resultado.stderr)
+        if not encontrado:
+            raise RuntimeError(f"app_gui.py no informó sus tiempos:\n{resultado.stderr}")
+        tiempos.append(float(encontrado.group(1)))
+    return statistics.median(tiempos)
+
+
+def hay_pantalla():
+    try:
+        tk.Tk().destroy()
+        return True
+    except tk.TclError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--presupuesto-importar-ms", type=float, default=80)
+    parser.add_argument("--presupuesto-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    correcto = True
+    ms, cargados = medir_imports(MODULOS_LOGIN, args.repeticiones)
+    diferidos_ms, _ = medir_imports(("exportar", "importar"), args.repeticiones)
+    print(f"Módulos del login sin customtkinter: {ms:.1f} ms (presupuesto {args.presupuesto_importar_ms:g} ms)")
+    print(f"Diferidos hasta usarse (exportar, importar): {diferidos_ms:.1f} ms")
+    if ms > args.presupuesto_importar_ms:
+        print("  Se pasa del presupuesto.")
+        correcto = False
+    if cargados:
+        print(f"  Se cargan al arrancar: {', '.join(cargados)}")
+        correcto = False
+
+    try:
+        en_proceso_nuevo("import customtkinter; print('null')")
+    except subprocess.CalledProcessError:
+        print("\ncustomtkinter no está instalado: no se mide la ventana.")
+    else:
+        if not hay_pantalla():
+            print("\nSin pantalla: no se mide la ventana.")
+        else:
+            gui_ms, cargados = medir_imports(("app_gui",), args.repeticiones)
+            print(f"\nImportar app_gui: {gui_ms:.1f} ms")
+            if cargados:
+                print(f"  app_gui carga al arrancar: {', '.join(cargados)}")
+                correcto = False
+            directorio = tempfile.mkdtemp(prefix="bench_inicio_")
+            try:
+                ruta = os.path.join(directorio, "inicio.db")
+                crear_base_sintetica(ruta)
+                pintura_ms = medir_ventana(ruta, args.repeticiones)
+            finally:
+                shutil.rmtree(directorio, ignore_errors=True)
+            print(f"Primera pintura: {pintura_ms:.1f} ms (presupuesto {args.presupuesto_ms:g} ms)")
+            if pintura_ms > args.presupuesto_ms:
+                print("  Se pasa del presupuesto.")
+                correcto = False
+
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Compara los reportes de nómina leyendo la base en vivo contra leerlos de la
+instantánea de db_manager (configurar_instantanea_reportes), con un hilo
+que genera nóminas sin parar y varios hilos que piden reportes
+(get_toda_nomina_reporte_db, get_nomina_reporte_db y el recorrido completo
+de iterar_recibos_db de un año). Informa la latencia de los reportes y de
+ejecutar_nomina_db, las nóminas generadas por segundo y la antigüedad
+máxima que tuvo la instantánea.
+
+Con escrituras continuas la copia puede pasarse de la antigüedad máxima:
+cada commit toma el bloqueo exclusivo de la base y la copia espera su
+turno para leerla, como cualquier lector. Por eso se verifica que, quietas
+las escrituras, la antigüedad vuelva a quedar dentro del máximo; que los
+reportes de la copia refrescada coincidan con los de la base en vivo; que
+la copia no acepte escrituras y que al desactivarla se borren sus
+archivos. Termina con código 1 si algo falla.
+
+Uso: python -m benchmarks.bench_instantanea [--postulantes 5000]
+         [--segundos 5] [--lectores 4] [--antiguedad 1]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import db_manager
+from datos_sinteticos import crear_base_sintetica, volumenes_por_escala
+
+
+def percentil(valores, p):
+    if not valores:
+        return float("nan")
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def periodos_de(ruta):
+    conn = sqlite3.connect(ruta)
+    try:
+        periodos = conn.execute("SELECT ID_Empresa, Mes, Anio FROM Nominas").fetchall()
+        empresas = [f[0] for f in conn.execute("SELECT ID_Empresa FROM Empresas")]
+    finally:
+        conn.close()
+    return periodos, empresas
+
+
+def correr(ruta, antiguedad, segundos, lectores):
+    """Escrituras y reportes concurrentes; devuelve las medidas."""
+    db_manager.configurar_base_datos(ruta, max_conexiones=lectores + 2)
+    db_manager.configurar_instantanea_reportes(antiguedad)
+    # La primera consulta crea la copia (y aplica las migraciones).
+    db_manager.get_toda_nomina_reporte_db()
+    periodos, empresas = periodos_de(ruta)
+    anios = sorted({anio for _, _, anio in periodos})
+    detener = threading.Event()
+    escrituras, reportes, antiguedades = [], {}, []
+    lock = threading.Lock()
+
+    def escritor():
+        pendientes = ((e, m, a) for a in range(2100, 3000) for m in range(1, 13) for e in empresas)
+        for id_empresa, mes, anio in pendientes:
+            if detener.is_set():
+                return
+            inicio = time.perf_counter()
+            exito, _, _ = db_manager.ejecutar_nomina_db(id_empresa, mes, anio)
+            if exito:
+                escrituras.append(time.perf_counter() - inicio)
+
+    def lector(numero):
+        rng = random.Random(numero)
+        consultas = (
+            ("get_toda_nomina_reporte_db", lambda: db_manager.get_toda_nomina_reporte_db()),
+            ("get_nomina_reporte_db", lambda: db_manager.get_nomina_reporte_db(*rng.choice(periodos))),
+            (
+                "iterar_recibos_db (un año)",
+                lambda: sum(1 for _ in db_manager.iterar_recibos_db(anio=rng.choice(anios))),
+            ),
+        )
+        while not detener.is_set():
+            nombre, consulta = rng.choice(consultas)
+            inicio = time.perf_counter()
+            consulta()
+            transcurrido = time.perf_counter() - inicio
+            with lock:
+                reportes.setdefault(nombre, []).append(transcurrido)
+
+    def monitor():
+        while not detener.wait(0.05):
+            estado = db_manager.get_estadisticas_instantanea()
+            if estado and estado["antiguedad_s"] is not None:
+                antiguedades.append(estado["antiguedad_s"])
+
+    hilos = [threading.Thread(target=escritor), threading.Thread(target=monitor)]
+    hilos += [threading.Thread(target=lector, args=(i,)) for i in range(lectores)]
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(segundos)
+    detener.set()
+    for hilo in hilos:
+        hilo.join()
+    return escrituras, reportes, antiguedades, db_manager.get_estadisticas_instantanea()
+
+
+def informar(titulo, segundos, escrituras, reportes):
+    print(f"\n{titulo}")
+    print(f"{'Operación':<32}{'Cantidad':>9}{'Por s':>8}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    filas = [("ejecutar_nomina_db", escrituras)] + sorted(reportes.items())
+    for nombre, tiempos in filas:
+        ms = [t * 1000 for t in tiempos]
+        print(
+            f"{nombre:<32}{len(ms):>9}{len(ms) / segundos:>8.1f}"
+            f"{statistics.median(ms) if ms else float('nan'):>10.1f}{percentil(ms, 0.95):>10.1f}"
+        )
+
+
+def verificar(antiguedad, estado):
+    correcto = True
+
+    def comprobar(condicion, descripcion):
+        nonlocal correcto
+        print(f"  {'ok   ' if condicion else 'FALLÓ'} {descripcion}")
+        correcto = correcto and condicion
+
+    print("\nVerificación:")
+    comprobar(estado["copias"] > 1, f"la copia se refrescó durante la carga ({estado['copias']} copias)")
+    instantanea = db_manager._instantanea
+    # Sin escrituras, el hilo de la instantánea la mantiene dentro del máximo.
+    time.sleep(antiguedad)
+    actual = db_manager.get_estadisticas_instantanea()["antiguedad_s"]
+    comprobar(actual <= antiguedad, f"sin escrituras la antigüedad vuelve al máximo ({actual:.2f} s)")
+
+    instantanea.refrescar()
+    with db_manager.get_conexion_reportes() as conn:
+        try:
+            conn.execute("DELETE FROM Nominas")
+            escribio = True
+        except sqlite3.OperationalError:
+            escribio = False
+    comprobar(not escribio, "la instantánea no acepta escrituras")
+    periodo = db_manager.get_toda_nomina_reporte_db()[0]
+    consultas = (
+        ("get_toda_nomina_reporte_db", lambda: db_manager.get_toda_nomina_reporte_db()),
+        ("iterar_recibos_db", lambda: list(db_manager.iterar_recibos_db(anio=periodo["Anio"]))),
+    )
+    copia = {nombre: [tuple(f) for f in consulta()] for nombre, consulta in consultas}
+    directorio = instantanea._directorio
+    db_manager.configurar_instantanea_reportes(None)
+    for nombre, consulta in consultas:
+        comprobar(
+            copia[nombre] == [tuple(f) for f in consulta()],
+            f"{nombre} coincide con la base en vivo después de refrescar",
+        )
+    comprobar(not os.path.exists(directorio), "al desactivarla se borran los archivos de la copia")
+    return correcto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postulantes", type=int, default=5000)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--lectores", type=int, default=4)
+    parser.add_argument("--antiguedad", type=float, default=1, help="Antigüedad máxima de la copia (s).")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix="bench_instantanea_")
+    try:
+        base = os.path.join(directorio, "base.db")
+        crear_base_sintetica(base, meses_nomina=24, **volumenes_por_escala(args.postulantes))
+        correcto = True
+        for titulo, antiguedad in (
+            ("Reportes sobre la base en vivo", None),
+            (f"Reportes sobre la instantánea (antigüedad máxima {args.antiguedad:g} s)", args.antiguedad),
+        ):
+            ruta = os.path.join(directorio, f"modo_{'vivo' if antiguedad is None else 'copia'}.db")
+            shutil.copyfile(base, ruta)
+            escrituras, reportes, antiguedades, estado = correr(
+                ruta, antiguedad, args.segundos, args.lectores
+            )
+            informar(titulo, args.segundos, escrituras, reportes)
+            if estado is not None:
+                print(
+                    f"Instantánea: {estado['copias']} copias, {estado['reinicios']} reinicios, "
+                    f"{estado['copias_en_un_paso']} en un paso, copia más lenta "
+                    f"{estado['copia_mas_lenta_s'] * 1000:.0f} ms, antigüedad máxima observada "
+                    f"{max(antiguedades, default=0):.2f} s"
+                )
+                correcto = verificar(antiguedad, estado) and correcto
+    finally:
+        db_manager.configurar_instantanea_reportes(None)
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Prueba de carga del login: compara la versión anterior de login_usuario
+(consulta del usuario más un JOIN de contratos y postulaciones para los
+postulantes) con la actual, que resuelve el rol en una sola búsqueda por
+Email gracias a usuarios.Contratos_Activos. Mide logins por segundo con
+uno y varios hilos y verifica que ambas versiones devuelvan el mismo
+usuario y rol para cada cuenta; termina con código 1 si difieren.
+
+Uso: python -m benchmarks.bench_login [--postulantes 100000] [--hilos 4]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import db_manager
+from datos_sinteticos import crear_base_sintetica
+
+
+def login_anterior(email, password):
+    # Réplica del login_usuario original, con la segunda consulta.
+    with db_manager.get_db_connection() as conn:
+        cursor = conn.cursor()
+        query = "SELECT ID_Usuario, Email, Tipo_Usuario, Estatus FROM Usuarios WHERE Email = ? AND Password = ?"
+        cursor.execute(query, (email, password))
+        usuario_data = cursor.fetchone()
+        if not usuario_data:
+            return None, None
+        usuario = dict(usuario_data)
+        if usuario["Estatus"] != "Activo":
+            return None, None
+        if usuario["Tipo_Usuario"] == "Postulante":
+            query_contrato = "SELECT c.ID_Contrato FROM Contratos c JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion WHERE p.ID_Postulante = ? AND c.Estatus = 'Activo'"
+            cursor.execute(query_contrato, (usuario["ID_Usuario"],))
+            if cursor.fetchone():
+                usuario["Tipo_Usuario"] = "Contratado"
+        return usuario, usuario["Tipo_Usuario"]
+
+
+def logins_por_segundo(funcion, credenciales, hilos):
+    inicio = time.perf_counter()
+    if hilos == 1:
+        for email, password in credenciales:
+            funcion(email, password)
+    else:
+        with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            list(ejecutor.map(lambda c: funcion(*c), credenciales))
+    return len(credenciales) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postulantes", type=int, default=100000)
+    parser.add_argument("--logins", type=int, default=50000)
+    parser.add_argument("--hilos", type=int, default=4)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    diferencias = 0
+    try:
+        ruta = os.path.join(directorio, "login.db")
+        crear_base_sintetica(
+            ruta,
+            empresas=max(5, args.postulantes // 1000),
+            postulantes=args.postulantes,
+            vacantes=max(10, args.postulantes // 20),
+            postulaciones=args.postulantes * 2,
+            contratos=args.postulantes // 4,
+            meses_nomina=0,
+        )
+        db_manager.configurar_base_datos(ruta, max_conexiones=max(5, args.hilos))
+        with db_manager.get_db_connection() as conn:
+            cuentas = [
+                (fila["Email"], fila["Password"])
+                for fila in conn.execute("SELECT Email, Password FROM Usuarios")
+            ]
+
+        for email, password in cuentas:
+            if login_anterior(email, password) != db_manager.login_usuario(email, password):
+                diferencias += 1
+        print(f"Cuentas verificadas: {len(cuentas)}, diferencias: {diferencias}\n")
+
+        rng = random.Random(7)
+        credenciales = [rng.choice(cuentas) for _ in range(args.logins)]
+        print(f"{'Hilos':<8}{'Anterior (login/s)':>20}{'Actual (login/s)':>18}{'Mejora':>9}")
+        for hilos in sorted({1, args.hilos}):
+            antes = logins_por_segundo(login_anterior, credenciales, hilos)
+            despues = logins_por_segundo(db_manager.login_usuario, credenciales, hilos)
+            print(f"{hilos:<8}{antes:>20.0f}{despues:>18.0f}{despues / antes:>8.2f}x")
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    sys.exit(1 if diferencias else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Mide la navegación entre las pantallas del menú de HiringGroup con y sin
+la caché de pantallas de MainFrame: sin caché cada visita arma los widgets
+y vuelve a consultar la base (lo que hacía clear_content_frame); con caché
+la pantalla ya armada solo se vuelve a mostrar mientras los datos no
+cambien.
+
+Antes verifica, sin interfaz, que db_manager.get_version_datos cambie
+exactamente cuando una función de db_manager confirma cambios en la base:
+para cada escenario de la suite compara la versión con el PRAGMA
+data_version de una conexión aparte y muestra qué tablas cambiaron de
+versión. Una lectura que cambiara la versión haría que las pantallas se
+rearmaran siempre. También comprueba que se vean los cambios hechos por
+otra conexión y por otro proceso, solo en la tabla que tocaron, y que
+get_catalogo no devuelva lo que tenía guardado. Termina con código 1 si
+algo no coincide.
+
+Sin pantalla (no se puede crear la ventana de Tk) solo hace la verificación.
+
+Uso: python -m benchmarks.bench_navegacion [--postulantes 5000] [--vueltas 5]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+import types
+
+import db_manager
+from benchmarks.suite import escenarios
+from datos_sinteticos import crear_base_sintetica, volumenes_por_escala
+
+# Pantallas del menú de HiringGroup que se recorren (sin formularios aparte).
+PANTALLAS = (
+    "show_gestionar_empresas",
+    "show_menu_catalogos",
+    "show_contratar_form",
+    "show_buscar_candidatos",
+    "show_nomina_form",
+    "show_reportes_nomina",
+    "show_importar",
+)
+
+
+# Cambio que hace otro proceso, como lo haría cli.py o importar.py.
+SCRIPT_OTRO_PROCESO = """
+import sqlite3, sys
+conn = sqlite3.connect(sys.argv[1])
+conn.execute("UPDATE Empresas SET Nombre_Empresa = Nombre_Empresa WHERE ID_Empresa = (SELECT MIN(ID_Empresa) FROM Empresas)")
+conn.commit()
+conn.close()
+"""
+
+
+def tablas_cambiadas(antes, despues):
+    return [
+        tabla
+        for tabla, a, d in zip(db_manager.TABLAS_VERSIONADAS, antes[1:], despues[1:])
+        if a != d
+    ]
+
+
+def verificar_versiones(ruta):
+    """
+    Compara get_version_datos con data_version en cada escenario de la suite
+    y con los cambios hechos fuera de db_manager.
+    """
+    correcto = True
+    testigo = sqlite3.connect(ruta)
+    with db_manager.get_db_connection() as conn:
+        casos = escenarios(conn, 1)
+    print(f"{'Función':<45}{'Confirmó cambios':>18}  Tablas con versión nueva")
+    for nombre, variante, preparar, maximo in casos:
+        if maximo == 0:
+            continue
+        args = preparar(0)
+        datos_antes = testigo.execute("PRAGMA data_version").fetchone()[0]
+        version_antes = db_manager.get_version_datos(db_manager.TABLAS_VERSIONADAS)
+        resultado = getattr(db_manager, nombre)(*args)
+        if isinstance(resultado, types.GeneratorType):
+            for _ in resultado:
+                pass
+        cambio_datos = testigo.execute("PRAGMA data_version").fetchone()[0] != datos_antes
+        tablas = tablas_cambiadas(
+            version_antes, db_manager.get_version_datos(db_manager.TABLAS_VERSIONADAS)
+        )
+        clave = f"{nombre} [{variante}]" if variante else nombre
+        marca = "" if cambio_datos == bool(tablas) else "  <- no coincide"
+        print(f"{clave:<45}{'sí' if cambio_datos else 'no':>18}  {', '.join(tablas) or '-'}{marca}")
+        if marca:
+            correcto = False
+
+    def cambiar_banco():
+        testigo.execute("UPDATE Bancos SET Nombre_Banco = 'Banco externo' WHERE ID_Banco = 1")
+        testigo.commit()
+
+    def otro_proceso():
+        subprocess.run([sys.executable, "-c", SCRIPT_OTRO_PROCESO, ruta], check=True)
+
+    print(f"\n{'Cambio fuera de db_manager':<45}{'Esperadas':>18}  Tablas con versión nueva")
+    db_manager.get_catalogo("Bancos", "ID_Banco", "Nombre_Banco")
+    for descripcion, cambiar, esperadas in (
+        ("otra conexión del proceso", cambiar_banco, ["bancos"]),
+        ("otro proceso", otro_proceso, ["empresas"]),
+    ):
+        version_antes = db_manager.get_version_datos(db_manager.TABLAS_VERSIONADAS)
+        cambiar()
+        tablas = tablas_cambiadas(
+            version_antes, db_manager.get_version_datos(db_manager.TABLAS_VERSIONADAS)
+        )
+        marca = "" if tablas == esperadas else "  <- no coincide"
+        print(f"{descripcion:<45}{', '.join(esperadas):>18}  {', '.join(tablas) or '-'}{marca}")
+        if marca:
+            correcto = False
+    bancos = dict(db_manager.get_catalogo("Bancos", "ID_Banco", "Nombre_Banco"))
+    if bancos.get(1) != "Banco externo":
+        print("get_catalogo devuelve el catálogo de antes del cambio  <- no coincide")
+        correcto = False
+    testigo.close()
+    return correcto
+
+
+def esperar_tareas(raiz, tareas):
+    while tareas.ocupado:
+        raiz.update()
+        time.sleep(0.001)
+    raiz.update()
+
+
+def medir_en_tk(app_gui, vueltas):
+    app = app_gui.App()
+    try:
+        usuario, rol = db_manager.login_usuario("admin@hiring.com", "admin")
+        app.usuario_actual, app.rol_actual = usuario, rol
+        app.show_frame(app_gui.MainFrame)
+        principal = app.container.winfo_children()[0]
+        esperar_tareas(app, app.tareas)
+
+        def recorrer(con_cache):
+            tiempos = {nombre: [] for nombre in PANTALLAS}
+            for _ in range(vueltas):
+                for nombre in PANTALLAS:
+                    if not con_cache:
+                        principal.pantallas.clear()
+                    inicio = time.perf_counter()
+                    getattr(principal, nombre)()
+                    esperar_tareas(app, app.tareas)
+                    tiempos[nombre].append(time.perf_counter() - inicio)
+            return tiempos
+
+        sin_cache = recorrer(False)
+        # La primera vuelta con caché arma las pantallas; se mide el resto.
+        recorrer(True)
+        con_cache = recorrer(True)
+    finally:
+        app.cerrar()
+
+    print(f"\n{'Pantalla':<28}{'Sin caché (ms)':>16}{'Con caché (ms)':>16}{'Mejora':>8}")
+    for nombre in PANTALLAS:
+        antes = sum(sin_cache[nombre]) / vueltas * 1000
+        despues = sum(con_cache[nombre]) / vueltas * 1000
+        print(f"{nombre:<28}{antes:>16.1f}{despues:>16.1f}{antes / despues:>7.1f}x")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postulantes", type=int, default=5000)
+    parser.add_argument("--vueltas", type=int, default=5)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix="bench_navegacion_")
+    ruta = os.path.join(directorio, "navegacion.db")
+    try:
+        crear_base_sintetica(ruta, meses_nomina=12, **volumenes_por_escala(args.postulantes))
+        db_manager.configurar_base_datos(ruta)
+        correcto = verificar_versiones(ruta)
+        try:
+            raiz = tk.Tk()
+        except tk.TclError as e:
+            print(f"\nSin pantalla ({e}): no se mide la navegación.")
+        else:
+            raiz.destroy()
+            import app_gui
+
+            correcto = medir_en_tk(app_gui, args.vueltas) and correcto
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compara la generación de nómina fila por fila (implementación original de
+ejecutar_nomina_db) con la versión actual sobre una base sintética con una
+sola empresa y muchos contratos activos. Verifica además que ambas
+produzcan exactamente los mismos recibos; termina con código 1 si difieren.
+
+Uso: python -m benchmarks.bench_nomina [--contratos 1000 10000 50000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import db_manager
+from datos_sinteticos import crear_base_sintetica
+
+COLUMNAS_RECIBO = (
+    "ID_Contrato, Salario_Base, Monto_Deduccion_INCES, Monto_Deduccion_IVSS, "
+    "Comision_Hiring_Group, Salario_Neto_Pagado, Fecha_Pago"
+)
+
+
+def ejecutar_nomina_por_filas(id_empresa, mes, anio):
+    # Réplica del bucle original: un INSERT por contrato calculado en Python.
+    with db_manager.get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO Nominas (ID_Empresa, Mes, Anio) VALUES (?, ?, ?)",
+            (id_empresa, mes, anio),
+        )
+        id_nomina = cursor.lastrowid
+        cursor.execute(
+            "SELECT c.ID_Contrato, c.Salario_Acordado FROM Contratos c JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion JOIN Vacantes v ON post.ID_Vacante = v.ID_Vacante WHERE v.ID_Empresa = ? AND c.Estatus = 'Activo'",
+            (id_empresa,),
+        )
+        for contrato in cursor.fetchall():
+            salario = contrato["Salario_Acordado"]
+            ded_inces, ded_ivss, comision = (
+                float(salario) * 0.005,
+                float(salario) * 0.01,
+                float(salario) * 0.02,
+            )
+            neto = float(salario) - ded_inces - ded_ivss
+            cursor.execute(
+                "INSERT INTO Recibos (ID_Nomina, ID_Contrato, Salario_Base, Monto_Deduccion_INCES, Monto_Deduccion_IVSS, Comision_Hiring_Group, Salario_Neto_Pagado, Fecha_Pago) VALUES (?, ?, ?, ?, ?, ?, ?, date('now'))",
+                (id_nomina, contrato["ID_Contrato"], salario, ded_inces, ded_ivss, comision, neto),
+            )
+        conn.commit()
+        return id_nomina
+
+
+def recibos_de(id_nomina):
+    with db_manager.get_db_connection() as conn:
+        return [
+            tuple(fila)
+            for fila in conn.execute(
+                f"SELECT {COLUMNAS_RECIBO} FROM Recibos WHERE ID_Nomina = ? ORDER BY ID_Contrato",
+                (id_nomina,),
+            )
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contratos", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    diferencias = False
+    try:
+        print(f"{'Contratos':>10}{'Por filas (ms)':>16}{'Actual (ms)':>20}{'Mejora':>9}  Resultado")
+        for total in args.contratos:
+            ruta = os.path.join(directorio, f"nomina_{total}.db")
+            crear_base_sintetica(
+                ruta,
+                empresas=1,
+                postulantes=total,
+                vacantes=max(1, total // 10),
+                postulaciones=total,
+                contratos=total,
+                meses_nomina=0,
+                experiencias_por_postulante=0,
+            )
+            db_manager.configurar_base_datos(ruta)
+            with db_manager.get_db_connection() as conn:
+                id_empresa = conn.execute("SELECT ID_Empresa FROM Empresas").fetchone()[0]
+
+            inicio = time.perf_counter()
+            id_por_filas = ejecutar_nomina_por_filas(id_empresa, 1, 2024)
+            por_filas = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            exito, mensaje, id_actual = db_manager.ejecutar_nomina_db(id_empresa, 2, 2024)
+            actual = time.perf_counter() - inicio
+            if not exito:
+                print(mensaje)
+                sys.exit(1)
+
+            iguales = recibos_de(id_por_filas) == recibos_de(id_actual)
+            diferencias = diferencias or not iguales
+            print(
+                f"{total:>10}{por_filas * 1000:>16.1f}{actual * 1000:>20.1f}"
+                f"{por_filas / actual:>8.1f}x  {'idénticos' if iguales else 'DIFERENTES'}"
+            )
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    sys.exit(1 if diferencias else 0)
+
+
+if __name__ == "__main__":
+    main()
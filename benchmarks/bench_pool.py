@@ -0,0 +1,100 @@
+"""
+Compara la latencia por llamada de las funciones de lectura de db_manager
+abriendo una conexión nueva en cada llamada (comportamiento anterior) contra
+el pool de conexiones.
+
+Uso: python -m benchmarks.bench_pool [--repeticiones N] [--db ruta]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+import db_manager
+
+
+@contextmanager
+def conexion_sin_pool():
+    # Réplica del get_db_connection original: conectar, configurar y cerrar.
+    conn = sqlite3.connect(db_manager.DB_PATH, timeout=10)
+    try:
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+        yield conn
+    finally:
+        conn.close()
+
+
+def llamadas_de_lectura():
+    with db_manager.get_db_connection() as conn:
+        id_empresa = conn.execute("SELECT MIN(ID_Empresa) FROM Empresas").fetchone()[0]
+        id_postulante = conn.execute(
+            "SELECT MIN(ID_Postulante) FROM Postulantes"
+        ).fetchone()[0]
+        nomina = conn.execute(
+            "SELECT ID_Nomina, ID_Empresa, Mes, Anio FROM Nominas LIMIT 1"
+        ).fetchone()
+    nomina = nomina or {"ID_Nomina": 0, "ID_Empresa": 0, "Mes": 1, "Anio": 2000}
+    return [
+        ("hay_usuarios_registrados", ()),
+        ("get_catalogo", ("Bancos", "ID_Banco", "Nombre_Banco")),
+        ("get_active_vacantes", ()),
+        ("get_postulaciones_para_contratar", ()),
+        ("get_vacantes_por_empresa", (id_empresa,)),
+        ("get_postulaciones_por_postulante", (id_postulante,)),
+        ("get_recibos_por_contratado", (id_postulante,)),
+        ("get_datos_constancia", (id_postulante,)),
+        (
+            "get_nomina_reporte_db",
+            (nomina["ID_Empresa"], nomina["Mes"], nomina["Anio"]),
+        ),
+        ("get_toda_nomina_reporte_db", ()),
+        ("get_nomina_generada_detalle_db", (nomina["ID_Nomina"],)),
+        ("get_experiencias_db", (id_postulante,)),
+        ("get_single_postulante", (id_postulante,)),
+        ("get_single_empresa", (id_empresa,)),
+    ]
+
+
+def medir(nombre, args, repeticiones):
+    funcion = getattr(db_manager, nombre)
+    funcion(*args)  # Calentamiento
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion(*args)
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    parser.add_argument("--db", default="hiring_group.db")
+    args = parser.parse_args()
+
+    # Se trabaja sobre una copia para no tocar la base de datos real.
+    directorio = tempfile.mkdtemp()
+    try:
+        copia = os.path.join(directorio, "bench.db")
+        shutil.copyfile(args.db, copia)
+        db_manager.configurar_base_datos(copia)
+        llamadas = llamadas_de_lectura()
+        con_pool = db_manager.get_db_connection
+
+        print(f"{'Función':<34}{'Sin pool (µs)':>15}{'Con pool (µs)':>15}{'Mejora':>9}")
+        for nombre, argumentos in llamadas:
+            db_manager.get_db_connection = conexion_sin_pool
+            antes = medir(nombre, argumentos, args.repeticiones)
+            db_manager.get_db_connection = con_pool
+            despues = medir(nombre, argumentos, args.repeticiones)
+            print(f"{nombre:<34}{antes:>15.1f}{despues:>15.1f}{antes / despues:>8.1f}x")
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
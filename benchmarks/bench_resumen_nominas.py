@@ -0,0 +1,114 @@
+"""
+Compara el reporte global de nómina calculado sumando todos los recibos
+(versión anterior de get_toda_nomina_reporte_db) con la lectura de
+resumen_nominas sobre una base sintética con varios años de nóminas.
+Después genera y borra nóminas para ejercitar los triggers y verifica que
+el reporte coincida con el cálculo completo y que
+verificar_resumen_nominas_db no encuentre diferencias; termina con código 1
+si algo no coincide.
+
+Uso: python -m benchmarks.bench_resumen_nominas [--meses 36]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import db_manager
+from datos_sinteticos import crear_base_sintetica
+
+
+def reporte_anterior():
+    with db_manager.get_db_connection() as conn:
+        query = """SELECT e.Nombre_Empresa, nom.Mes, nom.Anio, SUM(rec.Salario_Base) as Total_Nomina
+                   FROM Recibos rec JOIN Nominas nom ON rec.ID_Nomina = nom.ID_Nomina
+                   JOIN Empresas e ON nom.ID_Empresa = e.ID_Empresa
+                   GROUP BY e.Nombre_Empresa, nom.Mes, nom.Anio ORDER BY e.Nombre_Empresa, nom.Anio DESC, nom.Mes DESC"""
+        return conn.execute(query).fetchall()
+
+
+def claves(reporte):
+    return [
+        (f["Nombre_Empresa"], f["Mes"], f["Anio"], round(f["Total_Nomina"], 2))
+        for f in reporte
+    ]
+
+
+def mediana_ms(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--empresas", type=int, default=100)
+    parser.add_argument("--contratos", type=int, default=20000)
+    parser.add_argument("--meses", type=int, default=36)
+    parser.add_argument("--repeticiones", type=int, default=10)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    correcto = True
+    try:
+        ruta = os.path.join(directorio, "resumen.db")
+        crear_base_sintetica(
+            ruta,
+            empresas=args.empresas,
+            postulantes=args.contratos * 2,
+            vacantes=args.contratos // 5,
+            postulaciones=args.contratos * 3,
+            contratos=args.contratos,
+            meses_nomina=args.meses,
+        )
+        db_manager.configurar_base_datos(ruta)
+        inicio = time.perf_counter()
+        with db_manager.get_db_connection() as conn:
+            recibos = conn.execute("SELECT COUNT(*) FROM Recibos").fetchone()[0]
+            nominas = conn.execute("SELECT COUNT(*) FROM Resumen_Nominas").fetchone()[0]
+        print(
+            f"Migración: {nominas} nóminas resumidas a partir de {recibos} recibos "
+            f"en {time.perf_counter() - inicio:.1f} s"
+        )
+
+        antes = mediana_ms(reporte_anterior, args.repeticiones)
+        despues = mediana_ms(db_manager.get_toda_nomina_reporte_db, args.repeticiones)
+        print(f"Reporte global: {antes:.1f} ms sumando recibos, {despues:.1f} ms con el resumen")
+
+        # Nuevas nóminas y borrado de una existente pasan por los triggers.
+        resultados, segundos = db_manager.ejecutar_nomina_lote_db(12, 2030)
+        generados = sum(r["Recibos"] for r in resultados)
+        print(f"Nómina de un mes nuevo: {generados} recibos en {segundos:.2f} s")
+        with db_manager.get_db_connection() as conn:
+            conn.execute(
+                "DELETE FROM Recibos WHERE ID_Nomina = (SELECT MIN(ID_Nomina) FROM Nominas)"
+            )
+            conn.execute("DELETE FROM Nominas WHERE ID_Nomina = (SELECT MAX(ID_Nomina) FROM Nominas)")
+            conn.execute(
+                "UPDATE Recibos SET Salario_Base = Salario_Base + 1 WHERE ID_Recibo % 97 = 0"
+            )
+            conn.commit()
+
+        if claves(reporte_anterior()) != claves(db_manager.get_toda_nomina_reporte_db()):
+            print("El reporte con el resumen no coincide con la suma de recibos.")
+            correcto = False
+        diferencias = db_manager.verificar_resumen_nominas_db(reconstruir=False)
+        if diferencias:
+            print(f"verificar_resumen_nominas_db encontró {len(diferencias)} diferencia(s).")
+            correcto = False
+    finally:
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
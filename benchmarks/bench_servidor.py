@@ -0,0 +1,322 @@
+"""
+Prueba de carga de servidor.py: levanta el servicio en un puerto libre
+sobre una base sintética y lo recorre con varios clientes concurrentes
+(conexiones keep-alive de http.client) con una mezcla de lecturas y
+escrituras: búsqueda de vacantes, catálogos, postulaciones de un
+postulante, resumen de nóminas, login y nuevas postulaciones. Corre dos
+veces, con clientes que no guardan el ETag y con clientes que lo reenvían
+en If-None-Match, e informa solicitudes por segundo, latencias p50/p95 por
+ruta y cuántas respuestas fueron 304.
+
+Luego verifica que las respuestas coincidan con db_manager, que un ETag
+deje de valer después de una escritura, que cada postulación aceptada
+exista en la base y los códigos de error (400, 404, 405). Con la
+instantánea de reportes activada verifica además que /reportes/resumen
+muestre una nómina nueva en cuanto se renueva la copia, aunque se haya
+pedido antes de renovarla, y que el ETag no cambie mientras la copia sea
+la misma. Termina con código 1 si algo falla o si hubo errores 5xx.
+
+Uso: python -m benchmarks.bench_servidor [--postulantes 5000] [--clientes 8]
+         [--solicitudes 400] [--hilos 8] [--escrituras 0.1]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import db_manager
+import servidor
+from datos_sinteticos import crear_base_sintetica, volumenes_por_escala
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+class Cliente:
+    """Conexión keep-alive con los ETag recibidos por URL (si 'con_etag')."""
+
+    def __init__(self, puerto, con_etag):
+        self.conn = http.client.HTTPConnection("127.0.0.1", puerto, timeout=30)
+        self.con_etag = con_etag
+        self.etags = {}
+
+    def pedir(self, metodo, url, cuerpo=None, crudo=None):
+        cabeceras = {}
+        if metodo == "GET" and self.con_etag and url in self.etags:
+            cabeceras["If-None-Match"] = self.etags[url]
+        datos = crudo if crudo is not None else (json.dumps(cuerpo).encode() if cuerpo else None)
+        if datos is not None:
+            cabeceras["Content-Type"] = "application/json"
+        self.conn.request(metodo, url, body=datos, headers=cabeceras)
+        respuesta = self.conn.getresponse()
+        contenido = respuesta.read()
+        etag = respuesta.getheader("ETag")
+        if etag:
+            self.etags[url] = etag
+        return respuesta.status, (json.loads(contenido) if contenido else None), etag
+
+    def cerrar(self):
+        self.conn.close()
+
+
+def armar_mezcla(ids, escrituras):
+    """Lista de (peso, ruta, generador de (método, url, cuerpo))."""
+    areas, postulantes, vacantes = ids["areas"], ids["postulantes"], ids["vacantes"]
+    lecturas = [
+        (40, "GET /vacantes", lambda r: ("GET", f"/vacantes?tamano=50&area={r.choice(areas)}", None)),
+        (10, "GET /vacantes", lambda r: ("GET", "/vacantes?tamano=50&orden=DESC", None)),
+        (15, "GET /catalogos", lambda r: ("GET", f"/catalogos/{r.choice(('areas', 'bancos', 'empresas'))}", None)),
+        (
+            15,
+            "GET /postulantes/id/postulaciones",
+            lambda r: ("GET", f"/postulantes/{r.choice(postulantes[:50])}/postulaciones", None),
+        ),
+        (5, "GET /reportes/resumen", lambda r: ("GET", "/reportes/resumen", None)),
+        (
+            15,
+            "POST /login",
+            lambda r: ("POST", "/login", {"email": f"postulante{r.choice(postulantes)}@correo.com", "password": "clave"}),
+        ),
+    ]
+    total_lecturas = sum(peso for peso, _, _ in lecturas)
+    peso_escrituras = round(total_lecturas * escrituras / (1 - escrituras)) if escrituras else 0
+    escritura = (
+        peso_escrituras,
+        "POST /postulaciones",
+        lambda r: (
+            "POST",
+            "/postulaciones",
+            {"id_postulante": r.choice(postulantes), "id_vacante": r.choice(vacantes)},
+        ),
+    )
+    return lecturas + ([escritura] if peso_escrituras else [])
+
+
+def correr_carga(puerto, mezcla, clientes, solicitudes, con_etag, semilla):
+    pesos = [peso for peso, _, _ in mezcla]
+    aceptadas = []
+    lock = threading.Lock()
+
+    def cliente(numero):
+        rng = random.Random(semilla * 1000 + numero)
+        c = Cliente(puerto, con_etag)
+        medidas = []
+        try:
+            for _ in range(solicitudes):
+                _, nombre, generar = rng.choices(mezcla, pesos)[0]
+                metodo, url, cuerpo = generar(rng)
+                inicio = time.perf_counter()
+                estado, datos, _ = c.pedir(metodo, url, cuerpo)
+                medidas.append((nombre, estado, time.perf_counter() - inicio))
+                if nombre == "POST /postulaciones" and estado == 201:
+                    with lock:
+                        aceptadas.append((cuerpo["id_postulante"], cuerpo["id_vacante"]))
+        finally:
+            c.cerrar()
+        return medidas
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as ejecutor:
+        medidas = [m for lote in ejecutor.map(cliente, range(clientes)) for m in lote]
+    return medidas, time.perf_counter() - inicio, aceptadas
+
+
+def informar(titulo, medidas, segundos):
+    print(f"\n{titulo}: {len(medidas)} solicitudes en {segundos:.2f} s ({len(medidas) / segundos:.0f} sol/s)")
+    print(f"{'Ruta':<36}{'Cantidad':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'304':>7}  Estados")
+    for nombre in sorted({m[0] for m in medidas}):
+        propias = [m for m in medidas if m[0] == nombre]
+        tiempos = [m[2] * 1000 for m in propias]
+        estados = {}
+        for _, estado, _ in propias:
+            estados[estado] = estados.get(estado, 0) + 1
+        no_modificadas = estados.get(304, 0)
+        print(
+            f"{nombre:<36}{len(propias):>9}{statistics.median(tiempos):>10.2f}"
+            f"{percentil(tiempos, 0.95):>10.2f}{no_modificadas / len(propias):>7.0%}  "
+            + ", ".join(f"{e}: {n}" for e, n in sorted(estados.items()))
+        )
+    errores = [m for m in medidas if m[1] >= 500 or m[1] not in (200, 201, 304, 401, 409)]
+    if errores:
+        print(f"  {len(errores)} respuesta(s) inesperadas, por ejemplo {errores[0][:2]}.")
+    return not errores
+
+
+def como_json(filas):
+    return json.loads(json.dumps([dict(f) for f in filas], default=str))
+
+
+def verificar(puerto, ids, aceptadas):
+    correcto = True
+
+    def comprobar(condicion, descripcion):
+        nonlocal correcto
+        print(f"  {'ok   ' if condicion else 'FALLÓ'} {descripcion}")
+        correcto = correcto and condicion
+
+    print("\nVerificación de respuestas:")
+    c = Cliente(puerto, con_etag=True)
+    try:
+        url = "/vacantes?tamano=50"
+        estado, datos, etag = c.pedir("GET", url)
+        directas, siguiente = db_manager.get_active_vacantes_pagina(None, None, None, 50)
+        comprobar(
+            estado == 200 and datos["filas"] == como_json(directas) and datos["siguiente"] == siguiente,
+            "GET /vacantes coincide con get_active_vacantes_pagina",
+        )
+        estado, datos, _ = c.pedir("GET", url)
+        comprobar(estado == 304 and datos is None, "repetir GET /vacantes con If-None-Match da 304")
+
+        id_postulante = ids["postulantes"][0]
+        url_postulaciones = f"/postulantes/{id_postulante}/postulaciones"
+        c.pedir("GET", url_postulaciones)
+        tomadas = {v for p, v in aceptadas if p == id_postulante}
+        with db_manager.get_db_connection() as conn:
+            tomadas |= {
+                fila[0]
+                for fila in conn.execute(
+                    "SELECT ID_Vacante FROM Postulaciones WHERE ID_Postulante = ?", (id_postulante,)
+                )
+            }
+        id_vacante = next(v for v in ids["vacantes"] if v not in tomadas)
+        estado, datos, _ = c.pedir(
+            "POST", "/postulaciones", {"id_postulante": id_postulante, "id_vacante": id_vacante}
+        )
+        comprobar(estado == 201 and datos["exito"], "POST /postulaciones crea la postulación (201)")
+        estado, datos, _ = c.pedir(
+            "POST", "/postulaciones", {"id_postulante": id_postulante, "id_vacante": id_vacante}
+        )
+        comprobar(estado == 409 and not datos["exito"], "repetir la postulación da 409")
+        anterior = c.etags[url_postulaciones]
+        estado, datos, etag = c.pedir("GET", url_postulaciones)
+        comprobar(
+            estado == 200 and etag != anterior
+            and datos["filas"] == como_json(db_manager.get_postulaciones_por_postulante(id_postulante)),
+            "después de escribir, el ETag anterior ya no vale y la respuesta trae el cambio",
+        )
+
+        estado, datos, _ = c.pedir("POST", "/login", {"email": "admin@hiring.com", "password": "admin"})
+        comprobar(estado == 200 and datos["rol"] == "HiringGroup", "POST /login con credenciales válidas")
+        estado, _, _ = c.pedir("POST", "/login", {"email": "admin@hiring.com", "password": "otra"})
+        comprobar(estado == 401, "POST /login con contraseña incorrecta da 401")
+        estado, _, _ = c.pedir("GET", "/no/existe")
+        comprobar(estado == 404, "ruta inexistente da 404")
+        estado, _, _ = c.pedir("POST", "/vacantes", {})
+        comprobar(estado == 405, "método no permitido da 405")
+        estado, _, _ = c.pedir("POST", "/postulaciones", crudo=b"{no es json")
+        comprobar(estado == 400, "cuerpo que no es JSON da 400")
+        estado, _, _ = c.pedir("GET", "/vacantes?area=abc")
+        comprobar(estado == 400, "parámetro no numérico da 400")
+    finally:
+        c.cerrar()
+
+    with db_manager.get_db_connection() as conn:
+        faltan = [
+            par
+            for par in aceptadas
+            if not conn.execute(
+                "SELECT 1 FROM Postulaciones WHERE ID_Postulante = ? AND ID_Vacante = ?", par
+            ).fetchone()
+        ]
+    comprobar(not faltan, f"las {len(aceptadas)} postulaciones aceptadas durante la carga están en la base")
+    return correcto
+
+
+def verificar_instantanea(puerto, antiguedad=2.0):
+    correcto = True
+
+    def comprobar(condicion, descripcion):
+        nonlocal correcto
+        print(f"  {'ok   ' if condicion else 'FALLÓ'} {descripcion}")
+        correcto = correcto and condicion
+
+    print(f"\nVerificación con la instantánea de reportes ({antiguedad:.0f} s):")
+    db_manager.configurar_instantanea_reportes(antiguedad)
+    c = Cliente(puerto, con_etag=True)
+    try:
+        url = "/reportes/resumen"
+        _, antes, _ = c.pedir("GET", url)
+        estado, datos, _ = c.pedir("POST", "/nominas", {"mes": 12, "anio": 2030})
+        comprobar(estado == 200 and datos["exito"], "POST /nominas genera la nómina de 12/2030")
+        # Pedido antes de que se renueve la copia: puede venir sin la nómina nueva.
+        c.pedir("GET", url)
+        time.sleep(antiguedad * 1.2)
+        estado, datos, etag = c.pedir("GET", url)
+        comprobar(
+            estado == 200
+            and any(f["Mes"] == 12 and f["Anio"] == 2030 for f in datos["filas"])
+            and len(datos["filas"]) > len(antes["filas"]),
+            "al renovarse la copia, GET /reportes/resumen trae la nómina nueva",
+        )
+        time.sleep(antiguedad * 1.2)
+        estado, _, _ = c.pedir("GET", url)
+        comprobar(estado == 304, "sin escrituras, la copia renovada conserva el ETag (304)")
+    finally:
+        c.cerrar()
+        db_manager.configurar_instantanea_reportes(None)
+    return correcto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postulantes", type=int, default=5000)
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--solicitudes", type=int, default=400, help="Por cliente y por ronda.")
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--escrituras", type=float, default=0.1, help="Fracción de POST /postulaciones.")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix="bench_servidor_")
+    ruta = os.path.join(directorio, "servidor.db")
+    servicio = None
+    try:
+        crear_base_sintetica(ruta, **volumenes_por_escala(args.postulantes))
+        servicio = servidor.crear_servidor(ruta, puerto=0, hilos=args.hilos, registrar=False)
+        threading.Thread(target=servicio.serve_forever, daemon=True).start()
+        puerto = servicio.server_address[1]
+        with db_manager.get_db_connection() as conn:
+            ids = {
+                "areas": [f[0] for f in conn.execute("SELECT ID_Area_Conocimiento FROM Areas_Conocimiento")],
+                "postulantes": [f[0] for f in conn.execute("SELECT ID_Postulante FROM Postulantes")],
+                "vacantes": [f[0] for f in conn.execute("SELECT ID_Vacante FROM Vacantes WHERE Estatus = 'Activa'")],
+            }
+        mezcla = armar_mezcla(ids, args.escrituras)
+        print(
+            f"{args.clientes} clientes x {args.solicitudes} solicitudes, {args.hilos} hilos en el servidor, "
+            f"{args.escrituras:.0%} escrituras."
+        )
+
+        correcto = True
+        aceptadas = []
+        for ronda, (titulo, con_etag) in enumerate((("Sin If-None-Match", False), ("Con If-None-Match", True))):
+            medidas, segundos, nuevas = correr_carga(
+                puerto, mezcla, args.clientes, args.solicitudes, con_etag, ronda
+            )
+            aceptadas += nuevas
+            correcto = informar(titulo, medidas, segundos) and correcto
+        print(f"Caché de respuestas: {servicio.cache.estadisticas()}")
+        correcto = verificar(puerto, ids, aceptadas) and correcto
+        correcto = verificar_instantanea(puerto) and correcto
+    finally:
+        if servicio is not None:
+            servicio.shutdown()
+            servicio.server_close()
+        db_manager.cerrar_pool()
+        shutil.rmtree(directorio, ignore_errors=True)
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
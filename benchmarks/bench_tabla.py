@@ -0,0 +1,161 @@
+"""
+Compara el refresco de una tabla de 50.000 filas borrando e insertando todo
+(lo que hacían las funciones populate de app_gui.py) con
+TablaDatos.actualizar, que solo aplica las diferencias, en varios casos:
+sin cambios, 1% de filas modificadas, 1% borradas y 1% nuevas, y todas
+reordenadas. Verifica que la tabla quede con las filas y el orden pedidos
+y que se conserve la selección; termina con código 1 si no coincide.
+
+Sin pantalla (no se puede crear la ventana de Tk) solo verifica
+calcular_cambios sobre listas y cuenta las operaciones que haría cada
+método.
+
+Uso: python -m benchmarks.bench_tabla [--filas 50000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tkinter as tk
+
+from tabla_ui import TablaDatos, calcular_cambios
+
+COLUMNAS = ("ID", "Cargo", "Empresa", "Salario")
+
+
+def generar(filas):
+    return [
+        (i, (i, f"Cargo {i % 97}", f"Empresa {i % 13}", f"{1000 + i % 500:.2f}"))
+        for i in range(1, filas + 1)
+    ]
+
+
+def casos(base, rng):
+    """(nombre, filas nuevas) partiendo siempre de 'base'."""
+    n = len(base)
+    modificadas = list(base)
+    for i in rng.sample(range(n), n // 100):
+        clave, valores = modificadas[i]
+        modificadas[i] = (clave, valores[:3] + ("9999.00",))
+    borradas = set(rng.sample(range(n), n // 100))
+    altas_bajas = [fila for i, fila in enumerate(base) if i not in borradas]
+    for j in range(n // 100):
+        clave = n + 1 + j
+        altas_bajas.insert(
+            rng.randrange(len(altas_bajas) + 1),
+            (clave, (clave, "Nuevo", "Empresa", "1.00")),
+        )
+    reordenadas = list(base)
+    rng.shuffle(reordenadas)
+    return [
+        ("sin cambios", list(base)),
+        ("1% modificadas", modificadas),
+        ("1% borradas + 1% nuevas", altas_bajas),
+        ("reordenadas", reordenadas),
+    ]
+
+
+def aplicar_en_lista(orden, valores, filas):
+    """Aplica calcular_cambios a una lista, como lo haría el Treeview."""
+    filas = [(str(c), tuple(v)) for c, v in filas]
+    cambios = calcular_cambios(orden, valores, filas)
+    borrar = set(cambios.borrar)
+    orden = [iid for iid in orden if iid not in borrar]
+    for indice, iid, _ in cambios.insertar:
+        orden.insert(len(orden) if indice == "end" else indice, iid)
+    if cambios.orden is not None:
+        orden = list(cambios.orden)
+    return orden, dict(filas), cambios
+
+
+def verificar_en_listas(base, lista_casos):
+    correcto = True
+    print(f"{'Caso':<26}{'Borrar':>8}{'Modificar':>11}{'Insertar':>10}{'Reordenar':>11}{'Antes':>9}")
+    for nombre, filas in lista_casos:
+        orden = [str(c) for c, _ in base]
+        valores = {str(c): tuple(v) for c, v in base}
+        orden, valores, cambios = aplicar_en_lista(orden, valores, filas)
+        if orden != [str(c) for c, _ in filas]:
+            print(f"  {nombre}: el orden resultante no coincide.")
+            correcto = False
+        print(
+            f"{nombre:<26}{len(cambios.borrar):>8}{len(cambios.modificar):>11}"
+            f"{len(cambios.insertar):>10}{'sí' if cambios.orden else 'no':>11}"
+            f"{len(base) + len(filas):>9}"
+        )
+    return correcto
+
+
+def refrescar_todo(tabla, filas):
+    for i in tabla.get_children():
+        tabla.delete(i)
+    for clave, valores in filas:
+        tabla.insert("", "end", iid=str(clave), values=valores)
+
+
+def medir_en_tk(raiz, base, lista_casos):
+    correcto = True
+    tabla = TablaDatos(raiz, COLUMNAS)
+    tabla.pack()
+    print(f"\n{'Caso':<26}{'Todo (s)':>10}{'Diferencias (s)':>17}{'Mejora':>8}")
+    for nombre, filas in lista_casos:
+        refrescar_todo(tabla, base)
+        raiz.update()
+        inicio = time.perf_counter()
+        refrescar_todo(tabla, filas)
+        raiz.update()
+        antes = time.perf_counter() - inicio
+
+        tabla.limpiar()
+        tabla.actualizar(base)
+        seleccion = str(base[len(base) // 2][0])
+        tabla.selection_set(seleccion)
+        raiz.update()
+        inicio = time.perf_counter()
+        tabla.actualizar(filas)
+        raiz.update()
+        despues = time.perf_counter() - inicio
+        print(f"{nombre:<26}{antes:>10.3f}{despues:>17.3f}{antes / despues:>7.1f}x")
+
+        if list(tabla.get_children()) != [str(c) for c, _ in filas]:
+            print(f"  {nombre}: el orden de la tabla no coincide.")
+            correcto = False
+        for clave, valores in random.Random(7).sample(filas, 200):
+            if tuple(str(v) for v in tabla.item(str(clave), "values")) != tuple(
+                str(v) for v in valores
+            ):
+                print(f"  {nombre}: la fila {clave} no coincide.")
+                correcto = False
+                break
+        sigue = any(str(c) == seleccion for c, _ in filas)
+        if sigue and tabla.selection() != (seleccion,):
+            print(f"  {nombre}: se perdió la selección.")
+            correcto = False
+    return correcto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = random.Random(1234)
+    base = generar(args.filas)
+    lista_casos = casos(base, rng)
+    correcto = verificar_en_listas(base, lista_casos)
+    try:
+        raiz = tk.Tk()
+    except tk.TclError as e:
+        print(f"\nSin pantalla ({e}): no se mide el Treeview.")
+    else:
+        try:
+            correcto = medir_en_tk(raiz, base, lista_casos) and correcto
+        finally:
+            raiz.destroy()
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Mide TablaVirtual con resultados de distinto tamaño: memoria que ocupan las
+filas en una lista de tuplas y en FilasColumnares (y lo que tarda en
+llenarse), tiempo de mostrar(), de desplazarse hasta la mitad y el final, y
+de recorrer una consulta paginada de punta a punta (con una carga síncrona
+sobre una lista). Como referencia, inserta las mismas filas en un Treeview
+común. Verifica que FilasColumnares devuelva las mismas filas y que las
+filas visibles y la seleccionada sean las esperadas; termina con código 1
+si no coinciden.
+
+Sin pantalla (no se puede crear la ventana de Tk) solo mide la memoria.
+
+Uso: python -m benchmarks.bench_tabla_virtual [--tamanos 10000 100000 1000000]
+"""
+
+import argparse
+import sys
+import time
+import tkinter as tk
+import tracemalloc
+from tkinter import ttk
+
+from tabla_ui import FilasColumnares, TablaVirtual
+
+COLUMNAS = ("ID", "Cargo", "Empresa", "Salario")
+TAMANO_PAGINA = 200
+# Más allá de este tamaño el Treeview común tarda demasiado para la referencia.
+MAXIMO_TREEVIEW = 100000
+
+
+def generar(filas):
+    return [(i, f"Cargo {i % 97}", f"Empresa {i % 13}", f"{1000 + i % 500:.2f}") for i in range(filas)]
+
+
+def memoria(construir):
+    """(resultado, bytes que quedan ocupados, segundos) de construir()."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = construir()
+    segundos = time.perf_counter() - inicio
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, actual, segundos
+
+
+def medir_memoria(tamanos):
+    correcto = True
+    print(
+        f"{'Filas':>10}{'Tuplas (MB)':>13}{'Bytes/fila':>12}"
+        f"{'Columnas (MB)':>15}{'Bytes/fila':>12}{'Llenado (s)':>13}"
+    )
+    for n in tamanos:
+        filas, tuplas, _ = memoria(lambda: generar(n))
+        # Las filas llegan de a una, como desde formatear() en paginar().
+        columnares, compacta, segundos = memoria(lambda: FilasColumnares(iter(filas)))
+        print(
+            f"{n:>10}{tuplas / 1e6:>13.1f}{tuplas / n:>12.0f}"
+            f"{compacta / 1e6:>15.1f}{compacta / n:>12.0f}{segundos:>13.3f}"
+        )
+        if len(columnares) != n or list(columnares) != filas:
+            print(f"  {n}: FilasColumnares no devuelve las mismas filas.")
+            correcto = False
+    return correcto
+
+
+def cargar_de(filas):
+    """Carga paginada síncrona: el cursor es el ID de la última fila."""
+
+    def cargar(cursor, al_recibir, al_fallar):
+        inicio = 0 if cursor is None else cursor + 1
+        pagina = filas[inicio:inicio + TAMANO_PAGINA]
+        siguiente = pagina[-1][0] if len(pagina) == TAMANO_PAGINA else None
+        al_recibir((pagina, siguiente))
+
+    return cargar
+
+
+def visibles(tabla):
+    return [tuple(tabla.tree.item(iid, "values")) for iid in tabla.tree.get_children()]
+
+
+def esperadas(filas, inicio, cantidad):
+    return [tuple(str(v) for v in fila) for fila in filas[inicio:inicio + cantidad]]
+
+
+def cronometrar(raiz, accion):
+    inicio = time.perf_counter()
+    accion()
+    raiz.update()
+    return time.perf_counter() - inicio
+
+
+def medir_en_tk(raiz, tamanos):
+    correcto = True
+    print(
+        f"\n{'Filas':>10}{'Treeview (s)':>14}{'mostrar (s)':>13}"
+        f"{'mitad (ms)':>12}{'final (ms)':>12}{'paginar (s)':>13}"
+    )
+    for n in tamanos:
+        filas = generar(n)
+        referencia = float("nan")
+        if n <= MAXIMO_TREEVIEW:
+            arbol = ttk.Treeview(raiz, columns=COLUMNAS, show="headings")
+            arbol.pack()
+            referencia = cronometrar(
+                raiz, lambda: [arbol.insert("", "end", values=fila) for fila in filas]
+            )
+            arbol.destroy()
+
+        tabla = TablaVirtual(raiz, COLUMNAS, filas_visibles=20)
+        tabla.pack()
+        mostrar = cronometrar(raiz, lambda: tabla.mostrar(filas))
+        mitad = cronometrar(raiz, lambda: tabla._desplazar("moveto", "0.5"))
+        if visibles(tabla) != esperadas(filas, n // 2, 20):
+            print(f"  {n}: las filas visibles en la mitad no coinciden.")
+            correcto = False
+        final = cronometrar(raiz, lambda: tabla._desplazar("moveto", "1.0"))
+        if visibles(tabla) != esperadas(filas, n - 20, 20):
+            print(f"  {n}: las filas visibles al final no coinciden.")
+            correcto = False
+        tabla.tree.selection_set(str(5))
+        raiz.update()
+        if tabla.fila_seleccionada() != filas[n - 15]:
+            print(f"  {n}: la fila seleccionada no coincide.")
+            correcto = False
+
+        def recorrer():
+            tabla.paginar(cargar_de(filas))
+            while tabla.hay_mas():
+                tabla._desplazar("moveto", "1.0")
+
+        paginar = cronometrar(raiz, recorrer)
+        if list(tabla.filas) != filas:
+            print(f"  {n}: la consulta paginada no trajo todas las filas.")
+            correcto = False
+        tabla.destroy()
+        print(
+            f"{n:>10}{referencia:>14.3f}{mostrar:>13.3f}"
+            f"{mitad * 1000:>12.2f}{final * 1000:>12.2f}{paginar:>13.3f}"
+        )
+    return correcto
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    correcto = medir_memoria(args.tamanos)
+    try:
+        raiz = tk.Tk()
+    except tk.TclError as e:
+        print(f"\nSin pantalla ({e}): no se mide la tabla.")
+    else:
+        try:
+            correcto = medir_en_tk(raiz, args.tamanos) and correcto
+        finally:
+            raiz.destroy()
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
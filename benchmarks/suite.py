@@ -0,0 +1,400 @@
+"""
+Suite de rendimiento de db_manager: genera una base sintética por cada
+escala, mide cada función pública con llamadas representativas y reporta
+p50/p95/p99 y filas por segundo. Los resultados se guardan en JSON junto
+con el commit medido; con --comparar se contrastan con un JSON anterior y
+el programa termina con código 1 si alguna función empeoró más que el
+umbral o si alguna escritura falló.
+
+Uso: python -m benchmarks.suite [--escalas 2000,20000] [--repeticiones 30]
+         [--salida suite.json] [--comparar anterior.json] [--umbral 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+
+import db_manager
+from datos_sinteticos import crear_base_sintetica, volumenes_por_escala
+from instrumentacion import funciones_publicas
+
+# Diferencias de p50 por debajo de esto se consideran ruido al comparar.
+RUIDO_MS = 0.2
+
+
+def commit_actual():
+    try:
+        resultado = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return resultado.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- ESCENARIOS ---
+def insertar(sql, params=()):
+    with db_manager.get_db_connection() as conn:
+        id_fila = conn.execute(sql, params).lastrowid
+        conn.commit()
+        return id_fila
+
+
+def fijos(*args):
+    """Preparador de una lectura: los mismos argumentos en cada repetición."""
+    return lambda i: args
+
+
+def insertar_postulante(i):
+    id_usuario = insertar(
+        "INSERT INTO Usuarios (Email, Password, Tipo_Usuario) VALUES (?, 'clave', 'Postulante')",
+        (f"borrar{i}@suite.com",),
+    )
+    insertar(
+        "INSERT INTO Postulantes (ID_Postulante, Nombres, Apellidos, Cedula_Identidad) VALUES (?, 'Ana', 'Borrar', ?)",
+        (id_usuario, f"B-{i}"),
+    )
+    return (id_usuario,)
+
+
+def escenarios(conn, repeticiones):
+    """
+    Lista de (función, variante, preparar, máximo de repeticiones).
+    preparar(i) devuelve los argumentos de la repetición i y no se mide: las
+    escrituras reciben datos nuevos en cada llamada (correos, periodos o
+    filas recién insertadas para borrar) para no medir el camino de error.
+    """
+    empresa = conn.execute(
+        """SELECT v.ID_Empresa FROM Contratos c JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion
+           JOIN Vacantes v ON p.ID_Vacante = v.ID_Vacante WHERE c.Estatus = 'Activo'
+           GROUP BY v.ID_Empresa ORDER BY COUNT(*) DESC LIMIT 1"""
+    ).fetchone()[0]
+    contratado = conn.execute(
+        """SELECT p.ID_Postulante, u.Email, u.Password FROM Contratos c
+           JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion
+           JOIN Usuarios u ON u.ID_Usuario = p.ID_Postulante WHERE c.Estatus = 'Activo' LIMIT 1"""
+    ).fetchone()
+    id_postulante = contratado["ID_Postulante"]
+    nomina = conn.execute(
+        "SELECT ID_Nomina, Mes, Anio FROM Nominas WHERE ID_Empresa = ? LIMIT 1", (empresa,)
+    ).fetchone()
+    area = conn.execute("SELECT MIN(ID_Area_Conocimiento) FROM Areas_Conocimiento").fetchone()[0]
+    cursor_salario = conn.execute(
+        "SELECT Salario_Ofrecido || ':' || ID_Vacante FROM Vacantes ORDER BY ID_Vacante LIMIT 1"
+    ).fetchone()[0]
+    libres = [
+        fila[0]
+        for fila in conn.execute(
+            """SELECT ID_Postulacion FROM Postulaciones p WHERE Estatus IN ('Recibida', 'En Revision')
+               AND NOT EXISTS (SELECT 1 FROM Contratos c WHERE c.ID_Postulacion = p.ID_Postulacion)
+               LIMIT ?""",
+            (repeticiones,),
+        )
+    ]
+    postulantes = [
+        fila[0]
+        for fila in conn.execute(
+            "SELECT ID_Postulante FROM Postulantes ORDER BY ID_Postulante LIMIT ?", (repeticiones,)
+        )
+    ]
+    # Vacante sin postulaciones: recibe las de aplicar_a_vacante_db.
+    vacante = insertar(
+        "INSERT INTO Vacantes (ID_Empresa, Cargo_Vacante, Descripcion_Perfil, Salario_Ofrecido) VALUES (?, 'Suite', 'Suite', 1000)",
+        (empresa,),
+    )
+
+    datos_postulante = {
+        "Contraseña": "clave", "Nombres": "Ana", "Apellidos": "Suite", "Teléfono": "0414",
+        "ID_Universidad": None,
+    }
+    datos_empresa = {
+        "Contraseña": "clave", "Nombre Empresa": "Empresa Suite", "Sector": "Servicios",
+        "Persona de Contacto": "Ana", "Teléfono de Contacto": "0212", "Email de Contacto": "",
+    }
+    datos_contrato = {
+        "Tipo_Contrato": "Indefinido", "Salario_Acordado": 1000, "Tipo_Sangre": "O+",
+        "Contacto_Emergencia_Nombre": "Suite", "Contacto_Emergencia_Telefono": "0000",
+        "Numero_Cuenta": "0000", "ID_Banco": 1,
+    }
+    datos_experiencia = {
+        "Empresa": "Anterior", "Cargo": "Analista", "Fecha Inicio (YYYY-MM-DD)": "2015-01-01",
+        "Fecha Fin (YYYY-MM-DD, opcional)": "2018-06-30", "Descripción": "python sql",
+    }
+
+    def periodo(anio_inicial):
+        return lambda i: (i % 12 + 1, anio_inicial + i // 12)
+
+    return [
+        # Lecturas
+        ("login_usuario", "contratado", fijos(contratado["Email"], contratado["Password"]), None),
+        ("hay_usuarios_registrados", "", fijos(), None),
+        ("get_catalogo", "bancos", fijos("Bancos", "ID_Banco", "Nombre_Banco"), None),
+        ("get_active_vacantes", "", fijos(), None),
+        ("get_active_vacantes", "area, salario", fijos(area, None, "DESC"), None),
+        ("get_active_vacantes_pagina", "primera", fijos(), None),
+        ("get_active_vacantes_pagina", "salario, cursor", fijos(None, None, "DESC", 50, cursor_salario), None),
+        ("get_active_vacantes_pagina", "texto", fijos(None, None, None, 50, None, "desarrollador"), None),
+        ("get_postulaciones_para_contratar", "", fijos(), None),
+        ("buscar_postulantes_db", "", fijos("python"), None),
+        ("get_vacantes_por_empresa", "", fijos(empresa), None),
+        ("get_postulaciones_por_postulante", "", fijos(id_postulante), None),
+        ("get_recibos_por_contratado", "", fijos(id_postulante), None),
+        ("get_datos_constancia", "", fijos(id_postulante), None),
+        ("get_nomina_reporte_db", "", fijos(empresa, nomina["Mes"], nomina["Anio"]), None),
+        ("get_toda_nomina_reporte_db", "", fijos(), None),
+        ("verificar_resumen_nominas_db", "solo verificar", fijos(False), 5),
+        ("get_nomina_generada_detalle_db", "", fijos(nomina["ID_Nomina"]), None),
+        ("iterar_recibos_db", "periodo", fijos(nomina["Mes"], nomina["Anio"]), 10),
+        ("get_archivos_nomina_db", "", fijos(), None),
+        ("iterar_usuarios_db", "postulantes", fijos("Postulante"), 10),
+        ("get_experiencias_db", "", fijos(id_postulante), None),
+        ("get_single_postulante", "", fijos(id_postulante), None),
+        ("get_single_empresa", "", fijos(empresa), None),
+        ("get_tasas_nomina_db", "", fijos(), None),
+        ("previsualizar_nomina_db", "empresa", fijos(12, 2030, empresa), None),
+        ("previsualizar_nomina_db", "todas", fijos(12, 2030), 5),
+        # Escrituras
+        (
+            "crear_item_catalogo", "",
+            lambda i: ("Bancos", "Nombre_Banco", f"Banco suite {i}"), None,
+        ),
+        (
+            "actualizar_item_catalogo", "",
+            lambda i: ("Bancos", "ID_Banco", "Nombre_Banco", 1, f"Banco renombrado {i}"), None,
+        ),
+        (
+            "eliminar_item_catalogo", "",
+            lambda i: (
+                "Bancos", "ID_Banco",
+                insertar("INSERT INTO Bancos (Nombre_Banco) VALUES (?)", (f"Banco borrar {i}",)),
+            ),
+            None,
+        ),
+        (
+            "registrar_usuario_db", "postulante",
+            lambda i: (
+                "Postulante",
+                dict(datos_postulante, Email=f"nuevo{i}@suite.com", **{"Cédula": f"S-{i}"}),
+            ),
+            None,
+        ),
+        (
+            "registrar_usuario_db", "empresa",
+            lambda i: (
+                "Empresa", dict(datos_empresa, Email=f"empresa{i}@suite.com", RIF=f"J-S{i}"),
+            ),
+            None,
+        ),
+        ("crear_vacante_db", "", fijos(empresa, "Cargo", "Descripción", 1000, None), None),
+        ("aplicar_a_vacante_db", "", lambda i: (postulantes[i], vacante), len(postulantes)),
+        ("contratar_postulante_db", "", lambda i: (libres[i], datos_contrato), len(libres)),
+        ("crear_experiencia_db", "", fijos(id_postulante, datos_experiencia), None),
+        (
+            "actualizar_usuario_db", "postulante",
+            fijos(id_postulante, "Postulante", dict(datos_postulante, **{"Contraseña": ""})), None,
+        ),
+        ("actualizar_usuario_db", "empresa", fijos(empresa, "Empresa", datos_empresa), None),
+        ("actualizar_vacante_db", "", fijos(vacante, "Cargo", "Descripción", 1200, "Activa"), None),
+        (
+            "registrar_tasa_nomina_db", "",
+            lambda i: ("INCES", 0.005, f"{2100 + i}-01-01"), None,
+        ),
+        (
+            "ejecutar_nomina_db", "",
+            lambda i: (empresa, *periodo(2040)(i)), None,
+        ),
+        ("ejecutar_nomina_lote_db", "", periodo(2080), 3),
+        ("verificar_resumen_nominas_db", "reconstruir", fijos(True), 3),
+        # Mueve a los archivos las nóminas de la base sintética; las
+        # siguientes repeticiones ya no encontrarían nada que archivar.
+        ("archivar_nominas_db", "", fijos(12), 1),
+        (
+            "eliminar_vacante_db", "",
+            lambda i: (
+                insertar(
+                    "INSERT INTO Vacantes (ID_Empresa, Cargo_Vacante, Descripcion_Perfil, Salario_Ofrecido) VALUES (?, 'Borrar', 'Borrar', 1000)",
+                    (empresa,),
+                ),
+            ),
+            None,
+        ),
+        ("eliminar_usuario_db", "", insertar_postulante, None),
+        (
+            "eliminar_experiencia_db", "",
+            lambda i: (
+                insertar(
+                    "INSERT INTO Experiencias_Laborales (ID_Postulante, Empresa, Cargo_Ocupado, Fecha_Inicio) VALUES (?, 'Borrar', 'Borrar', '2015-01-01')",
+                    (id_postulante,),
+                ),
+            ),
+            None,
+        ),
+    ]
+
+
+# --- MEDICIÓN ---
+def contar_filas(resultado):
+    """
+    Filas que devolvió la función: el largo de la lista de resultados (o de
+    la que venga dentro de la tupla), las que produjo un generador, o 1 para
+    las escrituras y consultas de un solo registro.
+    """
+    if isinstance(resultado, types.GeneratorType):
+        return sum(1 for _ in resultado)
+    if isinstance(resultado, list):
+        return len(resultado)
+    if isinstance(resultado, tuple):
+        listas = [valor for valor in resultado if isinstance(valor, list)]
+        return len(listas[0]) if listas else 1
+    return 0 if resultado is None else 1
+
+
+def fallo(resultado):
+    # Las escrituras devuelven (exito, mensaje[, ...]).
+    return isinstance(resultado, tuple) and resultado and resultado[0] is False
+
+
+def medir(funcion, preparar, repeticiones):
+    tiempos, filas, errores = [], 0, []
+    for i in range(repeticiones):
+        args = preparar(i)
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        filas += contar_filas(resultado)
+        tiempos.append(time.perf_counter() - inicio)
+        if fallo(resultado):
+            errores.append(resultado[1])
+    if len(tiempos) > 1:
+        cuantiles = statistics.quantiles(tiempos, n=100, method="inclusive")
+        p50, p95, p99 = cuantiles[49], cuantiles[94], cuantiles[98]
+    else:
+        p50 = p95 = p99 = tiempos[0]
+    total = sum(tiempos)
+    return {
+        "llamadas": len(tiempos),
+        "p50_ms": round(p50 * 1000, 4),
+        "p95_ms": round(p95 * 1000, 4),
+        "p99_ms": round(p99 * 1000, 4),
+        "media_ms": round(total / len(tiempos) * 1000, 4),
+        "filas_por_llamada": round(filas / len(tiempos), 2),
+        "filas_por_s": round(filas / total, 1) if total else None,
+        "errores": errores[:3],
+    }
+
+
+def medir_escala(escala, repeticiones, directorio):
+    ruta = os.path.join(directorio, f"suite_{escala}.db")
+    volumenes = crear_base_sintetica(ruta, meses_nomina=12, **volumenes_por_escala(escala))
+    db_manager.configurar_base_datos(ruta)
+    try:
+        with db_manager.get_db_connection() as conn:
+            casos = escenarios(conn, repeticiones)
+        funciones = {}
+        for nombre, variante, preparar, maximo in casos:
+            veces = repeticiones if maximo is None else min(repeticiones, maximo)
+            if veces == 0:
+                continue
+            clave = f"{nombre} [{variante}]" if variante else nombre
+            funciones[clave] = medir(getattr(db_manager, nombre), preparar, veces)
+    finally:
+        db_manager.cerrar_pool()
+    medidas = {clave.split(" [")[0] for clave in funciones}
+    return {"volumenes": volumenes, "funciones": funciones}, medidas
+
+
+def imprimir(escala, resultado):
+    print(f"\nEscala {escala}: " + ", ".join(f"{t}={n}" for t, n in resultado["volumenes"].items()))
+    print(f"{'Función':<52}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'filas/s':>12}")
+    for clave, m in resultado["funciones"].items():
+        filas = f"{m['filas_por_s']:.0f}" if m["filas_por_s"] is not None else "-"
+        marca = "  ERROR" if m["errores"] else ""
+        print(f"{clave:<52}{m['p50_ms']:>9.2f}{m['p95_ms']:>9.2f}{m['p99_ms']:>9.2f}{filas:>12}{marca}")
+
+
+def comparar(anterior, actual, umbral):
+    """Devuelve [(escala, clave, p50 anterior, p50 actual)] de las regresiones."""
+    regresiones = []
+    for escala, resultado in actual["escalas"].items():
+        previas = anterior.get("escalas", {}).get(escala, {}).get("funciones", {})
+        for clave, m in resultado["funciones"].items():
+            if clave not in previas:
+                continue
+            antes, ahora = previas[clave]["p50_ms"], m["p50_ms"]
+            if ahora > antes * (1 + umbral) and ahora - antes > RUIDO_MS:
+                regresiones.append((escala, clave, antes, ahora))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--escalas", default="2000,20000", help="Postulantes de cada base, separados por coma."
+    )
+    parser.add_argument("--repeticiones", type=int, default=30)
+    parser.add_argument("--salida", help="JSON de resultados (por defecto suite_<commit>.json).")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior.")
+    parser.add_argument(
+        "--umbral", type=float, default=0.25, help="Aumento relativo de p50 que cuenta como regresión."
+    )
+    args = parser.parse_args()
+    escalas = [int(e) for e in args.escalas.split(",") if e.strip()]
+
+    commit = commit_actual()
+    resultados = {
+        "commit": commit,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "repeticiones": args.repeticiones,
+        "escalas": {},
+    }
+    correcto = True
+    directorio = tempfile.mkdtemp()
+    try:
+        for escala in escalas:
+            resultado, medidas = medir_escala(escala, args.repeticiones, directorio)
+            resultados["escalas"][str(escala)] = resultado
+            imprimir(escala, resultado)
+            sin_medir = sorted(set(funciones_publicas()) - medidas)
+            if sin_medir:
+                print("Funciones públicas sin escenario: " + ", ".join(sin_medir))
+                correcto = False
+            if any(m["errores"] for m in resultado["funciones"].values()):
+                correcto = False
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    salida = args.salida or f"suite_{commit or 'local'}.json"
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            anterior = json.load(archivo)
+        regresiones = comparar(anterior, resultados, args.umbral)
+        print(f"Comparación con {anterior.get('commit') or args.comparar}: {len(regresiones)} regresión(es)")
+        for escala, clave, antes, ahora in regresiones:
+            print(f"  [{escala}] {clave}: {antes:.2f} ms -> {ahora:.2f} ms")
+        if regresiones:
+            correcto = False
+    print("Verificación:", "correcta" if correcto else "FALLÓ")
+    sys.exit(0 if correcto else 1)
+
+
+if __name__ == "__main__":
+    main()
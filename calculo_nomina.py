@@ -0,0 +1,80 @@
+"""
+Motor de cálculo de nómina. Trabaja por columnas: recibe los salarios de todos
+los contratos de una empresa (o de un periodo completo) y calcula cada columna
+del recibo en una sola pasada, aplicando las tasas vigentes en el periodo.
+"""
+
+from collections import namedtuple
+
+CONCEPTOS = ("INCES", "IVSS", "Comision_Hiring_Group")
+
+# tope_base es el salario máximo sobre el que se aplica la tasa (None = sin tope).
+Tasa = namedtuple("Tasa", "concepto tasa tope_base")
+
+
+def fecha_periodo(mes, anio):
+    return f"{int(anio):04d}-{int(mes):02d}-01"
+
+
+def seleccionar_tasas(filas, mes, anio):
+    """
+    Elige, para cada concepto, la tasa vigente el primer día del periodo.
+    'filas' son tuplas (Concepto, Tasa, Tope_Base, Fecha_Desde, Fecha_Hasta).
+    Lanza ValueError si algún concepto no tiene una tasa vigente.
+    """
+    fecha = fecha_periodo(mes, anio)
+    vigentes = {}
+    for concepto, tasa, tope_base, desde, hasta in filas:
+        if desde > fecha or (hasta is not None and hasta < fecha):
+            continue
+        if concepto not in vigentes or desde > vigentes[concepto][0]:
+            vigentes[concepto] = (desde, Tasa(concepto, float(tasa), tope_base))
+    faltantes = [c for c in CONCEPTOS if c not in vigentes]
+    if faltantes:
+        raise ValueError(
+            f"No hay tasa vigente para {', '.join(faltantes)} en {int(mes)}/{int(anio)}."
+        )
+    return {concepto: tasa for concepto, (_, tasa) in vigentes.items()}
+
+
+def aplicar_tasa(tasa, salarios):
+    factor = tasa.tasa
+    if tasa.tope_base is None:
+        return [s * factor for s in salarios]
+    tope = float(tasa.tope_base)
+    return [(s if s < tope else tope) * factor for s in salarios]
+
+
+def calcular_recibos(salarios, tasas):
+    """
+    Calcula todas las columnas de los recibos. Devuelve un diccionario de
+    listas paralelas a 'salarios' con las claves Salario_Base,
+    Monto_Deduccion_INCES, Monto_Deduccion_IVSS, Comision_Hiring_Group y
+    Salario_Neto_Pagado.
+    """
+    base = [float(s) for s in salarios]
+    inces = aplicar_tasa(tasas["INCES"], base)
+    ivss = aplicar_tasa(tasas["IVSS"], base)
+    comision = aplicar_tasa(tasas["Comision_Hiring_Group"], base)
+    neto = [s - a - b for s, a, b in zip(base, inces, ivss)]
+    return {
+        "Salario_Base": base,
+        "Monto_Deduccion_INCES": inces,
+        "Monto_Deduccion_IVSS": ivss,
+        "Comision_Hiring_Group": comision,
+        "Salario_Neto_Pagado": neto,
+    }
+
+
+def filas_recibos(ids_contrato, columnas):
+    """Une los IDs de contrato con las columnas calculadas en tuplas por recibo."""
+    return list(
+        zip(
+            ids_contrato,
+            columnas["Salario_Base"],
+            columnas["Monto_Deduccion_INCES"],
+            columnas["Monto_Deduccion_IVSS"],
+            columnas["Comision_Hiring_Group"],
+            columnas["Salario_Neto_Pagado"],
+        )
+    )
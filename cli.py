@@ -0,0 +1,412 @@
+"""
+Línea de comandos sobre db_manager para trabajos por lotes (cron, scripts)
+en un servidor sin pantalla: nómina, reportes, catálogos, importación y
+exportación de usuarios y mantenimiento de la base. No importa tkinter.
+
+El resultado de cada comando sale por stdout en el formato de --formato:
+  json   (por defecto) un objeto con comando, exito, mensaje, resumen,
+         filas y segundos.
+  jsonl  una fila JSON por línea, escritas a medida que se leen; el mensaje
+         y el resumen van a stderr. Conviene para reportes grandes.
+  csv    encabezados y filas; el mensaje y el resumen van a stderr.
+Termina con código 0 si el comando tuvo éxito, 1 si falló y 2 si los
+argumentos no son válidos. Con HIRING_GROUP_INSTRUMENTAR=1 se registran
+las consultas lentas como en la interfaz (ver instrumentacion.py).
+
+Uso: python cli.py [--db ruta] [--formato json|jsonl|csv] COMANDO ...
+  nomina generar --mes M --anio A [--empresa ID] [--hilos N]
+  nomina previsualizar --mes M --anio A [--empresa ID]
+  nomina tasas
+  nomina registrar-tasa CONCEPTO TASA DESDE [--tope MONTO]
+  reporte resumen
+  reporte periodo --empresa ID --mes M --anio A
+  reporte detalle --nomina ID
+  reporte recibos [--mes M] [--anio A] [--empresa ID] [--nomina ID]
+  reporte exportar {recibos,resumen} salida.csv|salida.xlsx [filtros]
+  catalogo listar|agregar|renombrar|eliminar CATALOGO [ID] [NOMBRE]
+  usuarios importar TIPO archivo.csv [--lote N]
+  usuarios exportar {empresas,postulantes} salida.csv|salida.xlsx [--con-password]
+  db migrar | db tablas | db integridad | db optimizar [--vacuum]
+  db verificar-resumen [--solo-verificar]
+  db archivar [--meses 24] | db archivos
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+
+import db_manager
+import exportar
+import importar
+
+# 'filas' es un iterable de diccionarios (o sqlite3.Row); 'resumen', un
+# diccionario con los totales del comando o None.
+Resultado = namedtuple("Resultado", ("exito", "mensaje", "filas", "resumen"), defaults=((), None))
+
+CATALOGOS = {
+    "areas": ("Areas_Conocimiento", "ID_Area_Conocimiento", "Nombre_Area"),
+    "profesiones": ("Profesiones", "ID_Profesion", "Nombre_Profesion"),
+    "universidades": ("Universidades", "ID_Universidad", "Nombre_Universidad"),
+    "bancos": ("Bancos", "ID_Banco", "Nombre_Banco"),
+}
+
+
+# --- NÓMINA ---
+def nomina_generar(args):
+    if args.empresa is not None:
+        exito, mensaje, id_nomina = db_manager.ejecutar_nomina_db(args.empresa, args.mes, args.anio)
+        filas = [{"ID_Empresa": args.empresa, "ID_Nomina": id_nomina}] if exito else []
+        return Resultado(exito, mensaje, filas)
+    resultados, segundos = db_manager.ejecutar_nomina_lote_db(args.mes, args.anio, args.hilos)
+    resumen = {estado: 0 for estado in ("Generada", "Omitida", "Error")}
+    for fila in resultados:
+        resumen[fila["Estado"]] += 1
+    resumen["Recibos"] = sum(fila["Recibos"] for fila in resultados)
+    mensaje = (
+        f"{resumen['Generada']} nómina(s) generada(s), {resumen['Omitida']} omitida(s) y "
+        f"{resumen['Error']} con error en {segundos:.2f} s."
+    )
+    return Resultado(resumen["Error"] == 0, mensaje, resultados, resumen)
+
+
+def nomina_previsualizar(args):
+    exito, mensaje, filas = db_manager.previsualizar_nomina_db(args.mes, args.anio, args.empresa)
+    return Resultado(exito, mensaje, filas)
+
+
+def nomina_tasas(args):
+    return Resultado(True, "Tasas de nómina registradas.", db_manager.get_tasas_nomina_db())
+
+
+def nomina_registrar_tasa(args):
+    exito, mensaje = db_manager.registrar_tasa_nomina_db(
+        args.concepto, args.tasa, args.desde, args.tope
+    )
+    return Resultado(exito, mensaje)
+
+
+# --- REPORTES ---
+def reporte_resumen(args):
+    filas = db_manager.get_toda_nomina_reporte_db()
+    return Resultado(True, f"{len(filas)} periodo(s) por empresa.", filas)
+
+
+def reporte_periodo(args):
+    filas = db_manager.get_nomina_reporte_db(args.empresa, args.mes, args.anio)
+    return Resultado(True, f"{len(filas)} recibo(s) en el periodo.", filas)
+
+
+def reporte_detalle(args):
+    filas = db_manager.get_nomina_generada_detalle_db(args.nomina)
+    return Resultado(True, f"{len(filas)} recibo(s) en la nómina {args.nomina}.", filas)
+
+
+def reporte_recibos(args):
+    # Generador: en jsonl y csv las filas salen sin cargar el periodo entero.
+    filas = db_manager.iterar_recibos_db(args.mes, args.anio, args.empresa, args.nomina)
+    return Resultado(True, "Recibos que cumplen los filtros.", filas)
+
+
+def reporte_exportar(args):
+    exito, mensaje = exportar.exportar_reporte(
+        args.reporte, args.salida, args.mes, args.anio, args.empresa, args.nomina
+    )
+    return Resultado(exito, mensaje)
+
+
+# --- CATÁLOGOS ---
+def catalogo_listar(args):
+    tabla, id_col, nombre_col = CATALOGOS[args.catalogo]
+    filas = db_manager.get_catalogo(tabla, id_col, nombre_col)
+    return Resultado(True, f"{len(filas)} elemento(s) en {tabla}.", filas)
+
+
+def catalogo_agregar(args):
+    tabla, _, nombre_col = CATALOGOS[args.catalogo]
+    return Resultado(*db_manager.crear_item_catalogo(tabla, nombre_col, args.nombre))
+
+
+def catalogo_renombrar(args):
+    tabla, id_col, nombre_col = CATALOGOS[args.catalogo]
+    return Resultado(
+        *db_manager.actualizar_item_catalogo(tabla, id_col, nombre_col, args.id, args.nombre)
+    )
+
+
+def catalogo_eliminar(args):
+    tabla, id_col, _ = CATALOGOS[args.catalogo]
+    return Resultado(*db_manager.eliminar_item_catalogo(tabla, id_col, args.id))
+
+
+# --- USUARIOS ---
+def usuarios_importar(args):
+    resultado = importar.importar_csv(args.tipo, args.archivo, args.lote)
+    errores = resultado["Errores"]
+    resumen = {
+        "Filas": resultado["Filas"],
+        "Importadas": resultado["Importadas"],
+        "Errores": len(errores),
+        "Segundos": round(resultado["Segundos"], 3),
+    }
+    mensaje = (
+        f"{resumen['Importadas']} de {resumen['Filas']} fila(s) importadas, "
+        f"{resumen['Errores']} con errores."
+    )
+    filas = [{"Linea": linea, "Error": error} for linea, error in errores]
+    return Resultado(not errores, mensaje, filas, resumen)
+
+
+def usuarios_exportar(args):
+    exito, mensaje = exportar.exportar_reporte(
+        args.tipo, args.salida, con_password=args.con_password
+    )
+    return Resultado(exito, mensaje)
+
+
+# --- MANTENIMIENTO ---
+def db_migrar(args):
+    # Abrir la primera conexión del pool aplica las migraciones pendientes.
+    with db_manager.get_db_connection() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+    esperada = len(db_manager.MIGRACIONES)
+    fila = {"Version": version, "Esperada": esperada}
+    if version < esperada:
+        return Resultado(False, "La base no tiene el esquema base cargado.", [fila])
+    return Resultado(True, f"Esquema en la versión {version}.", [fila])
+
+
+def db_tablas(args):
+    with db_manager.get_db_connection() as conn:
+        tablas = [
+            fila[0]
+            for fila in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )
+        ]
+        filas = [
+            {"Tabla": tabla, "Filas": conn.execute(f'SELECT COUNT(*) FROM "{tabla}"').fetchone()[0]}
+            for tabla in tablas
+        ]
+    return Resultado(True, f"{len(filas)} tabla(s).", filas)
+
+
+def db_integridad(args):
+    with db_manager.get_db_connection() as conn:
+        integridad = [fila[0] for fila in conn.execute("PRAGMA integrity_check")]
+        foraneas = conn.execute("PRAGMA foreign_key_check").fetchall()
+    filas = [{"Tipo": "integridad", "Detalle": d} for d in integridad if d != "ok"]
+    filas += [
+        {"Tipo": "clave foránea", "Detalle": f"{f[0]} fila {f[1]} -> {f[2]}"} for f in foraneas
+    ]
+    if filas:
+        return Resultado(False, f"{len(filas)} problema(s) de integridad.", filas)
+    return Resultado(True, "La base de datos está íntegra.")
+
+
+def db_optimizar(args):
+    with db_manager.get_db_connection() as conn:
+        antes = conn.execute("PRAGMA page_count").fetchone()[0]
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+        if args.vacuum:
+            conn.execute("VACUUM")
+        despues = conn.execute("PRAGMA page_count").fetchone()[0]
+    resumen = {"Paginas_Antes": antes, "Paginas_Despues": despues}
+    return Resultado(True, "Estadísticas actualizadas" + (" y base compactada." if args.vacuum else "."), (), resumen)
+
+
+def db_archivar(args):
+    exito, mensaje, filas = db_manager.archivar_nominas_db(args.meses)
+    return Resultado(exito, mensaje, filas)
+
+
+def db_archivos(args):
+    filas = db_manager.get_archivos_nomina_db()
+    return Resultado(True, f"{len(filas)} archivo(s) de nóminas.", filas)
+
+
+def db_verificar_resumen(args):
+    diferencias = db_manager.verificar_resumen_nominas_db(reconstruir=not args.solo_verificar)
+    filas = [
+        {"ID_Nomina": d[0], "Columna": d[1], "Guardado": d[2], "Calculado": d[3]}
+        for d in diferencias
+    ]
+    mensaje = f"{len(filas)} diferencia(s) en {len({d[0] for d in diferencias})} nómina(s)."
+    if not args.solo_verificar:
+        mensaje += " resumen_nominas reconstruida."
+    return Resultado(not diferencias, mensaje, filas)
+
+
+# --- SALIDA ---
+def _como_dict(fila):
+    return fila if isinstance(fila, dict) else dict(fila)
+
+
+def _a_json(valor):
+    return json.dumps(valor, ensure_ascii=False, default=str)
+
+
+def escribir(resultado, formato, comando, inicio, salida=sys.stdout, errores=sys.stderr):
+    filas = (_como_dict(fila) for fila in resultado.filas)
+    if formato == "json":
+        filas = list(filas)
+        salida.write(
+            _a_json(
+                {
+                    "comando": comando,
+                    "exito": resultado.exito,
+                    "mensaje": resultado.mensaje,
+                    "resumen": resultado.resumen,
+                    "filas": filas,
+                    "segundos": round(time.perf_counter() - inicio, 4),
+                }
+            )
+            + "\n"
+        )
+        return
+    if formato == "jsonl":
+        for fila in filas:
+            salida.write(_a_json(fila) + "\n")
+    else:
+        escritor, columnas = csv.writer(salida), None
+        for fila in filas:
+            if columnas is None:
+                columnas = list(fila)
+                escritor.writerow(columnas)
+            escritor.writerow("" if fila[c] is None else fila[c] for c in columnas)
+    errores.write(f"{resultado.mensaje} ({time.perf_counter() - inicio:.2f} s)\n")
+    if resultado.resumen:
+        errores.write(_a_json(resultado.resumen) + "\n")
+
+
+# --- ARGUMENTOS ---
+def _periodo(parser, obligatorio=True):
+    parser.add_argument("--mes", type=int, required=obligatorio, metavar="M")
+    parser.add_argument("--anio", type=int, required=obligatorio, metavar="A")
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=db_manager.DB_PATH)
+    parser.add_argument("--formato", choices=("json", "jsonl", "csv"), default="json")
+    grupos = parser.add_subparsers(dest="grupo", required=True)
+
+    def comandos(nombre, ayuda):
+        return grupos.add_parser(nombre, help=ayuda).add_subparsers(dest="accion", required=True)
+
+    nomina = comandos("nomina", "Generación y consulta de nóminas.")
+    p = nomina.add_parser("generar", help="Genera la nómina del periodo (todas las empresas o una).")
+    _periodo(p)
+    p.add_argument("--empresa", type=int, metavar="ID")
+    p.add_argument("--hilos", type=int, default=4, help="Hilos de cálculo al generar todas.")
+    p.set_defaults(funcion=nomina_generar)
+    p = nomina.add_parser("previsualizar", help="Calcula los recibos sin guardarlos.")
+    _periodo(p)
+    p.add_argument("--empresa", type=int, metavar="ID")
+    p.set_defaults(funcion=nomina_previsualizar)
+    nomina.add_parser("tasas", help="Lista las tasas de deducción.").set_defaults(funcion=nomina_tasas)
+    p = nomina.add_parser("registrar-tasa", help="Registra una tasa nueva desde una fecha.")
+    p.add_argument("concepto")
+    p.add_argument("tasa", type=float)
+    p.add_argument("desde", help="Fecha YYYY-MM-DD.")
+    p.add_argument("--tope", type=float, help="Tope de la base de cálculo.")
+    p.set_defaults(funcion=nomina_registrar_tasa)
+
+    reporte = comandos("reporte", "Reportes de nómina.")
+    reporte.add_parser("resumen", help="Totales por empresa y periodo.").set_defaults(
+        funcion=reporte_resumen
+    )
+    p = reporte.add_parser("periodo", help="Recibos de una empresa en un periodo.")
+    p.add_argument("--empresa", type=int, required=True, metavar="ID")
+    _periodo(p)
+    p.set_defaults(funcion=reporte_periodo)
+    p = reporte.add_parser("detalle", help="Recibos de una nómina generada.")
+    p.add_argument("--nomina", type=int, required=True, metavar="ID")
+    p.set_defaults(funcion=reporte_detalle)
+    for nombre, ayuda, funcion in (
+        ("recibos", "Recibos que cumplen los filtros (en streaming).", reporte_recibos),
+        ("exportar", "Exporta un reporte a CSV o XLSX.", reporte_exportar),
+    ):
+        p = reporte.add_parser(nombre, help=ayuda)
+        if nombre == "exportar":
+            p.add_argument("reporte", choices=("recibos", "resumen"))
+            p.add_argument("salida", help="Archivo .csv o .xlsx a crear.")
+        _periodo(p, obligatorio=False)
+        p.add_argument("--empresa", type=int, metavar="ID")
+        p.add_argument("--nomina", type=int, metavar="ID")
+        p.set_defaults(funcion=funcion)
+
+    catalogo = comandos("catalogo", "Mantenimiento de catálogos.")
+    for nombre, funcion, argumentos in (
+        ("listar", catalogo_listar, ()),
+        ("agregar", catalogo_agregar, ("nombre",)),
+        ("renombrar", catalogo_renombrar, ("id", "nombre")),
+        ("eliminar", catalogo_eliminar, ("id",)),
+    ):
+        p = catalogo.add_parser(nombre)
+        p.add_argument("catalogo", choices=sorted(CATALOGOS))
+        for argumento in argumentos:
+            p.add_argument(argumento, type=int if argumento == "id" else str)
+        p.set_defaults(funcion=funcion)
+
+    usuarios = comandos("usuarios", "Importación y exportación de usuarios.")
+    p = usuarios.add_parser("importar", help="Importa un CSV (ver importar.py).")
+    p.add_argument("tipo", choices=sorted(importar.IMPORTADORES))
+    p.add_argument("archivo")
+    p.add_argument("--lote", type=int, default=5000, help="Filas por transacción.")
+    p.set_defaults(funcion=usuarios_importar)
+    p = usuarios.add_parser("exportar", help="Exporta con las columnas de importar.py.")
+    p.add_argument("tipo", choices=("empresas", "postulantes"))
+    p.add_argument("salida", help="Archivo .csv o .xlsx a crear.")
+    p.add_argument("--con-password", action="store_true", help="Incluir la contraseña.")
+    p.set_defaults(funcion=usuarios_exportar)
+
+    base = comandos("db", "Mantenimiento de la base de datos.")
+    base.add_parser("migrar", help="Aplica las migraciones pendientes.").set_defaults(funcion=db_migrar)
+    base.add_parser("tablas", help="Filas de cada tabla.").set_defaults(funcion=db_tablas)
+    base.add_parser("integridad", help="integrity_check y foreign_key_check.").set_defaults(
+        funcion=db_integridad
+    )
+    p = base.add_parser("optimizar", help="ANALYZE y PRAGMA optimize.")
+    p.add_argument("--vacuum", action="store_true", help="Compactar además el archivo.")
+    p.set_defaults(funcion=db_optimizar)
+    p = base.add_parser("verificar-resumen", help="Verifica y reconstruye resumen_nominas.")
+    p.add_argument("--solo-verificar", action="store_true")
+    p.set_defaults(funcion=db_verificar_resumen)
+    p = base.add_parser("archivar", help="Mueve las nóminas viejas a archivos por año.")
+    p.add_argument("--meses", type=int, default=24, help="Horizonte: se archiva lo anterior.")
+    p.set_defaults(funcion=db_archivar)
+    base.add_parser("archivos", help="Archivos de nóminas por año.").set_defaults(funcion=db_archivos)
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if os.environ.get("HIRING_GROUP_INSTRUMENTAR", "") not in ("", "0"):
+        import instrumentacion
+
+        instrumentacion.activar_desde_entorno()
+    db_manager.configurar_base_datos(args.db)
+    comando = f"{args.grupo} {args.accion}"
+    inicio = time.perf_counter()
+    try:
+        resultado = args.funcion(args)
+        escribir(resultado, args.formato, comando, inicio)
+    except BrokenPipeError:
+        # Quien leía la salida (head, por ejemplo) la cerró antes de tiempo.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError, sqlite3.Error) as e:
+        resultado = Resultado(False, f"Error: {e}")
+        escribir(resultado, args.formato, comando, inicio)
+    return 0 if resultado.exito else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
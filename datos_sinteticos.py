@@ -0,0 +1,306 @@
+"""
+Generador determinista de bases de datos sintéticas con el esquema de
+hiring_group.sql, pensado para pruebas de rendimiento a distintas escalas.
+La misma semilla y los mismos parámetros producen siempre los mismos datos.
+"""
+
+import os
+import random
+import sqlite3
+
+RUTA_ESQUEMA = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "hiring_group.sql"
+)
+
+NOMBRES = (
+    "Ana", "Carlos", "María", "José", "Luis", "Carmen", "Pedro", "Lucía",
+    "Jorge", "Valentina", "Miguel", "Gabriela", "Andrés", "Daniela", "Rafael",
+)
+APELLIDOS = (
+    "González", "Rodríguez", "Pérez", "Hernández", "García", "Martínez",
+    "López", "Díaz", "Ramírez", "Torres", "Rojas", "Castillo", "Medina",
+)
+AREAS = (
+    "Tecnología", "Salud", "Finanzas", "Ingeniería", "Educación",
+    "Mercadeo", "Logística", "Derecho",
+)
+CARGOS = (
+    "Analista", "Desarrollador", "Gerente", "Asistente", "Coordinador",
+    "Especialista", "Supervisor", "Consultor", "Técnico", "Director",
+)
+HABILIDADES = (
+    "python", "sql", "contabilidad", "ventas", "redes", "docencia", "auditoría",
+    "logística", "soporte", "diseño", "mantenimiento", "nómina", "java",
+)
+BANCOS = ("Banesco", "Bancamiga", "Banco de Venezuela", "Mercantil", "Provincial")
+TIPOS_CONTRATO = ("Un mes", "Seis meses", "Un año", "Indefinido")
+
+
+def aplicar_esquema(conn):
+    with open(RUTA_ESQUEMA, encoding="utf-8") as archivo:
+        conn.executescript(archivo.read())
+
+
+def volumenes_por_escala(postulantes):
+    """
+    Volúmenes proporcionales a la cantidad de postulantes, con las mismas
+    relaciones que los valores por defecto de crear_base_sintetica (una
+    empresa por cada 100 postulantes, una vacante por cada 4, etc.).
+    """
+    return {
+        "empresas": max(5, postulantes // 100),
+        "postulantes": postulantes,
+        "vacantes": max(10, postulantes // 4),
+        "postulaciones": postulantes * 2,
+        "contratos": postulantes // 2,
+    }
+
+
+def crear_base_sintetica(
+    ruta,
+    empresas=20,
+    postulantes=2000,
+    vacantes=500,
+    postulaciones=4000,
+    contratos=1000,
+    meses_nomina=3,
+    experiencias_por_postulante=2,
+    semilla=1234,
+):
+    """
+    Crea (o reemplaza) la base de datos en 'ruta' con los volúmenes pedidos.
+    Las nóminas se generan para 'meses_nomina' meses a partir de enero de 2024
+    con el mismo cálculo que ejecutar_nomina_db. Devuelve un diccionario con
+    la cantidad de filas insertadas por tabla.
+    """
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    rng = random.Random(semilla)
+    postulaciones = min(postulaciones, postulantes * vacantes)
+    contratos = min(contratos, postulaciones)
+
+    conn = sqlite3.connect(ruta)
+    try:
+        aplicar_esquema(conn)
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        conn.execute("BEGIN")
+
+        conn.executemany(
+            "INSERT INTO Areas_Conocimiento (ID_Area_Conocimiento, Nombre_Area) VALUES (?, ?)",
+            enumerate(AREAS, start=1),
+        )
+        profesiones = []
+        for id_area, area in enumerate(AREAS, start=1):
+            for cargo in CARGOS:
+                profesiones.append((len(profesiones) + 1, f"{cargo} de {area}", id_area))
+        conn.executemany(
+            "INSERT INTO Profesiones (ID_Profesion, Nombre_Profesion, ID_Area_Conocimiento) VALUES (?, ?, ?)",
+            profesiones,
+        )
+        conn.executemany(
+            "INSERT INTO Universidades (ID_Universidad, Nombre_Universidad) VALUES (?, ?)",
+            ((i, f"Universidad {i}") for i in range(1, 11)),
+        )
+        conn.executemany(
+            "INSERT INTO Bancos (ID_Banco, Nombre_Banco) VALUES (?, ?)",
+            enumerate(BANCOS, start=1),
+        )
+
+        # Usuario 1 es el administrador; luego empresas y postulantes.
+        ids_empresas = range(2, empresas + 2)
+        ids_postulantes = range(empresas + 2, empresas + 2 + postulantes)
+        usuarios = [(1, "admin@hiring.com", "admin", "HiringGroup")]
+        usuarios += [(i, f"empresa{i}@correo.com", "clave", "Empresa") for i in ids_empresas]
+        usuarios += [
+            (i, f"postulante{i}@correo.com", "clave", "Postulante")
+            for i in ids_postulantes
+        ]
+        conn.executemany(
+            "INSERT INTO Usuarios (ID_Usuario, Email, Password, Tipo_Usuario, Fecha_Creacion) VALUES (?, ?, ?, ?, '2023-01-01 08:00:00')",
+            usuarios,
+        )
+        conn.executemany(
+            "INSERT INTO Empresas (ID_Empresa, Nombre_Empresa, RIF, Sector_Industrial, Persona_Contacto, Telefono_Contacto, Email_Contacto) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    i,
+                    f"Empresa {i}",
+                    f"J-{i:08d}",
+                    rng.choice(AREAS),
+                    f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}",
+                    f"0212{rng.randrange(10**7):07d}",
+                    f"contacto{i}@correo.com",
+                )
+                for i in ids_empresas
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO Postulantes (ID_Postulante, Nombres, Apellidos, Cedula_Identidad, Telefono, ID_Universidad) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    i,
+                    rng.choice(NOMBRES),
+                    f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}",
+                    str(10_000_000 + i),
+                    f"0414{rng.randrange(10**7):07d}",
+                    rng.randint(1, 10),
+                )
+                for i in ids_postulantes
+            ),
+        )
+        experiencias = []
+        for i in ids_postulantes:
+            for _ in range(experiencias_por_postulante):
+                anio_inicio = rng.randint(2005, 2020)
+                experiencias.append(
+                    (
+                        i,
+                        f"Compañía {rng.randint(1, 500)}",
+                        rng.choice(CARGOS),
+                        f"{anio_inicio}-{rng.randint(1, 12):02d}-01",
+                        f"{anio_inicio + rng.randint(1, 3)}-{rng.randint(1, 12):02d}-01",
+                        " ".join(rng.sample(HABILIDADES, 3)),
+                    )
+                )
+        conn.executemany(
+            "INSERT INTO Experiencias_Laborales (ID_Postulante, Empresa, Cargo_Ocupado, Fecha_Inicio, Fecha_Fin, Descripcion) VALUES (?, ?, ?, ?, ?, ?)",
+            experiencias,
+        )
+
+        salarios = {}
+        filas_vacantes = []
+        for i in range(1, vacantes + 1):
+            id_profesion, nombre_profesion, _ = rng.choice(profesiones)
+            salarios[i] = round(rng.uniform(300, 5000), 2)
+            filas_vacantes.append(
+                (
+                    i,
+                    rng.choice(ids_empresas),
+                    nombre_profesion,
+                    f"Se busca {nombre_profesion.lower()} con experiencia en "
+                    + ", ".join(rng.sample(HABILIDADES, 3)),
+                    salarios[i],
+                    id_profesion,
+                    f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 09:00:00",
+                    rng.choices(("Activa", "Inactiva", "Cerrada"), (8, 1, 1))[0],
+                )
+            )
+        conn.executemany(
+            "INSERT INTO Vacantes (ID_Vacante, ID_Empresa, Cargo_Vacante, Descripcion_Perfil, Salario_Ofrecido, ID_Profesion, Fecha_Publicacion, Estatus) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            filas_vacantes,
+        )
+
+        pares = set()
+        while len(pares) < postulaciones:
+            pares.add(
+                (rng.randrange(ids_postulantes.start, ids_postulantes.stop), rng.randint(1, vacantes))
+            )
+        pares = sorted(pares)
+        contratadas = set(rng.sample(range(len(pares)), contratos))
+        filas_postulaciones, filas_contratos = [], []
+        for id_postulacion, (id_postulante, id_vacante) in enumerate(pares, start=1):
+            fecha = f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00"
+            if id_postulacion - 1 in contratadas:
+                estatus = "Aceptada"
+                filas_contratos.append(
+                    (
+                        id_postulacion,
+                        fecha[:10],
+                        rng.choice(TIPOS_CONTRATO),
+                        salarios[id_vacante],
+                        rng.choice(("O+", "O-", "A+", "B+", "AB+")),
+                        f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}",
+                        f"0416{rng.randrange(10**7):07d}",
+                        f"0134{rng.randrange(10**16):016d}",
+                        rng.randint(1, len(BANCOS)),
+                        rng.choices(("Activo", "Finalizado"), (9, 1))[0],
+                    )
+                )
+            else:
+                estatus = rng.choice(("Recibida", "En Revision", "Rechazada"))
+            filas_postulaciones.append(
+                (id_postulacion, id_postulante, id_vacante, fecha, estatus)
+            )
+        conn.executemany(
+            "INSERT INTO Postulaciones (ID_Postulacion, ID_Postulante, ID_Vacante, Fecha_Postulacion, Estatus) VALUES (?, ?, ?, ?, ?)",
+            filas_postulaciones,
+        )
+        conn.executemany(
+            "INSERT INTO Contratos (ID_Postulacion, Fecha_Contratacion, Tipo_Contrato, Salario_Acordado, Tipo_Sangre, Contacto_Emergencia_Nombre, Contacto_Emergencia_Telefono, Numero_Cuenta, ID_Banco, Estatus) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            filas_contratos,
+        )
+
+        for mes in range(1, meses_nomina + 1):
+            anio, mes_real = 2024 + (mes - 1) // 12, (mes - 1) % 12 + 1
+            conn.execute(
+                """INSERT INTO Nominas (ID_Empresa, Mes, Anio, Fecha_Generacion)
+                   SELECT DISTINCT v.ID_Empresa, ?, ?, ? FROM Contratos c
+                   JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
+                   JOIN Vacantes v ON post.ID_Vacante = v.ID_Vacante WHERE c.Estatus = 'Activo'""",
+                (mes_real, anio, f"{anio}-{mes_real:02d}-28 12:00:00"),
+            )
+            conn.execute(
+                """INSERT INTO Recibos (ID_Nomina, ID_Contrato, Salario_Base, Monto_Deduccion_INCES, Monto_Deduccion_IVSS,
+                   Comision_Hiring_Group, Salario_Neto_Pagado, Fecha_Pago)
+                   SELECT n.ID_Nomina, c.ID_Contrato, c.Salario_Acordado, c.Salario_Acordado * 0.005, c.Salario_Acordado * 0.01,
+                   c.Salario_Acordado * 0.02, c.Salario_Acordado - c.Salario_Acordado * 0.005 - c.Salario_Acordado * 0.01, ?
+                   FROM Contratos c JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
+                   JOIN Vacantes v ON post.ID_Vacante = v.ID_Vacante
+                   JOIN Nominas n ON n.ID_Empresa = v.ID_Empresa AND n.Mes = ? AND n.Anio = ?
+                   WHERE c.Estatus = 'Activo' ORDER BY c.ID_Contrato""",
+                (f"{anio}-{mes_real:02d}-28", mes_real, anio),
+            )
+        conn.commit()
+        conn.execute("ANALYZE")
+
+        tablas = (
+            "Usuarios", "Empresas", "Postulantes", "Experiencias_Laborales",
+            "Vacantes", "Postulaciones", "Contratos", "Nominas", "Recibos",
+        )
+        return {
+            tabla: conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+            for tabla in tablas
+        }
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Genera una base de datos sintética.")
+    parser.add_argument("ruta")
+    parser.add_argument(
+        "--escala",
+        type=int,
+        help="Cantidad de postulantes; el resto de volúmenes se calcula en proporción.",
+    )
+    parser.add_argument("--empresas", type=int, default=20)
+    parser.add_argument("--postulantes", type=int, default=2000)
+    parser.add_argument("--vacantes", type=int, default=500)
+    parser.add_argument("--postulaciones", type=int, default=4000)
+    parser.add_argument("--contratos", type=int, default=1000)
+    parser.add_argument("--meses-nomina", type=int, default=3)
+    parser.add_argument("--experiencias", type=int, default=2, help="Por postulante.")
+    parser.add_argument("--semilla", type=int, default=1234)
+    args = parser.parse_args()
+    if args.escala:
+        volumenes = volumenes_por_escala(args.escala)
+    else:
+        volumenes = {
+            "empresas": args.empresas,
+            "postulantes": args.postulantes,
+            "vacantes": args.vacantes,
+            "postulaciones": args.postulaciones,
+            "contratos": args.contratos,
+        }
+    conteos = crear_base_sintetica(
+        args.ruta,
+        meses_nomina=args.meses_nomina,
+        experiencias_por_postulante=args.experiencias,
+        semilla=args.semilla,
+        **volumenes,
+    )
+    print(json.dumps(conteos, indent=2, ensure_ascii=False))
@@ -0,0 +1,244 @@
+"""
+Versión asyncio de las operaciones de db_manager. Cada función de este
+módulo tiene el mismo nombre, los mismos parámetros y el mismo resultado que
+su equivalente en db_manager, pero es una corrutina:
+
+    resultado = await db_async.get_active_vacantes_pagina(texto="python")
+
+Las lecturas corren en un grupo acotado de hilos, cada uno con su propia
+conexión. Todas las escrituras pasan por un único hilo escritor, de modo que
+nunca hay dos transacciones de escritura compitiendo por el archivo y
+cientos de corrutinas pueden compartirlo sin errores "database is locked".
+
+Con configurar(wal=True) la base de datos se pasa además a modo WAL, para
+que las lecturas no esperen al escritor ni lo bloqueen. Es un cambio
+permanente del archivo, que afecta a todos sus clientes (la aplicación,
+cli.py, servidor.py, la instantánea de reportes): por eso no se hace si no
+se pide. Sin WAL, las lecturas y el escritor se turnan (ver TurnoEscritura).
+"""
+
+import asyncio
+import atexit
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import db_manager
+
+
+# --- EJECUTOR ---
+class TurnoEscritura:
+    """
+    Lecturas en paralelo o una escritura sola, en orden de llegada. Sin WAL,
+    SQLite no deja leer mientras se confirma una escritura: con el escritor
+    confirmando una detrás de otra, un lector que reintenta con el busy
+    timeout puede no encontrar nunca el hueco y terminar en "database is
+    locked". Con el turno, el escritor espera a las lecturas en curso y las
+    nuevas esperan a que termine la escritura.
+    """
+
+    def __init__(self):
+        self._llegada = threading.Lock()
+        self._sin_lectores = threading.Condition()
+        self._lectores = 0
+
+    @contextmanager
+    def lectura(self):
+        with self._llegada:
+            with self._sin_lectores:
+                self._lectores += 1
+        try:
+            yield
+        finally:
+            with self._sin_lectores:
+                self._lectores -= 1
+                if not self._lectores:
+                    self._sin_lectores.notify_all()
+
+    @contextmanager
+    def escritura(self):
+        with self._llegada:
+            with self._sin_lectores:
+                while self._lectores:
+                    self._sin_lectores.wait()
+            yield
+
+
+class EjecutorBD:
+    """
+    Corre funciones de db_manager en hilos con conexión propia: 'lectores'
+    hilos para consultas y uno solo para escrituras. Las llamadas que
+    exceden la capacidad esperan en la cola del ejecutor correspondiente.
+    """
+
+    def __init__(self, lectores=4, timeout=10, wal=False):
+        # Siempre el archivo de db_manager: ejecutar_nomina_lote_db calcula
+        # los recibos en hilos propios que usan el pool global.
+        self.ruta = db_manager.DB_PATH
+        # Pool dedicado: una conexión por hilo, retenida mientras el hilo viva.
+        self._pool = db_manager.PoolConexiones(
+            self.ruta, max_conexiones=lectores + 1, timeout=timeout
+        )
+        conn = self._pool.obtener()
+        try:
+            if wal:
+                conn.execute("PRAGMA journal_mode = WAL")
+            modo = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        finally:
+            self._pool.devolver(conn)
+        # En WAL las lecturas no compiten con el escritor y no hace falta turno.
+        self._turno = None if modo.lower() == "wal" else TurnoEscritura()
+        self._conexiones = []
+        self._lock = threading.Lock()
+        self._lectores = ThreadPoolExecutor(
+            max_workers=lectores,
+            thread_name_prefix="db_lector",
+            initializer=self._abrir_conexion,
+        )
+        self._escritor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="db_escritor",
+            initializer=self._abrir_conexion,
+        )
+
+    def _abrir_conexion(self):
+        conn = self._pool.obtener()
+        with self._lock:
+            self._conexiones.append(conn)
+        db_manager.fijar_conexion_del_hilo(conn)
+
+    async def _ejecutar(self, ejecutor, funcion, args, kwargs, turno=None):
+        loop = asyncio.get_running_loop()
+        llamada = functools.partial(funcion, *args, **kwargs)
+        if turno is not None:
+            llamada = functools.partial(self._en_turno, turno, llamada)
+        return await loop.run_in_executor(ejecutor, llamada)
+
+    @staticmethod
+    def _en_turno(turno, llamada):
+        with turno():
+            return llamada()
+
+    async def leer(self, funcion, *args, **kwargs):
+        """Ejecuta una función de solo lectura en uno de los hilos lectores."""
+        turno = self._turno and self._turno.lectura
+        return await self._ejecutar(self._lectores, funcion, args, kwargs, turno)
+
+    async def escribir(self, funcion, *args, **kwargs):
+        """Ejecuta una función que modifica datos en el hilo escritor."""
+        turno = self._turno and self._turno.escritura
+        return await self._ejecutar(self._escritor, funcion, args, kwargs, turno)
+
+    def cerrar(self):
+        """Espera a las llamadas en curso y cierra las conexiones."""
+        self._lectores.shutdown(wait=True, cancel_futures=True)
+        self._escritor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            conexiones, self._conexiones = self._conexiones, []
+        for conn in conexiones:
+            self._pool.devolver(conn)
+        self._pool.cerrar()
+
+
+_ejecutor = None
+_ejecutor_lock = threading.Lock()
+
+
+def get_ejecutor():
+    global _ejecutor
+    with _ejecutor_lock:
+        if _ejecutor is None:
+            _ejecutor = EjecutorBD()
+        return _ejecutor
+
+
+def configurar(lectores=4, timeout=10, wal=False):
+    """
+    Reinicia el ejecutor con 'lectores' hilos de lectura sobre la base de
+    datos actual de db_manager (ver db_manager.configurar_base_datos). Con
+    wal=True pasa el archivo a modo WAL (ver el comentario del módulo).
+    """
+    global _ejecutor
+    with _ejecutor_lock:
+        if _ejecutor is not None:
+            _ejecutor.cerrar()
+        _ejecutor = EjecutorBD(lectores, timeout, wal)
+
+
+def cerrar_sincrono():
+    global _ejecutor
+    with _ejecutor_lock:
+        if _ejecutor is not None:
+            _ejecutor.cerrar()
+            _ejecutor = None
+
+
+async def cerrar():
+    """Cierra el ejecutor sin bloquear el bucle de eventos."""
+    await asyncio.to_thread(cerrar_sincrono)
+
+
+atexit.register(cerrar_sincrono)
+
+
+# La función se busca en db_manager en cada llamada (y no al importar este
+# módulo) para respetar los reemplazos posteriores, como los de
+# instrumentacion.activar().
+def _lectura(funcion):
+    @functools.wraps(funcion)
+    async def envoltura(*args, **kwargs):
+        actual = getattr(db_manager, funcion.__name__)
+        return await get_ejecutor().leer(actual, *args, **kwargs)
+
+    return envoltura
+
+
+def _escritura(funcion):
+    @functools.wraps(funcion)
+    async def envoltura(*args, **kwargs):
+        actual = getattr(db_manager, funcion.__name__)
+        return await get_ejecutor().escribir(actual, *args, **kwargs)
+
+    return envoltura
+
+
+# --- LECTURAS ---
+login_usuario = _lectura(db_manager.login_usuario)
+hay_usuarios_registrados = _lectura(db_manager.hay_usuarios_registrados)
+get_catalogo = _lectura(db_manager.get_catalogo)
+get_tasas_nomina_db = _lectura(db_manager.get_tasas_nomina_db)
+previsualizar_nomina_db = _lectura(db_manager.previsualizar_nomina_db)
+get_active_vacantes = _lectura(db_manager.get_active_vacantes)
+get_active_vacantes_pagina = _lectura(db_manager.get_active_vacantes_pagina)
+get_postulaciones_para_contratar = _lectura(db_manager.get_postulaciones_para_contratar)
+buscar_postulantes_db = _lectura(db_manager.buscar_postulantes_db)
+get_vacantes_por_empresa = _lectura(db_manager.get_vacantes_por_empresa)
+get_postulaciones_por_postulante = _lectura(db_manager.get_postulaciones_por_postulante)
+get_recibos_por_contratado = _lectura(db_manager.get_recibos_por_contratado)
+get_datos_constancia = _lectura(db_manager.get_datos_constancia)
+get_nomina_reporte_db = _lectura(db_manager.get_nomina_reporte_db)
+get_toda_nomina_reporte_db = _lectura(db_manager.get_toda_nomina_reporte_db)
+get_nomina_generada_detalle_db = _lectura(db_manager.get_nomina_generada_detalle_db)
+get_experiencias_db = _lectura(db_manager.get_experiencias_db)
+get_single_postulante = _lectura(db_manager.get_single_postulante)
+get_single_empresa = _lectura(db_manager.get_single_empresa)
+
+# --- ESCRITURAS ---
+crear_item_catalogo = _escritura(db_manager.crear_item_catalogo)
+actualizar_item_catalogo = _escritura(db_manager.actualizar_item_catalogo)
+eliminar_item_catalogo = _escritura(db_manager.eliminar_item_catalogo)
+registrar_usuario_db = _escritura(db_manager.registrar_usuario_db)
+actualizar_usuario_db = _escritura(db_manager.actualizar_usuario_db)
+eliminar_usuario_db = _escritura(db_manager.eliminar_usuario_db)
+crear_vacante_db = _escritura(db_manager.crear_vacante_db)
+actualizar_vacante_db = _escritura(db_manager.actualizar_vacante_db)
+eliminar_vacante_db = _escritura(db_manager.eliminar_vacante_db)
+aplicar_a_vacante_db = _escritura(db_manager.aplicar_a_vacante_db)
+contratar_postulante_db = _escritura(db_manager.contratar_postulante_db)
+crear_experiencia_db = _escritura(db_manager.crear_experiencia_db)
+eliminar_experiencia_db = _escritura(db_manager.eliminar_experiencia_db)
+registrar_tasa_nomina_db = _escritura(db_manager.registrar_tasa_nomina_db)
+ejecutar_nomina_db = _escritura(db_manager.ejecutar_nomina_db)
+ejecutar_nomina_lote_db = _escritura(db_manager.ejecutar_nomina_lote_db)
+verificar_resumen_nominas_db = _escritura(db_manager.verificar_resumen_nominas_db)
@@ -1,27 +1,1275 @@
+import os
+import pathlib
+import re
+import shutil
 import sqlite3
-from datetime import datetime
+import sys
+import tempfile
+import threading
+import time
+import atexit
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
 from contextlib import contextmanager
 
+import calculo_nomina
+
+DB_PATH = os.environ.get("HIRING_GROUP_DB", "hiring_group.db")
+
+
+# --- MIGRACIONES DEL ESQUEMA ---
+# Rehace la fila de postulantes_fts de un candidato: datos personales más el
+# texto de todas sus experiencias laborales.
+SQL_REFRESCAR_POSTULANTE_FTS = """DELETE FROM postulantes_fts WHERE rowid = {id};
+              INSERT INTO postulantes_fts (rowid, Nombres, Apellidos, Cedula_Identidad, Experiencia)
+              SELECT p.ID_Postulante, p.Nombres, p.Apellidos, p.Cedula_Identidad,
+                     (SELECT group_concat(e.Empresa || ' ' || e.Cargo_Ocupado || ' ' || coalesce(e.Descripcion, ''), ' ')
+                      FROM experiencias_laborales e WHERE e.ID_Postulante = p.ID_Postulante)
+              FROM postulantes p WHERE p.ID_Postulante = {id};"""
+
+# Suma o resta un contrato al usuario dueño de la postulación si el contrato
+# está activo.
+SQL_SUMAR_CONTRATO_ACTIVO = """UPDATE usuarios SET Contratos_Activos = Contratos_Activos {signo} 1
+              WHERE {contrato}.Estatus = 'Activo'
+                AND ID_Usuario = (SELECT ID_Postulante FROM postulaciones
+                                  WHERE ID_Postulacion = {contrato}.ID_Postulacion);"""
+# Traslada los contratos activos de una postulación entre postulantes.
+SQL_MOVER_CONTRATOS_ACTIVOS = """UPDATE usuarios SET Contratos_Activos = Contratos_Activos {signo}
+                (SELECT COUNT(*) FROM contratos WHERE ID_Postulacion = new.ID_Postulacion AND Estatus = 'Activo')
+              WHERE ID_Usuario = {postulacion}.ID_Postulante;"""
+
+# Acumulan un recibo (new) en el resumen de su nómina o lo descuentan (old);
+# el resumen de una nómina sin recibos se elimina.
+SQL_SUMAR_RECIBO_RESUMEN = """INSERT INTO resumen_nominas (ID_Nomina, Empleados, Total_Salario_Base,
+                Total_INCES, Total_IVSS, Total_Comision, Total_Neto)
+              VALUES (new.ID_Nomina, 1, new.Salario_Base, new.Monto_Deduccion_INCES,
+                      new.Monto_Deduccion_IVSS, new.Comision_Hiring_Group, new.Salario_Neto_Pagado)
+              ON CONFLICT (ID_Nomina) DO UPDATE SET
+                Empleados = Empleados + 1,
+                Total_Salario_Base = Total_Salario_Base + excluded.Total_Salario_Base,
+                Total_INCES = Total_INCES + excluded.Total_INCES,
+                Total_IVSS = Total_IVSS + excluded.Total_IVSS,
+                Total_Comision = Total_Comision + excluded.Total_Comision,
+                Total_Neto = Total_Neto + excluded.Total_Neto;"""
+SQL_RESTAR_RECIBO_RESUMEN = """UPDATE resumen_nominas SET
+                Empleados = Empleados - 1,
+                Total_Salario_Base = Total_Salario_Base - old.Salario_Base,
+                Total_INCES = Total_INCES - old.Monto_Deduccion_INCES,
+                Total_IVSS = Total_IVSS - old.Monto_Deduccion_IVSS,
+                Total_Comision = Total_Comision - old.Comision_Hiring_Group,
+                Total_Neto = Total_Neto - old.Salario_Neto_Pagado
+              WHERE ID_Nomina = old.ID_Nomina;
+              DELETE FROM resumen_nominas WHERE ID_Nomina = old.ID_Nomina AND Empleados <= 0;"""
+# El resumen calculado desde cero, con las columnas de resumen_nominas.
+SQL_CALCULAR_RESUMEN_NOMINAS = """SELECT ID_Nomina, COUNT(*), SUM(Salario_Base), SUM(Monto_Deduccion_INCES),
+              SUM(Monto_Deduccion_IVSS), SUM(Comision_Hiring_Group), SUM(Salario_Neto_Pagado)
+              FROM recibos GROUP BY ID_Nomina"""
+
+# Tablas con contador de cambios en versiones_tablas (ver get_version_datos).
+# Las tablas FTS y resumen_nominas se derivan de otras y no llevan uno propio.
+# El de recibos lo suben los triggers de nominas (migración 10).
+TABLAS_VERSIONADAS = (
+    "usuarios",
+    "empresas",
+    "postulantes",
+    "experiencias_laborales",
+    "vacantes",
+    "postulaciones",
+    "contratos",
+    "nominas",
+    "recibos",
+    "areas_conocimiento",
+    "profesiones",
+    "universidades",
+    "bancos",
+    "tasas_nomina",
+    "archivos_nomina",
+)
+SQL_SUBIR_VERSION_TABLA = "UPDATE versiones_tablas SET Version = Version + 1 WHERE Tabla = '{tabla}';"
+
+# hiring_group.sql es el esquema base (versión 0). Cada entrada de MIGRACIONES
+# lleva la base de datos a la versión siguiente (PRAGMA user_version) y se
+# aplica automáticamente la primera vez que el pool abre una conexión.
+MIGRACIONES = [
+    # 1: Tasas de nómina configurables con vigencia y tope.
+    [
+        """CREATE TABLE IF NOT EXISTS `tasas_nomina` (
+          `ID_Tasa` INTEGER PRIMARY KEY,
+          `Concepto` TEXT NOT NULL CHECK(`Concepto` IN ('INCES','IVSS','Comision_Hiring_Group')),
+          `Tasa` REAL NOT NULL CHECK(`Tasa` >= 0),
+          `Tope_Base` REAL DEFAULT NULL,
+          `Fecha_Desde` TEXT NOT NULL,
+          `Fecha_Hasta` TEXT DEFAULT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_tasas_nomina_concepto ON tasas_nomina(Concepto, Fecha_Desde)",
+        """INSERT INTO tasas_nomina (Concepto, Tasa, Fecha_Desde) VALUES
+           ('INCES', 0.005, '2000-01-01'), ('IVSS', 0.01, '2000-01-01'),
+           ('Comision_Hiring_Group', 0.02, '2000-01-01')""",
+    ],
+    # 2: Índices detectados por auditoria_indices.py.
+    [
+        "CREATE INDEX IF NOT EXISTS idx_recibos_nomina ON recibos(ID_Nomina)",
+        "CREATE INDEX IF NOT EXISTS idx_experiencias_postulante ON experiencias_laborales(ID_Postulante, Fecha_Inicio)",
+        "CREATE INDEX IF NOT EXISTS idx_postulaciones_postulante_fecha ON postulaciones(ID_Postulante, Fecha_Postulacion)",
+        """CREATE INDEX IF NOT EXISTS idx_postulaciones_pendientes ON postulaciones(ID_Postulante, ID_Vacante)
+           WHERE Estatus IN ('Recibida', 'En Revision')""",
+        """CREATE INDEX IF NOT EXISTS idx_vacantes_activas_salario ON vacantes(Salario_Ofrecido, ID_Vacante)
+           WHERE Estatus = 'Activa'""",
+        "CREATE INDEX IF NOT EXISTS idx_vacantes_profesion ON vacantes(ID_Profesion)",
+        "CREATE INDEX IF NOT EXISTS idx_empresas_nombre ON empresas(Nombre_Empresa)",
+    ],
+    # 3: Búsqueda de texto completo sobre cargo y descripción de las vacantes.
+    [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS vacantes_fts USING fts5(
+          Cargo_Vacante, Descripcion_Perfil,
+          content='vacantes', content_rowid='ID_Vacante',
+          tokenize='unicode61 remove_diacritics 2'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS trg_vacantes_fts_insert AFTER INSERT ON vacantes BEGIN
+          INSERT INTO vacantes_fts (rowid, Cargo_Vacante, Descripcion_Perfil)
+          VALUES (new.ID_Vacante, new.Cargo_Vacante, new.Descripcion_Perfil);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_vacantes_fts_delete AFTER DELETE ON vacantes BEGIN
+          INSERT INTO vacantes_fts (vacantes_fts, rowid, Cargo_Vacante, Descripcion_Perfil)
+          VALUES ('delete', old.ID_Vacante, old.Cargo_Vacante, old.Descripcion_Perfil);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_vacantes_fts_update
+          AFTER UPDATE OF Cargo_Vacante, Descripcion_Perfil ON vacantes BEGIN
+          INSERT INTO vacantes_fts (vacantes_fts, rowid, Cargo_Vacante, Descripcion_Perfil)
+          VALUES ('delete', old.ID_Vacante, old.Cargo_Vacante, old.Descripcion_Perfil);
+          INSERT INTO vacantes_fts (rowid, Cargo_Vacante, Descripcion_Perfil)
+          VALUES (new.ID_Vacante, new.Cargo_Vacante, new.Descripcion_Perfil);
+        END""",
+        "INSERT INTO vacantes_fts (vacantes_fts) VALUES ('rebuild')",
+    ],
+    # 4: Búsqueda de candidatos por datos personales y experiencia laboral.
+    [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS postulantes_fts USING fts5(
+          Nombres, Apellidos, Cedula_Identidad, Experiencia,
+          tokenize='unicode61 remove_diacritics 2'
+        )""",
+        *[
+            f"""CREATE TRIGGER IF NOT EXISTS {nombre} {evento} BEGIN
+              {SQL_REFRESCAR_POSTULANTE_FTS.format(id=id_postulante)}
+            END"""
+            for nombre, evento, id_postulante in (
+                ("trg_postulantes_fts_insert", "AFTER INSERT ON postulantes", "new.ID_Postulante"),
+                (
+                    "trg_postulantes_fts_update",
+                    "AFTER UPDATE OF Nombres, Apellidos, Cedula_Identidad ON postulantes",
+                    "new.ID_Postulante",
+                ),
+                ("trg_postulantes_fts_delete", "AFTER DELETE ON postulantes", "old.ID_Postulante"),
+                ("trg_experiencias_fts_insert", "AFTER INSERT ON experiencias_laborales", "new.ID_Postulante"),
+                (
+                    "trg_experiencias_fts_update",
+                    "AFTER UPDATE ON experiencias_laborales",
+                    "new.ID_Postulante",
+                ),
+                ("trg_experiencias_fts_delete", "AFTER DELETE ON experiencias_laborales", "old.ID_Postulante"),
+                (
+                    "trg_experiencias_fts_mover",
+                    "AFTER UPDATE OF ID_Postulante ON experiencias_laborales"
+                    " WHEN old.ID_Postulante <> new.ID_Postulante",
+                    "old.ID_Postulante",
+                ),
+            )
+        ],
+        """INSERT INTO postulantes_fts (rowid, Nombres, Apellidos, Cedula_Identidad, Experiencia)
+           SELECT p.ID_Postulante, p.Nombres, p.Apellidos, p.Cedula_Identidad, x.Experiencia
+           FROM postulantes p LEFT JOIN (
+             SELECT ID_Postulante,
+                    group_concat(Empresa || ' ' || Cargo_Ocupado || ' ' || coalesce(Descripcion, ''), ' ') AS Experiencia
+             FROM experiencias_laborales GROUP BY ID_Postulante
+           ) x ON x.ID_Postulante = p.ID_Postulante""",
+    ],
+    # 5: Contratos activos por usuario, para resolver el rol "Contratado" en
+    # el login sin consultar contratos ni postulaciones.
+    [
+        "ALTER TABLE usuarios ADD COLUMN `Contratos_Activos` INTEGER NOT NULL DEFAULT 0",
+        *[
+            f"""CREATE TRIGGER IF NOT EXISTS {nombre} {evento} BEGIN
+              {cuerpo}
+            END"""
+            for nombre, evento, cuerpo in (
+                (
+                    "trg_contratos_activos_insert",
+                    "AFTER INSERT ON contratos",
+                    SQL_SUMAR_CONTRATO_ACTIVO.format(signo="+", contrato="new"),
+                ),
+                (
+                    "trg_contratos_activos_delete",
+                    "AFTER DELETE ON contratos",
+                    SQL_SUMAR_CONTRATO_ACTIVO.format(signo="-", contrato="old"),
+                ),
+                (
+                    "trg_contratos_activos_update",
+                    "AFTER UPDATE OF Estatus, ID_Postulacion ON contratos",
+                    SQL_SUMAR_CONTRATO_ACTIVO.format(signo="-", contrato="old")
+                    + SQL_SUMAR_CONTRATO_ACTIVO.format(signo="+", contrato="new"),
+                ),
+                (
+                    "trg_postulaciones_contratos_mover",
+                    "AFTER UPDATE OF ID_Postulante ON postulaciones"
+                    " WHEN old.ID_Postulante <> new.ID_Postulante",
+                    SQL_MOVER_CONTRATOS_ACTIVOS.format(signo="-", postulacion="old")
+                    + SQL_MOVER_CONTRATOS_ACTIVOS.format(signo="+", postulacion="new"),
+                ),
+            )
+        ],
+        """UPDATE usuarios SET Contratos_Activos = (
+             SELECT COUNT(*) FROM contratos c JOIN postulaciones p ON c.ID_Postulacion = p.ID_Postulacion
+             WHERE p.ID_Postulante = usuarios.ID_Usuario AND c.Estatus = 'Activo')
+           WHERE Tipo_Usuario = 'Postulante'""",
+    ],
+    # 6: Totales por nómina mantenidos al insertar o borrar recibos, para el
+    # reporte global sin sumar todos los recibos emitidos.
+    [
+        """CREATE TABLE IF NOT EXISTS `resumen_nominas` (
+          `ID_Nomina` INTEGER PRIMARY KEY,
+          `Empleados` INTEGER NOT NULL,
+          `Total_Salario_Base` REAL NOT NULL,
+          `Total_INCES` REAL NOT NULL,
+          `Total_IVSS` REAL NOT NULL,
+          `Total_Comision` REAL NOT NULL,
+          `Total_Neto` REAL NOT NULL,
+          FOREIGN KEY(`ID_Nomina`) REFERENCES `nominas`(`ID_Nomina`) ON DELETE CASCADE
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_resumen_nominas_insert AFTER INSERT ON recibos BEGIN
+          {SQL_SUMAR_RECIBO_RESUMEN}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_resumen_nominas_delete AFTER DELETE ON recibos BEGIN
+          {SQL_RESTAR_RECIBO_RESUMEN}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_resumen_nominas_update
+          AFTER UPDATE OF ID_Nomina, Salario_Base, Monto_Deduccion_INCES, Monto_Deduccion_IVSS,
+          Comision_Hiring_Group, Salario_Neto_Pagado ON recibos BEGIN
+          {SQL_RESTAR_RECIBO_RESUMEN}
+          {SQL_SUMAR_RECIBO_RESUMEN}
+        END""",
+        f"INSERT INTO resumen_nominas {SQL_CALCULAR_RESUMEN_NOMINAS}",
+    ],
+    # 7: Archivos por año con las nóminas viejas (ver archivar_nominas_db).
+    [
+        """CREATE TABLE IF NOT EXISTS `archivos_nomina` (
+          `Anio` INTEGER PRIMARY KEY,
+          `Archivo` TEXT NOT NULL,
+          `Nominas` INTEGER NOT NULL DEFAULT 0,
+          `Recibos` INTEGER NOT NULL DEFAULT 0,
+          `Fecha_Archivado` TEXT DEFAULT CURRENT_TIMESTAMP
+        )""",
+    ],
+    # 8: Un contador de cambios por tabla, que suben los triggers en la misma
+    # transacción que el cambio; cualquier proceso lo ve (get_version_datos).
+    [
+        """CREATE TABLE IF NOT EXISTS `versiones_tablas` (
+          `Tabla` TEXT PRIMARY KEY,
+          `Version` INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID""",
+        "INSERT OR IGNORE INTO versiones_tablas (Tabla) VALUES "
+        + ", ".join(f"('{tabla}')" for tabla in TABLAS_VERSIONADAS),
+        *[
+            f"""CREATE TRIGGER IF NOT EXISTS trg_version_{tabla}_{evento.lower()}
+              AFTER {evento} ON {tabla} BEGIN
+              {SQL_SUBIR_VERSION_TABLA.format(tabla=tabla)}
+            END"""
+            for tabla in TABLAS_VERSIONADAS
+            for evento in ("INSERT", "UPDATE", "DELETE")
+        ],
+    ],
+    # 9: Índice de la clave foránea de Contratos hacia Bancos: sin él, agregar
+    # o eliminar un banco recorre todos los contratos (auditoria_indices.py).
+    ["CREATE INDEX IF NOT EXISTS idx_contratos_banco ON contratos(ID_Banco)"],
+    # 10: Los recibos solo cambian junto con su nómina (se insertan después de
+    # ella y se borran con ella), así que el contador de recibos lo suben los
+    # triggers de nominas, una vez por nómina, y no uno por recibo: el trigger
+    # por fila le costaba a ejecutar_nomina_db cerca de un tercio del tiempo.
+    [
+        *[
+            f"DROP TRIGGER IF EXISTS trg_version_{tabla}_{evento.lower()}"
+            for tabla in ("recibos", "nominas")
+            for evento in ("INSERT", "UPDATE", "DELETE")
+        ],
+        *[
+            f"""CREATE TRIGGER IF NOT EXISTS trg_version_nominas_{evento.lower()}
+              AFTER {evento} ON nominas BEGIN
+              {SQL_SUBIR_VERSION_TABLA.format(tabla="nominas")}
+              {SQL_SUBIR_VERSION_TABLA.format(tabla="recibos")}
+            END"""
+            for evento in ("INSERT", "UPDATE", "DELETE")
+        ],
+    ],
+]
+
+
+def aplicar_migraciones(conn):
+    """
+    Aplica las migraciones pendientes. Devuelve False si la base de datos aún
+    no tiene el esquema base cargado.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRACIONES):
+        return True
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        tiene_esquema = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usuarios'"
+        ).fetchone()
+        if not tiene_esquema:
+            conn.rollback()
+            return False
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for sentencias in MIGRACIONES[version:]:
+            for sentencia in sentencias:
+                conn.execute(sentencia)
+        conn.execute(f"PRAGMA user_version = {len(MIGRACIONES)}")
+        conn.commit()
+        return True
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+
+# --- TRAZA DE SENTENCIAS ---
+# Trace callback de sqlite3 para todas las conexiones de los pools (el
+# global, los de db_async.py y los de la instantánea de reportes), o None.
+# Queda puesto en la conexión, no en cada préstamo, para que un generador
+# que retiene su conexión o una llamada anidada no se lo quiten a otra. Lo
+# instala el hilo que recibe la conexión: hacerlo desde otro hilo mientras
+# la conexión ejecuta una consulta puede bloquear a los dos.
+_trace_conexiones = None
+_trace_instalado = {}  # conexion -> callback que tiene puesto
+
+
+def fijar_trace_conexiones(callback):
+    """
+    Hace que las conexiones de los pools lleven 'callback' como trace
+    callback desde su próximo préstamo; con None se quita.
+    """
+    global _trace_conexiones
+    _trace_conexiones = callback
+
+
+def _aplicar_trace(conn):
+    if _trace_instalado.get(conn) is not _trace_conexiones:
+        conn.set_trace_callback(_trace_conexiones)
+        _trace_instalado[conn] = _trace_conexiones
+    return conn
+
+
+# --- POOL DE CONEXIONES ---
+MMAP_SOLO_LECTURA = 256 * 1024 * 1024
+class PoolConexiones:
+    """
+    Pool acotado de conexiones SQLite ya configuradas (row_factory y
+    foreign_keys). Las conexiones se reutilizan entre llamadas en orden LIFO,
+    se validan antes de entregarlas si llevan un rato sin usarse y se cierran
+    cuando superan el tiempo máximo de inactividad.
+
+    Con solo_lectura=True abre un archivo que nadie modifica (la instantánea
+    de reportes): sin migraciones y sin bloqueos (immutable=1).
+    """
+
+    def __init__(
+        self,
+        ruta,
+        max_conexiones=5,
+        max_inactividad=300,
+        intervalo_validacion=30,
+        timeout=10,
+        solo_lectura=False,
+    ):
+        self.ruta = ruta
+        self.max_conexiones = max_conexiones
+        self.max_inactividad = max_inactividad
+        self.intervalo_validacion = intervalo_validacion
+        self.timeout = timeout
+        self.solo_lectura = solo_lectura
+        self._libres = []  # Pila de (conexion, instante_de_devolucion)
+        self._abiertas = 0
+        self._cerrado = False
+        self._esquema_al_dia = solo_lectura
+        self._condicion = threading.Condition()
+
+    @property
+    def abiertas(self):
+        with self._condicion:
+            return self._abiertas
+
+    def _crear_conexion(self):
+        if self.solo_lectura:
+            conn = sqlite3.connect(
+                f"{pathlib.Path(self.ruta).absolute().as_uri()}?mode=ro&immutable=1",
+                uri=True,
+                timeout=self.timeout,
+                check_same_thread=False,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.ruta, timeout=self.timeout, check_same_thread=False
+            )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+        if self.solo_lectura:
+            # El archivo recién copiado está en la caché del sistema: se lee
+            # mapeado en memoria en lugar de llenar la caché de cada conexión.
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SOLO_LECTURA}")
+        if not self._esquema_al_dia:
+            try:
+                self._esquema_al_dia = aplicar_migraciones(conn)
+            except sqlite3.Error:
+                conn.close()
+                raise
+        return conn
+
+    def _cerrar_conexion(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        _trace_instalado.pop(conn, None)
+        with self._condicion:
+            self._abiertas -= 1
+            self._condicion.notify()
+
+    def _descartar_inactivas(self):
+        # Las más antiguas quedan al fondo de la pila.
+        ahora = time.monotonic()
+        vencidas = []
+        while self._libres and ahora - self._libres[0][1] > self.max_inactividad:
+            vencidas.append(self._libres.pop(0)[0])
+        return vencidas
+
+    @staticmethod
+    def _es_valida(conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def obtener(self):
+        return _aplicar_trace(self._obtener())
+
+    def _obtener(self):
+        limite = time.monotonic() + self.timeout
+        while True:
+            conn, devuelta = None, None
+            with self._condicion:
+                while True:
+                    if self._cerrado:
+                        raise sqlite3.ProgrammingError(
+                            "El pool de conexiones está cerrado."
+                        )
+                    vencidas = self._descartar_inactivas()
+                    if self._libres:
+                        conn, devuelta = self._libres.pop()
+                        break
+                    if self._abiertas - len(vencidas) < self.max_conexiones:
+                        break
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise sqlite3.OperationalError(
+                            "No hay conexiones disponibles en el pool."
+                        )
+                    self._condicion.wait(restante)
+                if conn is None:
+                    self._abiertas += 1
+            for vencida in vencidas:
+                self._cerrar_conexion(vencida)
+
+            if conn is None:
+                try:
+                    return self._crear_conexion()
+                except sqlite3.Error:
+                    with self._condicion:
+                        self._abiertas -= 1
+                        self._condicion.notify()
+                    raise
+            if time.monotonic() - devuelta < self.intervalo_validacion:
+                return conn
+            if self._es_valida(conn):
+                return conn
+            self._cerrar_conexion(conn)
+
+    def devolver(self, conn):
+        try:
+            # Una transacción pendiente no debe filtrarse al siguiente uso.
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._cerrar_conexion(conn)
+            return
+        with self._condicion:
+            if not self._cerrado:
+                self._libres.append((conn, time.monotonic()))
+                self._condicion.notify()
+                return
+        self._cerrar_conexion(conn)
+
+    def cerrar(self):
+        with self._condicion:
+            self._cerrado = True
+            libres, self._libres = self._libres, []
+        for conn, _ in libres:
+            self._cerrar_conexion(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PoolConexiones(DB_PATH)
+        return _pool
+
+
+def configurar_base_datos(ruta, **opciones_pool):
+    """
+    Cambia el archivo de base de datos que usa el módulo y reinicia el pool.
+    Las opciones se pasan tal cual a PoolConexiones.
+    """
+    global DB_PATH, _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.cerrar()
+        DB_PATH = ruta
+        _pool = PoolConexiones(ruta, **opciones_pool)
+    _cerrar_instantanea()
+    _versiones_tablas.reiniciar()
+    invalidar_cache_catalogos()
+
+
+def cerrar_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.cerrar()
+            _pool = None
+    _cerrar_instantanea()
+    _versiones_tablas.reiniciar()
+
+
+atexit.register(cerrar_pool)
+
+
+# --- VERSIÓN DE LOS DATOS ---
+class VersionesTablas:
+    """
+    Contadores de versiones_tablas leídos con una conexión propia, que solo
+    escribe para aplicar las migraciones pendientes al abrirse. Se vuelven
+    a leer únicamente cuando cambia su PRAGMA data_version, que sube con
+    cada commit de cualquier otra conexión a la base, sea de este proceso
+    o de otro (cli.py, servidor.py, importar.py, otra ventana).
+    La generación cambia con cada base configurada: data_version vuelve a
+    empezar con cada conexión.
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._data_version = None
+        self._versiones = {}
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generacion(self):
+        return self._generacion
+
+    def versiones(self):
+        """Diccionario tabla -> versión, al día con la base."""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+                try:
+                    aplicar_migraciones(conn)
+                except sqlite3.Error:
+                    conn.close()
+                    raise
+                self._conn = conn
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                try:
+                    self._versiones = dict(
+                        self._conn.execute("SELECT Tabla, Version FROM versiones_tablas")
+                    )
+                    self._data_version = data_version
+                except sqlite3.Error:
+                    # Base sin esquema todavía u ocupada: se vuelve a leer la
+                    # próxima vez y mientras tanto queda lo último leído.
+                    pass
+            return self._versiones
+
+    def reiniciar(self):
+        """Cierra la conexión; la próxima consulta abre la base configurada."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._data_version = None
+            self._versiones = {}
+            self._generacion += 1
+
+
+_versiones_tablas = VersionesTablas()
+
+
+def get_version_datos(tablas=None):
+    """
+    Versión de los datos de 'tablas' (todas si es None), comparable con
+    ==: cambia cuando cualquier conexión confirma cambios en alguna de
+    ellas. La interfaz la usa para saber si una pantalla guardada sigue al
+    día.
+    """
+    versiones = _versiones_tablas.versiones()
+    if tablas is None:
+        tablas = sorted(versiones)
+    return (_versiones_tablas.generacion,) + tuple(
+        versiones.get(tabla.lower(), 0) for tabla in tablas
+    )
+
 
 # --- CONTEXT MANAGER PARA LA CONEXIÓN ---
+# Conexión fija del hilo actual; si existe, get_db_connection la usa en lugar
+# del pool (ver db_async.py, que da una conexión propia a cada hilo de trabajo).
+_conexion_del_hilo = threading.local()
+
+
+def fijar_conexion_del_hilo(conn):
+    """
+    Hace que get_db_connection entregue siempre 'conn' en el hilo actual.
+    Con None se vuelve a usar el pool.
+    """
+    _conexion_del_hilo.conn = conn
+
+
 @contextmanager
 def get_db_connection():
     """
-    Un context manager que maneja la apertura y cierre de la conexión a la BD.
-    Garantiza que la conexión siempre se cierre, incluso si hay errores.
+    Un context manager que presta una conexión del pool y la devuelve al salir.
+    Garantiza que la conexión siempre se devuelva (sin transacciones
+    pendientes), incluso si hay errores.
     """
+    propia = getattr(_conexion_del_hilo, "conn", None)
+    if propia is not None:
+        _aplicar_trace(propia)
+        try:
+            yield propia
+        except sqlite3.Error as e:
+            print(f"Error de conexión a la base de datos: {e}", file=sys.stderr)
+            raise
+        finally:
+            if propia.in_transaction:
+                propia.rollback()
+        return
+    pool = get_pool()
     conn = None
     try:
-        conn = sqlite3.connect("hiring_group.db", timeout=10)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON;")
+        conn = pool.obtener()
         yield conn
     except sqlite3.Error as e:
-        print(f"Error de conexión a la base de datos: {e}")
+        print(f"Error de conexión a la base de datos: {e}", file=sys.stderr)
         raise
     finally:
         if conn:
-            conn.close()
+            pool.devolver(conn)
+
+
+# --- INSTANTÁNEA PARA REPORTES ---
+class InstantaneaReportes:
+    """
+    Copia de la base de datos para las consultas de reportes, para que no
+    compitan con las escrituras (ejecutar_nomina_db, contratar_postulante_db).
+    Se copia con la API de backup de sqlite3 de a 'paginas_por_paso' páginas,
+    con una pausa entre pasos en la que la base queda libre para escribir. Si
+    otra conexión escribe durante la copia, SQLite la recomienza; después de
+    'max_reinicios' se copia en un solo paso.
+
+    Cada copia va a un archivo nuevo que se lee con un pool de solo lectura;
+    el anterior se borra cuando ya no le quedan conexiones abiertas. Un hilo
+    la refresca cada antiguedad_maxima / 2 segundos y, si al pedirla tiene
+    más de 'antiguedad_maxima' y no se está copiando, se refresca en el
+    momento. Si los datos no cambiaron desde la última copia (PRAGMA
+    data_version) no se copia nada.
+    """
+
+    # Numera las instantáneas del proceso (ver get_version_reportes).
+    _numeros = itertools.count(1)
+
+    def __init__(
+        self,
+        ruta,
+        antiguedad_maxima=60,
+        paginas_por_paso=256,
+        pausa=0.001,
+        max_reinicios=2,
+        max_conexiones=5,
+    ):
+        self.ruta = ruta
+        self.antiguedad_maxima = antiguedad_maxima
+        self.paginas_por_paso = paginas_por_paso
+        self.pausa = pausa
+        self.max_reinicios = max_reinicios
+        self.max_conexiones = max_conexiones
+        self.refrescos = 0
+        self.copias = 0
+        self.reinicios = 0
+        self.copias_en_un_paso = 0
+        self.ultima_copia_s = None
+        self.copia_mas_lenta_s = 0.0
+        self.numero = next(InstantaneaReportes._numeros)
+        self._directorio = tempfile.mkdtemp(prefix="hiring_group_reportes_")
+        # Lee data_version y es el origen de las copias; nunca escribe.
+        self._origen = sqlite3.connect(ruta, timeout=10, check_same_thread=False)
+        self._refresco_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._version = None
+        self._instante = None
+        self._generacion = 0
+        self._generacion_copia = None  # La del archivo que lee self._pool
+        self._anteriores = []
+        self._detener = threading.Event()
+        try:
+            self.refrescar()
+        except sqlite3.Error:
+            self.cerrar()
+            raise
+        self._hilo = threading.Thread(
+            target=self._refrescar_periodicamente, name="instantanea-reportes", daemon=True
+        )
+        self._hilo.start()
+
+    def _refrescar_periodicamente(self):
+        while not self._detener.wait(self.antiguedad_maxima / 2):
+            try:
+                self.refrescar()
+            except sqlite3.Error as e:
+                print(f"No se pudo refrescar la instantánea de reportes: {e}", file=sys.stderr)
+
+    def _copiar(self, destino):
+        """Copia paso a paso; devuelve cuántas veces se recomenzó la copia."""
+        reinicios = 0
+        anterior = None
+
+        class Recomenzada(Exception):
+            pass
+
+        def progreso(estado, restantes, total):
+            nonlocal reinicios, anterior
+            # Un paso que encontró la base ocupada cuenta como un reinicio.
+            ocupada = estado in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+            if ocupada or (anterior is not None and restantes > anterior):
+                reinicios += 1
+                if reinicios > self.max_reinicios:
+                    raise Recomenzada()
+            anterior = restantes
+            time.sleep(self.pausa)
+
+        try:
+            self._origen.backup(
+                destino, pages=self.paginas_por_paso, progress=progreso, sleep=self.pausa
+            )
+        except Recomenzada:
+            # Con escrituras continuas la copia por pasos no termina nunca: se
+            # toma un bloqueo de lectura (esperando como cualquier conexión,
+            # con su timeout) y se copia en un solo paso. Las escrituras
+            # esperan lo que dura la copia.
+            self._origen.execute("BEGIN")
+            try:
+                self._origen.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                self._origen.backup(destino)
+            finally:
+                self._origen.rollback()
+            self.copias_en_un_paso += 1
+        return reinicios
+
+    def refrescar(self, esperar=True):
+        """
+        Actualiza la copia si la base cambió. Devuelve True si copió. Con
+        esperar=False no hace nada si ya hay otro refresco en curso.
+        """
+        if not self._refresco_lock.acquire(blocking=esperar):
+            return False
+        try:
+            inicio = time.monotonic()
+            version = self._origen.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._version:
+                with self._lock:
+                    self._instante = inicio
+                    self.refrescos += 1
+                return False
+            self._generacion += 1
+            generacion = self._generacion
+            ruta = os.path.join(self._directorio, f"reportes-{generacion}.db")
+            destino = sqlite3.connect(ruta)
+            try:
+                reinicios = self._copiar(destino)
+            finally:
+                destino.close()
+            pool = PoolConexiones(ruta, max_conexiones=self.max_conexiones, solo_lectura=True)
+            with self._lock:
+                anterior = self._pool
+                self._pool, self._version, self._instante = pool, version, inicio
+                self._generacion_copia = generacion
+                self.refrescos += 1
+                self.copias += 1
+                self.reinicios += reinicios
+                self.ultima_copia_s = time.monotonic() - inicio
+                self.copia_mas_lenta_s = max(self.copia_mas_lenta_s, self.ultima_copia_s)
+            if anterior is not None:
+                anterior.cerrar()
+                self._anteriores.append(anterior)
+            self._borrar_anteriores()
+            return True
+        finally:
+            self._refresco_lock.release()
+
+    def _borrar_anteriores(self):
+        pendientes = []
+        for pool in self._anteriores:
+            try:
+                if pool.abiertas:
+                    raise OSError("Todavía hay conexiones abiertas.")
+                os.remove(pool.ruta)
+            except OSError:
+                pendientes.append(pool)
+        self._anteriores = pendientes
+
+    def antiguedad(self):
+        """Segundos desde la última vez que la copia coincidía con la base."""
+        with self._lock:
+            return None if self._instante is None else time.monotonic() - self._instante
+
+    def _refrescar_si_vencida(self):
+        antiguedad = self.antiguedad()
+        if antiguedad is None or antiguedad > self.antiguedad_maxima:
+            # Si ya se está copiando, se usa la copia actual en lugar de esperar.
+            try:
+                self.refrescar(esperar=self._pool is None)
+            except sqlite3.Error as e:
+                if self._pool is None:
+                    raise
+                print(f"Se usa la instantánea anterior de reportes: {e}", file=sys.stderr)
+
+    def generacion(self):
+        """
+        Número de la copia que entregaría conexion() ahora, refrescada antes
+        si venció: cambia solo cuando se hace una copia nueva.
+        """
+        self._refrescar_si_vencida()
+        with self._lock:
+            return self._generacion_copia
+
+    @contextmanager
+    def conexion(self):
+        self._refrescar_si_vencida()
+        while True:
+            with self._lock:
+                pool = self._pool
+            try:
+                conn = pool.obtener()
+                break
+            except sqlite3.ProgrammingError:
+                # Se reemplazó la copia entre leer el pool y pedir la conexión.
+                if pool is self._pool:
+                    raise
+        try:
+            yield conn
+        finally:
+            pool.devolver(conn)
+
+    def estadisticas(self):
+        antiguedad = self.antiguedad()
+        with self._lock:
+            return {
+                "antiguedad_s": antiguedad,
+                "antiguedad_maxima_s": self.antiguedad_maxima,
+                "refrescos": self.refrescos,
+                "copias": self.copias,
+                "reinicios": self.reinicios,
+                "copias_en_un_paso": self.copias_en_un_paso,
+                "ultima_copia_s": self.ultima_copia_s,
+                "copia_mas_lenta_s": self.copia_mas_lenta_s,
+            }
+
+    def cerrar(self):
+        self._detener.set()
+        hilo = getattr(self, "_hilo", None)
+        if hilo is not None and hilo is not threading.current_thread():
+            hilo.join()
+        with self._refresco_lock:
+            self._origen.close()
+            with self._lock:
+                pool, self._pool = self._pool, None
+            if pool is not None:
+                pool.cerrar()
+        shutil.rmtree(self._directorio, ignore_errors=True)
+
+
+# Opciones de la instantánea (None: los reportes leen la base en vivo). Se
+# activa con configurar_instantanea_reportes o con la variable de entorno
+# HIRING_GROUP_INSTANTANEA_S (antigüedad máxima en segundos); la copia se
+# crea con la primera consulta de reportes.
+_opciones_instantanea = (
+    {"antiguedad_maxima": float(os.environ["HIRING_GROUP_INSTANTANEA_S"])}
+    if os.environ.get("HIRING_GROUP_INSTANTANEA_S")
+    else None
+)
+_instantanea = None
+_instantanea_lock = threading.Lock()
+
+
+def configurar_instantanea_reportes(antiguedad_maxima=None, **opciones):
+    """
+    Hace que los reportes de nómina lean una copia de la base con a lo sumo
+    'antiguedad_maxima' segundos de atraso; con None vuelven a leer la base
+    en vivo. Las opciones se pasan tal cual a InstantaneaReportes.
+    """
+    global _opciones_instantanea
+    _cerrar_instantanea()
+    with _instantanea_lock:
+        _opciones_instantanea = (
+            None if antiguedad_maxima is None else dict(opciones, antiguedad_maxima=antiguedad_maxima)
+        )
+
+
+def _cerrar_instantanea():
+    global _instantanea
+    with _instantanea_lock:
+        instantanea, _instantanea = _instantanea, None
+    if instantanea is not None:
+        instantanea.cerrar()
+
+
+def get_estadisticas_instantanea():
+    """Estado de la instantánea de reportes, o None si no está en uso."""
+    instantanea = _instantanea
+    return None if instantanea is None else instantanea.estadisticas()
+
+
+def _get_instantanea():
+    """La instantánea de reportes (se crea al primer uso), o None si no está activada."""
+    global _instantanea
+    with _instantanea_lock:
+        if _instantanea is None and _opciones_instantanea is not None:
+            # La copia tiene que salir con el esquema al día: las migraciones
+            # se aplican al abrir la primera conexión del pool.
+            with get_db_connection():
+                pass
+            _instantanea = InstantaneaReportes(DB_PATH, **_opciones_instantanea)
+        return _instantanea
+
+
+def get_version_reportes():
+    """
+    Versión de lo que leen los reportes, para cachear sus resultados: None
+    si leen la base en vivo; con la instantánea activada, su número y el de
+    la copia vigente (refrescada antes si venció), que no cambian mientras
+    los reportes devuelvan lo mismo.
+    """
+    instantanea = _get_instantanea()
+    if instantanea is None:
+        return None
+    return instantanea.numero, instantanea.generacion()
+
+
+@contextmanager
+def get_conexion_reportes():
+    """
+    Conexión para las consultas de reportes: de la instantánea si está
+    activada (ver configurar_instantanea_reportes) o de get_db_connection.
+    """
+    instantanea = _get_instantanea()
+    if instantanea is None:
+        with get_db_connection() as conn:
+            yield conn
+        return
+    with instantanea.conexion() as conn:
+        yield conn
+
+
+# --- ARCHIVO DE NÓMINAS ---
+# archivar_nominas_db mueve las nóminas viejas, con sus recibos y totales, a
+# un archivo SQLite por año junto a la base, registrado en archivos_nomina.
+# Las consultas de nómina adjuntan (ATTACH) solo los archivos de los años
+# que piden y repiten la consulta en cada esquema con UNION ALL: cada nómina
+# está en un único lugar, junto con sus recibos.
+COLUMNAS_NOMINAS = "ID_Nomina, ID_Empresa, Mes, Anio, Fecha_Generacion, Estatus"
+COLUMNAS_RECIBOS = """ID_Recibo, ID_Nomina, ID_Contrato, Salario_Base, Monto_Deduccion_INCES,
+                      Monto_Deduccion_IVSS, Comision_Hiring_Group, Salario_Neto_Pagado, Fecha_Pago"""
+# Las mismas tablas sin claves foráneas: empresas y contratos siguen en la base.
+SQL_ESQUEMA_ARCHIVO = [
+    """CREATE TABLE IF NOT EXISTS {esquema}.nominas (
+      ID_Nomina INTEGER PRIMARY KEY,
+      ID_Empresa INTEGER NOT NULL,
+      Mes INTEGER NOT NULL,
+      Anio INTEGER NOT NULL,
+      Fecha_Generacion TEXT,
+      Estatus TEXT NOT NULL,
+      UNIQUE (ID_Empresa, Mes, Anio)
+    )""",
+    """CREATE TABLE IF NOT EXISTS {esquema}.recibos (
+      ID_Recibo INTEGER PRIMARY KEY,
+      ID_Nomina INTEGER NOT NULL,
+      ID_Contrato INTEGER NOT NULL,
+      Salario_Base REAL NOT NULL,
+      Monto_Deduccion_INCES REAL NOT NULL,
+      Monto_Deduccion_IVSS REAL NOT NULL,
+      Comision_Hiring_Group REAL NOT NULL,
+      Salario_Neto_Pagado REAL NOT NULL,
+      Fecha_Pago TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS {esquema}.idx_recibos_nomina ON recibos(ID_Nomina)",
+    "CREATE INDEX IF NOT EXISTS {esquema}.idx_recibos_contrato ON recibos(ID_Contrato)",
+    """CREATE TABLE IF NOT EXISTS {esquema}.resumen_nominas (
+      ID_Nomina INTEGER PRIMARY KEY,
+      Empleados INTEGER NOT NULL,
+      Total_Salario_Base REAL NOT NULL,
+      Total_INCES REAL NOT NULL,
+      Total_IVSS REAL NOT NULL,
+      Total_Comision REAL NOT NULL,
+      Total_Neto REAL NOT NULL
+    )""",
+]
+
+
+def _nombre_archivo_nominas(anio):
+    base = os.path.splitext(os.path.basename(DB_PATH))[0]
+    return f"{base}_nominas_{anio}.db"
+
+
+def _ruta_archivo_nominas(archivo):
+    # archivos_nomina guarda solo el nombre: los archivos van junto a la base.
+    return os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), archivo)
+
+
+@contextmanager
+def _esquemas_nomina(conn, anio=None):
+    """
+    Adjunta a 'conn' el archivo de nóminas del año 'anio' (todos si es None)
+    y entrega la lista de esquemas donde buscar nóminas: "main" y uno por
+    archivo. Los desadjunta al salir.
+    """
+    query = "SELECT Anio, Archivo FROM archivos_nomina"
+    params = ()
+    if anio is not None:
+        query += " WHERE Anio = ?"
+        params = (anio,)
+    archivos = conn.execute(query + " ORDER BY Anio", params).fetchall()
+    esquemas = ["main"]
+    try:
+        for anio_archivo, archivo in archivos:
+            ruta = _ruta_archivo_nominas(archivo)
+            if not os.path.exists(ruta):
+                raise sqlite3.OperationalError(f"No se encuentra el archivo de nóminas {ruta}.")
+            esquema = f"archivo_{anio_archivo}"
+            conn.execute(f"ATTACH DATABASE ? AS {esquema}", (ruta,))
+            esquemas.append(esquema)
+        yield esquemas
+    finally:
+        for esquema in esquemas[1:]:
+            conn.execute(f"DETACH DATABASE {esquema}")
+
+
+def _en_esquemas(plantilla, esquemas, params=()):
+    """La consulta 'plantilla' ({esquema} en las tablas de nómina) en cada esquema, con UNION ALL."""
+    query = " UNION ALL ".join(plantilla.format(esquema=esquema) for esquema in esquemas)
+    return query, list(params) * len(esquemas)
+
+
+def _nominas_archivadas(conn, mes, anio):
+    """{ID_Empresa: ID_Nomina} de las nóminas del periodo que están archivadas."""
+    with _esquemas_nomina(conn, anio) as esquemas:
+        if len(esquemas) == 1:
+            return {}
+        query, params = _en_esquemas(
+            "SELECT ID_Empresa, ID_Nomina FROM {esquema}.nominas WHERE Mes = ? AND Anio = ?",
+            esquemas[1:],
+            (mes, anio),
+        )
+        return {fila[0]: fila[1] for fila in conn.execute(query, params)}
+
+
+def archivar_nominas_db(meses_horizonte=24, hoy=None):
+    """
+    Mueve las nóminas de los periodos con más de 'meses_horizonte' meses de
+    antigüedad respecto de 'hoy' (con sus recibos y totales) al archivo de
+    su año. Cada año se mueve en una transacción que abarca la base y el
+    archivo. No se archiva la nómina ni el recibo con el ID más alto, para
+    que SQLite no vuelva a entregar IDs que ya están en un archivo.
+    Devuelve (exito, mensaje, filas) con Anio, Archivo, Nominas y Recibos
+    movidos por año.
+    """
+    if meses_horizonte < 0:
+        return False, "El horizonte debe ser de cero meses o más.", []
+    hoy = hoy or datetime.now()
+    limite = hoy.year * 12 + hoy.month - 1 - meses_horizonte
+    filas = []
+    try:
+        with get_db_connection() as conn:
+            max_nomina, max_recibo = conn.execute(
+                "SELECT (SELECT MAX(ID_Nomina) FROM nominas), (SELECT MAX(ID_Recibo) FROM recibos)"
+            ).fetchone()
+            anios = [
+                fila[0]
+                for fila in conn.execute(
+                    "SELECT DISTINCT Anio FROM nominas WHERE Anio * 12 + Mes - 1 < ? ORDER BY Anio",
+                    (limite,),
+                )
+            ]
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS nominas_a_archivar (ID_Nomina INTEGER PRIMARY KEY)"
+            )
+            elegidas = "SELECT ID_Nomina FROM temp.nominas_a_archivar"
+            for anio in anios:
+                archivo = _nombre_archivo_nominas(anio)
+                ruta = _ruta_archivo_nominas(archivo)
+                existia = os.path.exists(ruta)
+                archivado = False
+                conn.execute("ATTACH DATABASE ? AS archivo", (ruta,))
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    for sentencia in SQL_ESQUEMA_ARCHIVO:
+                        conn.execute(sentencia.format(esquema="archivo"))
+                    conn.execute("DELETE FROM temp.nominas_a_archivar")
+                    conn.execute(
+                        """INSERT INTO temp.nominas_a_archivar
+                           SELECT n.ID_Nomina FROM main.nominas n
+                           WHERE n.Anio = ? AND n.Anio * 12 + n.Mes - 1 < ? AND n.ID_Nomina < ?
+                             AND NOT EXISTS (SELECT 1 FROM main.recibos r
+                                             WHERE r.ID_Nomina = n.ID_Nomina AND r.ID_Recibo >= ?)""",
+                        (anio, limite, max_nomina, max_recibo or 0),
+                    )
+                    nominas = conn.execute(
+                        f"INSERT INTO archivo.nominas SELECT {COLUMNAS_NOMINAS} FROM main.nominas WHERE ID_Nomina IN ({elegidas})"
+                    ).rowcount
+                    recibos = conn.execute(
+                        f"INSERT INTO archivo.recibos SELECT {COLUMNAS_RECIBOS} FROM main.recibos WHERE ID_Nomina IN ({elegidas})"
+                    ).rowcount
+                    conn.execute(
+                        f"INSERT INTO archivo.resumen_nominas SELECT * FROM main.resumen_nominas WHERE ID_Nomina IN ({elegidas})"
+                    )
+                    # El resumen se borra antes que los recibos para que sus
+                    # triggers no lo vayan descontando fila por fila.
+                    for tabla in ("resumen_nominas", "recibos", "nominas"):
+                        conn.execute(f"DELETE FROM main.{tabla} WHERE ID_Nomina IN ({elegidas})")
+                    if nominas:
+                        conn.execute(
+                            """INSERT INTO archivos_nomina (Anio, Archivo, Nominas, Recibos) VALUES (?, ?, ?, ?)
+                               ON CONFLICT (Anio) DO UPDATE SET Nominas = Nominas + excluded.Nominas,
+                               Recibos = Recibos + excluded.Recibos, Fecha_Archivado = CURRENT_TIMESTAMP""",
+                            (anio, archivo, nominas, recibos),
+                        )
+                    conn.commit()
+                    if nominas:
+                        archivado = True
+                        filas.append({"Anio": anio, "Archivo": archivo, "Nominas": nominas, "Recibos": recibos})
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.execute("DETACH DATABASE archivo")
+                    if not existia and not archivado:
+                        os.remove(ruta)
+            conn.execute("DROP TABLE temp.nominas_a_archivar")
+    except sqlite3.Error as e:
+        return False, f"Error al archivar nóminas: {e}", filas
+    # Una instantánea de reportes anterior vería los años recién archivados
+    # dos veces (en su copia de la base y en el archivo).
+    if filas and _instantanea is not None:
+        _instantanea.refrescar()
+    if not filas:
+        return True, "No hay nóminas anteriores al horizonte para archivar.", filas
+    return (
+        True,
+        f"{sum(f['Nominas'] for f in filas)} nómina(s) y {sum(f['Recibos'] for f in filas)} "
+        f"recibo(s) archivados en {len(filas)} archivo(s).",
+        filas,
+    )
+
+
+def get_archivos_nomina_db():
+    with get_db_connection() as conn:
+        return conn.execute(
+            "SELECT Anio, Archivo, Nominas, Recibos, Fecha_Archivado FROM archivos_nomina ORDER BY Anio"
+        ).fetchall()
+
+
+# --- CACHÉ DE CATÁLOGOS ---
+class CacheCatalogos:
+    """
+    Caché en memoria de los resultados de get_catalogo, por (tabla, columnas).
+    Las funciones que escriben en una tabla de catálogo la invalidan; cada
+    tabla lleva un número de versión para que una lectura que empezó antes
+    de una invalidación no guarde datos ya obsoletos. Cada entrada guarda
+    además la versión de los datos (get_version_datos) con que se leyó, que
+    también cambia con lo que escriben otros procesos.
+    """
+
+    def __init__(self):
+        self._datos = {}
+        self._versiones = {}
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def obtener(self, tabla, clave, cargar, version_datos=None):
+        tabla = tabla.lower()
+        with self._lock:
+            guardado = self._datos.get((tabla, clave))
+            if guardado is not None and guardado[0] == version_datos:
+                self.aciertos += 1
+                return list(guardado[1])
+            self.fallos += 1
+            version = self._versiones.get(tabla, 0)
+        filas = cargar()
+        with self._lock:
+            if self._versiones.get(tabla, 0) == version:
+                self._datos[(tabla, clave)] = (version_datos, tuple(filas))
+        return list(filas)
+
+    def invalidar(self, tabla=None):
+        """Descarta las entradas de 'tabla' (o todas si es None)."""
+        with self._lock:
+            self.invalidaciones += 1
+            if tabla is None:
+                tablas = {t for t, _ in self._datos} | set(self._versiones)
+            else:
+                tablas = {tabla.lower()}
+            for t in tablas:
+                self._versiones[t] = self._versiones.get(t, 0) + 1
+            self._datos = {
+                (t, clave): filas
+                for (t, clave), filas in self._datos.items()
+                if t not in tablas
+            }
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "invalidaciones": self.invalidaciones,
+                "entradas": len(self._datos),
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
+
+
+_cache_catalogos = CacheCatalogos()
+
+
+def invalidar_cache_catalogos(tabla=None):
+    _cache_catalogos.invalidar(tabla)
+
+
+def get_estadisticas_cache_catalogos():
+    return _cache_catalogos.estadisticas()
 
 
 # --- FUNCIONES DE LA BASE DE DATOS (REFACTORIZADAS) ---
@@ -31,7 +1279,12 @@ def get_db_connection():
 def login_usuario(email, password):
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        query = "SELECT ID_Usuario, Email, Tipo_Usuario, Estatus FROM Usuarios WHERE Email = ? AND Password = ?"
+        # Un postulante con algún contrato activo entra como "Contratado";
+        # Contratos_Activos lo mantienen los triggers de contratos.
+        query = """SELECT ID_Usuario, Email,
+                   CASE WHEN Tipo_Usuario = 'Postulante' AND Contratos_Activos > 0
+                        THEN 'Contratado' ELSE Tipo_Usuario END AS Tipo_Usuario,
+                   Estatus FROM Usuarios WHERE Email = ? AND Password = ?"""
         cursor.execute(query, (email, password))
         usuario_data = cursor.fetchone()
 
@@ -42,12 +1295,6 @@ def login_usuario(email, password):
         if usuario["Estatus"] != "Activo":
             return None, None
 
-        if usuario["Tipo_Usuario"] == "Postulante":
-            query_contrato = "SELECT c.ID_Contrato FROM Contratos c JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion WHERE p.ID_Postulante = ? AND c.Estatus = 'Activo'"
-            cursor.execute(query_contrato, (usuario["ID_Usuario"],))
-            if cursor.fetchone():
-                usuario["Tipo_Usuario"] = "Contratado"
-
         return usuario, usuario["Tipo_Usuario"]
 
 
@@ -62,19 +1309,24 @@ def hay_usuarios_registrados():
 
 
 def get_catalogo(tabla, id_col, nombre_col):
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        if isinstance(nombre_col, list):
-            nombre_col_str = ", ".join(nombre_col)
-            order_col = nombre_col[0]
-        else:
-            nombre_col_str = nombre_col
-            order_col = nombre_col
+    if isinstance(nombre_col, list):
+        nombre_col_str = ", ".join(nombre_col)
+        order_col = nombre_col[0]
+    else:
+        nombre_col_str = nombre_col
+        order_col = nombre_col
+
+    def cargar():
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {id_col}, {nombre_col_str} FROM {tabla} ORDER BY {order_col}"
+            )
+            return cursor.fetchall()
 
-        cursor.execute(
-            f"SELECT {id_col}, {nombre_col_str} FROM {tabla} ORDER BY {order_col}"
-        )
-        return cursor.fetchall()
+    return _cache_catalogos.obtener(
+        tabla, (id_col, nombre_col_str), cargar, get_version_datos((tabla,))
+    )
 
 
 def crear_item_catalogo(tabla, nombre_col, nombre_valor):
@@ -84,6 +1336,7 @@ def crear_item_catalogo(tabla, nombre_col, nombre_valor):
                 f"INSERT INTO {tabla} ({nombre_col}) VALUES (?)", (nombre_valor,)
             )
             conn.commit()
+            invalidar_cache_catalogos(tabla)
             return True, "Elemento agregado con éxito."
     except sqlite3.IntegrityError:
         return False, f"Error: Ese valor ya existe en {tabla}."
@@ -99,6 +1352,7 @@ def actualizar_item_catalogo(tabla, id_col, nombre_col, id_valor, nuevo_nombre):
                 (nuevo_nombre, id_valor),
             )
             conn.commit()
+            invalidar_cache_catalogos(tabla)
             return True, "Elemento actualizado con éxito."
     except sqlite3.Error as e:
         return False, f"Error al actualizar: {e}"
@@ -109,6 +1363,7 @@ def eliminar_item_catalogo(tabla, id_col, id_valor):
         with get_db_connection() as conn:
             conn.execute(f"DELETE FROM {tabla} WHERE {id_col} = ?", (id_valor,))
             conn.commit()
+            invalidar_cache_catalogos(tabla)
             return True, "Elemento eliminado con éxito."
     except sqlite3.IntegrityError:
         return False, "Error: El elemento está en uso y no se puede eliminar."
@@ -153,6 +1408,8 @@ def registrar_usuario_db(tipo_usuario, datos):
                 cursor.execute(sql_postulante, valores)
 
             conn.commit()
+            if tipo_usuario == "Empresa":
+                invalidar_cache_catalogos("Empresas")
             return True, f"Usuario tipo '{tipo_usuario}' creado con éxito."
     except sqlite3.IntegrityError as e:
         return False, f"Error de integridad: El Email, RIF o Cédula ya existen. ({e})"
@@ -221,59 +1478,288 @@ def aplicar_a_vacante_db(id_postulante, id_vacante):
         return False, f"Error inesperado: {e}"
 
 
+SQL_CONTRATOS_ACTIVOS_EMPRESA = """SELECT c.ID_Contrato, c.Salario_Acordado
+                                   FROM Contratos c JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
+                                   JOIN Vacantes v ON post.ID_Vacante = v.ID_Vacante
+                                   WHERE v.ID_Empresa = ? AND c.Estatus = 'Activo' ORDER BY c.ID_Contrato"""
+SQL_INSERTAR_RECIBO = """INSERT INTO Recibos (ID_Nomina, ID_Contrato, Salario_Base, Monto_Deduccion_INCES, Monto_Deduccion_IVSS,
+                         Comision_Hiring_Group, Salario_Neto_Pagado, Fecha_Pago) VALUES (?, ?, ?, ?, ?, ?, ?, date('now'))"""
+# Monto de un concepto con la tasa y el tope elegidos por calculo_nomina
+# (parámetros :tasa_X y :tope_X); mismas operaciones que aplicar_tasa.
+SQL_MONTO_CONCEPTO = "MIN(c.Salario_Acordado, COALESCE(:tope_{concepto}, c.Salario_Acordado)) * :tasa_{concepto}"
+# Todos los recibos de la nómina de una empresa en una sola sentencia.
+SQL_INSERTAR_RECIBOS_EMPRESA = """INSERT INTO Recibos (ID_Nomina, ID_Contrato, Salario_Base, Monto_Deduccion_INCES, Monto_Deduccion_IVSS,
+                         Comision_Hiring_Group, Salario_Neto_Pagado, Fecha_Pago)
+                         SELECT :id_nomina, c.ID_Contrato, c.Salario_Acordado, {inces}, {ivss}, {comision},
+                         c.Salario_Acordado - {inces} - {ivss}, date('now')
+                         FROM Contratos c JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
+                         JOIN Vacantes v ON post.ID_Vacante = v.ID_Vacante
+                         WHERE v.ID_Empresa = :id_empresa AND c.Estatus = 'Activo' ORDER BY c.ID_Contrato""".format(
+    inces=SQL_MONTO_CONCEPTO.format(concepto="INCES"),
+    ivss=SQL_MONTO_CONCEPTO.format(concepto="IVSS"),
+    comision=SQL_MONTO_CONCEPTO.format(concepto="Comision_Hiring_Group"),
+)
+
+
+def _tasas_vigentes(conn, mes, anio):
+    filas = conn.execute(
+        "SELECT Concepto, Tasa, Tope_Base, Fecha_Desde, Fecha_Hasta FROM tasas_nomina"
+    ).fetchall()
+    return calculo_nomina.seleccionar_tasas(filas, mes, anio)
+
+
+def _calcular_recibos_empresa(id_empresa, tasas, conn=None):
+    if conn is None:
+        with get_db_connection() as conn:
+            return _calcular_recibos_empresa(id_empresa, tasas, conn)
+    contratos = conn.execute(SQL_CONTRATOS_ACTIVOS_EMPRESA, (id_empresa,)).fetchall()
+    columnas = calculo_nomina.calcular_recibos(
+        [c["Salario_Acordado"] for c in contratos], tasas
+    )
+    return calculo_nomina.filas_recibos([c["ID_Contrato"] for c in contratos], columnas)
+
+
+def _insertar_nomina(conn, id_empresa, mes, anio, recibos):
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO Nominas (ID_Empresa, Mes, Anio) VALUES (?, ?, ?)",
+        (id_empresa, mes, anio),
+    )
+    id_nomina = cursor.lastrowid
+    cursor.executemany(
+        SQL_INSERTAR_RECIBO, ((id_nomina, *recibo) for recibo in recibos)
+    )
+    return id_nomina
+
+
+def get_tasas_nomina_db():
+    with get_db_connection() as conn:
+        return conn.execute(
+            "SELECT ID_Tasa, Concepto, Tasa, Tope_Base, Fecha_Desde, Fecha_Hasta FROM tasas_nomina ORDER BY Concepto, Fecha_Desde DESC"
+        ).fetchall()
+
+
+FECHA_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def registrar_tasa_nomina_db(concepto, tasa, fecha_desde, tope_base=None):
+    """
+    Registra una nueva tasa para el concepto a partir de 'fecha_desde'
+    (YYYY-MM-DD). La tasa abierta anterior queda vigente hasta el día previo.
+    """
+    # Las fechas de tasas_nomina se comparan como texto: tienen que venir
+    # completas (2024-06-01, no 2024-6-1) para que el orden sea el de las fechas.
+    try:
+        if not FECHA_ISO.match(fecha_desde):
+            raise ValueError
+        date.fromisoformat(fecha_desde)
+    except (TypeError, ValueError):
+        return False, f"La fecha debe tener el formato YYYY-MM-DD: {fecha_desde}"
+    if tope_base is not None and tope_base < 0:
+        return False, "El tope de la base de cálculo no puede ser negativo."
+    try:
+        with get_db_connection() as conn:
+            conn.execute(
+                """UPDATE tasas_nomina SET Fecha_Hasta = date(?, '-1 day')
+                   WHERE Concepto = ? AND Fecha_Hasta IS NULL AND Fecha_Desde < ?""",
+                (fecha_desde, concepto, fecha_desde),
+            )
+            conn.execute(
+                "INSERT INTO tasas_nomina (Concepto, Tasa, Tope_Base, Fecha_Desde) VALUES (?, ?, ?, ?)",
+                (concepto, tasa, tope_base, fecha_desde),
+            )
+            conn.commit()
+            return True, "Tasa registrada con éxito."
+    except sqlite3.Error as e:
+        return False, f"Error al registrar la tasa: {e}"
+
+
 def ejecutar_nomina_db(id_empresa, mes, anio):
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             check_query = "SELECT ID_Nomina FROM Nominas WHERE ID_Empresa = ? AND Mes = ? AND Anio = ?"
             cursor.execute(check_query, (id_empresa, mes, anio))
-            if cursor.fetchone():
+            if cursor.fetchone() or id_empresa in _nominas_archivadas(conn, mes, anio):
                 return (
                     False,
                     "Ya se generó una nómina para esta empresa en este periodo.",
                     None,
                 )
-            sql_nomina = "INSERT INTO Nominas (ID_Empresa, Mes, Anio) VALUES (?, ?, ?)"
-            cursor.execute(sql_nomina, (id_empresa, mes, anio))
+            tasas = _tasas_vigentes(conn, mes, anio)
+            cursor.execute(
+                "INSERT INTO Nominas (ID_Empresa, Mes, Anio) VALUES (?, ?, ?)",
+                (id_empresa, mes, anio),
+            )
             id_nomina = cursor.lastrowid
-            sql_contratos = "SELECT c.ID_Contrato, c.Salario_Acordado FROM Contratos c JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion JOIN Vacantes v ON post.ID_Vacante = v.ID_Vacante WHERE v.ID_Empresa = ? AND c.Estatus = 'Activo'"
-            cursor.execute(sql_contratos, (id_empresa,))
-            contratos = cursor.fetchall()
-            if not contratos:
+            # Todos los recibos se calculan e insertan en una sola sentencia,
+            # con las tasas vigentes como parámetros.
+            params = {"id_nomina": id_nomina, "id_empresa": id_empresa}
+            for concepto, tasa in tasas.items():
+                params[f"tasa_{concepto}"] = tasa.tasa
+                params[f"tope_{concepto}"] = tasa.tope_base
+            cursor.execute(SQL_INSERTAR_RECIBOS_EMPRESA, params)
+            total_recibos = cursor.rowcount
+            if not total_recibos:
                 conn.rollback()
                 return False, "No hay empleados activos para esta empresa.", None
-            for contrato in contratos:
-                salario = contrato["Salario_Acordado"]
-                ded_inces, ded_ivss, comision = (
-                    float(salario) * 0.005,
-                    float(salario) * 0.01,
-                    float(salario) * 0.02,
-                )
-                neto = float(salario) - ded_inces - ded_ivss
-                sql_recibo = "INSERT INTO Recibos (ID_Nomina, ID_Contrato, Salario_Base, Monto_Deduccion_INCES, Monto_Deduccion_IVSS, Comision_Hiring_Group, Salario_Neto_Pagado, Fecha_Pago) VALUES (?, ?, ?, ?, ?, ?, ?, date('now'))"
-                cursor.execute(
-                    sql_recibo,
-                    (
-                        id_nomina,
-                        contrato["ID_Contrato"],
-                        salario,
-                        ded_inces,
-                        ded_ivss,
-                        comision,
-                        neto,
-                    ),
-                )
             conn.commit()
             return (
                 True,
-                f"Nómina generada con éxito para {len(contratos)} empleado(s).",
+                f"Nómina generada con éxito para {total_recibos} empleado(s).",
                 id_nomina,
             )
+    except ValueError as e:
+        return False, str(e), None
     except sqlite3.Error as e:
-        conn.rollback()
         return False, f"Error al generar nómina: {e}", None
 
 
+def previsualizar_nomina_db(mes, anio, id_empresa=None):
+    """
+    Calcula los recibos que generaría la nómina del periodo sin guardarlos,
+    para una empresa o (si id_empresa es None) para todas. Devuelve
+    (exito, mensaje, filas) donde cada fila es un diccionario con Empresa,
+    Empleado, Cedula_Identidad y las columnas del recibo.
+    """
+    try:
+        with get_db_connection() as conn:
+            tasas = _tasas_vigentes(conn, mes, anio)
+            query = """SELECT e.Nombre_Empresa, (p.Nombres || ' ' || p.Apellidos) AS Empleado, p.Cedula_Identidad,
+                       c.ID_Contrato, c.Salario_Acordado
+                       FROM Contratos c JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
+                       JOIN Postulantes p ON post.ID_Postulante = p.ID_Postulante
+                       JOIN Vacantes v ON post.ID_Vacante = v.ID_Vacante
+                       JOIN Empresas e ON v.ID_Empresa = e.ID_Empresa
+                       WHERE c.Estatus = 'Activo'"""
+            params = []
+            if id_empresa:
+                query += " AND v.ID_Empresa = ?"
+                params.append(id_empresa)
+            query += " ORDER BY e.Nombre_Empresa, Empleado"
+            contratos = conn.execute(query, params).fetchall()
+    except ValueError as e:
+        return False, str(e), []
+    except sqlite3.Error as e:
+        return False, f"Error al previsualizar la nómina: {e}", []
+    if not contratos:
+        return False, "No hay empleados activos para esta selección.", []
+    columnas = calculo_nomina.calcular_recibos(
+        [c["Salario_Acordado"] for c in contratos], tasas
+    )
+    filas = [
+        {
+            "Empresa": c["Nombre_Empresa"],
+            "Empleado": c["Empleado"],
+            "Cedula_Identidad": c["Cedula_Identidad"],
+            "ID_Contrato": c["ID_Contrato"],
+        }
+        for c in contratos
+    ]
+    for nombre, valores in columnas.items():
+        for fila, valor in zip(filas, valores):
+            fila[nombre] = valor
+    return True, f"Vista previa de {len(filas)} recibo(s).", filas
+
+
+def ejecutar_nomina_lote_db(mes, anio, max_hilos=4):
+    """
+    Genera la nómina del periodo para todas las empresas. Los recibos de cada
+    empresa se calculan en paralelo en un pool de hilos y un único escritor
+    los inserta, con una transacción por empresa.
+    Devuelve (resultados, segundos): una lista de diccionarios con las claves
+    ID_Empresa, Nombre_Empresa, Estado ('Generada', 'Omitida' o 'Error'),
+    Mensaje, ID_Nomina y Recibos, y el tiempo total transcurrido.
+    """
+    inicio = time.perf_counter()
+    with get_db_connection() as conn:
+        empresas = conn.execute(
+            """SELECT e.ID_Empresa, e.Nombre_Empresa, n.ID_Nomina FROM Empresas e
+               LEFT JOIN Nominas n ON n.ID_Empresa = e.ID_Empresa AND n.Mes = ? AND n.Anio = ?
+               ORDER BY e.Nombre_Empresa""",
+            (mes, anio),
+        ).fetchall()
+        archivadas = _nominas_archivadas(conn, mes, anio)
+
+    resultados = {}
+
+    def registrar(empresa, estado, mensaje, id_nomina=None, recibos=0):
+        resultados[empresa["ID_Empresa"]] = {
+            "ID_Empresa": empresa["ID_Empresa"],
+            "Nombre_Empresa": empresa["Nombre_Empresa"],
+            "Estado": estado,
+            "Mensaje": mensaje,
+            "ID_Nomina": id_nomina,
+            "Recibos": recibos,
+        }
+
+    pendientes = []
+    for empresa in empresas:
+        id_nomina = empresa["ID_Nomina"] or archivadas.get(empresa["ID_Empresa"])
+        if id_nomina:
+            registrar(
+                empresa,
+                "Omitida",
+                "Ya se generó una nómina para esta empresa en este periodo.",
+                id_nomina,
+            )
+        else:
+            pendientes.append(empresa)
+
+    try:
+        with get_db_connection() as conn:
+            tasas = _tasas_vigentes(conn, mes, anio)
+    except ValueError as e:
+        for empresa in pendientes:
+            registrar(empresa, "Error", str(e))
+        pendientes = []
+
+    with ThreadPoolExecutor(max_workers=max_hilos) as ejecutor:
+        futuros = {
+            ejecutor.submit(_calcular_recibos_empresa, e["ID_Empresa"], tasas): e
+            for e in pendientes
+        }
+        with get_db_connection() as escritor:
+            for futuro in as_completed(futuros):
+                empresa = futuros[futuro]
+                try:
+                    recibos = futuro.result()
+                    if not recibos:
+                        registrar(
+                            empresa,
+                            "Omitida",
+                            "No hay empleados activos para esta empresa.",
+                        )
+                        continue
+                    id_nomina = _insertar_nomina(
+                        escritor, empresa["ID_Empresa"], mes, anio, recibos
+                    )
+                    escritor.commit()
+                    registrar(
+                        empresa,
+                        "Generada",
+                        f"Nómina generada con éxito para {len(recibos)} empleado(s).",
+                        id_nomina,
+                        len(recibos),
+                    )
+                except sqlite3.Error as e:
+                    escritor.rollback()
+                    if isinstance(e, sqlite3.IntegrityError) and "UNIQUE" in str(e):
+                        # Otra sesión generó la nómina después de la consulta inicial.
+                        registrar(
+                            empresa,
+                            "Omitida",
+                            "Ya se generó una nómina para esta empresa en este periodo.",
+                        )
+                    else:
+                        registrar(empresa, "Error", f"Error al generar nómina: {e}")
+
+    return (
+        [resultados[e["ID_Empresa"]] for e in empresas],
+        time.perf_counter() - inicio,
+    )
+
+
 def crear_experiencia_db(id_postulante, datos):
     try:
         with get_db_connection() as conn:
@@ -296,27 +1782,116 @@ def crear_experiencia_db(id_postulante, datos):
         return False, f"Error al agregar experiencia: {e}"
 
 
+TOKENS_BUSQUEDA = re.compile(r"\w+")
+
+
+def consulta_fts(texto):
+    """
+    Convierte el texto escrito por el usuario en una consulta FTS5: cada
+    palabra se busca como prefijo y deben aparecer todas. Devuelve None si el
+    texto no tiene palabras.
+    """
+    tokens = TOKENS_BUSQUEDA.findall(texto or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _consulta_vacantes_activas(filtro_area=None, filtro_prof=None, consulta=None):
+    query = """SELECT v.ID_Vacante, v.Cargo_Vacante, v.Descripcion_Perfil, v.Salario_Ofrecido, 
+               e.Nombre_Empresa, p.Nombre_Profesion, ac.Nombre_Area{relevancia}
+               FROM {origen} JOIN Empresas e ON v.ID_Empresa = e.ID_Empresa JOIN Profesiones p ON v.ID_Profesion = p.ID_Profesion
+               LEFT JOIN Areas_Conocimiento ac ON p.ID_Area_Conocimiento = ac.ID_Area_Conocimiento
+               WHERE v.Estatus = 'Activa'"""
+    params = []
+    if consulta:
+        query = query.format(
+            relevancia=", bm25(vacantes_fts) AS Relevancia",
+            origen="vacantes_fts JOIN Vacantes v ON v.ID_Vacante = vacantes_fts.rowid",
+        )
+        query += " AND vacantes_fts MATCH ?"
+        params.append(consulta)
+    else:
+        query = query.format(relevancia="", origen="Vacantes v")
+    if filtro_area:
+        query += " AND ac.ID_Area_Conocimiento = ?"
+        params.append(filtro_area)
+    if filtro_prof:
+        query += " AND p.ID_Profesion = ?"
+        params.append(filtro_prof)
+    return query, params
+
+
 def get_active_vacantes(filtro_area=None, filtro_prof=None, sort_salary=None):
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        query = """SELECT v.ID_Vacante, v.Cargo_Vacante, v.Descripcion_Perfil, v.Salario_Ofrecido, 
-                   e.Nombre_Empresa, p.Nombre_Profesion, ac.Nombre_Area
-                   FROM Vacantes v JOIN Empresas e ON v.ID_Empresa = e.ID_Empresa JOIN Profesiones p ON v.ID_Profesion = p.ID_Profesion
-                   LEFT JOIN Areas_Conocimiento ac ON p.ID_Area_Conocimiento = ac.ID_Area_Conocimiento
-                   WHERE v.Estatus = 'Activa'"""
-        params = []
-        if filtro_area:
-            query += " AND ac.ID_Area_Conocimiento = ?"
-            params.append(filtro_area)
-        if filtro_prof:
-            query += " AND p.ID_Profesion = ?"
-            params.append(filtro_prof)
+        query, params = _consulta_vacantes_activas(filtro_area, filtro_prof)
         if sort_salary:
             query += f" ORDER BY v.Salario_Ofrecido {sort_salary}"
         cursor.execute(query, params)
         return cursor.fetchall()
 
 
+def _codificar_cursor(valor, id_fila):
+    return f"{float(valor)!r}:{id_fila}"
+
+
+def _decodificar_cursor(cursor):
+    """Separa un cursor de paginación 'valor:id' en (float, int)."""
+    try:
+        valor, id_fila = cursor.rsplit(":", 1)
+        return float(valor), int(id_fila)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Cursor de paginación inválido: {cursor!r}")
+
+
+def get_active_vacantes_pagina(
+    filtro_area=None,
+    filtro_prof=None,
+    sort_salary=None,
+    tamano_pagina=50,
+    cursor=None,
+    texto=None,
+):
+    """
+    Página de vacantes activas con paginación por clave (keyset) sobre
+    (Salario_Ofrecido, ID_Vacante). 'cursor' es el valor devuelto por la
+    página anterior (None para la primera). Con 'texto' se buscan las
+    palabras en el cargo y la descripción (FTS5); si no se pide orden por
+    salario, los resultados salen por relevancia (bm25). Devuelve
+    (filas, siguiente_cursor); siguiente_cursor es None cuando no quedan más.
+    """
+    consulta = consulta_fts(texto)
+    query, params = _consulta_vacantes_activas(filtro_area, filtro_prof, consulta)
+    if sort_salary in ("DESC", "ASC"):
+        clave = "v.Salario_Ofrecido"
+        comparacion = "<" if sort_salary == "DESC" else ">"
+        orden = f"v.Salario_Ofrecido {sort_salary}, v.ID_Vacante {sort_salary}"
+    elif consulta:
+        # bm25 es más negativo cuanto más relevante: orden ascendente.
+        clave, comparacion, orden = "Relevancia", ">", "Relevancia, v.ID_Vacante"
+    else:
+        clave, comparacion, orden = None, ">", "v.ID_Vacante"
+    if cursor is not None:
+        valor, id_vacante = _decodificar_cursor(cursor)
+        if clave:
+            query += f" AND ({clave}, v.ID_Vacante) {comparacion} (?, ?)"
+            params += [valor, id_vacante]
+        else:
+            query += " AND v.ID_Vacante > ?"
+            params.append(id_vacante)
+    query += f" ORDER BY {orden} LIMIT ?"
+    params.append(tamano_pagina + 1)
+    with get_db_connection() as conn:
+        filas = conn.execute(query, params).fetchall()
+    if len(filas) <= tamano_pagina:
+        return filas, None
+    filas = filas[:tamano_pagina]
+    ultima = filas[-1]
+    valor = ultima["Relevancia"] if clave == "Relevancia" else ultima["Salario_Ofrecido"]
+    return filas, _codificar_cursor(valor, ultima["ID_Vacante"])
+
+
 def get_postulaciones_para_contratar():
     with get_db_connection() as conn:
         return conn.execute("""SELECT post.ID_Postulacion, p.Nombres, p.Apellidos, v.Cargo_Vacante 
@@ -325,6 +1900,35 @@ def get_postulaciones_para_contratar():
                                WHERE post.Estatus IN ('Recibida', 'En Revision')""").fetchall()
 
 
+def buscar_postulantes_db(texto, tamano_pagina=50, cursor=None):
+    """
+    Busca candidatos por nombre, cédula o experiencia laboral (empresa, cargo
+    y descripción), ordenados por relevancia (bm25) y paginados por clave
+    sobre (relevancia, ID_Postulante). Devuelve (filas, siguiente_cursor).
+    """
+    consulta = consulta_fts(texto)
+    if not consulta:
+        return [], None
+    query = """SELECT p.ID_Postulante, p.Nombres, p.Apellidos, p.Cedula_Identidad, u.Nombre_Universidad,
+               snippet(postulantes_fts, 3, '[', ']', '…', 12) AS Coincidencia,
+               bm25(postulantes_fts) AS Relevancia
+               FROM postulantes_fts JOIN Postulantes p ON p.ID_Postulante = postulantes_fts.rowid
+               LEFT JOIN Universidades u ON p.ID_Universidad = u.ID_Universidad
+               WHERE postulantes_fts MATCH ?"""
+    params = [consulta]
+    if cursor is not None:
+        query += " AND (Relevancia, p.ID_Postulante) > (?, ?)"
+        params += list(_decodificar_cursor(cursor))
+    query += " ORDER BY Relevancia, p.ID_Postulante LIMIT ?"
+    params.append(tamano_pagina + 1)
+    with get_db_connection() as conn:
+        filas = conn.execute(query, params).fetchall()
+    if len(filas) <= tamano_pagina:
+        return filas, None
+    filas = filas[:tamano_pagina]
+    return filas, _codificar_cursor(filas[-1]["Relevancia"], filas[-1]["ID_Postulante"])
+
+
 def get_vacantes_por_empresa(id_empresa):
     with get_db_connection() as conn:
         return conn.execute(
@@ -340,17 +1944,18 @@ def get_postulaciones_por_postulante(id_postulante):
 
 
 def get_recibos_por_contratado(id_postulante, mes=None, anio=None):
-    with get_db_connection() as conn:
-        query = "SELECT r.Fecha_Pago, r.Salario_Base, r.Salario_Neto_Pagado, n.Mes, n.Anio FROM Recibos r JOIN Nominas n ON r.ID_Nomina = n.ID_Nomina JOIN Contratos c ON r.ID_Contrato = c.ID_Contrato JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion WHERE p.ID_Postulante = ?"
-        params = [id_postulante]
-        if mes:
-            query += " AND n.Mes = ?"
-            params.append(mes)
-        if anio:
-            query += " AND n.Anio = ?"
-            params.append(anio)
-        query += " ORDER BY n.Anio DESC, n.Mes DESC"
-        return conn.execute(query, params).fetchall()
+    # Sin año se recorre el historial completo, incluidos los años archivados.
+    query = "SELECT r.ID_Recibo, r.Fecha_Pago, r.Salario_Base, r.Salario_Neto_Pagado, n.Mes, n.Anio FROM {esquema}.Recibos r JOIN {esquema}.Nominas n ON r.ID_Nomina = n.ID_Nomina JOIN Contratos c ON r.ID_Contrato = c.ID_Contrato JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion WHERE p.ID_Postulante = ?"
+    params = [id_postulante]
+    if mes:
+        query += " AND n.Mes = ?"
+        params.append(mes)
+    if anio:
+        query += " AND n.Anio = ?"
+        params.append(anio)
+    with get_db_connection() as conn, _esquemas_nomina(conn, anio or None) as esquemas:
+        query, params = _en_esquemas(query, esquemas, params)
+        return conn.execute(query + " ORDER BY Anio DESC, Mes DESC", params).fetchall()
 
 
 def get_datos_constancia(id_postulante):
@@ -399,33 +2004,174 @@ def get_datos_constancia(id_postulante):
 
 
 def get_nomina_reporte_db(id_empresa, mes, anio):
-    with get_db_connection() as conn:
-        query = """SELECT (p.Nombres || ' ' || p.Apellidos) AS Empleado, p.Cedula_Identidad, rec.Salario_Base
-                   FROM Recibos rec JOIN Nominas nom ON rec.ID_Nomina = nom.ID_Nomina
-                   JOIN Contratos c ON rec.ID_Contrato = c.ID_Contrato JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
-                   JOIN Postulantes p ON post.ID_Postulante = p.ID_Postulante
-                   WHERE nom.ID_Empresa = ? AND nom.Mes = ? AND nom.Anio = ?"""
-        return conn.execute(query, (id_empresa, mes, anio)).fetchall()
+    query = """SELECT (p.Nombres || ' ' || p.Apellidos) AS Empleado, p.Cedula_Identidad, rec.Salario_Base
+               FROM {esquema}.Recibos rec JOIN {esquema}.Nominas nom ON rec.ID_Nomina = nom.ID_Nomina
+               JOIN Contratos c ON rec.ID_Contrato = c.ID_Contrato JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
+               JOIN Postulantes p ON post.ID_Postulante = p.ID_Postulante
+               WHERE nom.ID_Empresa = ? AND nom.Mes = ? AND nom.Anio = ?"""
+    with get_conexion_reportes() as conn, _esquemas_nomina(conn, anio) as esquemas:
+        query, params = _en_esquemas(query, esquemas, (id_empresa, mes, anio))
+        return conn.execute(query, params).fetchall()
 
 
 def get_toda_nomina_reporte_db():
+    # Lee los totales de resumen_nominas (una fila por nómina) en lugar de
+    # sumar todos los recibos emitidos.
+    query = """SELECT e.Nombre_Empresa, nom.Mes, nom.Anio, SUM(r.Total_Salario_Base) as Total_Nomina,
+               SUM(r.Empleados) AS Empleados, SUM(r.Total_INCES + r.Total_IVSS) AS Total_Deducciones,
+               SUM(r.Total_Comision) AS Total_Comision, SUM(r.Total_Neto) AS Total_Neto
+               FROM {esquema}.Resumen_Nominas r JOIN {esquema}.Nominas nom ON r.ID_Nomina = nom.ID_Nomina
+               JOIN Empresas e ON nom.ID_Empresa = e.ID_Empresa
+               GROUP BY e.Nombre_Empresa, nom.Mes, nom.Anio"""
+    with get_conexion_reportes() as conn, _esquemas_nomina(conn) as esquemas:
+        query, params = _en_esquemas(query, esquemas)
+        return conn.execute(
+            query + " ORDER BY Nombre_Empresa, Anio DESC, Mes DESC", params
+        ).fetchall()
+
+
+COLUMNAS_RESUMEN_NOMINAS = (
+    "Empleados",
+    "Total_Salario_Base",
+    "Total_INCES",
+    "Total_IVSS",
+    "Total_Comision",
+    "Total_Neto",
+)
+
+
+def verificar_resumen_nominas_db(reconstruir=True, tolerancia=0.005):
+    """
+    Compara resumen_nominas con los totales calculados desde los recibos y,
+    si 'reconstruir' es True, lo reemplaza por el cálculo completo en la
+    misma transacción. Devuelve la lista de diferencias como tuplas
+    (ID_Nomina, columna, guardado, calculado); una nómina que falta en uno
+    de los dos lados aparece con None. Los montos que difieren menos que
+    'tolerancia' (redondeo de las sumas incrementales) no cuentan.
+    """
     with get_db_connection() as conn:
-        query = """SELECT e.Nombre_Empresa, nom.Mes, nom.Anio, SUM(rec.Salario_Base) as Total_Nomina
-                   FROM Recibos rec JOIN Nominas nom ON rec.ID_Nomina = nom.ID_Nomina
-                   JOIN Empresas e ON nom.ID_Empresa = e.ID_Empresa
-                   GROUP BY e.Nombre_Empresa, nom.Mes, nom.Anio ORDER BY e.Nombre_Empresa, nom.Anio DESC, nom.Mes DESC"""
-        return conn.execute(query).fetchall()
+        conn.execute("BEGIN IMMEDIATE")
+        guardado = {
+            fila[0]: tuple(fila[1:])
+            for fila in conn.execute(
+                f"SELECT ID_Nomina, {', '.join(COLUMNAS_RESUMEN_NOMINAS)} FROM resumen_nominas"
+            )
+        }
+        calculado = {
+            fila[0]: tuple(fila[1:]) for fila in conn.execute(SQL_CALCULAR_RESUMEN_NOMINAS)
+        }
+        diferencias = []
+        for id_nomina in sorted(guardado.keys() | calculado.keys()):
+            antes = guardado.get(id_nomina, (None,) * len(COLUMNAS_RESUMEN_NOMINAS))
+            despues = calculado.get(id_nomina, (None,) * len(COLUMNAS_RESUMEN_NOMINAS))
+            for columna, a, b in zip(COLUMNAS_RESUMEN_NOMINAS, antes, despues):
+                if a is None or b is None:
+                    if a != b:
+                        diferencias.append((id_nomina, columna, a, b))
+                elif abs(a - b) >= tolerancia:
+                    diferencias.append((id_nomina, columna, a, b))
+        if reconstruir:
+            conn.execute("DELETE FROM resumen_nominas")
+            conn.execute(f"INSERT INTO resumen_nominas {SQL_CALCULAR_RESUMEN_NOMINAS}")
+            # resumen_nominas no tiene versión propia: cuenta como cambio de recibos.
+            conn.execute(SQL_SUBIR_VERSION_TABLA.format(tabla="recibos"))
+            conn.commit()
+        else:
+            conn.rollback()
+        return diferencias
 
 
 def get_nomina_generada_detalle_db(id_nomina):
+    query = """SELECT (p.Nombres || ' ' || p.Apellidos) AS Empleado, p.Cedula_Identidad, rec.Salario_Base,
+               (rec.Monto_Deduccion_INCES + rec.Monto_Deduccion_IVSS) as Total_Deducciones, rec.Salario_Neto_Pagado
+               FROM {esquema}.Recibos rec JOIN Contratos c ON rec.ID_Contrato = c.ID_Contrato
+               JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
+               JOIN Postulantes p ON post.ID_Postulante = p.ID_Postulante
+               WHERE rec.ID_Nomina = ?"""
     with get_db_connection() as conn:
-        query = """SELECT (p.Nombres || ' ' || p.Apellidos) AS Empleado, p.Cedula_Identidad, rec.Salario_Base,
-                   (rec.Monto_Deduccion_INCES + rec.Monto_Deduccion_IVSS) as Total_Deducciones, rec.Salario_Neto_Pagado
-                   FROM Recibos rec JOIN Contratos c ON rec.ID_Contrato = c.ID_Contrato 
-                   JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
-                   JOIN Postulantes p ON post.ID_Postulante = p.ID_Postulante
-                   WHERE rec.ID_Nomina = ? ORDER BY Empleado"""
-        return conn.execute(query, (id_nomina,)).fetchall()
+        filas = conn.execute(query.format(esquema="main") + " ORDER BY Empleado", (id_nomina,)).fetchall()
+        if filas:
+            return filas
+        # Sin el año no se sabe en qué archivo está: se busca en todos.
+        with _esquemas_nomina(conn) as esquemas:
+            if len(esquemas) == 1:
+                return filas
+            query, params = _en_esquemas(query, esquemas[1:], (id_nomina,))
+            return conn.execute(query + " ORDER BY Empleado", params).fetchall()
+
+
+def iterar_recibos_db(mes=None, anio=None, id_empresa=None, id_nomina=None, tamano_lote=1000):
+    """
+    Genera los recibos que cumplen los filtros, con la empresa, el periodo y
+    el empleado de cada uno, leyéndolos de a 'tamano_lote' filas para no
+    cargar el periodo completo en memoria. Salen en orden de nómina y recibo,
+    primero los de los años archivados. La conexión queda prestada hasta que
+    el generador se agota o se cierra.
+    """
+    query = """SELECT e.Nombre_Empresa, nom.Mes, nom.Anio, (p.Nombres || ' ' || p.Apellidos) AS Empleado,
+               p.Cedula_Identidad, rec.Salario_Base, rec.Monto_Deduccion_INCES, rec.Monto_Deduccion_IVSS,
+               rec.Comision_Hiring_Group, rec.Salario_Neto_Pagado, rec.Fecha_Pago
+               FROM {esquema}.Nominas nom JOIN Empresas e ON nom.ID_Empresa = e.ID_Empresa
+               JOIN {esquema}.Recibos rec ON rec.ID_Nomina = nom.ID_Nomina
+               JOIN Contratos c ON rec.ID_Contrato = c.ID_Contrato
+               JOIN Postulaciones post ON c.ID_Postulacion = post.ID_Postulacion
+               JOIN Postulantes p ON post.ID_Postulante = p.ID_Postulante
+               WHERE 1=1"""
+    params = []
+    for columna, valor in (
+        ("nom.Mes", mes),
+        ("nom.Anio", anio),
+        ("nom.ID_Empresa", id_empresa),
+        ("nom.ID_Nomina", id_nomina),
+    ):
+        if valor is not None:
+            query += f" AND {columna} = ?"
+            params.append(valor)
+    query += " ORDER BY nom.ID_Nomina, rec.ID_Recibo"
+    with get_conexion_reportes() as conn, _esquemas_nomina(conn, anio) as esquemas:
+        for esquema in esquemas[1:] + esquemas[:1]:
+            cursor = conn.execute(query.format(esquema=esquema), params)
+            try:
+                while True:
+                    filas = cursor.fetchmany(tamano_lote)
+                    if not filas:
+                        break
+                    yield from filas
+            finally:
+                # Un cursor a medio leer impide desadjuntar su archivo.
+                cursor.close()
+
+
+# Columnas de iterar_usuarios_db: las mismas que lee importar.py.
+SQL_USUARIOS_EXPORTABLES = {
+    "Empresa": """SELECT u.Email, u.Password, e.Nombre_Empresa, e.RIF, e.Sector_Industrial,
+                  e.Persona_Contacto, e.Telefono_Contacto, e.Email_Contacto
+                  FROM Usuarios u JOIN Empresas e ON e.ID_Empresa = u.ID_Usuario
+                  ORDER BY e.ID_Empresa""",
+    "Postulante": """SELECT u.Email, u.Password, p.Nombres, p.Apellidos, p.Cedula_Identidad,
+                     p.Fecha_Nacimiento, p.Direccion, p.Telefono, un.Nombre_Universidad AS Universidad
+                     FROM Usuarios u JOIN Postulantes p ON p.ID_Postulante = u.ID_Usuario
+                     LEFT JOIN Universidades un ON un.ID_Universidad = p.ID_Universidad
+                     ORDER BY u.ID_Usuario""",
+}
+
+
+def iterar_usuarios_db(tipo_usuario, tamano_lote=1000):
+    """
+    Genera las empresas o postulantes ('Empresa' o 'Postulante') con sus
+    datos de usuario, con las columnas que acepta importar.py, leyéndolos de
+    a 'tamano_lote' filas. Como iterar_recibos_db, la conexión queda
+    prestada hasta que el generador se agota o se cierra.
+    """
+    if tipo_usuario not in SQL_USUARIOS_EXPORTABLES:
+        raise ValueError(f"Tipo de usuario no exportable: '{tipo_usuario}'.")
+    with get_db_connection() as conn:
+        cursor = conn.execute(SQL_USUARIOS_EXPORTABLES[tipo_usuario])
+        while True:
+            filas = cursor.fetchmany(tamano_lote)
+            if not filas:
+                return
+            yield from filas
 
 
 def get_experiencias_db(id_postulante):
@@ -480,6 +2226,8 @@ def actualizar_usuario_db(id_usuario, tipo_usuario, datos):
                 )
                 conn.execute(sql, valores)
             conn.commit()
+            if tipo_usuario == "Empresa":
+                invalidar_cache_catalogos("Empresas")
             return True, "Datos actualizados con éxito."
     except sqlite3.Error as e:
         return False, f"Error al actualizar los datos: {e}"
@@ -523,6 +2271,8 @@ def eliminar_usuario_db(id_usuario):
             cursor.execute("DELETE FROM Usuarios WHERE ID_Usuario = ?", (id_usuario,))
             conn.commit()
             if cursor.rowcount > 0:
+                # Si era una empresa, el borrado en cascada la quitó del catálogo.
+                invalidar_cache_catalogos("Empresas")
                 return True, "Usuario eliminado con éxito."
             else:
                 return False, "No se encontró el usuario para eliminar."
@@ -0,0 +1,241 @@
+"""
+Exportación de reportes de nómina (y de los usuarios, con las columnas que
+lee importar.py) a CSV y XLSX. Las filas se escriben a
+medida que se leen de la base de datos (db_manager.iterar_recibos_db), así
+que la memoria usada no depende del tamaño del periodo. El XLSX se genera
+sin dependencias externas: es un ZIP con el XML mínimo que abren Excel y
+LibreOffice, y la hoja se escribe en streaming dentro del ZIP.
+
+Uso: python exportar.py {recibos,resumen,empresas,postulantes} salida.csv|salida.xlsx
+         [--mes M] [--anio A] [--empresa ID] [--nomina ID] [--con-password] [--db ruta]
+"""
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+import db_manager
+
+# (clave de la fila, encabezado) de cada reporte exportable.
+COLUMNAS_RECIBOS = (
+    ("Nombre_Empresa", "Empresa"),
+    ("Mes", "Mes"),
+    ("Anio", "Año"),
+    ("Empleado", "Empleado"),
+    ("Cedula_Identidad", "Cédula"),
+    ("Salario_Base", "Salario Base"),
+    ("Monto_Deduccion_INCES", "Deducción INCES"),
+    ("Monto_Deduccion_IVSS", "Deducción IVSS"),
+    ("Comision_Hiring_Group", "Comisión Hiring Group"),
+    ("Salario_Neto_Pagado", "Salario Neto"),
+    ("Fecha_Pago", "Fecha de Pago"),
+)
+COLUMNAS_RESUMEN = (
+    ("Nombre_Empresa", "Empresa"),
+    ("Mes", "Mes"),
+    ("Anio", "Año"),
+    ("Empleados", "Empleados"),
+    ("Total_Nomina", "Total Salario Base"),
+    ("Total_Deducciones", "Total Deducciones"),
+    ("Total_Comision", "Total Comisión"),
+    ("Total_Neto", "Total Neto"),
+)
+# Usuarios: los encabezados son los nombres de columna de importar.py, así
+# el archivo se puede volver a importar (con --con-password, que importar
+# exige).
+COLUMNAS_EMPRESAS = tuple(
+    (c, c)
+    for c in (
+        "Email", "Password", "Nombre_Empresa", "RIF", "Sector_Industrial",
+        "Persona_Contacto", "Telefono_Contacto", "Email_Contacto",
+    )
+)
+COLUMNAS_POSTULANTES = tuple(
+    (c, c)
+    for c in (
+        "Email", "Password", "Nombres", "Apellidos", "Cedula_Identidad",
+        "Fecha_Nacimiento", "Direccion", "Telefono", "Universidad",
+    )
+)
+REPORTES = ("recibos", "resumen", "empresas", "postulantes")
+FORMATOS = ("csv", "xlsx")
+
+
+# --- CSV ---
+def escribir_csv(ruta, encabezados, filas, delimitador=","):
+    """
+    Escribe las filas en 'ruta' como CSV UTF-8 con BOM, para que Excel
+    reconozca los acentos. Devuelve la cantidad de filas escritas.
+    """
+    cantidad = 0
+    with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+        escritor = csv.writer(archivo, delimiter=delimitador)
+        escritor.writerow(encabezados)
+        for fila in filas:
+            escritor.writerow("" if valor is None else valor for valor in fila)
+            cantidad += 1
+    return cantidad
+
+
+# --- XLSX ---
+# Caracteres de control que XML 1.0 no admite.
+CARACTERES_INVALIDOS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+XLSX_TIPOS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+</Types>"""
+XLSX_RELACIONES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+XLSX_LIBRO = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="{hoja}" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+XLSX_RELACIONES_LIBRO = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+# Estilo 1: encabezado en negrita.
+XLSX_ESTILOS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/><xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>
+</styleSheet>"""
+
+
+def _celda_xlsx(valor, estilo=""):
+    # Cadenas en línea (inlineStr): no hace falta acumular una tabla compartida.
+    if valor is None:
+        return "<c/>"
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        texto = escape(CARACTERES_INVALIDOS.sub("", str(valor)))
+        return f'<c t="inlineStr"{estilo}><is><t xml:space="preserve">{texto}</t></is></c>'
+    return f"<c{estilo}><v>{valor!r}</v></c>"
+
+
+def escribir_xlsx(ruta, encabezados, filas, hoja="Reporte"):
+    """
+    Escribe las filas en 'ruta' como un libro XLSX de una hoja con el
+    encabezado en negrita. Devuelve la cantidad de filas escritas.
+    """
+    cantidad = 0
+    with zipfile.ZipFile(ruta, "w", zipfile.ZIP_DEFLATED) as libro:
+        libro.writestr("[Content_Types].xml", XLSX_TIPOS)
+        libro.writestr("_rels/.rels", XLSX_RELACIONES)
+        libro.writestr("xl/workbook.xml", XLSX_LIBRO.format(hoja=escape(hoja[:31])))
+        libro.writestr("xl/_rels/workbook.xml.rels", XLSX_RELACIONES_LIBRO)
+        libro.writestr("xl/styles.xml", XLSX_ESTILOS)
+        with libro.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as binario:
+
+            def escribir(texto):
+                binario.write(texto.encode("utf-8"))
+
+            escribir(
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                "<sheetData>"
+            )
+            escribir(
+                "<row>" + "".join(_celda_xlsx(e, ' s="1"') for e in encabezados) + "</row>"
+            )
+            for fila in filas:
+                escribir("<row>" + "".join(_celda_xlsx(v) for v in fila) + "</row>")
+                cantidad += 1
+            escribir("</sheetData></worksheet>")
+    return cantidad
+
+
+# --- REPORTES ---
+def formato_de(ruta):
+    formato = os.path.splitext(ruta)[1].lower().lstrip(".")
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: '{formato}'. Use .csv o .xlsx.")
+    return formato
+
+
+def _filas(filas, columnas):
+    for fila in filas:
+        yield tuple(fila[clave] for clave, _ in columnas)
+
+
+def exportar_reporte(
+    reporte, ruta, mes=None, anio=None, id_empresa=None, id_nomina=None, con_password=False
+):
+    """
+    Exporta un reporte a 'ruta' (el formato sale de la extensión):
+    'recibos' son los recibos que cumplen los filtros, uno por fila;
+    'resumen' son los totales por empresa y periodo de todas las nóminas;
+    'empresas' y 'postulantes' son los usuarios de ese tipo, sin la
+    contraseña salvo que 'con_password' sea True.
+    Devuelve (exito, mensaje) como las funciones de db_manager.
+    """
+    try:
+        formato = formato_de(ruta)
+        if reporte == "recibos":
+            columnas = COLUMNAS_RECIBOS
+            filas = db_manager.iterar_recibos_db(mes, anio, id_empresa, id_nomina)
+        elif reporte == "resumen":
+            columnas = COLUMNAS_RESUMEN
+            filas = db_manager.get_toda_nomina_reporte_db()
+        elif reporte in ("empresas", "postulantes"):
+            columnas, tipo = (
+                (COLUMNAS_EMPRESAS, "Empresa")
+                if reporte == "empresas"
+                else (COLUMNAS_POSTULANTES, "Postulante")
+            )
+            if not con_password:
+                columnas = tuple(c for c in columnas if c[0] != "Password")
+            filas = db_manager.iterar_usuarios_db(tipo)
+        else:
+            raise ValueError(f"Reporte desconocido: '{reporte}'.")
+        escribir = escribir_xlsx if formato == "xlsx" else escribir_csv
+        cantidad = escribir(ruta, [titulo for _, titulo in columnas], _filas(filas, columnas))
+        return True, f"Se exportaron {cantidad} fila(s) a {os.path.basename(ruta)}."
+    except ValueError as e:
+        return False, str(e)
+    except (OSError, sqlite3.Error) as e:
+        return False, f"Error al exportar: {e}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("reporte", choices=REPORTES)
+    parser.add_argument("salida", help="Archivo .csv o .xlsx a crear.")
+    parser.add_argument("--mes", type=int)
+    parser.add_argument("--anio", type=int)
+    parser.add_argument("--empresa", type=int, help="ID de la empresa.")
+    parser.add_argument("--nomina", type=int, help="ID de la nómina.")
+    parser.add_argument(
+        "--con-password",
+        action="store_true",
+        help="Incluir la contraseña al exportar usuarios (importar.py la exige).",
+    )
+    parser.add_argument("--db", default=db_manager.DB_PATH)
+    args = parser.parse_args()
+
+    db_manager.configurar_base_datos(args.db)
+    exito, mensaje = exportar_reporte(
+        args.reporte, args.salida, args.mes, args.anio, args.empresa, args.nomina,
+        args.con_password,
+    )
+    print(mensaje)
+    sys.exit(0 if exito else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 PRAGMA foreign_keys = ON;
 
+BEGIN TRANSACTION;
+
 -- --- Tabla de Usuarios (Tabla Central) ---
 CREATE TABLE IF NOT EXISTS `usuarios` (
   `ID_Usuario` INTEGER PRIMARY KEY,
@@ -0,0 +1,485 @@
+"""
+Importación masiva desde CSV de empresas, postulantes, experiencias
+laborales y vacantes. El archivo se lee en streaming y se procesa por lotes:
+cada fila se valida, las que repiten un Email, RIF o Cédula (en el archivo o
+en la base) se descartan, y las demás se insertan con executemany en una
+sola transacción por lote. Una fila con errores se informa con su número de
+línea y no detiene la importación.
+
+Columnas de cada tipo (las marcadas con * son obligatorias):
+  empresas:     Email*, Password*, Nombre_Empresa*, RIF, Sector_Industrial,
+                Persona_Contacto, Telefono_Contacto, Email_Contacto
+  postulantes:  Email*, Password*, Nombres*, Apellidos*, Cedula_Identidad,
+                Fecha_Nacimiento, Direccion, Telefono, Universidad
+  experiencias: Email_Postulante*, Empresa*, Cargo_Ocupado*, Fecha_Inicio*,
+                Fecha_Fin, Descripcion
+  vacantes:     Email_Empresa*, Cargo_Vacante*, Descripcion_Perfil*,
+                Salario_Ofrecido*, Profesion, Estatus
+
+Los montos aceptan la coma decimal ("1500,50" o "1.500,50"); sin coma, un
+punto seguido de tres dígitos ("1.500") se rechaza por ambiguo.
+
+Uso: python importar.py {empresas,postulantes,experiencias,vacantes} archivo.csv
+         [--db ruta] [--lote 5000] [--errores errores.csv]
+"""
+
+import argparse
+import csv
+from abc import ABC, abstractmethod
+import re
+import sqlite3
+import sys
+import time
+from datetime import date
+
+import db_manager
+
+EMAIL_VALIDO = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+FECHA_VALIDA = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# "1.500" puede ser 1500 (punto de miles) o 1,5 (punto decimal).
+MILES_AMBIGUOS = re.compile(r"\.\d{3}$")
+# Máximo de parámetros por consulta IN (...) al buscar claves existentes.
+MAX_PARAMETROS = 500
+
+
+# --- VALIDACIÓN DE CAMPOS ---
+def _texto(fila, columna, obligatorio=False):
+    valor = (fila.get(columna) or "").strip()
+    if obligatorio and not valor:
+        raise ValueError(f"Falta el valor de '{columna}'.")
+    return valor or None
+
+
+def _email(fila, columna):
+    valor = _texto(fila, columna, obligatorio=True)
+    if not EMAIL_VALIDO.match(valor):
+        raise ValueError(f"'{columna}' no es un email válido: {valor}")
+    return valor
+
+
+def _fecha(fila, columna, obligatorio=False):
+    valor = _texto(fila, columna, obligatorio)
+    if valor:
+        try:
+            # fromisoformat es mucho más rápido que strptime para miles de filas.
+            if not FECHA_VALIDA.match(valor):
+                raise ValueError
+            date.fromisoformat(valor)
+        except ValueError:
+            raise ValueError(f"'{columna}' debe tener el formato YYYY-MM-DD: {valor}")
+    return valor
+
+
+def _monto(fila, columna):
+    valor = _texto(fila, columna, obligatorio=True)
+    # Se acepta la coma decimal de las hojas de cálculo en español.
+    if "," in valor:
+        normalizado = valor.replace(".", "").replace(",", ".")
+    elif MILES_AMBIGUOS.search(valor):
+        raise ValueError(
+            f"'{columna}' es ambiguo: {valor}. Escriba los miles sin separador "
+            "o use la coma decimal (1500 o 1,5)."
+        )
+    else:
+        normalizado = valor
+    try:
+        monto = float(normalizado)
+    except ValueError:
+        raise ValueError(f"'{columna}' no es un número: {valor}")
+    if monto <= 0:
+        raise ValueError(f"'{columna}' debe ser mayor que cero.")
+    return monto
+
+
+def _catalogo(conn, tabla, id_col, nombre_col):
+    # Nombre (sin distinguir mayúsculas) -> ID.
+    return {
+        fila[1].casefold(): fila[0]
+        for fila in conn.execute(f"SELECT {id_col}, {nombre_col} FROM {tabla}")
+    }
+
+
+def _de_catalogo(fila, columna, catalogo):
+    valor = _texto(fila, columna)
+    if valor is None:
+        return None
+    if valor.casefold() not in catalogo:
+        raise ValueError(f"'{columna}' no existe en el catálogo: {valor}")
+    return catalogo[valor.casefold()]
+
+
+def _existentes(conn, sql, valores):
+    # Valores de la lista que ya están en la base, consultados por bloques.
+    valores = [v for v in set(valores) if v is not None]
+    encontrados = {}
+    for i in range(0, len(valores), MAX_PARAMETROS):
+        bloque = valores[i : i + MAX_PARAMETROS]
+        marcas = ", ".join("?" * len(bloque))
+        encontrados.update(
+            (fila[0], fila[1]) for fila in conn.execute(sql.format(marcas=marcas), bloque)
+        )
+    return encontrados
+
+
+# --- IMPORTADORES ---
+class Importador(ABC):
+    """
+    Base de los importadores. Cada subclase define sus columnas, cómo
+    validar una fila (validar), cómo descartar o completar un lote contra la
+    base (revisar_lote) y cómo insertarlo (insertar).
+    """
+
+    columnas = ()
+    obligatorias = ()
+    # (campo validado, SQL que devuelve los valores ya usados) de las claves únicas.
+    claves_unicas = ()
+
+    def __init__(self, conn):
+        self.vistos = {campo: set() for campo, _ in self.claves_unicas}
+
+    @abstractmethod
+    def validar(self, fila):
+        """Devuelve los datos de la fila validados o lanza ValueError."""
+
+    def revisar_lote(self, conn, lote):
+        """
+        Descarta las filas cuyas claves únicas ya se vieron en el archivo o
+        existen en la base. Devuelve (filas_validas, errores).
+        """
+        errores = []
+        for campo, sql in self.claves_unicas:
+            usados = _existentes(conn, sql, [datos[campo] for _, datos in lote])
+            validas = []
+            for linea, datos in lote:
+                valor = datos[campo]
+                if valor is not None and (valor in usados or valor in self.vistos[campo]):
+                    errores.append((linea, f"{campo} ya registrado: {valor}"))
+                    continue
+                if valor is not None:
+                    self.vistos[campo].add(valor)
+                validas.append((linea, datos))
+            lote = validas
+        return lote, errores
+
+    @abstractmethod
+    def insertar(self, conn, filas):
+        """Inserta las filas validadas; la transacción la maneja quien llama."""
+
+
+class ImportadorUsuarios(Importador):
+    """Usuarios con su perfil: los IDs se asignan a partir del mayor existente."""
+
+    tipo_usuario = None
+    sql_perfil = None
+
+    @abstractmethod
+    def valores_perfil(self, id_usuario, datos):
+        """Parámetros de sql_perfil para el usuario recién creado."""
+
+    def insertar(self, conn, filas):
+        siguiente = conn.execute("SELECT COALESCE(MAX(ID_Usuario), 0) + 1 FROM Usuarios").fetchone()[0]
+        ids = range(siguiente, siguiente + len(filas))
+        conn.executemany(
+            "INSERT INTO Usuarios (ID_Usuario, Email, Password, Tipo_Usuario) VALUES (?, ?, ?, ?)",
+            (
+                (id_usuario, d["Email"], d["Password"], self.tipo_usuario)
+                for id_usuario, d in zip(ids, filas)
+            ),
+        )
+        conn.executemany(
+            self.sql_perfil,
+            (self.valores_perfil(id_usuario, d) for id_usuario, d in zip(ids, filas)),
+        )
+
+
+class ImportadorEmpresas(ImportadorUsuarios):
+    columnas = (
+        "Email", "Password", "Nombre_Empresa", "RIF", "Sector_Industrial",
+        "Persona_Contacto", "Telefono_Contacto", "Email_Contacto",
+    )
+    obligatorias = ("Email", "Password", "Nombre_Empresa")
+    claves_unicas = (
+        ("Email", "SELECT Email, ID_Usuario FROM Usuarios WHERE Email IN ({marcas})"),
+        ("RIF", "SELECT RIF, ID_Empresa FROM Empresas WHERE RIF IN ({marcas})"),
+    )
+    tipo_usuario = "Empresa"
+    sql_perfil = "INSERT INTO Empresas (ID_Empresa, Nombre_Empresa, RIF, Sector_Industrial, Persona_Contacto, Telefono_Contacto, Email_Contacto) VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+    def validar(self, fila):
+        datos = {c: _texto(fila, c) for c in self.columnas}
+        datos["Email"] = _email(fila, "Email")
+        datos["Password"] = _texto(fila, "Password", obligatorio=True)
+        datos["Nombre_Empresa"] = _texto(fila, "Nombre_Empresa", obligatorio=True)
+        if datos["Email_Contacto"]:
+            datos["Email_Contacto"] = _email(fila, "Email_Contacto")
+        return datos
+
+    def valores_perfil(self, id_usuario, d):
+        return (
+            id_usuario, d["Nombre_Empresa"], d["RIF"], d["Sector_Industrial"],
+            d["Persona_Contacto"], d["Telefono_Contacto"], d["Email_Contacto"],
+        )
+
+
+class ImportadorPostulantes(ImportadorUsuarios):
+    columnas = (
+        "Email", "Password", "Nombres", "Apellidos", "Cedula_Identidad",
+        "Fecha_Nacimiento", "Direccion", "Telefono", "Universidad",
+    )
+    obligatorias = ("Email", "Password", "Nombres", "Apellidos")
+    claves_unicas = (
+        ("Email", "SELECT Email, ID_Usuario FROM Usuarios WHERE Email IN ({marcas})"),
+        (
+            "Cedula_Identidad",
+            "SELECT Cedula_Identidad, ID_Postulante FROM Postulantes WHERE Cedula_Identidad IN ({marcas})",
+        ),
+    )
+    tipo_usuario = "Postulante"
+    sql_perfil = "INSERT INTO Postulantes (ID_Postulante, Nombres, Apellidos, Cedula_Identidad, Fecha_Nacimiento, Direccion, Telefono, ID_Universidad) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+    def __init__(self, conn):
+        super().__init__(conn)
+        self.universidades = _catalogo(conn, "Universidades", "ID_Universidad", "Nombre_Universidad")
+
+    def validar(self, fila):
+        datos = {c: _texto(fila, c) for c in self.columnas}
+        datos["Email"] = _email(fila, "Email")
+        for columna in ("Password", "Nombres", "Apellidos"):
+            datos[columna] = _texto(fila, columna, obligatorio=True)
+        datos["Fecha_Nacimiento"] = _fecha(fila, "Fecha_Nacimiento")
+        datos["ID_Universidad"] = _de_catalogo(fila, "Universidad", self.universidades)
+        return datos
+
+    def valores_perfil(self, id_usuario, d):
+        return (
+            id_usuario, d["Nombres"], d["Apellidos"], d["Cedula_Identidad"],
+            d["Fecha_Nacimiento"], d["Direccion"], d["Telefono"], d["ID_Universidad"],
+        )
+
+
+class ImportadorConReferencia(Importador):
+    """Filas que pertenecen a un usuario existente, identificado por su email."""
+
+    columna_email = None
+    sql_referencia = None
+    campo_id = None
+
+    def revisar_lote(self, conn, lote):
+        lote, errores = super().revisar_lote(conn, lote)
+        ids = _existentes(
+            conn, self.sql_referencia, [datos[self.columna_email] for _, datos in lote]
+        )
+        validas = []
+        for linea, datos in lote:
+            id_referencia = ids.get(datos[self.columna_email])
+            if id_referencia is None:
+                errores.append(
+                    (linea, f"No existe el usuario {datos[self.columna_email]}.")
+                )
+                continue
+            datos[self.campo_id] = id_referencia
+            validas.append((linea, datos))
+        return validas, errores
+
+
+class ImportadorExperiencias(ImportadorConReferencia):
+    columnas = (
+        "Email_Postulante", "Empresa", "Cargo_Ocupado", "Fecha_Inicio",
+        "Fecha_Fin", "Descripcion",
+    )
+    obligatorias = ("Email_Postulante", "Empresa", "Cargo_Ocupado", "Fecha_Inicio")
+    columna_email = "Email_Postulante"
+    sql_referencia = """SELECT u.Email, p.ID_Postulante FROM Usuarios u
+                        JOIN Postulantes p ON p.ID_Postulante = u.ID_Usuario WHERE u.Email IN ({marcas})"""
+    campo_id = "ID_Postulante"
+
+    def validar(self, fila):
+        datos = {c: _texto(fila, c) for c in self.columnas}
+        datos["Email_Postulante"] = _email(fila, "Email_Postulante")
+        datos["Empresa"] = _texto(fila, "Empresa", obligatorio=True)
+        datos["Cargo_Ocupado"] = _texto(fila, "Cargo_Ocupado", obligatorio=True)
+        datos["Fecha_Inicio"] = _fecha(fila, "Fecha_Inicio", obligatorio=True)
+        datos["Fecha_Fin"] = _fecha(fila, "Fecha_Fin")
+        if datos["Fecha_Fin"] and datos["Fecha_Fin"] < datos["Fecha_Inicio"]:
+            raise ValueError("'Fecha_Fin' es anterior a 'Fecha_Inicio'.")
+        return datos
+
+    def insertar(self, conn, filas):
+        conn.executemany(
+            "INSERT INTO Experiencias_Laborales (ID_Postulante, Empresa, Cargo_Ocupado, Fecha_Inicio, Fecha_Fin, Descripcion) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (d["ID_Postulante"], d["Empresa"], d["Cargo_Ocupado"], d["Fecha_Inicio"], d["Fecha_Fin"], d["Descripcion"])
+                for d in filas
+            ),
+        )
+
+
+class ImportadorVacantes(ImportadorConReferencia):
+    columnas = (
+        "Email_Empresa", "Cargo_Vacante", "Descripcion_Perfil",
+        "Salario_Ofrecido", "Profesion", "Estatus",
+    )
+    obligatorias = ("Email_Empresa", "Cargo_Vacante", "Descripcion_Perfil", "Salario_Ofrecido")
+    columna_email = "Email_Empresa"
+    sql_referencia = """SELECT u.Email, e.ID_Empresa FROM Usuarios u
+                        JOIN Empresas e ON e.ID_Empresa = u.ID_Usuario WHERE u.Email IN ({marcas})"""
+    campo_id = "ID_Empresa"
+    estatus_validos = ("Activa", "Inactiva", "Cerrada")
+
+    def __init__(self, conn):
+        super().__init__(conn)
+        self.profesiones = _catalogo(conn, "Profesiones", "ID_Profesion", "Nombre_Profesion")
+
+    def validar(self, fila):
+        datos = {c: _texto(fila, c) for c in self.columnas}
+        datos["Email_Empresa"] = _email(fila, "Email_Empresa")
+        datos["Cargo_Vacante"] = _texto(fila, "Cargo_Vacante", obligatorio=True)
+        datos["Descripcion_Perfil"] = _texto(fila, "Descripcion_Perfil", obligatorio=True)
+        datos["Salario_Ofrecido"] = _monto(fila, "Salario_Ofrecido")
+        datos["ID_Profesion"] = _de_catalogo(fila, "Profesion", self.profesiones)
+        datos["Estatus"] = datos["Estatus"] or "Activa"
+        if datos["Estatus"] not in self.estatus_validos:
+            raise ValueError(
+                f"'Estatus' debe ser uno de {', '.join(self.estatus_validos)}."
+            )
+        return datos
+
+    def insertar(self, conn, filas):
+        conn.executemany(
+            "INSERT INTO Vacantes (ID_Empresa, Cargo_Vacante, Descripcion_Perfil, Salario_Ofrecido, ID_Profesion, Estatus) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (d["ID_Empresa"], d["Cargo_Vacante"], d["Descripcion_Perfil"], d["Salario_Ofrecido"], d["ID_Profesion"], d["Estatus"])
+                for d in filas
+            ),
+        )
+
+
+IMPORTADORES = {
+    "empresas": ImportadorEmpresas,
+    "postulantes": ImportadorPostulantes,
+    "experiencias": ImportadorExperiencias,
+    "vacantes": ImportadorVacantes,
+}
+
+
+# --- PROCESO ---
+def _insertar_lote(conn, importador, lote):
+    """
+    Inserta el lote en una transacción. Si la base rechaza alguna fila, se
+    repite fila por fila con SAVEPOINT para informar solo las que fallan.
+    Devuelve (insertadas, errores).
+    """
+    if not lote:
+        return 0, []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        importador.insertar(conn, [datos for _, datos in lote])
+        conn.commit()
+        return len(lote), []
+    except sqlite3.IntegrityError:
+        conn.rollback()
+    errores = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for linea, datos in lote:
+            conn.execute("SAVEPOINT fila")
+            try:
+                importador.insertar(conn, [datos])
+            except sqlite3.IntegrityError as e:
+                conn.execute("ROLLBACK TO fila")
+                errores.append((linea, f"Rechazada por la base de datos: {e}"))
+            conn.execute("RELEASE fila")
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return len(lote) - len(errores), errores
+
+
+def _detectar_delimitador(archivo):
+    # Excel en español guarda los CSV con punto y coma.
+    muestra = archivo.read(4096)
+    archivo.seek(0)
+    try:
+        return csv.Sniffer().sniff(muestra, delimiters=",;\t").delimiter
+    except csv.Error:
+        return ","
+
+
+def importar_csv(tipo, ruta, tamano_lote=5000):
+    """
+    Importa el CSV 'ruta' como 'tipo' (ver IMPORTADORES). Devuelve un
+    diccionario con Filas (leídas), Importadas, Errores (lista de
+    (linea, mensaje)) y Segundos.
+    """
+    inicio = time.perf_counter()
+    errores, filas, importadas = [], 0, 0
+    with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+        lector = csv.DictReader(archivo, delimiter=_detectar_delimitador(archivo))
+        with db_manager.get_db_connection() as conn:
+            importador = IMPORTADORES[tipo](conn)
+            faltantes = [c for c in importador.obligatorias if c not in (lector.fieldnames or [])]
+            if faltantes:
+                errores.append((1, f"Faltan columnas: {', '.join(faltantes)}"))
+            else:
+                lote = []
+                for fila in lector:
+                    filas += 1
+                    try:
+                        lote.append((lector.line_num, importador.validar(fila)))
+                    except ValueError as e:
+                        errores.append((lector.line_num, str(e)))
+                    if len(lote) >= tamano_lote:
+                        importadas += _procesar_lote(conn, importador, lote, errores)
+                        lote = []
+                importadas += _procesar_lote(conn, importador, lote, errores)
+    if tipo == "empresas" and importadas:
+        db_manager.invalidar_cache_catalogos("Empresas")
+    errores.sort()
+    return {
+        "Filas": filas,
+        "Importadas": importadas,
+        "Errores": errores,
+        "Segundos": time.perf_counter() - inicio,
+    }
+
+
+def _procesar_lote(conn, importador, lote, errores):
+    lote, rechazadas = importador.revisar_lote(conn, lote)
+    errores.extend(rechazadas)
+    insertadas, fallidas = _insertar_lote(conn, importador, lote)
+    errores.extend(fallidas)
+    return insertadas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("tipo", choices=sorted(IMPORTADORES))
+    parser.add_argument("archivo", help="CSV con encabezados (coma o punto y coma).")
+    parser.add_argument("--db", default=db_manager.DB_PATH)
+    parser.add_argument("--lote", type=int, default=5000, help="Filas por transacción.")
+    parser.add_argument("--errores", help="CSV donde guardar las filas rechazadas.")
+    args = parser.parse_args()
+
+    db_manager.configurar_base_datos(args.db)
+    resultado = importar_csv(args.tipo, args.archivo, args.lote)
+    for linea, mensaje in resultado["Errores"][:20]:
+        print(f"Línea {linea}: {mensaje}")
+    if len(resultado["Errores"]) > 20:
+        print(f"... y {len(resultado['Errores']) - 20} error(es) más.")
+    if args.errores:
+        with open(args.errores, "w", newline="", encoding="utf-8-sig") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(("Linea", "Error"))
+            escritor.writerows(resultado["Errores"])
+    segundos = resultado["Segundos"]
+    print(
+        f"{resultado['Importadas']} de {resultado['Filas']} fila(s) importadas en "
+        f"{segundos:.2f} s ({resultado['Filas'] / segundos if segundos else 0:.0f} filas/s), "
+        f"{len(resultado['Errores'])} con errores."
+    )
+    sys.exit(1 if resultado["Errores"] else 0)
+
+
+if __name__ == "__main__":
+    main()
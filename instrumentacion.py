@@ -0,0 +1,400 @@
+"""
+Instrumentación opcional de db_manager. Al activarla, cada función pública
+de db_manager queda envuelta para contar sus llamadas y acumular un
+histograma de latencias, y las conexiones de db_manager llevan el trace
+callback de sqlite3 para saber qué sentencias ejecutó cada llamada. Las
+llamadas que superan el umbral se registran en el log de consultas lentas
+junto con sus sentencias (agrupadas, con el tiempo de cada una) y su
+EXPLAIN QUERY PLAN.
+
+Se activa desde el código con activar() o al iniciar la aplicación con:
+
+    HIRING_GROUP_INSTRUMENTAR=1 [HIRING_GROUP_UMBRAL_MS=100]
+    [HIRING_GROUP_LOG_CONSULTAS=consultas_lentas.log] python app_gui.py
+
+Desactivada, db_manager queda intacto salvo por una comparación al prestar
+cada conexión.
+"""
+
+import atexit
+import collections
+import functools
+import os
+import sqlite3
+import sys
+import threading
+import time
+import types
+from datetime import datetime
+
+import db_manager
+from auditoria_indices import es_auditable, normalizar
+
+# Funciones públicas de db_manager que no son operaciones de la aplicación:
+# manejo del pool y de la caché, o que no tocan la base de datos.
+INFRAESTRUCTURA = {
+    "aplicar_migraciones",
+    "configurar_base_datos",
+    "cerrar_pool",
+    "get_pool",
+    "get_db_connection",
+    "fijar_conexion_del_hilo",
+    "fijar_trace_conexiones",
+    "invalidar_cache_catalogos",
+    "get_estadisticas_cache_catalogos",
+    "get_version_datos",
+    "configurar_instantanea_reportes",
+    "get_conexion_reportes",
+    "get_estadisticas_instantanea",
+    "get_version_reportes",
+    "consulta_fts",
+}
+# Límite superior (ms) de cada cubeta del histograma; la última es "más".
+LIMITES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+MAX_CONSULTAS_LENTAS = 200
+MAX_SENTENCIAS_LOG = 10
+
+
+def funciones_publicas():
+    """Nombres de las funciones de db_manager que se instrumentan."""
+    return sorted(
+        nombre
+        for nombre, funcion in vars(db_manager).items()
+        if isinstance(funcion, types.FunctionType)
+        and funcion.__module__ == db_manager.__name__
+        and not nombre.startswith("_")
+        and nombre not in INFRAESTRUCTURA
+    )
+
+
+
+# --- REGISTRO ---
+class EstadisticaFuncion:
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.histograma = [0] * (len(LIMITES_MS) + 1)
+
+    def agregar(self, segundos, error):
+        self.llamadas += 1
+        self.errores += error
+        self.total += segundos
+        self.maximo = max(self.maximo, segundos)
+        ms = segundos * 1000
+        cubeta = next((i for i, limite in enumerate(LIMITES_MS) if ms <= limite), len(LIMITES_MS))
+        self.histograma[cubeta] += 1
+
+    def percentil_ms(self, fraccion):
+        """Límite superior de la cubeta donde cae el percentil (cota, no valor exacto)."""
+        objetivo = fraccion * self.llamadas
+        acumulado = 0
+        for i, cantidad in enumerate(self.histograma):
+            acumulado += cantidad
+            if cantidad and acumulado >= objetivo:
+                return LIMITES_MS[i] if i < len(LIMITES_MS) else self.maximo * 1000
+        return 0.0
+
+
+class Llamada:
+    """Una llamada en curso: su tiempo y las sentencias que ejecutó."""
+
+    __slots__ = ("nombre", "hora", "segundos", "eventos")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.hora = datetime.now()
+        self.segundos = 0.0
+        # (instante, sql) por sentencia; sql None marca el fin de un tramo medido.
+        self.eventos = []
+
+
+class Registro:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.funciones = collections.defaultdict(EstadisticaFuncion)
+        self.lentas = collections.deque(maxlen=MAX_CONSULTAS_LENTAS)
+        self.desde = datetime.now()
+
+    def agregar(self, nombre, segundos, error):
+        with self._lock:
+            self.funciones[nombre].agregar(segundos, error)
+
+    def agregar_lenta(self, entrada):
+        with self._lock:
+            self.lentas.append(entrada)
+
+    def copiar(self):
+        """(estadísticas por función, consultas lentas) en un instante dado."""
+        with self._lock:
+            funciones = {
+                nombre: (e.llamadas, e.errores, e.total, e.maximo, list(e.histograma),
+                         e.percentil_ms(0.50), e.percentil_ms(0.95), e.percentil_ms(0.99))
+                for nombre, e in self.funciones.items()
+            }
+            return funciones, list(self.lentas)
+
+    def reiniciar(self):
+        with self._lock:
+            self.funciones.clear()
+            self.lentas.clear()
+            self.desde = datetime.now()
+
+
+_registro = Registro()
+_originales = {}
+_config = {"umbral_ms": 100.0, "ruta_log": None}
+_hilo = threading.local()
+
+
+def _pila():
+    if not hasattr(_hilo, "pila"):
+        _hilo.pila = []
+    return _hilo.pila
+
+
+# --- CAPTURA ---
+def _anotar_sentencia(sql):
+    # Todas las conexiones llevan el callback mientras la instrumentación
+    # está activa: cada sentencia cuenta para la llamada que se está midiendo
+    # en el hilo que la ejecuta. Los EXPLAIN son los de _plan.
+    pila = _pila()
+    if pila and not sql.startswith("EXPLAIN QUERY PLAN "):
+        pila[-1].eventos.append((time.perf_counter(), sql))
+
+
+def _medir_tramo(llamada, funcion, *args, **kwargs):
+    pila = _pila()
+    pila.append(llamada)
+    inicio = time.perf_counter()
+    try:
+        return funcion(*args, **kwargs)
+    finally:
+        fin = time.perf_counter()
+        llamada.segundos += fin - inicio
+        llamada.eventos.append((fin, None))
+        pila.pop()
+
+
+def _terminar(llamada, error=False):
+    _registro.agregar(llamada.nombre, llamada.segundos, error)
+    if llamada.segundos * 1000 >= _config["umbral_ms"]:
+        _registrar_lenta(llamada)
+
+
+def _medir_generador(llamada, generador):
+    # Solo cuenta el tiempo dentro del generador, no el de quien lo consume.
+    error = False
+    try:
+        while True:
+            try:
+                valor = _medir_tramo(llamada, next, generador)
+            except StopIteration:
+                return
+            yield valor
+    except Exception:
+        error = True
+        raise
+    finally:
+        generador.close()
+        _terminar(llamada, error)
+
+
+def _instrumentar(nombre, funcion):
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        llamada = Llamada(nombre)
+        try:
+            resultado = _medir_tramo(llamada, funcion, *args, **kwargs)
+        except Exception:
+            _terminar(llamada, error=True)
+            raise
+        if isinstance(resultado, types.GeneratorType):
+            return _medir_generador(llamada, resultado)
+        _terminar(llamada)
+        return resultado
+
+    return envoltura
+
+
+# --- CONSULTAS LENTAS ---
+def _agrupar_sentencias(llamada):
+    """
+    Agrupa las sentencias de la llamada por SQL normalizado. El tiempo de
+    cada una es el que pasó hasta el evento siguiente, así que incluye el
+    procesamiento en Python de sus filas.
+    """
+    grupos = {}
+    grupo = None
+    eventos = llamada.eventos
+    for i, (instante, sql) in enumerate(eventos):
+        if sql is None:  # Fin de un tramo medido.
+            continue
+        siguiente = eventos[i + 1][0] if i + 1 < len(eventos) else instante
+        # Las sentencias de los triggers ("-- TRIGGER ...") cuentan para la
+        # sentencia que los disparó.
+        if not sql.startswith("--"):
+            clave = normalizar(sql)
+            grupo = grupos.setdefault(
+                clave, {"SQL": clave, "Ejemplo": sql, "Ejecuciones": 0, "Segundos": 0.0}
+            )
+            grupo["Ejecuciones"] += 1
+        if grupo is not None:
+            grupo["Segundos"] += siguiente - instante
+    return sorted(grupos.values(), key=lambda g: g["Segundos"], reverse=True)
+
+
+def _plan(sql):
+    if not es_auditable(sql):
+        return []
+    try:
+        with db_manager.get_db_connection() as conn:
+            return [fila[3] for fila in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+    except sqlite3.Error as e:
+        return [f"(sin plan: {e})"]
+
+
+def _registrar_lenta(llamada):
+    sentencias = [
+        {
+            "SQL": grupo["SQL"],
+            "Ejecuciones": grupo["Ejecuciones"],
+            "Milisegundos": round(grupo["Segundos"] * 1000, 2),
+            "Plan": _plan(grupo["Ejemplo"]),
+        }
+        for grupo in _agrupar_sentencias(llamada)[:MAX_SENTENCIAS_LOG]
+    ]
+    entrada = {
+        "Hora": llamada.hora.isoformat(timespec="seconds"),
+        "Funcion": llamada.nombre,
+        "Milisegundos": round(llamada.segundos * 1000, 2),
+        "Sentencias": sentencias,
+    }
+    _registro.agregar_lenta(entrada)
+    try:
+        if _config["ruta_log"]:
+            with open(_config["ruta_log"], "a", encoding="utf-8") as archivo:
+                archivo.write(formatear_lenta(entrada) + "\n")
+        else:
+            print(formatear_lenta(entrada), file=sys.stderr)
+    except OSError as e:
+        print(f"No se pudo escribir el log de consultas lentas: {e}", file=sys.stderr)
+
+
+def formatear_lenta(entrada):
+    lineas = [f"[{entrada['Hora']}] {entrada['Funcion']}: {entrada['Milisegundos']:.1f} ms"]
+    for sentencia in entrada["Sentencias"]:
+        lineas.append(
+            f"  {sentencia['Milisegundos']:.1f} ms x{sentencia['Ejecuciones']}: {sentencia['SQL']}"
+        )
+        lineas.extend(f"      {paso}" for paso in sentencia["Plan"])
+    return "\n".join(lineas)
+
+
+# --- ACTIVACIÓN ---
+def activa():
+    return bool(_originales)
+
+
+def activar(umbral_ms=100.0, ruta_log=None, resumen_al_salir=False):
+    """
+    Envuelve las funciones públicas de db_manager e instala el trace
+    callback en sus conexiones.
+    Las llamadas de más de 'umbral_ms' van al log de consultas lentas:
+    'ruta_log' o, si es None, la salida de errores. Llamarla otra vez solo
+    actualiza la configuración.
+    """
+    _config["umbral_ms"] = umbral_ms
+    _config["ruta_log"] = ruta_log
+    if not _originales:
+        db_manager.fijar_trace_conexiones(_anotar_sentencia)
+        for nombre in funciones_publicas():
+            funcion = getattr(db_manager, nombre)
+            _originales[nombre] = funcion
+            setattr(db_manager, nombre, _instrumentar(nombre, funcion))
+    if resumen_al_salir:
+        atexit.unregister(volcar_resumen)
+        atexit.register(volcar_resumen)
+
+
+def desactivar():
+    """Devuelve db_manager a su estado original. Las estadísticas se conservan."""
+    for nombre, funcion in _originales.items():
+        setattr(db_manager, nombre, funcion)
+    _originales.clear()
+    db_manager.fijar_trace_conexiones(None)
+    atexit.unregister(volcar_resumen)
+
+
+def activar_desde_entorno():
+    """Activa la instrumentación si HIRING_GROUP_INSTRUMENTAR está definida."""
+    if os.environ.get("HIRING_GROUP_INSTRUMENTAR", "") not in ("", "0"):
+        activar(
+            umbral_ms=float(os.environ.get("HIRING_GROUP_UMBRAL_MS", 100)),
+            ruta_log=os.environ.get("HIRING_GROUP_LOG_CONSULTAS") or None,
+            resumen_al_salir=True,
+        )
+
+
+def reiniciar():
+    _registro.reiniciar()
+
+
+# --- RESUMEN ---
+def get_umbral_ms():
+    return _config["umbral_ms"]
+
+
+def resumen():
+    """
+    Estadísticas por función, de la que más tiempo acumuló a la que menos.
+    Los percentiles salen del histograma: son la cota superior de la cubeta.
+    """
+    funciones, _ = _registro.copiar()
+    filas = [
+        {
+            "Funcion": nombre,
+            "Llamadas": llamadas,
+            "Errores": errores,
+            "Total_ms": total * 1000,
+            "Media_ms": total * 1000 / llamadas,
+            "Max_ms": maximo * 1000,
+            "P50_ms": p50,
+            "P95_ms": p95,
+            "P99_ms": p99,
+            "Histograma": histograma,
+        }
+        for nombre, (llamadas, errores, total, maximo, histograma, p50, p95, p99) in funciones.items()
+    ]
+    return sorted(filas, key=lambda f: f["Total_ms"], reverse=True)
+
+
+def consultas_lentas():
+    """Las últimas llamadas lentas registradas, de la más reciente a la más antigua."""
+    return list(reversed(_registro.copiar()[1]))
+
+
+def texto_resumen():
+    encabezados = [f"<={limite}" for limite in LIMITES_MS] + ["más"]
+    lineas = [
+        f"Instrumentación de db_manager desde {_registro.desde:%Y-%m-%d %H:%M:%S} "
+        f"(umbral de consultas lentas: {_config['umbral_ms']:g} ms)",
+        f"{'Función':<36}{'Llamadas':>9}{'Errores':>8}{'Media ms':>10}{'p95 ms':>9}{'Máx ms':>10}"
+        f"{'Total ms':>11}  Histograma (ms: " + " ".join(encabezados) + ")",
+    ]
+    for f in resumen():
+        lineas.append(
+            f"{f['Funcion']:<36}{f['Llamadas']:>9}{f['Errores']:>8}{f['Media_ms']:>10.2f}"
+            f"{f['P95_ms']:>9.0f}{f['Max_ms']:>10.2f}{f['Total_ms']:>11.1f}  "
+            + " ".join(str(n) for n in f["Histograma"])
+        )
+    lentas = consultas_lentas()
+    lineas.append(f"\n{len(lentas)} llamada(s) lenta(s) registrada(s).")
+    lineas.extend(formatear_lenta(entrada) for entrada in lentas)
+    return "\n".join(lineas)
+
+
+def volcar_resumen(archivo=None):
+    """Escribe el resumen en 'archivo' (un objeto de texto) o en la salida de errores."""
+    print(texto_resumen(), file=archivo or sys.stderr)
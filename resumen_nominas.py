@@ -0,0 +1,39 @@
+"""
+Verificación de resumen_nominas: recalcula los totales de cada nómina desde
+los recibos, muestra las diferencias con la tabla mantenida por triggers y
+la reconstruye. Termina con código 1 si encontró diferencias.
+
+Uso: python resumen_nominas.py [--db ruta] [--solo-verificar]
+"""
+
+import argparse
+import sys
+
+import db_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=db_manager.DB_PATH)
+    parser.add_argument(
+        "--solo-verificar",
+        action="store_true",
+        help="Mostrar las diferencias sin reconstruir la tabla.",
+    )
+    args = parser.parse_args()
+
+    db_manager.configurar_base_datos(args.db)
+    diferencias = db_manager.verificar_resumen_nominas_db(
+        reconstruir=not args.solo_verificar
+    )
+    for id_nomina, columna, guardado, calculado in diferencias:
+        print(f"Nómina {id_nomina}: {columna} guardado={guardado} calculado={calculado}")
+    nominas = len({d[0] for d in diferencias})
+    print(f"{len(diferencias)} diferencia(s) en {nominas} nómina(s).")
+    if not args.solo_verificar:
+        print("resumen_nominas reconstruida.")
+    sys.exit(1 if diferencias else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+"""
+Servicio HTTP/JSON local sobre db_manager, para que varios clientes (la
+interfaz de escritorio, un portal web de postulantes) compartan una sola
+base de datos. Usa solo la biblioteca estándar: un HTTPServer que atiende
+las conexiones en un pool fijo de hilos, con tantas conexiones SQLite en el
+pool de db_manager como hilos.
+
+Las respuestas GET llevan un ETag que identifica la versión de la base
+(PRAGMA data_version de una conexión propia, que cambia con cada commit de
+cualquier otra conexión, de este proceso o de otro). Con If-None-Match
+igual se responde 304 sin consultar la base, y el cuerpo de las últimas
+URLs pedidas se guarda en memoria mientras la versión no cambie. Con
+--instantanea los reportes llevan en cambio la versión de la copia que
+leen (db_manager.get_version_reportes).
+
+No hay autenticación: el servicio escucha en 127.0.0.1 salvo que se pida
+otra dirección con --host.
+
+Rutas (los cuerpos y las respuestas son JSON):
+  GET  /salud
+  POST /login                          {"email", "password"}
+  GET  /vacantes                       ?area&profesion&orden=ASC|DESC&texto&cursor&tamano
+  GET  /candidatos                     ?texto&cursor&tamano
+  GET  /catalogos/<nombre>             areas, profesiones, universidades, bancos, empresas
+  GET  /postulantes/<id>/postulaciones
+  GET  /postulantes/<id>/recibos       ?mes&anio
+  GET  /postulaciones/pendientes
+  POST /postulaciones                  {"id_postulante", "id_vacante"}
+  POST /contratos                      {"id_postulacion", "datos": {...}}
+  GET  /nominas/previsualizar          ?mes&anio&empresa
+  POST /nominas                        {"mes", "anio", "empresa" (opcional)}
+  GET  /nominas/<id>/recibos
+  GET  /reportes/resumen
+  GET  /reportes/periodo               ?empresa&mes&anio
+
+Uso: python servidor.py [--db ruta] [--host 127.0.0.1] [--puerto 8080] [--hilos 8]
+           [--instantanea SEGUNDOS]
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import db_manager
+
+CATALOGOS = {
+    "areas": ("Areas_Conocimiento", "ID_Area_Conocimiento", "Nombre_Area"),
+    "profesiones": ("Profesiones", "ID_Profesion", "Nombre_Profesion"),
+    "universidades": ("Universidades", "ID_Universidad", "Nombre_Universidad"),
+    "bancos": ("Bancos", "ID_Banco", "Nombre_Banco"),
+    "empresas": ("Empresas", "ID_Empresa", "Nombre_Empresa"),
+}
+TAMANO_PAGINA_MAXIMO = 200
+
+
+class ErrorSolicitud(Exception):
+    """Solicitud inválida: se responde con 'estado' y el mensaje."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# --- VERSIÓN Y CACHÉ ---
+class VersionBase:
+    """
+    Versión de la base para los ETag: PRAGMA data_version de una conexión
+    que no escribe, más un identificador de esta ejecución del servidor
+    (data_version vuelve a empezar con cada conexión). Para los reportes,
+    si leen la instantánea, la versión es la de la copia.
+    """
+
+    def __init__(self, ruta):
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._instancia = f"{os.getpid():x}{time.time_ns() & 0xFFFFFF:x}"
+
+    def actual(self, reporte=False):
+        if reporte:
+            version = db_manager.get_version_reportes()
+            if version is not None:
+                return f"{self._instancia}-r{version[0]}.{version[1]}"
+        with self._lock:
+            return f"{self._instancia}-{self._conn.execute('PRAGMA data_version').fetchone()[0]}"
+
+    def cerrar(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CacheRespuestas:
+    """Cuerpo de las últimas respuestas GET por URL, con la versión con que se generaron."""
+
+    def __init__(self, max_entradas=256):
+        self.max_entradas = max_entradas
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, url, version):
+        with self._lock:
+            guardado = self._datos.get(url)
+            if guardado is None or guardado[0] != version:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(url)
+            self.aciertos += 1
+            return guardado[1]
+
+    def guardar(self, url, version, cuerpo):
+        with self._lock:
+            self._datos[url] = (version, cuerpo)
+            self._datos.move_to_end(url)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def estadisticas(self):
+        with self._lock:
+            return {"entradas": len(self._datos), "aciertos": self.aciertos, "fallos": self.fallos}
+
+
+# --- RUTAS ---
+# (método, patrón, función, se puede cachear, lee los reportes). La función
+# recibe la consulta (diccionario), el cuerpo JSON y los grupos del patrón, y
+# devuelve (estado HTTP, datos). Las rutas con reporte=True consultan con
+# get_conexion_reportes y se versionan con la instantánea si está activada.
+RUTAS = []
+
+
+def ruta(metodo, patron, cache=True, reporte=False):
+    def registrar(funcion):
+        RUTAS.append(
+            (metodo, re.compile(f"^{patron}$"), funcion, metodo == "GET" and cache, reporte)
+        )
+        return funcion
+
+    return registrar
+
+
+def buscar_ruta(metodo, camino):
+    metodos = set()
+    for metodo_ruta, patron, funcion, cacheable, reporte in RUTAS:
+        encontrado = patron.match(camino)
+        if encontrado:
+            if metodo_ruta == metodo:
+                return funcion, encontrado.groups(), cacheable, reporte
+            metodos.add(metodo_ruta)
+    if metodos:
+        raise ErrorSolicitud(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {', '.join(sorted(metodos))}.")
+    raise ErrorSolicitud(HTTPStatus.NOT_FOUND, f"No existe la ruta {camino}.")
+
+
+def _entero(datos, clave, obligatorio=False):
+    valor = datos.get(clave)
+    if valor in (None, ""):
+        if obligatorio:
+            raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, f"Falta '{clave}'.")
+        return None
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, f"'{clave}' debe ser un número entero.")
+
+
+def _tamano(consulta):
+    tamano = _entero(consulta, "tamano") or 50
+    return max(1, min(tamano, TAMANO_PAGINA_MAXIMO))
+
+
+def _filas(filas):
+    return [dict(fila) for fila in filas]
+
+
+def _escritura(exito, mensaje, estado_exito=HTTPStatus.OK, **extra):
+    # Las escrituras de db_manager devuelven (exito, mensaje[, ...]).
+    estado = estado_exito if exito else HTTPStatus.CONFLICT
+    return estado, dict({"exito": exito, "mensaje": mensaje}, **extra)
+
+
+@ruta("GET", "/salud", cache=False)
+def salud(consulta, cuerpo):
+    return HTTPStatus.OK, {
+        "estado": "ok",
+        "version_esquema": len(db_manager.MIGRACIONES),
+        "instantanea_reportes": db_manager.get_estadisticas_instantanea(),
+    }
+
+
+@ruta("POST", "/login")
+def login(consulta, cuerpo):
+    usuario, rol = db_manager.login_usuario(cuerpo.get("email"), cuerpo.get("password"))
+    if not usuario:
+        return HTTPStatus.UNAUTHORIZED, {
+            "exito": False,
+            "mensaje": "Email, contraseña incorrectos o usuario inactivo.",
+        }
+    return HTTPStatus.OK, {"exito": True, "usuario": usuario, "rol": rol}
+
+
+@ruta("GET", "/vacantes")
+def vacantes(consulta, cuerpo):
+    orden = consulta.get("orden")
+    if orden not in (None, "ASC", "DESC"):
+        raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, "'orden' debe ser ASC o DESC.")
+    try:
+        filas, siguiente = db_manager.get_active_vacantes_pagina(
+            _entero(consulta, "area"),
+            _entero(consulta, "profesion"),
+            orden,
+            _tamano(consulta),
+            consulta.get("cursor"),
+            consulta.get("texto"),
+        )
+    except ValueError as e:
+        raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, str(e))
+    return HTTPStatus.OK, {"filas": _filas(filas), "siguiente": siguiente}
+
+
+@ruta("GET", "/candidatos")
+def candidatos(consulta, cuerpo):
+    try:
+        filas, siguiente = db_manager.buscar_postulantes_db(
+            consulta.get("texto", ""), _tamano(consulta), consulta.get("cursor")
+        )
+    except ValueError as e:
+        raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, str(e))
+    return HTTPStatus.OK, {"filas": _filas(filas), "siguiente": siguiente}
+
+
+@ruta("GET", "/catalogos/(\\w+)")
+def catalogo(consulta, cuerpo, nombre):
+    if nombre not in CATALOGOS:
+        raise ErrorSolicitud(HTTPStatus.NOT_FOUND, f"No existe el catálogo '{nombre}'.")
+    return HTTPStatus.OK, {"filas": _filas(db_manager.get_catalogo(*CATALOGOS[nombre]))}
+
+
+@ruta("GET", "/postulantes/(\\d+)/postulaciones")
+def postulaciones_de(consulta, cuerpo, id_postulante):
+    filas = db_manager.get_postulaciones_por_postulante(int(id_postulante))
+    return HTTPStatus.OK, {"filas": _filas(filas)}
+
+
+@ruta("GET", "/postulantes/(\\d+)/recibos")
+def recibos_de(consulta, cuerpo, id_postulante):
+    filas = db_manager.get_recibos_por_contratado(
+        int(id_postulante), _entero(consulta, "mes"), _entero(consulta, "anio")
+    )
+    return HTTPStatus.OK, {"filas": _filas(filas)}
+
+
+@ruta("GET", "/postulaciones/pendientes")
+def postulaciones_pendientes(consulta, cuerpo):
+    return HTTPStatus.OK, {"filas": _filas(db_manager.get_postulaciones_para_contratar())}
+
+
+@ruta("POST", "/postulaciones")
+def postular(consulta, cuerpo):
+    exito, mensaje = db_manager.aplicar_a_vacante_db(
+        _entero(cuerpo, "id_postulante", True), _entero(cuerpo, "id_vacante", True)
+    )
+    return _escritura(exito, mensaje, HTTPStatus.CREATED)
+
+
+@ruta("POST", "/contratos")
+def contratar(consulta, cuerpo):
+    datos = cuerpo.get("datos")
+    if not isinstance(datos, dict):
+        raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, "Falta 'datos' con los datos del contrato.")
+    try:
+        exito, mensaje = db_manager.contratar_postulante_db(
+            _entero(cuerpo, "id_postulacion", True), datos
+        )
+    except KeyError as e:
+        raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, f"Falta el dato {e} del contrato.")
+    return _escritura(exito, mensaje, HTTPStatus.CREATED)
+
+
+@ruta("GET", "/nominas/previsualizar")
+def previsualizar_nomina(consulta, cuerpo):
+    exito, mensaje, filas = db_manager.previsualizar_nomina_db(
+        _entero(consulta, "mes", True), _entero(consulta, "anio", True), _entero(consulta, "empresa")
+    )
+    return HTTPStatus.OK, {"exito": exito, "mensaje": mensaje, "filas": filas}
+
+
+@ruta("POST", "/nominas")
+def generar_nomina(consulta, cuerpo):
+    mes, anio = _entero(cuerpo, "mes", True), _entero(cuerpo, "anio", True)
+    id_empresa = _entero(cuerpo, "empresa")
+    if id_empresa is not None:
+        exito, mensaje, id_nomina = db_manager.ejecutar_nomina_db(id_empresa, mes, anio)
+        return _escritura(exito, mensaje, HTTPStatus.CREATED, id_nomina=id_nomina)
+    resultados, segundos = db_manager.ejecutar_nomina_lote_db(mes, anio)
+    errores = sum(1 for r in resultados if r["Estado"] == "Error")
+    return _escritura(
+        errores == 0,
+        f"{len(resultados) - errores} empresa(s) procesadas, {errores} con error.",
+        HTTPStatus.OK,
+        resultados=resultados,
+        segundos=round(segundos, 3),
+    )
+
+
+@ruta("GET", "/nominas/(\\d+)/recibos")
+def recibos_de_nomina(consulta, cuerpo, id_nomina):
+    return HTTPStatus.OK, {"filas": _filas(db_manager.get_nomina_generada_detalle_db(int(id_nomina)))}
+
+
+@ruta("GET", "/reportes/resumen", reporte=True)
+def reporte_resumen(consulta, cuerpo):
+    return HTTPStatus.OK, {"filas": _filas(db_manager.get_toda_nomina_reporte_db())}
+
+
+@ruta("GET", "/reportes/periodo", reporte=True)
+def reporte_periodo(consulta, cuerpo):
+    filas = db_manager.get_nomina_reporte_db(
+        _entero(consulta, "empresa", True), _entero(consulta, "mes", True), _entero(consulta, "anio", True)
+    )
+    return HTTPStatus.OK, {"filas": _filas(filas)}
+
+
+# --- SERVIDOR ---
+def _a_json(datos):
+    return json.dumps(datos, ensure_ascii=False, default=str).encode("utf-8")
+
+
+class Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "HiringGroup/1.0"
+    # Una conexión keep-alive ocupa un hilo del pool: se cierra si queda
+    # inactiva este tiempo (segundos).
+    timeout = 10
+    # Cabeceras y cuerpo se escriben por separado: sin esto Nagle y el ACK
+    # diferido del cliente suman ~40 ms a cada respuesta keep-alive.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def log_message(self, formato, *args):
+        if self.server.registrar:
+            super().log_message(formato, *args)
+
+    def _leer_cuerpo(self):
+        largo = int(self.headers.get("Content-Length") or 0)
+        if not largo:
+            return {}
+        try:
+            cuerpo = json.loads(self.rfile.read(largo))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, "El cuerpo no es JSON válido.")
+        if not isinstance(cuerpo, dict):
+            raise ErrorSolicitud(HTTPStatus.BAD_REQUEST, "El cuerpo debe ser un objeto JSON.")
+        return cuerpo
+
+    def _responder(self, estado, cuerpo=b"", etag=None):
+        self.send_response(estado)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if estado != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        if estado != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(cuerpo)
+
+    def _atender(self, metodo):
+        url = urlsplit(self.path)
+        consulta = {clave: valores[-1] for clave, valores in parse_qs(url.query).items()}
+        try:
+            cuerpo = self._leer_cuerpo() if metodo == "POST" else {}
+            funcion, grupos, cacheable, reporte = buscar_ruta(metodo, url.path)
+            if not cacheable:
+                estado, datos = funcion(consulta, cuerpo, *grupos)
+                self._responder(estado, _a_json(datos))
+                return
+            # La versión se lee antes de consultar: si alguien escribe en
+            # el medio, la respuesta queda con una versión vieja y la
+            # siguiente solicitud la vuelve a generar.
+            version = self.server.version.actual(reporte)
+            etag = f'"{version}"'
+            if etag in (self.headers.get("If-None-Match") or ""):
+                self._responder(HTTPStatus.NOT_MODIFIED, etag=etag)
+                return
+            respuesta = self.server.cache.obtener(self.path, version)
+            if respuesta is None:
+                estado, datos = funcion(consulta, cuerpo, *grupos)
+                respuesta = _a_json(datos)
+                if estado != HTTPStatus.OK:
+                    self._responder(estado, respuesta)
+                    return
+                self.server.cache.guardar(self.path, version, respuesta)
+            self._responder(HTTPStatus.OK, respuesta, etag)
+        except ErrorSolicitud as e:
+            self._responder(e.estado, _a_json({"exito": False, "mensaje": str(e)}))
+        except (sqlite3.Error, ValueError, TypeError):
+            traceback.print_exc(file=sys.stderr)
+            self._responder(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                _a_json({"exito": False, "mensaje": "Error interno del servidor."}),
+            )
+
+
+class ServidorHTTP(HTTPServer):
+    """
+    HTTPServer que atiende cada conexión en un pool fijo de hilos, en lugar
+    de crear un hilo por conexión como ThreadingHTTPServer.
+    """
+
+    request_queue_size = 128
+
+    def __init__(self, direccion, ruta_db, hilos=8, registrar=True):
+        super().__init__(direccion, Manejador)
+        self.hilos = hilos
+        self.registrar = registrar
+        self.version = VersionBase(ruta_db)
+        self.cache = CacheRespuestas()
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="servidor")
+
+    def process_request(self, request, client_address):
+        self._ejecutor.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._ejecutor.shutdown(wait=True)
+        self.version.cerrar()
+
+
+def crear_servidor(ruta_db, host="127.0.0.1", puerto=8080, hilos=8, registrar=True):
+    """Configura db_manager con un pool de 'hilos' conexiones y crea el servidor (puerto 0: uno libre)."""
+    db_manager.configurar_base_datos(ruta_db, max_conexiones=hilos)
+    return ServidorHTTP((host, puerto), ruta_db, hilos, registrar)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=db_manager.DB_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--silencioso", action="store_true", help="No registrar cada solicitud.")
+    parser.add_argument(
+        "--instantanea",
+        type=float,
+        metavar="SEGUNDOS",
+        help="Leer los reportes de una copia de la base con esta antigüedad máxima.",
+    )
+    args = parser.parse_args()
+
+    if args.instantanea is not None:
+        db_manager.configurar_instantanea_reportes(args.instantanea)
+
+    if os.environ.get("HIRING_GROUP_INSTRUMENTAR", "") not in ("", "0"):
+        import instrumentacion
+
+        instrumentacion.activar_desde_entorno()
+    servidor = crear_servidor(args.db, args.host, args.puerto, args.hilos, not args.silencioso)
+    host, puerto = servidor.server_address[:2]
+    print(f"Escuchando en http://{host}:{puerto} con {args.hilos} hilos.", file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        db_manager.cerrar_pool()
+
+
+if __name__ == "__main__":
+    main()
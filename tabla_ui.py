@@ -0,0 +1,467 @@
+"""
+Tablas para la interfaz gráfica. TablaDatos es un
+ttk.Treeview cuyas filas se identifican por su clave primaria: actualizar()
+compara las filas nuevas con las que ya muestra y solo borra, modifica o
+inserta las que cambiaron, en lugar de borrar todo y volver a insertarlo
+(dos llamadas a Tk por fila). La selección y la posición del
+desplazamiento se conservan.
+
+TablaVirtual es para resultados grandes: guarda las filas por columnas en
+buffers compactos (FilasColumnares), solo crea los ítems visibles y carga
+las páginas a medida que el usuario se desplaza.
+"""
+
+from array import array
+from collections import namedtuple
+from itertools import accumulate, islice
+from tkinter import ttk
+
+# borrar: iids a borrar. modificar: [(iid, valores)]. insertar: [(índice,
+# iid, valores)]. orden: lista completa de iids si las filas que quedan
+# cambiaron de orden (None si no hace falta reordenar).
+Cambios = namedtuple("Cambios", ("borrar", "modificar", "insertar", "orden"))
+
+
+def calcular_cambios(orden_actual, valores_actuales, filas):
+    """
+    Compara lo que muestra la tabla (los iids 'orden_actual' y sus valores
+    conocidos 'valores_actuales') con 'filas', una lista de (iid, valores)
+    en el orden deseado, y devuelve los Cambios para pasar de uno a otro.
+    """
+    deseado = [iid for iid, _ in filas]
+    nuevas = set(deseado)
+    if len(nuevas) != len(deseado):
+        raise ValueError("Las filas de una tabla deben tener claves distintas.")
+    presentes = set(orden_actual)
+    borrar = [iid for iid in orden_actual if iid not in nuevas]
+    modificar = [
+        (iid, valores)
+        for iid, valores in filas
+        if iid in presentes and valores_actuales.get(iid) != valores
+    ]
+    quedan = [iid for iid in orden_actual if iid in nuevas]
+    if quedan == [iid for iid in deseado if iid in presentes]:
+        # Las filas que quedan ya están en orden: cada nueva se inserta en su
+        # posición final (las anteriores a ella ya ocupan la suya).
+        insertar = [
+            (indice, iid, valores)
+            for indice, (iid, valores) in enumerate(filas)
+            if iid not in presentes
+        ]
+        orden = None
+    else:
+        insertar = [("end", iid, valores) for iid, valores in filas if iid not in presentes]
+        orden = deseado
+    return Cambios(borrar, modificar, insertar, orden)
+
+
+class TablaDatos(ttk.Treeview):
+    """
+    Treeview con filas identificadas por clave que se llena con
+    actualizar(). Sigue siendo un Treeview: selection(), item() y el resto
+    funcionan igual; el iid de cada fila es str(clave).
+    """
+
+    def __init__(self, parent, columnas, widths=None, **kwargs):
+        kwargs.setdefault("show", "headings")
+        kwargs.setdefault("style", "Treeview")
+        super().__init__(parent, columns=columnas, **kwargs)
+        widths = widths or {}
+        for col in columnas:
+            self.heading(col, text=col)
+            self.column(col, width=widths.get(col, 120), anchor="w")
+        self._valores = {}
+
+    @staticmethod
+    def _normalizar(filas):
+        return [(str(clave), tuple(valores)) for clave, valores in filas]
+
+    def actualizar(self, filas):
+        """
+        Deja en la tabla exactamente 'filas', un iterable de (clave, valores)
+        en el orden en que deben mostrarse. Devuelve los Cambios aplicados.
+        """
+        filas = self._normalizar(filas)
+        orden_actual = self.get_children()
+        ancla = self._fila_superior(orden_actual)
+        cambios = calcular_cambios(orden_actual, self._valores, filas)
+        if cambios.borrar:
+            self.delete(*cambios.borrar)
+        for iid, valores in cambios.modificar:
+            self.item(iid, values=valores)
+        for indice, iid, valores in cambios.insertar:
+            self.insert("", indice, iid=iid, values=valores)
+        if cambios.orden is not None:
+            self.set_children("", *cambios.orden)
+        self._valores = dict(filas)
+        if ancla is not None and ancla in self._valores:
+            # La fila que estaba arriba sigue arriba aunque cambien las de antes.
+            self.yview_moveto(self.index(ancla) / len(filas))
+        return cambios
+
+    def agregar(self, filas):
+        """Añade 'filas' al final; las que ya están solo se actualizan."""
+        for iid, valores in self._normalizar(filas):
+            if iid in self._valores:
+                if self._valores[iid] != valores:
+                    self.item(iid, values=valores)
+            else:
+                self.insert("", "end", iid=iid, values=valores)
+            self._valores[iid] = valores
+
+    def limpiar(self):
+        hijos = self.get_children()
+        if hijos:
+            self.delete(*hijos)
+        self._valores = {}
+
+    def _fila_superior(self, orden_actual):
+        primero = self.yview()[0]
+        if not orden_actual or primero <= 0:
+            return None
+        return orden_actual[min(int(primero * len(orden_actual)), len(orden_actual) - 1)]
+
+
+# --- ALMACÉN DE FILAS ---
+class _Columna:
+    """
+    Valores de una columna en un buffer según el tipo del primero que no es
+    None: enteros en array('q'), reales en array('d') y texto en un bytearray
+    UTF-8 con la posición donde termina cada valor. Los None se anotan
+    aparte. Si llega un valor de otro tipo, la columna pasa a ser una lista.
+    """
+
+    __slots__ = ("tipo", "datos", "finales", "nulos", "largo")
+
+    def __init__(self):
+        self.tipo = None
+        self.datos = None
+        self.finales = None
+        self.nulos = set()
+        self.largo = 0
+
+    @staticmethod
+    def _tipo_de(valor):
+        if type(valor) is int and -(2**63) <= valor < 2**63:
+            return "q"
+        if type(valor) is float:
+            return "d"
+        if type(valor) is str:
+            return "texto"
+        return "objeto"
+
+    def _iniciar(self, tipo):
+        # Los None anteriores quedan como relleno: 0 o texto vacío.
+        self.tipo = tipo
+        if tipo == "texto":
+            self.datos = bytearray()
+            self.finales = array("Q", bytes(8 * self.largo))
+        elif tipo == "objeto":
+            self.datos = [None] * self.largo
+        else:
+            self.datos = array(tipo, bytes(array(tipo).itemsize * self.largo))
+
+    def _pasar_a_lista(self):
+        self.datos = [self.valor(i) for i in range(self.largo)]
+        self.tipo = "objeto"
+        self.finales = None
+        self.nulos = set()
+
+    def agregar(self, valor):
+        if valor is None:
+            self.nulos.add(self.largo)
+        elif self.tipo is None:
+            self._iniciar(self._tipo_de(valor))
+        elif self.tipo != "objeto" and self._tipo_de(valor) != self.tipo:
+            self._pasar_a_lista()
+        if self.tipo == "texto":
+            if valor is not None:
+                self.datos += valor.encode()
+            self.finales.append(len(self.datos))
+        elif self.tipo is not None:
+            self.datos.append(0 if valor is None and self.tipo != "objeto" else valor)
+        self.largo += 1
+
+    def extender(self, valores):
+        """Agrega 'valores' de una vez si todos son del tipo de la columna."""
+        tipo = self.tipo or (self._tipo_de(valores[0]) if valores[0] is not None else None)
+        clase = {"q": int, "d": float, "texto": str}.get(tipo)
+        if clase is None or set(map(type, valores)) != {clase}:
+            for valor in valores:
+                self.agregar(valor)
+            return
+        if self.tipo is None:
+            self._iniciar(tipo)
+        if tipo == "texto":
+            codificados = list(map(str.encode, valores))
+            self.finales.extend(
+                islice(accumulate(map(len, codificados), initial=len(self.datos)), 1, None)
+            )
+            self.datos += b"".join(codificados)
+        else:
+            try:
+                self.datos.extend(valores)
+            except OverflowError:
+                for valor in valores:
+                    self.agregar(valor)
+                return
+        self.largo += len(valores)
+
+    def valor(self, i):
+        if self.nulos and i in self.nulos:
+            return None
+        if self.tipo == "texto":
+            inicio = self.finales[i - 1] if i else 0
+            return self.datos[inicio:self.finales[i]].decode()
+        return self.datos[i]
+
+
+class FilasColumnares:
+    """
+    Secuencia de filas (tuplas) guardada por columnas en buffers compactos
+    (ver _Columna): un entero o un texto corto ocupa unos pocos bytes en
+    lugar de un objeto de Python por valor y una tupla por fila. Admite
+    len(), índices e iteración; las filas se arman al pedirlas.
+    """
+
+    LOTE = 4096
+
+    def __init__(self, filas=()):
+        self._columnas = None
+        self._largo = 0
+        self.extend(filas)
+
+    def extend(self, filas):
+        filas = iter(filas)
+        while True:
+            lote = [tuple(fila) for fila in islice(filas, self.LOTE)]
+            if not lote:
+                return
+            if self._columnas is None:
+                self._columnas = [_Columna() for _ in lote[0]]
+            for columna, valores in zip(self._columnas, zip(*lote)):
+                columna.extender(valores)
+            self._largo += len(lote)
+
+    def __len__(self):
+        return self._largo
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._largo
+        if not 0 <= i < self._largo:
+            raise IndexError("Índice de fila fuera de rango.")
+        return tuple(columna.valor(i) for columna in self._columnas)
+
+    def __iter__(self):
+        return (self[i] for i in range(self._largo))
+
+
+class TablaVirtual(ttk.Frame):
+    """
+    Tabla para resultados grandes: guarda las filas en FilasColumnares y el
+    Treeview solo tiene tantos ítems como filas visibles, que se
+    reutilizan al desplazarse. Crear la tabla y desplazarla cuesta lo mismo
+    con cien filas que con un millón.
+
+    Se llena con mostrar(filas) o con paginar(cargar, formatear), que pide
+    páginas a una función con cursor (paginación por clave) a medida que el
+    usuario se acerca al final de lo cargado.
+
+    selection() e item() imitan a los del Treeview usando el índice de la
+    fila como iid, así el código que lee la fila seleccionada no cambia.
+    """
+
+    def __init__(self, parent, columnas, widths=None, filas_visibles=20, **kwargs):
+        super().__init__(parent, **kwargs)
+        widths = widths or {}
+        self.tree = ttk.Treeview(
+            self,
+            columns=columnas,
+            show="headings",
+            style="Treeview",
+            selectmode="browse",
+            height=filas_visibles,
+        )
+        for col in columnas:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=widths.get(col, 120), anchor="w")
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.barra.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.visibles = filas_visibles
+        self.filas = FilasColumnares()
+        self.inicio = 0
+        self._seleccion = None
+        # Lo que muestra cada ítem del Treeview: índice de la fila o None.
+        self._espacios = []
+        for k in range(filas_visibles):
+            self.tree.insert("", "end", iid=str(k), values=())
+            self.tree.detach(str(k))
+            self._espacios.append(None)
+        # Paginación: 'consulta' descarta páginas de una carga anterior.
+        self._cargar = None
+        self._formatear = None
+        self._al_fallar = None
+        self._cursor = None
+        self._cargando = False
+        self._consulta = 0
+
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+        for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(evento, self._rueda)
+        pasos = {"<Up>": -1, "<Down>": 1, "<Prior>": -filas_visibles, "<Next>": filas_visibles}
+        for tecla, paso in pasos.items():
+            self.tree.bind(tecla, lambda event, paso=paso: self._mover_seleccion(paso))
+        self._dibujar()
+
+    # --- Datos ---
+    def mostrar(self, filas):
+        """Reemplaza el contenido por 'filas' (tuplas con los valores de cada columna)."""
+        self._consulta += 1
+        self._cargar = None
+        self._cargando = False
+        self.filas = FilasColumnares(filas)
+        self._reiniciar_vista()
+
+    def paginar(self, cargar, formatear=tuple, al_fallar=None):
+        """
+        Reemplaza el contenido por los resultados de una consulta paginada.
+        cargar(cursor, al_recibir, al_fallar) debe pedir la página que empieza
+        en 'cursor' (None para la primera) y llamar a al_recibir((filas,
+        siguiente_cursor)); cuando siguiente_cursor es None no hay más.
+        'formatear' convierte cada fila en la tupla que se muestra.
+        """
+        self._consulta += 1
+        self._cargar = cargar
+        self._formatear = formatear
+        self._al_fallar = al_fallar
+        self._cursor = None
+        self._cargando = False
+        self.filas = FilasColumnares()
+        self._reiniciar_vista()
+        self._pedir_pagina()
+
+    def hay_mas(self):
+        return self._cargar is not None
+
+    def fila_seleccionada(self):
+        return self.filas[self._seleccion] if self._seleccion is not None else None
+
+    def selection(self):
+        return (str(self._seleccion),) if self._seleccion is not None else ()
+
+    def item(self, iid, opcion=None):
+        valores = list(self.filas[int(iid)])
+        return valores if opcion == "values" else {"values": valores}
+
+    def _pedir_pagina(self):
+        if self._cargar is None or self._cargando:
+            return
+        self._cargando = True
+        consulta = self._consulta
+
+        def al_recibir(resultado):
+            if consulta != self._consulta:
+                return
+            self._cargando = False
+            filas, self._cursor = resultado
+            self.filas.extend(self._formatear(fila) for fila in filas)
+            if self._cursor is None:
+                self._cargar = None
+            self._dibujar()
+
+        def al_fallar(error):
+            if consulta != self._consulta:
+                return
+            self._cargando = False
+            self._cargar = None
+            if self._al_fallar:
+                self._al_fallar(error)
+
+        self._cargar(self._cursor, al_recibir, al_fallar)
+
+    # --- Vista ---
+    def _reiniciar_vista(self):
+        self.inicio = 0
+        self._seleccion = None
+        self.tree.selection_remove(self.tree.selection())
+        self._dibujar()
+
+    def _dibujar(self):
+        total = len(self.filas)
+        self.inicio = max(0, min(self.inicio, total - self.visibles))
+        for k in range(self.visibles):
+            indice = self.inicio + k
+            iid = str(k)
+            if indice < total:
+                if self._espacios[k] is None:
+                    self.tree.move(iid, "", k)
+                self.tree.item(iid, values=self.filas[indice])
+                self._espacios[k] = indice
+            elif self._espacios[k] is not None:
+                self.tree.detach(iid)
+                self._espacios[k] = None
+        if self._seleccion is not None and 0 <= self._seleccion - self.inicio < self.visibles:
+            self.tree.selection_set(str(self._seleccion - self.inicio))
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+        # Mientras haya páginas por cargar la barra deja lugar para una más.
+        extension = total + (self.visibles if self.hay_mas() else 0)
+        if extension:
+            fin = min(1.0, (self.inicio + self.visibles) / extension)
+            self.barra.set(self.inicio / extension, fin)
+        else:
+            self.barra.set(0.0, 1.0)
+        if self.hay_mas() and self.inicio + 2 * self.visibles >= total:
+            self._pedir_pagina()
+
+    def _ir_a(self, inicio):
+        self.inicio = int(inicio)
+        self._dibujar()
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            extension = len(self.filas) + (self.visibles if self.hay_mas() else 0)
+            self._ir_a(float(cantidad) * extension)
+        elif accion == "scroll":
+            paso = self.visibles if unidad == "pages" else 1
+            self._ir_a(self.inicio + int(cantidad) * paso)
+
+    def _rueda(self, event):
+        if event.num == 4:
+            paso = -3
+        elif event.num == 5:
+            paso = 3
+        else:
+            paso = -3 if event.delta > 0 else 3
+        self._ir_a(self.inicio + paso)
+        return "break"
+
+    def _mover_seleccion(self, paso):
+        if not self.filas:
+            return "break"
+        actual = self.inicio if self._seleccion is None else self._seleccion + paso
+        self._seleccion = max(0, min(actual, len(self.filas) - 1))
+        if self._seleccion < self.inicio:
+            self.inicio = self._seleccion
+        elif self._seleccion >= self.inicio + self.visibles:
+            self.inicio = self._seleccion - self.visibles + 1
+        self._dibujar()
+        self.event_generate("<<TablaSeleccion>>")
+        return "break"
+
+    def _al_seleccionar(self, event):
+        seleccion = self.tree.selection()
+        if seleccion:
+            indice = self.inicio + int(seleccion[0])
+            if indice != self._seleccion:
+                self._seleccion = indice
+                self.event_generate("<<TablaSeleccion>>")
+        elif self._seleccion is not None and 0 <= self._seleccion - self.inicio < self.visibles:
+            # El usuario quitó la selección; si la fila solo salió de la
+            # vista (desplazamiento), se conserva.
+            self._seleccion = None
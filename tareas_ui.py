@@ -0,0 +1,165 @@
+"""
+Ejecución en segundo plano para la interfaz gráfica. Las llamadas a
+db_manager corren en un pool de hilos y sus resultados vuelven al hilo de Tk
+mediante una cola revisada con after(), de modo que la ventana nunca se
+bloquea esperando a la base de datos.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Tarea:
+    """Solicitud en curso. Una tarea cancelada nunca llama a sus callbacks."""
+
+    def __init__(self, grupo, generacion, al_terminar, al_fallar):
+        self.grupo = grupo
+        self.generacion = generacion
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.cancelada = False
+        self.futuro = None
+
+
+class EjecutorTareas:
+    """
+    Ejecuta funciones en un pool de hilos y entrega el resultado (o la
+    excepción) en el hilo de Tk llamando a 'al_terminar' (o 'al_fallar').
+
+    Las tareas pueden pertenecer a un grupo (por ejemplo, la pantalla
+    visible). cancelar(grupo) descarta las tareas pendientes del grupo: las
+    que aún no empezaron no se ejecutan y las que ya corren terminan en
+    segundo plano pero su resultado se ignora.
+
+    'al_cambiar_ocupado' recibe True cuando empieza a haber tareas visibles
+    pendientes y False cuando ya no queda ninguna.
+    """
+
+    def __init__(
+        self,
+        raiz,
+        max_hilos=4,
+        intervalo_ms=30,
+        al_cambiar_ocupado=None,
+        al_fallar_por_defecto=None,
+    ):
+        self.raiz = raiz
+        self.intervalo_ms = intervalo_ms
+        self.al_cambiar_ocupado = al_cambiar_ocupado
+        self.al_fallar_por_defecto = al_fallar_por_defecto
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_hilos, thread_name_prefix="tareas_ui"
+        )
+        self._resultados = queue.Queue()
+        self._generaciones = {}
+        # Solo se tocan desde el hilo de Tk.
+        self._activas = set()
+        self._sondeando = False
+        self._cerrado = False
+
+    @property
+    def ocupado(self):
+        return bool(self._activas)
+
+    def ejecutar(
+        self, funcion, *args, al_terminar=None, al_fallar=None, grupo=None, **kwargs
+    ):
+        """Programa funcion(*args, **kwargs) y devuelve la Tarea creada."""
+        if self._cerrado:
+            raise RuntimeError("El ejecutor de tareas está cerrado.")
+        tarea = Tarea(
+            grupo, self._generaciones.get(grupo, 0), al_terminar, al_fallar
+        )
+        estaba_ocupado = self.ocupado
+        self._activas.add(tarea)
+        tarea.futuro = self._executor.submit(
+            self._correr, tarea, funcion, args, kwargs
+        )
+        if not estaba_ocupado:
+            self._notificar_ocupado()
+        self._programar_sondeo()
+        return tarea
+
+    def _correr(self, tarea, funcion, args, kwargs):
+        # Hilo de trabajo: nunca toca widgets, solo deja el resultado en la cola.
+        if tarea.cancelada:
+            return
+        try:
+            self._resultados.put((tarea, True, funcion(*args, **kwargs)))
+        except Exception as e:
+            self._resultados.put((tarea, False, e))
+
+    def cancelar(self, grupo=None):
+        """
+        Cancela las tareas de 'grupo', o todas si grupo es None. Devuelve
+        cuántas tareas pendientes se descartaron.
+        """
+        if grupo is None:
+            for g in list(self._generaciones):
+                self._generaciones[g] += 1
+        else:
+            self._generaciones[grupo] = self._generaciones.get(grupo, 0) + 1
+        estaba_ocupado = self.ocupado
+        descartadas = 0
+        for tarea in list(self._activas):
+            if grupo is None or tarea.grupo == grupo:
+                self._descartar(tarea)
+                descartadas += 1
+        if estaba_ocupado and not self.ocupado:
+            self._notificar_ocupado()
+        return descartadas
+
+    def _descartar(self, tarea):
+        tarea.cancelada = True
+        tarea.futuro.cancel()
+        self._activas.discard(tarea)
+
+    def _es_vigente(self, tarea):
+        return not tarea.cancelada and tarea.generacion == self._generaciones.get(
+            tarea.grupo, 0
+        )
+
+    def _programar_sondeo(self):
+        if not self._sondeando and not self._cerrado:
+            self._sondeando = True
+            self.raiz.after(self.intervalo_ms, self._procesar_resultados)
+
+    def _procesar_resultados(self):
+        self._sondeando = False
+        if self._cerrado:
+            return
+        try:
+            while True:
+                try:
+                    tarea, exito, valor = self._resultados.get_nowait()
+                except queue.Empty:
+                    break
+                if tarea not in self._activas:
+                    continue
+                self._activas.discard(tarea)
+                if not self.ocupado:
+                    self._notificar_ocupado()
+                if not self._es_vigente(tarea):
+                    continue
+                if exito:
+                    if tarea.al_terminar:
+                        tarea.al_terminar(valor)
+                else:
+                    manejador = tarea.al_fallar or self.al_fallar_por_defecto
+                    if manejador:
+                        manejador(valor)
+        finally:
+            # Un error en un callback no debe dejar sin entregar a las demás tareas.
+            if self._activas:
+                self._programar_sondeo()
+
+    def _notificar_ocupado(self):
+        if self.al_cambiar_ocupado:
+            self.al_cambiar_ocupado(self.ocupado)
+
+    def cerrar(self):
+        """Cancela todo y libera los hilos sin esperar a las tareas en curso."""
+        self._cerrado = True
+        for tarea in list(self._activas):
+            self._descartar(tarea)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,171 @@
+"""
+Recibos que genera ejecutar_nomina_db para un periodo de prueba: una
+empresa con tres contratos activos de salario conocido y uno finalizado,
+con las tasas por defecto (INCES 0,5 %, IVSS 1 %, comisión 2 %) y con un
+cambio de tasa con tope. Además, sobre una base sintética de unos cientos
+de contratos, compara los recibos con los del bucle original fila por fila
+(benchmarks/bench_nomina.py).
+
+Uso: python -m unittest (desde la raíz del repositorio)
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import db_manager
+from benchmarks.bench_nomina import ejecutar_nomina_por_filas, recibos_de
+from datos_sinteticos import crear_base_sintetica
+
+# ID_Contrato -> (Estatus, Salario_Acordado)
+CONTRATOS = {
+    1: ("Activo", 1000.0),
+    2: ("Activo", 2500.5),
+    3: ("Activo", 30000.0),
+    4: ("Finalizado", 4000.0),
+}
+# ID_Contrato -> (Salario_Base, INCES, IVSS, Comisión, Neto) con las tasas por defecto.
+ESPERADOS = {
+    1: (1000.0, 5.0, 10.0, 20.0, 985.0),
+    2: (2500.5, 12.5025, 25.005, 50.01, 2462.9925),
+    3: (30000.0, 150.0, 300.0, 600.0, 29550.0),
+}
+
+
+class TestRecibosNomina(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp(prefix="test_nomina_")
+        ruta = os.path.join(self.directorio, "nomina.db")
+        crear_base_sintetica(
+            ruta, empresas=1, postulantes=10, vacantes=3, postulaciones=10, contratos=4, meses_nomina=0
+        )
+        conn = sqlite3.connect(ruta)
+        try:
+            conn.executemany(
+                "UPDATE Contratos SET Estatus = ?, Salario_Acordado = ? WHERE ID_Contrato = ?",
+                [(estatus, salario, id_contrato) for id_contrato, (estatus, salario) in CONTRATOS.items()],
+            )
+            conn.commit()
+            self.id_empresa = conn.execute("SELECT ID_Empresa FROM Empresas").fetchone()[0]
+        finally:
+            conn.close()
+        db_manager.configurar_base_datos(ruta)
+
+    def tearDown(self):
+        db_manager.cerrar_pool()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def recibos(self, id_nomina):
+        with db_manager.get_db_connection() as conn:
+            return {
+                fila[0]: tuple(fila[1:])
+                for fila in conn.execute(
+                    """SELECT ID_Contrato, Salario_Base, Monto_Deduccion_INCES, Monto_Deduccion_IVSS,
+                       Comision_Hiring_Group, Salario_Neto_Pagado FROM Recibos WHERE ID_Nomina = ?""",
+                    (id_nomina,),
+                )
+            }
+
+    def comprobar(self, obtenidos, esperados):
+        self.assertEqual(set(obtenidos), set(esperados))
+        for id_contrato, montos in esperados.items():
+            for obtenido, esperado in zip(obtenidos[id_contrato], montos):
+                self.assertAlmostEqual(obtenido, esperado, places=6, msg=f"contrato {id_contrato}")
+
+    def test_recibos_con_tasas_por_defecto(self):
+        exito, mensaje, id_nomina = db_manager.ejecutar_nomina_db(self.id_empresa, 3, 2024)
+        self.assertTrue(exito, mensaje)
+        self.comprobar(self.recibos(id_nomina), ESPERADOS)
+
+    def test_tasa_con_tope_desde_su_fecha(self):
+        exito, mensaje = db_manager.registrar_tasa_nomina_db("IVSS", 0.012, "2024-06-01", tope_base=10000)
+        self.assertTrue(exito, mensaje)
+        _, _, anterior = db_manager.ejecutar_nomina_db(self.id_empresa, 5, 2024)
+        _, _, posterior = db_manager.ejecutar_nomina_db(self.id_empresa, 6, 2024)
+        self.comprobar(self.recibos(anterior), ESPERADOS)
+        self.comprobar(
+            self.recibos(posterior),
+            {
+                1: (1000.0, 5.0, 12.0, 20.0, 983.0),
+                2: (2500.5, 12.5025, 30.006, 50.01, 2457.9915),
+                3: (30000.0, 150.0, 120.0, 600.0, 29730.0),
+            },
+        )
+
+    def test_fecha_o_tope_invalidos_no_registran_tasa(self):
+        for fecha, tope in (("2024-6-1", None), ("2024-02-30", None), ("2024-06-01", -1)):
+            exito, mensaje = db_manager.registrar_tasa_nomina_db("IVSS", 0.5, fecha, tope_base=tope)
+            self.assertFalse(exito, mensaje)
+        _, _, id_nomina = db_manager.ejecutar_nomina_db(self.id_empresa, 7, 2024)
+        self.comprobar(self.recibos(id_nomina), ESPERADOS)
+
+    def test_periodo_repetido_no_duplica_recibos(self):
+        _, _, id_nomina = db_manager.ejecutar_nomina_db(self.id_empresa, 3, 2024)
+        exito, _, repetida = db_manager.ejecutar_nomina_db(self.id_empresa, 3, 2024)
+        self.assertFalse(exito)
+        self.assertIsNone(repetida)
+        with db_manager.get_db_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM Recibos").fetchone()[0], len(ESPERADOS))
+        self.comprobar(self.recibos(id_nomina), ESPERADOS)
+
+    def test_version_de_recibos_sube_una_vez_por_nomina(self):
+        antes = db_manager.get_version_datos(("nominas", "recibos"))
+        db_manager.ejecutar_nomina_db(self.id_empresa, 4, 2024)
+        despues = db_manager.get_version_datos(("nominas", "recibos"))
+        self.assertEqual([d - a for a, d in zip(antes[1:], despues[1:])], [1, 1])
+        with db_manager.get_db_connection() as conn:
+            conn.execute("DELETE FROM Nominas")
+            conn.commit()
+        self.assertEqual(db_manager.get_version_datos(("recibos",))[1], despues[2] + 1)
+
+
+class TestRecibosContraBucleOriginal(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp(prefix="test_nomina_")
+        ruta = os.path.join(self.directorio, "sintetica.db")
+        crear_base_sintetica(
+            ruta, empresas=4, postulantes=400, vacantes=40, postulaciones=400, contratos=300, meses_nomina=0
+        )
+        db_manager.configurar_base_datos(ruta)
+        with db_manager.get_db_connection() as conn:
+            self.empresas = [
+                fila[0]
+                for fila in conn.execute(
+                    """SELECT DISTINCT v.ID_Empresa FROM Contratos c
+                       JOIN Postulaciones p ON c.ID_Postulacion = p.ID_Postulacion
+                       JOIN Vacantes v ON p.ID_Vacante = v.ID_Vacante
+                       WHERE c.Estatus = 'Activo' ORDER BY v.ID_Empresa"""
+                )
+            ]
+
+    def tearDown(self):
+        db_manager.cerrar_pool()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def test_ejecutar_nomina_db_igual_al_bucle_por_filas(self):
+        self.assertGreater(len(self.empresas), 1)
+        total = 0
+        for id_empresa in self.empresas:
+            esperados = recibos_de(ejecutar_nomina_por_filas(id_empresa, 1, 2024))
+            exito, mensaje, id_nomina = db_manager.ejecutar_nomina_db(id_empresa, 2, 2024)
+            self.assertTrue(exito, mensaje)
+            self.assertEqual(recibos_de(id_nomina), esperados, f"empresa {id_empresa}")
+            total += len(esperados)
+        self.assertGreaterEqual(total, 200)
+
+    def test_nomina_por_lote_igual_al_bucle_por_filas(self):
+        esperados = {
+            id_empresa: recibos_de(ejecutar_nomina_por_filas(id_empresa, 1, 2024))
+            for id_empresa in self.empresas
+        }
+        resultados, _ = db_manager.ejecutar_nomina_lote_db(2, 2024)
+        generadas = {r["ID_Empresa"]: r["ID_Nomina"] for r in resultados if r["Estado"] == "Generada"}
+        self.assertEqual(set(generadas), set(esperados))
+        for id_empresa, id_nomina in generadas.items():
+            self.assertEqual(recibos_de(id_nomina), esperados[id_empresa], f"empresa {id_empresa}")
+
+
+if __name__ == "__main__":
+    unittest.main()